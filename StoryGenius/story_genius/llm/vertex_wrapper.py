@@ -1,6 +1,7 @@
 import vertexai
 from vertexai.generative_models import GenerativeModel, SafetySetting
 import os
+import threading
 
 class VertexLLM:
     def __init__(self, project_id="winged-precept-458206-j1", location="us-central1", model_name="gemini-2.0-flash-001"):
@@ -13,56 +14,64 @@ class VertexLLM:
         try:
             vertexai.init(project=self.project_id, location=self.location)
             self.model = GenerativeModel(self.model_name)
+            # One model per distinct system instruction; building them is expensive
+            self._models = {None: self.model}
+            self._models_lock = threading.Lock()
+            self._safety_settings = self._build_safety_settings()
             print(f"Vertex AI initialized with project {self.project_id} and model {self.model_name}")
         except Exception as e:
             print(f"Failed to initialize Vertex AI: {e}")
             raise
 
+    def _build_safety_settings(self):
+        return [
+            SafetySetting(
+                category=SafetySetting.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+                threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+            ),
+            SafetySetting(
+                category=SafetySetting.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+                threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+            ),
+            SafetySetting(
+                category=SafetySetting.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+                threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+            ),
+            SafetySetting(
+                category=SafetySetting.HarmCategory.HARM_CATEGORY_HARASSMENT,
+                threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+            ),
+        ]
+
+    def _get_model(self, system_instruction=None):
+        """
+        Returns a model for the given system instruction, building it once and caching it.
+        """
+        model = self._models.get(system_instruction)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(system_instruction)
+                if model is None:
+                    model = GenerativeModel(self.model_name, system_instruction=[system_instruction])
+                    self._models[system_instruction] = model
+        return model
+
+    def _generation_config(self, temperature):
+        return {
+            "max_output_tokens": 8192,
+            "temperature": temperature,
+            "top_p": 0.95,
+        }
+
     def generate_content(self, prompt, system_instruction=None, temperature=0.7):
         """
         Generates content using Vertex AI Gemini model.
         """
         try:
-            # Note: system_instruction is supported in newer SDK versions for Gemini 1.5
-            # If creating a chat session, system_instruction goes into history or model init.
-            # For simplicity, we prepend it to the prompt if provided, or use the model's system_instruction arg if available.
-            
-            # Re-init model with system instruction if needed (expensive) or just prepend.
-            # Efficient way: instantiate model with system_instruction if provided.
-            if system_instruction:
-                 model = GenerativeModel(self.model_name, system_instruction=[system_instruction])
-            else:
-                 model = self.model
-
-            generation_config = {
-                "max_output_tokens": 8192,
-                "temperature": temperature,
-                "top_p": 0.95,
-            }
-
-            safety_settings = [
-                SafetySetting(
-                    category=SafetySetting.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                    threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
-                ),
-                SafetySetting(
-                    category=SafetySetting.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                    threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
-                ),
-                SafetySetting(
-                    category=SafetySetting.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                    threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
-                ),
-                SafetySetting(
-                    category=SafetySetting.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                    threshold=SafetySetting.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
-                ),
-            ]
-
-            response = model.generate_content(
+            response = self._get_model(system_instruction).generate_content(
                 [prompt],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
+                generation_config=self._generation_config(temperature),
+                safety_settings=self._safety_settings,
                 stream=False,
             )
 
@@ -72,6 +81,30 @@ class VertexLLM:
             # Fallback or re-raise
             raise
 
+    def stream_content(self, prompt, system_instruction=None, temperature=0.7):
+        """
+        Streams generated text, yielding chunks as the model produces them.
+        """
+        try:
+            responses = self._get_model(system_instruction).generate_content(
+                [prompt],
+                generation_config=self._generation_config(temperature),
+                safety_settings=self._safety_settings,
+                stream=True,
+            )
+
+            for chunk in responses:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. finish metadata)
+                    continue
+                if text:
+                    yield text
+        except Exception as e:
+            print(f"Error streaming content with Vertex AI: {e}")
+            raise
+
 if __name__ == "__main__":
     # Test the wrapper
     llm = VertexLLM()
@@ -0,0 +1,236 @@
+"""
+Analytics Rollups
+Incrementally maintained per-day, per-platform counters and top-k trackers,
+so dashboard queries cost O(days) instead of O(videos).
+"""
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from dataclasses import dataclass
+import heapq
+
+
+# Metrics tracked per event
+EVENT_METRICS = ("views", "likes", "shares")
+
+# Metrics with a maintained top-k; engagement can go down as views grow, so
+# a bounded top-k can't track it exactly
+TOP_K_METRICS = ("views", "likes", "shares", "quality")
+
+DEFAULT_TOP_K = 100
+
+
+def engagement_rate(likes: int, shares: int, views: int) -> float:
+    """Engagement = (likes + shares) / views * 100"""
+    if views == 0:
+        return 0.0
+    return ((likes + shares) / views) * 100
+
+
+def day_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+
+@dataclass
+class Counters:
+    """Additive counters for one rollup bucket"""
+    videos: int = 0
+    views: int = 0
+    likes: int = 0
+    shares: int = 0
+    engagement_sum: float = 0.0  # sum of per-video engagement rates
+    quality_sum: float = 0.0
+
+    def merge(self, other: "Counters"):
+        self.videos += other.videos
+        self.views += other.views
+        self.likes += other.likes
+        self.shares += other.shares
+        self.engagement_sum += other.engagement_sum
+        self.quality_sum += other.quality_sum
+
+    @property
+    def engagement(self) -> float:
+        """Engagement rate of the events in this bucket"""
+        return engagement_rate(self.likes, self.shares, self.views)
+
+    def to_dict(self) -> Dict:
+        return {
+            "videos": self.videos,
+            "views": self.views,
+            "likes": self.likes,
+            "shares": self.shares,
+            "engagement": round(self.engagement, 2)
+        }
+
+
+class TopK:
+    """
+    Bounded top-k for scores that only increase.
+
+    Members live in a dict; a min-heap over them (with stale entries skipped
+    lazily) gives the current floor. A non-member can only enter by beating
+    the floor, which is exact as long as scores never decrease.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TOP_K):
+        self.capacity = capacity
+        self._scores: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def update(self, key: str, score: float):
+        if key in self._scores:
+            self._scores[key] = score
+            self._push(score, key)
+            return
+
+        if len(self._scores) < self.capacity:
+            self._scores[key] = score
+            self._push(score, key)
+            return
+
+        floor_score, floor_key = self._floor()
+        if score <= floor_score:
+            return
+
+        heapq.heappop(self._heap)
+        del self._scores[floor_key]
+        self._scores[key] = score
+        self._push(score, key)
+
+    def discard(self, key: str):
+        self._scores.pop(key, None)
+
+    def top(self, n: int) -> List[str]:
+        """Keys of the n highest scores, best first (n <= capacity)"""
+        return [k for k, _ in heapq.nlargest(n, self._scores.items(), key=lambda kv: kv[1])]
+
+    def _push(self, score: float, key: str):
+        heapq.heappush(self._heap, (score, key))
+        if len(self._heap) > 2 * self.capacity + 16:
+            # Drop stale entries
+            self._heap = [(s, k) for k, s in self._scores.items()]
+            heapq.heapify(self._heap)
+
+    def _floor(self) -> Tuple[float, str]:
+        while True:
+            score, key = self._heap[0]
+            if self._scores.get(key) == score:
+                return score, key
+            heapq.heappop(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class AnalyticsRollups:
+    """
+    Rollup tables for AnalyticsService.
+
+    - by_created_day: lifetime counters of the videos created on each day,
+      which is what date-range metrics filter on
+    - by_activity_day / by_platform_day: events by the day they happened,
+      for time series
+    - by_platform: lifetime counters per platform
+    - top: per-metric top-k of video ids
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.top_k = top_k
+        self.by_created_day: Dict[str, Counters] = {}
+        self.by_activity_day: Dict[str, Counters] = {}
+        self.by_platform_day: Dict[Tuple[str, str], Counters] = {}
+        self.by_platform: Dict[str, Counters] = {}
+        self.top: Dict[str, TopK] = {m: TopK(top_k) for m in TOP_K_METRICS}
+
+        self._created_day: Dict[str, str] = {}
+        self._platform: Dict[str, str] = {}
+
+    # ----- Updates -----
+
+    def add_video(self, video, platform: str = "unknown"):
+        """Register a new video (a VideoPerformance)"""
+        created = day_key(video.created_at)
+        self._created_day[video.id] = created
+        self._platform[video.id] = platform
+
+        for bucket in (self._bucket(self.by_created_day, created),
+                       self._bucket(self.by_platform, platform)):
+            bucket.videos += 1
+            bucket.quality_sum += video.quality
+            bucket.views += video.views
+            bucket.likes += video.likes
+            bucket.shares += video.shares
+            bucket.engagement_sum += video.engagement
+
+        for metric in TOP_K_METRICS:
+            self.top[metric].update(video.id, getattr(video, metric))
+
+    def record(self, video, metric: str, count: int = 1, now: Optional[datetime] = None):
+        """
+        Roll up `count` events of `metric` that were already applied to the
+        video's own counters, and refresh its engagement.
+        """
+        now = now or datetime.utcnow()
+        platform = self._platform.get(video.id, "unknown")
+        created = self._created_day.get(video.id, day_key(video.created_at))
+        activity = day_key(now)
+
+        old_engagement = video.engagement
+        video.engagement = engagement_rate(video.likes, video.shares, video.views)
+        delta = video.engagement - old_engagement
+
+        for bucket in (self._bucket(self.by_created_day, created),
+                       self._bucket(self.by_platform, platform)):
+            setattr(bucket, metric, getattr(bucket, metric) + count)
+            bucket.engagement_sum += delta
+
+        for bucket in (self._bucket(self.by_activity_day, activity),
+                       self._bucket(self.by_platform_day, (platform, activity))):
+            setattr(bucket, metric, getattr(bucket, metric) + count)
+
+        if metric in self.top:
+            self.top[metric].update(video.id, getattr(video, metric))
+
+    @staticmethod
+    def _bucket(table: Dict, key) -> Counters:
+        bucket = table.get(key)
+        if bucket is None:
+            bucket = table[key] = Counters()
+        return bucket
+
+    # ----- Queries -----
+
+    def totals(self, since: Optional[date] = None) -> Counters:
+        """Counters for videos created on or after `since` (all if None)"""
+        since_key = since.strftime("%Y-%m-%d") if since else None
+        result = Counters()
+        for day, bucket in self.by_created_day.items():
+            if since_key is None or day >= since_key:
+                result.merge(bucket)
+        return result
+
+    def timeseries(
+        self,
+        days: int,
+        end: Optional[date] = None,
+        platform: Optional[str] = None
+    ) -> List[Tuple[str, Counters]]:
+        """Activity counters for each of the last `days` days, oldest first"""
+        end = end or datetime.utcnow().date()
+        empty = Counters()
+        series = []
+        for i in range(days):
+            day = (end - timedelta(days=days - i - 1)).strftime("%Y-%m-%d")
+            if platform is None:
+                bucket = self.by_activity_day.get(day, empty)
+            else:
+                bucket = self.by_platform_day.get((platform, day), empty)
+            series.append((day, bucket))
+        return series
+
+    def top_ids(self, metric: str, limit: int) -> Optional[List[str]]:
+        """Top video ids by metric, or None if it isn't tracked at that depth"""
+        tracker = self.top.get(metric)
+        if tracker is None or limit > self.top_k:
+            return None
+        return tracker.top(limit)
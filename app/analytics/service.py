@@ -6,7 +6,10 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import defaultdict
+import heapq
+import itertools
 
+from app.analytics.rollups import AnalyticsRollups, engagement_rate
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -74,31 +77,39 @@ class AnalyticsService:
         # Mock data storage (in production: use database)
         self._videos: Dict[str, VideoPerformance] = {}
         self._timeseries: Dict[str, List[TimeseriesData]] = defaultdict(list)
+        # Incrementally maintained aggregates behind the dashboard queries
+        self._rollups = AnalyticsRollups()
         logger.info("AnalyticsService initialized")
     
+    def _track(self, video_id: str, metric: str) -> bool:
+        video = self._videos.get(video_id)
+        if video is None:
+            return False
+        setattr(video, metric, getattr(video, metric) + 1)
+        self._rollups.record(video, metric)
+        return True
+    
     def track_video_view(self, video_id: str):
         """Track video view"""
-        if video_id in self._videos:
-            self._videos[video_id].views += 1
+        if self._track(video_id, "views"):
             logger.debug(f"Tracked view for video: {video_id}")
     
     def track_video_like(self, video_id: str):
         """Track video like"""
-        if video_id in self._videos:
-            self._videos[video_id].likes += 1
+        if self._track(video_id, "likes"):
             logger.debug(f"Tracked like for video: {video_id}")
     
     def track_video_share(self, video_id: str):
         """Track video share"""
-        if video_id in self._videos:
-            self._videos[video_id].shares += 1
+        if self._track(video_id, "shares"):
             logger.debug(f"Tracked share for video: {video_id}")
     
     def add_video(
         self,
         video_id: str,
         title: str,
-        quality: float
+        quality: float,
+        platform: str = "unknown"
     ):
         """Add video to analytics tracking"""
         video = VideoPerformance(
@@ -113,6 +124,7 @@ class AnalyticsService:
         )
         
         self._videos[video_id] = video
+        self._rollups.add_video(video, platform)
         logger.info(f"Added video to analytics: {video_id}")
     
     def calculate_engagement(self, video_id: str) -> float:
@@ -125,13 +137,8 @@ class AnalyticsService:
         
         video = self._videos[video_id]
         
-        if video.views == 0:
-            return 0.0
-        
-        engagement = ((video.likes + video.shares) / video.views) * 100
-        video.engagement = engagement
-        
-        return engagement
+        # Kept current by the rollups on every tracked event
+        return engagement_rate(video.likes, video.shares, video.views)
     
     def get_metrics(
         self,
@@ -146,15 +153,11 @@ class AnalyticsService:
         Returns:
             AnalyticsMetrics
         """
-        # Filter videos by date range
+        # Sum the per-creation-day rollups in range: O(days), not O(videos)
         cutoff_date = self._get_cutoff_date(date_range)
+        totals = self._rollups.totals(cutoff_date.date() if cutoff_date else None)
         
-        filtered_videos = [
-            v for v in self._videos.values()
-            if cutoff_date is None or v.created_at >= cutoff_date
-        ]
-        
-        if not filtered_videos:
+        if not totals.videos:
             return AnalyticsMetrics(
                 total_videos=0,
                 total_views=0,
@@ -164,17 +167,14 @@ class AnalyticsService:
                 total_shares=0
             )
         
-        total_videos = len(filtered_videos)
-        total_views = sum(v.views for v in filtered_videos)
-        total_likes = sum(v.likes for v in filtered_videos)
-        total_shares = sum(v.shares for v in filtered_videos)
+        total_videos = totals.videos
+        total_views = totals.views
+        total_likes = totals.likes
+        total_shares = totals.shares
         
         # Calculate averages
-        avg_engagement = sum(
-            self.calculate_engagement(v.id) for v in filtered_videos
-        ) / total_videos
-        
-        avg_quality = sum(v.quality for v in filtered_videos) / total_videos
+        avg_engagement = totals.engagement_sum / total_videos
+        avg_quality = totals.quality_sum / total_videos
         
         metrics = AnalyticsMetrics(
             total_videos=total_videos,
@@ -207,23 +207,17 @@ class AnalyticsService:
         Returns:
             List of top videos
         """
-        # Update engagement for all videos
-        for video_id in self._videos:
-            self.calculate_engagement(video_id)
-        
-        # Sort videos
-        videos = list(self._videos.values())
-        
-        if sort_by == "views":
-            videos.sort(key=lambda v: v.views, reverse=True)
-        elif sort_by == "likes":
-            videos.sort(key=lambda v: v.likes, reverse=True)
-        elif sort_by == "engagement":
-            videos.sort(key=lambda v: v.engagement, reverse=True)
-        elif sort_by == "quality":
-            videos.sort(key=lambda v: v.quality, reverse=True)
-        
-        top_videos = videos[:limit]
+        top_ids = self._rollups.top_ids(sort_by, limit)
+        
+        if top_ids is not None:
+            top_videos = [self._videos[video_id] for video_id in top_ids]
+        elif sort_by in ("views", "likes", "shares", "engagement", "quality"):
+            # Deeper than the maintained top-k, or engagement (not monotonic)
+            top_videos = heapq.nlargest(
+                limit, self._videos.values(), key=lambda v: getattr(v, sort_by)
+            )
+        else:
+            top_videos = list(itertools.islice(self._videos.values(), limit))
         
         logger.info(f"Retrieved top {limit} videos sorted by {sort_by}")
         
@@ -231,38 +225,33 @@ class AnalyticsService:
     
     def get_engagement_timeseries(
         self,
-        date_range: str = "30d"
+        date_range: str = "30d",
+        platform: Optional[str] = None
     ) -> List[TimeseriesData]:
         """
         Get engagement timeseries data.
         
         Args:
             date_range: Time range (7d, 30d, 90d)
+            platform: Optional platform filter
         
         Returns:
             List of timeseries data points
         """
         days = self._parse_date_range(date_range)
         
-        # Generate mock timeseries data
-        # In production: aggregate from database
-        timeseries = []
-        
-        import random
-        base_engagement = 65.0
-        
-        for i in range(days):
-            date = (datetime.utcnow() - timedelta(days=days-i-1)).strftime("%Y-%m-%d")
-            
-            # Simulate engagement trend (slightly increasing)
-            engagement = base_engagement + (i * 0.3) + random.uniform(-5, 5)
-            
-            timeseries.append(TimeseriesData(
-                date=date,
-                value=round(engagement, 2)
-            ))
-        
-        return timeseries
+        # Engagement of each day's tracked events
+        return [
+            TimeseriesData(date=day, value=round(bucket.engagement, 2))
+            for day, bucket in self._rollups.timeseries(days, platform=platform)
+        ]
+    
+    def get_platform_breakdown(self) -> Dict[str, Dict]:
+        """Lifetime counters per platform"""
+        return {
+            platform: bucket.to_dict()
+            for platform, bucket in self._rollups.by_platform.items()
+        }
     
     def export_to_csv(self) -> str:
         """
@@ -341,6 +330,7 @@ class AnalyticsService:
                 {"date": ts.date, "value": ts.value}
                 for ts in engagement_timeseries
             ],
+            "platforms": self.get_platform_breakdown(),
             "date_range": date_range
         }
 
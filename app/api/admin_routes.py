@@ -3,8 +3,9 @@ Admin API Routes
 Health checks, dead letter management, recovery, and cleanup endpoints.
 """
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 from app.reliability.health import HealthCheckService
 from app.reliability.dead_letter import DeadLetterService, ResolutionStatus
@@ -39,20 +40,33 @@ async def liveness_probe():
 @router.get("/health/ready")
 async def readiness_probe():
     """Kubernetes readiness probe"""
-    return health_service.check_readiness()
+    readiness = health_service.check_readiness()
+    status_code = 200 if readiness["status"] == "ready" else 503
+    return JSONResponse(status_code=status_code, content=readiness)
 
 
 # ==================== Dead Letter Endpoints ====================
 
 @router.get("/dead-letter")
-async def list_dead_letters(status: Optional[str] = None, limit: int = 50):
-    """List dead letter entries"""
+async def list_dead_letters(
+    status: Optional[str] = None,
+    failure_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+):
+    """List dead letter entries, newest first; pass next_cursor to page"""
     status_filter = ResolutionStatus(status) if status else None
-    entries = dead_letter_service.list_entries(status=status_filter, limit=limit)
+    try:
+        entries, next_cursor = dead_letter_service.list_page(
+            status=status_filter, failure_type=failure_type, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "count": len(entries),
-        "entries": [e.to_dict() for e in entries]
+        "entries": [e.to_dict() for e in entries],
+        "next_cursor": next_cursor
     }
 
 
@@ -84,6 +98,35 @@ async def retry_dead_letter(entry_id: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+class BulkRetryRequest(BaseModel):
+    entry_ids: Optional[List[str]] = None
+    failure_type: Optional[str] = None
+    limit: Optional[int] = Field(default=None, ge=0)
+    batch_size: int = Field(default=100, gt=0)
+    max_per_second: float = Field(default=50.0, gt=0)
+
+
+@router.post("/dead-letter/retry")
+def bulk_retry_dead_letters(request: BulkRetryRequest):
+    """
+    Retry pending entries (given ids, or all of a failure type) in
+    rate-limited batches; like the single retry, returns the job info of
+    every entry marked retried so the caller can resubmit the jobs.
+    """
+    # Plain def: FastAPI runs it in the threadpool, so pacing sleeps don't block the loop
+    jobs = []
+    result = dead_letter_service.bulk_retry(
+        entry_ids=request.entry_ids,
+        failure_type=request.failure_type,
+        limit=request.limit,
+        batch_size=request.batch_size,
+        max_per_second=request.max_per_second,
+        enqueue=jobs.extend
+    )
+    result["jobs"] = jobs
+    return result
+
+
 class DismissRequest(BaseModel):
     notes: Optional[str] = None
 
@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 
 from app.assets.service import asset_service
+from app.assets.blobs import CHUNK_SIZE
 from app.assets.folders import folder_service
 from app.assets.tags import tag_service
 from app.assets.versions import version_service
@@ -58,12 +59,13 @@ async def upload_asset(
     auth: AuthContext = Depends(get_current_user)
 ):
     """Upload new asset"""
-    data = await file.read()
+    # Stream the spooled upload in chunks instead of reading it into memory
+    chunks = iter(lambda: file.file.read(CHUNK_SIZE), b"")
     
-    asset, msg = asset_service.upload_asset(
+    asset, msg = asset_service.upload_asset_stream(
         user_id=auth.user.user_id,
         filename=file.filename,
-        data=data,
+        chunks=chunks,
         name=name,
         description=description,
         folder_id=folder_id
@@ -79,16 +81,25 @@ async def upload_asset(
 async def list_assets(
     asset_type: Optional[str] = None,
     folder_id: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
     auth: AuthContext = Depends(get_current_user)
 ):
-    """List user's assets"""
+    """List user's assets (newest first, optionally paginated)"""
     assets = asset_service.list_assets(
+        user_id=auth.user.user_id,
+        asset_type=asset_type,
+        folder_id=folder_id,
+        offset=offset,
+        limit=limit
+    )
+    total = len(assets) if limit is None and not offset else asset_service.count_assets(
         user_id=auth.user.user_id,
         asset_type=asset_type,
         folder_id=folder_id
     )
     return {
-        "count": len(assets),
+        "count": total,
         "assets": [a.to_dict() for a in assets]
     }
 
@@ -162,10 +173,11 @@ async def update_asset(
 async def delete_asset(
     asset_id: str,
     force: bool = False,
+    permanent: bool = False,
     auth: AuthContext = Depends(get_current_user)
 ):
-    """Delete asset"""
-    success, msg = asset_service.delete_asset(asset_id, auth.user.user_id, force)
+    """Delete asset (soft delete unless permanent=true, which also purges soft-deleted assets)"""
+    success, msg = asset_service.delete_asset(asset_id, auth.user.user_id, force, permanent)
     
     if not success:
         raise HTTPException(status_code=400, detail=msg)
@@ -59,7 +59,9 @@ async def get_current_user(
     x_api_key: Optional[str] = Header(None, alias="X-API-Key")
 ) -> AuthContext:
     """Get current authenticated user"""
-    auth_logger.info(f"AUTH CHECK: auth_header={'Present' if authorization else 'Missing'} api_key={'Present' if x_api_key else 'Missing'}")
+    # Per-request trace stays off the hot path unless debug logging is enabled
+    if auth_logger.isEnabledFor(logging.DEBUG):
+        auth_logger.debug(f"AUTH CHECK: auth_header={'Present' if authorization else 'Missing'} api_key={'Present' if x_api_key else 'Missing'}")
     
     # Try API key first
     if x_api_key:
@@ -73,9 +75,9 @@ async def get_current_user(
         token = authorization[7:]
         user_id = extract_user_id(token)
         if user_id:
-            user = auth_service.get_user(user_id)
-            if user and user.is_active():
-                return auth_service.get_auth_context(user)
+            context = auth_service.get_user_context(user_id)
+            if context:
+                return context
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
     raise HTTPException(status_code=401, detail="Authentication required")
@@ -8,6 +8,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from pathlib import Path
+import asyncio
 
 from app.api.routes import router
 from app.core.config import settings
@@ -15,6 +16,9 @@ from app.core.database import init_db
 from app.core.logging import get_logger
 from app.core.exceptions import CustomException
 from app.api.middleware import RequestContextMiddleware, GlobalExceptionMiddleware
+from app.api.router_registry import LazyRouterRegistry, LazyRouterMiddleware, RouterSpec
+from app.webhooks.delivery import delivery_engine
+from app.middleware import audit_writer
 
 logger = get_logger(__name__)
 
@@ -86,81 +90,37 @@ app.add_middleware(
 )
 
 # Include routes
-app.include_router(router)
-# Include Week 18 Creator Routes
-from app.api.creator_routes import router as creator_router
-app.include_router(creator_router)
-
-from app.api.analytics import router as analytics_router
-app.include_router(analytics_router, prefix="/v1")
-
-# Include Auth Routes
+# Core and auth routers are registered eagerly; the rest are imported on the
+# first request that needs them, or by the warm-up after startup.
 from app.api.auth_routes import router as auth_router
-app.include_router(auth_router)
-
-# Include Video Format Routes (Week 23)
-from app.api.video_routes import router as video_router
-app.include_router(video_router)
-
-# Include Batch Generation Routes (Week 24)
-from app.api.batch_routes import router as batch_router
-app.include_router(batch_router)
-
-# Include Template Routes (Week 25)
-from app.api.template_routes import router as template_router
-app.include_router(template_router)
-
-# Include Admin Routes (Week 26 - Reliability)
-from app.api.admin_routes import router as admin_router
-app.include_router(admin_router)
 
-# Include Engine Routes (Week 27)
-from app.api.engine_routes import router as engine_router
-app.include_router(engine_router)
-
-# Include Text Overlay Routes (Week 28)
-from app.api.text_routes import router as text_router
-app.include_router(text_router)
-
-# Include Pacing Routes (Week 29)
-from app.api.pacing_routes import router as pacing_router
-app.include_router(pacing_router)
-
-# Include Thumbnail Routes (Week 30)
-from app.api.thumbnail_routes import router as thumbnail_router
-app.include_router(thumbnail_router)
-
-# Include Observability Routes (Week 31)
-from app.api.observability_routes import router as observability_router
-app.include_router(observability_router)
-
-# Include Auth Routes (Week 32)
-from app.api.auth_routes import router as auth_router
-app.include_router(auth_router)
-
-# Include Asset Routes (Week 33)
-from app.api.asset_routes import router as asset_router
-app.include_router(asset_router)
-
-# Include Project Organization Routes (Week 34)
-from app.api.project_org_routes import router as project_org_router
-app.include_router(project_org_router)
-
-# Include Variation Routes (Week 35)
-from app.api.variation_routes import router as variation_router
-app.include_router(variation_router)
-
-# Include Caption Routes (Week 36)
-from app.api.caption_routes import router as caption_router
-app.include_router(caption_router)
-
-# Include Schedule Routes (Week 37)
-from app.api.schedule_routes import router as schedule_router
-app.include_router(schedule_router)
-
-# Include Export Routes (Week 38 - FINAL)
-from app.api.export_routes import router as export_router
-app.include_router(export_router)
+router_registry = LazyRouterRegistry(app, [
+    RouterSpec("app.api.creator_routes", ("/v1/analytics", "/v1/branding", "/v1/calendar", "/v1/preview")),
+    RouterSpec("app.api.analytics", ("/v1/analytics",), prefix="/v1"),
+    RouterSpec("app.api.video_routes", ("/v1/video",)),                   # Week 23
+    RouterSpec("app.api.batch_routes", ("/v1/batch",)),                   # Week 24
+    RouterSpec("app.api.template_routes", ("/v1/templates",)),            # Week 25
+    RouterSpec("app.api.admin_routes", ("/v1/admin",)),                   # Week 26
+    RouterSpec("app.api.engine_routes", ("/v1/engines", "/v1/hooks", "/v1/scripts")),  # Week 27
+    RouterSpec("app.api.text_routes", ("/v1/text",)),                     # Week 28
+    RouterSpec("app.api.pacing_routes", ("/v1/pacing",)),                 # Week 29
+    RouterSpec("app.api.thumbnail_routes", ("/v1/thumbnails",)),          # Week 30
+    RouterSpec("app.api.observability_routes", ("/v1/dashboard", "/v1/errors", "/v1/health", "/v1/metrics")),  # Week 31
+    RouterSpec("app.api.asset_routes", ("/v1/assets",)),                  # Week 33
+    RouterSpec("app.api.project_org_routes", ("/v1/projects",)),          # Week 34
+    RouterSpec("app.api.variation_routes", ("/v1/scripts/variations",)),  # Week 35
+    RouterSpec("app.api.caption_routes", ("/v1/captions",)),              # Week 36
+    RouterSpec("app.api.schedule_routes", ("/v1/schedules",)),            # Week 37
+    RouterSpec("app.api.export_routes", ("/v1/exports",)),                # Week 38
+], lazy=settings.LAZY_ROUTERS)
+
+router_registry.include(router, name="app.api.routes")
+router_registry.include(auth_router, name="app.api.auth_routes")
+if not router_registry.lazy:
+    router_registry.load_all(trigger="eager")
+
+app.add_middleware(LazyRouterMiddleware, registry=router_registry)
+app.state.router_registry = router_registry
 
 
 @app.on_event("startup")
@@ -169,6 +129,33 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     init_db()
     logger.info("Database initialized")
+    
+    # Resume pending and retrying webhook deliveries left in the outbox
+    delivery_engine.ensure_started()
+    
+    if settings.ROUTER_WARMUP and router_registry.pending:
+        # Import remaining routers off the event loop so early requests
+        # (health checks, auth) are served while engines load
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, _warm_up_routers)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drain background workers before the process exits."""
+    await delivery_engine.stop()
+    await audit_writer.stop_all()
+
+
+def _warm_up_routers():
+    router_registry.load_all(trigger="warmup")
+    report = router_registry.report()
+    logger.info(
+        f"Router warm-up finished in {report['warmup_ms']}ms "
+        f"(imports {report['total_import_ms']}ms)"
+    )
+    for row in report["routers"][:5]:
+        logger.info(f"  {row['module']}: import {row['import_ms']}ms, {row['routes']} routes")
 
 
 @app.get("/")
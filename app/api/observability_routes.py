@@ -3,9 +3,11 @@ Observability API Routes
 Health, metrics, errors, and dashboard endpoints.
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 from typing import Optional
 
+from app.core.profiling import profiler
 from app.observability.health import health_monitor, HealthStatus
 from app.observability.metrics import metrics
 from app.observability.errors import error_tracker, ErrorStatus
@@ -21,8 +23,8 @@ router = APIRouter(prefix="/v1", tags=["observability"])
 
 @router.get("/health")
 async def get_health():
-    """Overall health status"""
-    health = await health_monitor.check_all()
+    """Overall health status (background-refreshed snapshot)"""
+    health = await health_monitor.get_health()
     status_code = 200 if health.status != HealthStatus.UNHEALTHY else 503
     return health.to_dict()
 
@@ -36,13 +38,15 @@ async def liveness_probe():
 @router.get("/health/ready")
 async def readiness_probe():
     """Readiness probe for container orchestration"""
-    return health_monitor.readiness()
+    readiness = health_monitor.readiness()
+    status_code = 200 if readiness["status"] == "ready" else 503
+    return JSONResponse(status_code=status_code, content=readiness)
 
 
 @router.get("/health/components")
 async def get_component_health():
     """All component health statuses"""
-    health = await health_monitor.check_all()
+    health = await health_monitor.get_health()
     return {
         "overall": health.status.value,
         "components": [c.to_dict() for c in health.components]
@@ -89,6 +93,43 @@ async def get_api_metrics():
     }
 
 
+@router.get("/metrics/stages")
+async def get_stage_metrics():
+    """Per-stage latency percentiles keyed "kind/name" """
+    return {
+        "enabled": profiler.enabled,
+        "sample_rate": profiler.sample_rate,
+        "stages": profiler.histograms()
+    }
+
+
+@router.get("/metrics/stages/prometheus")
+async def get_stage_metrics_prometheus():
+    """Per-stage latency histograms in Prometheus text format"""
+    return PlainTextResponse(profiler.prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/stages/jobs")
+async def list_profiled_jobs():
+    """Jobs with a recorded span tree, most recent first"""
+    return {"jobs": profiler.job_ids()}
+
+
+@router.get("/metrics/stages/jobs/{job_id}")
+async def get_job_profile(job_id: str, format: str = "json"):
+    """Flamegraph breakdown of one job (format=folded for folded stacks)"""
+    if format == "folded":
+        folded = profiler.folded(job_id)
+        if not folded:
+            raise HTTPException(status_code=404, detail="No profile recorded for this job")
+        return PlainTextResponse(folded + "\n")
+    
+    breakdown = profiler.breakdown(job_id)
+    if breakdown is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this job")
+    return breakdown
+
+
 # ==================== Error Endpoints ====================
 
 @router.get("/errors")
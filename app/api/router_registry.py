@@ -0,0 +1,198 @@
+"""
+Lazy Router Registry
+Defers importing route modules (and the engines they pull in) until a
+request needs them or the background warm-up reaches them, and records
+per-router import timings for the startup report.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import copy
+import importlib
+import threading
+import time
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# Paths that need every router registered (the OpenAPI schema)
+SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+@dataclass
+class RouterSpec:
+    """A route module and the URL prefixes that trigger loading it."""
+    module: str
+    paths: Tuple[str, ...]
+    prefix: str = ""  # passed to include_router
+    attr: str = "router"
+
+    def matches(self, path: str) -> bool:
+        for p in self.paths:
+            if path == p or path.startswith(p + "/"):
+                return True
+        return False
+
+
+@dataclass
+class RouterTiming:
+    module: str
+    import_seconds: float
+    include_seconds: float
+    route_count: int
+    trigger: str  # "eager", "request" or "warmup"
+
+    def to_dict(self) -> Dict:
+        return {
+            "module": self.module,
+            "import_ms": round(self.import_seconds * 1000, 2),
+            "include_ms": round(self.include_seconds * 1000, 2),
+            "routes": self.route_count,
+            "trigger": self.trigger
+        }
+
+
+class LazyRouterRegistry:
+    """
+    Registers routers on an app in declaration order, importing each module
+    only when first needed.
+
+    Loaded routes are spliced in at the position the routers were declared,
+    before any catch-all routes added later, so route precedence is the
+    same as with eager includes. The route list is never mutated in place:
+    a new list is built and swapped in with one assignment, so a request
+    being routed on the event loop keeps iterating a consistent list while
+    the warm-up thread loads routers.
+    """
+
+    def __init__(self, app, specs: List[RouterSpec], lazy: bool = True):
+        self.app = app
+        self.specs = list(specs)
+        self.lazy = lazy
+        self.timings: Dict[str, RouterTiming] = {}
+
+        self._anchor = len(app.router.routes)
+        self._loaded: Dict[str, list] = {}
+        self._lock = threading.RLock()
+        self._warmup_seconds: Optional[float] = None
+
+    @property
+    def pending(self) -> List[RouterSpec]:
+        return [s for s in self.specs if s.module not in self._loaded]
+
+    def include(self, router, prefix: str = "", name: str = "", trigger: str = "eager"):
+        """Register an already-imported router (before any lazy loads)."""
+        start = time.perf_counter()
+        self.app.include_router(router, prefix=prefix)
+        self._anchor = len(self.app.router.routes)
+        if name:
+            self.timings[name] = RouterTiming(
+                name, 0.0, time.perf_counter() - start, len(router.routes), trigger
+            )
+
+    def load(self, spec: RouterSpec, trigger: str = "request") -> bool:
+        """Import and register one router. Returns False if already loaded."""
+        if spec.module in self._loaded:
+            return False
+
+        with self._lock:
+            if spec.module in self._loaded:
+                return False
+
+            start = time.perf_counter()
+            module = importlib.import_module(spec.module)
+            imported = time.perf_counter()
+
+            new_routes = self._build_routes(getattr(module, spec.attr), spec.prefix)
+
+            # Splice in after every earlier-declared router that is loaded
+            position = self._anchor
+            for other in self.specs:
+                if other is spec:
+                    break
+                position += len(self._loaded.get(other.module, ()))
+            routes = self.app.router.routes
+            self.app.router.routes = routes[:position] + new_routes + routes[position:]
+
+            self._loaded[spec.module] = new_routes
+            self.app.openapi_schema = None
+
+            self.timings[spec.module] = RouterTiming(
+                spec.module,
+                imported - start,
+                time.perf_counter() - imported,
+                len(new_routes),
+                trigger
+            )
+
+        logger.info(
+            f"Loaded router {spec.module} ({trigger}) in "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return True
+
+    def _build_routes(self, router, prefix: str) -> list:
+        """Routes the app would add for router, built on a scratch copy of its router"""
+        scratch = copy.copy(self.app.router)
+        scratch.routes = []
+        scratch.include_router(router, prefix=prefix)
+        return scratch.routes
+
+    def load_for_path(self, path: str) -> int:
+        """Load every pending router that serves path."""
+        if path in SCHEMA_PATHS:
+            return self.load_all(trigger="request")
+
+        count = 0
+        for spec in self.pending:
+            if spec.matches(path):
+                count += self.load(spec, trigger="request")
+        return count
+
+    def load_all(self, trigger: str = "warmup") -> int:
+        start = time.perf_counter()
+        count = 0
+        for spec in self.pending:
+            try:
+                count += self.load(spec, trigger=trigger)
+            except Exception as e:
+                if trigger != "warmup":
+                    raise
+                # Retried on the first request that needs it
+                logger.error(f"Failed to load router {spec.module}: {e}")
+        if trigger == "warmup":
+            self._warmup_seconds = time.perf_counter() - start
+        return count
+
+    def report(self) -> Dict:
+        """Per-router timing breakdown, slowest first."""
+        rows = sorted(
+            self.timings.values(),
+            key=lambda t: t.import_seconds + t.include_seconds,
+            reverse=True
+        )
+        return {
+            "lazy": self.lazy,
+            "loaded": len(self._loaded),
+            "pending": [s.module for s in self.pending],
+            "total_import_ms": round(sum(t.import_seconds for t in rows) * 1000, 2),
+            "warmup_ms": (
+                round(self._warmup_seconds * 1000, 2)
+                if self._warmup_seconds is not None else None
+            ),
+            "routers": [t.to_dict() for t in rows]
+        }
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that loads the routers a request path needs."""
+
+    def __init__(self, app, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.pending:
+            self.registry.load_for_path(scope["path"])
+        await self.app(scope, receive, send)
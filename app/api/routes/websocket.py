@@ -2,6 +2,8 @@
 WebSocket API Route
 Real-time notifications endpoint.
 """
+import json
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.realtime import ws_manager
 from app.core.logging import get_logger
@@ -23,6 +25,8 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str = "default_user"
     - Video generation started/completed/failed
     - Batch processing progress
     - Quality approval
+    - Scenes of a watched job as soon as they are generated
+      (send {"type": "watch_job", "job_id": "..."})
     """
     await ws_manager.connect(websocket, user_id)
     
@@ -34,6 +38,20 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str = "default_user"
             # Echo back for heartbeat
             if data == "ping":
                 await websocket.send_text("pong")
+                continue
+            
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            
+            if not isinstance(message, dict) or not message.get("job_id"):
+                continue
+            
+            if message.get("type") == "watch_job":
+                ws_manager.watch_job(user_id, message["job_id"])
+            elif message.get("type") == "unwatch_job":
+                ws_manager.unwatch_job(user_id, message["job_id"])
                 
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket, user_id)
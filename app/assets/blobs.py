@@ -0,0 +1,182 @@
+"""
+Content-Addressable Blob Store
+Deduplicated SHA-256 keyed storage with refcounts and hardlinked copies.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+
+from app.assets.storage import STORAGE_BASE, ensure_storage_dir
+
+
+BLOB_BASE = f"{STORAGE_BASE}/blobs"
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Linux FICLONE ioctl (reflink on btrfs/xfs)
+_FICLONE = 0x40049409
+
+
+class BlobTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds its size limit"""
+
+
+class BlobStore:
+    """
+    Stores each distinct content once under blobs/<aa>/<bb>/<sha256>.
+
+    Uploads are streamed to a temp file while hashing, so memory stays flat
+    regardless of file size. Asset and version files are hardlinks (or
+    reflinks) to the blob, so extra copies cost no disk. Refcounts track how
+    many linked paths exist; the blob is removed when the last one goes.
+    """
+
+    def __init__(self, base_path: str = BLOB_BASE):
+        self.base_path = base_path
+        self._refcounts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def blob_path(self, checksum: str) -> str:
+        return os.path.join(self.base_path, checksum[:2], checksum[2:4], checksum)
+
+    def exists(self, checksum: str) -> bool:
+        return os.path.exists(self.blob_path(checksum))
+
+    def write_stream(
+        self,
+        chunks: Iterable[bytes],
+        max_size: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """
+        Write a stream of chunks, hashing as it goes.
+
+        Returns:
+            (checksum, size). If the content already exists the temp file is
+            discarded and the existing blob is reused.
+        """
+        tmp_dir = os.path.join(self.base_path, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4()}.part")
+
+        sha256 = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise BlobTooLargeError(f"Upload exceeds {max_size} bytes")
+                    sha256.update(chunk)
+                    f.write(chunk)
+
+            checksum = sha256.hexdigest()
+            final_path = self.blob_path(checksum)
+
+            with self._lock:
+                if os.path.exists(final_path):
+                    os.remove(tmp_path)
+                else:
+                    ensure_storage_dir(final_path)
+                    os.replace(tmp_path, final_path)
+
+            return checksum, size
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def write_bytes(self, data: bytes, max_size: Optional[int] = None) -> Tuple[str, int]:
+        """Store in-memory content"""
+        return self.write_stream(
+            (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)),
+            max_size=max_size
+        )
+
+    def link(self, checksum: str, dest_path: str) -> bool:
+        """
+        Materialize a blob at dest_path and take a reference to it.
+
+        Tries a hardlink, then a reflink, then falls back to a plain copy
+        (e.g. across filesystems).
+        """
+        src = self.blob_path(checksum)
+        if not os.path.exists(src):
+            return False
+
+        with self._lock:
+            # Pin the count before linking changes st_nlink
+            self._refcounts[checksum] = self._current_refcount(checksum)
+
+        ensure_storage_dir(dest_path)
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+
+        try:
+            os.link(src, dest_path)
+        except OSError:
+            if not self._reflink(src, dest_path):
+                shutil.copyfile(src, dest_path)
+
+        self.add_ref(checksum)
+        return True
+
+    def _reflink(self, src: str, dst: str) -> bool:
+        try:
+            import fcntl
+        except ImportError:
+            return False
+
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return True
+        except OSError:
+            if os.path.exists(dst):
+                os.remove(dst)
+            return False
+
+    def add_ref(self, checksum: str) -> int:
+        with self._lock:
+            count = self._current_refcount(checksum) + 1
+            self._refcounts[checksum] = count
+            return count
+
+    def release(self, checksum: str, linked_path: Optional[str] = None) -> int:
+        """
+        Drop a reference (and its linked path); deletes the blob at zero.
+
+        Returns:
+            Remaining reference count
+        """
+        with self._lock:
+            # Read the count before unlinking, since it may come from st_nlink
+            count = max(0, self._current_refcount(checksum) - 1)
+            if linked_path and os.path.exists(linked_path):
+                os.remove(linked_path)
+            if count == 0:
+                self._refcounts.pop(checksum, None)
+                path = self.blob_path(checksum)
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                self._refcounts[checksum] = count
+            return count
+
+    def refcount(self, checksum: str) -> int:
+        with self._lock:
+            return self._current_refcount(checksum)
+
+    def _current_refcount(self, checksum: str) -> int:
+        """Known refcount, recovered from the blob's hardlink count after a restart"""
+        count = self._refcounts.get(checksum)
+        if count is None:
+            path = self.blob_path(checksum)
+            count = max(0, os.stat(path).st_nlink - 1) if os.path.exists(path) else 0
+        return count
+
+
+blob_store = BlobStore()
@@ -0,0 +1,210 @@
+"""
+Asset Indexes
+Per-user secondary indexes (type/status/folder bitmaps, name trigrams) and
+incrementally maintained aggregates for asset queries.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+import re
+
+from app.assets.models import Asset, AssetStatus
+
+
+_WORD_RE = re.compile(r"\w")
+GRAM_SIZE = 3
+
+
+def name_grams(text: str) -> Set[str]:
+    """
+    Lowercase character trigrams of a name or query (any script). A name
+    containing a query contains every trigram of it, so the trigram
+    bitmaps narrow a substring search to a few candidates.
+    """
+    text = text.lower()
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def iter_bits_desc(bits: int) -> Iterator[int]:
+    """Set bit positions, highest first"""
+    while bits:
+        position = bits.bit_length() - 1
+        yield position
+        bits ^= 1 << position
+
+
+class UserAssetIndex:
+    """
+    Indexes for one user's assets.
+
+    Each asset gets a dense ordinal in upload order, so newest-first is
+    simply highest bit first. Filters are bitmaps (Python ints) combined
+    with AND, and only the requested page is materialized. Name search is
+    a case-insensitive substring match: trigram bitmaps select candidates
+    and only those names are compared.
+    """
+
+    def __init__(self):
+        self._ordinals: Dict[str, int] = {}
+        self._assets: List[Asset] = []
+
+        self.live = 0  # not deleted
+        self.by_type: Dict[str, int] = {}
+        self.by_status: Dict[str, int] = {}
+        self.by_folder: Dict[Optional[str], int] = {}
+        self.by_gram: Dict[str, int] = {}
+
+        # Aggregates over live assets
+        self.total_count = 0
+        self.total_size = 0
+        self.count_by_type: Dict[str, int] = {}
+
+    # ----- Maintenance -----
+
+    def add(self, asset: Asset):
+        ordinal = len(self._assets)
+        self._ordinals[asset.asset_id] = ordinal
+        self._assets.append(asset)
+        bit = 1 << ordinal
+
+        self.live |= bit
+        self._set(self.by_type, asset.asset_type.value, bit)
+        self._set(self.by_status, asset.status.value, bit)
+        self._set(self.by_folder, asset.folder_id, bit)
+        for gram in name_grams(asset.name):
+            self._set(self.by_gram, gram, bit)
+
+        self.total_count += 1
+        self.total_size += asset.file_size
+        type_key = asset.asset_type.value
+        self.count_by_type[type_key] = self.count_by_type.get(type_key, 0) + 1
+
+    def remove(self, asset: Asset):
+        """Take a (soft-)deleted asset out of the live set and aggregates"""
+        ordinal = self._ordinals.get(asset.asset_id)
+        if ordinal is None:
+            return
+        bit = 1 << ordinal
+        if not self.live & bit:
+            return
+
+        self.live &= ~bit
+        self.total_count -= 1
+        self.total_size -= asset.file_size
+        type_key = asset.asset_type.value
+        self.count_by_type[type_key] -= 1
+        if not self.count_by_type[type_key]:
+            del self.count_by_type[type_key]
+
+    def purge(self, asset: Asset):
+        """Forget a deleted asset entirely (its ordinal is left unused)"""
+        ordinal = self._ordinals.get(asset.asset_id)
+        if ordinal is None:
+            return
+        self.remove(asset)
+        bit = 1 << ordinal
+        self._clear(self.by_type, asset.asset_type.value, bit)
+        self._clear(self.by_status, asset.status.value, bit)
+        self._clear(self.by_folder, asset.folder_id, bit)
+        for gram in name_grams(asset.name):
+            self._clear(self.by_gram, gram, bit)
+
+    def set_status(self, asset: Asset, old_status: AssetStatus):
+        bit = self._bit(asset)
+        self._clear(self.by_status, old_status.value, bit)
+        self._set(self.by_status, asset.status.value, bit)
+
+    def move_folder(self, asset: Asset, old_folder: Optional[str]):
+        bit = self._bit(asset)
+        self._clear(self.by_folder, old_folder, bit)
+        self._set(self.by_folder, asset.folder_id, bit)
+
+    def rename(self, asset: Asset, old_name: str):
+        bit = self._bit(asset)
+        for gram in name_grams(old_name):
+            self._clear(self.by_gram, gram, bit)
+        for gram in name_grams(asset.name):
+            self._set(self.by_gram, gram, bit)
+
+    def _bit(self, asset: Asset) -> int:
+        return 1 << self._ordinals[asset.asset_id]
+
+    @staticmethod
+    def _set(index: Dict, key, bit: int):
+        index[key] = index.get(key, 0) | bit
+
+    @staticmethod
+    def _clear(index: Dict, key, bit: int):
+        if key in index:
+            index[key] &= ~bit
+            if not index[key]:
+                del index[key]
+
+    # ----- Queries -----
+
+    def name_bitmap(self, query: str, candidates: int) -> int:
+        """
+        Candidates whose name contains query (case-insensitive). A query
+        without any word character matches nothing.
+        """
+        query = query.lower()
+        if not _WORD_RE.search(query):
+            return 0
+        for gram in name_grams(query):
+            if not candidates:
+                return 0
+            candidates &= self.by_gram.get(gram, 0)
+        bits = 0
+        for ordinal in iter_bits_desc(candidates):
+            if query in self._assets[ordinal].name.lower():
+                bits |= 1 << ordinal
+        return bits
+
+    def bitmap_for_ids(self, asset_ids: Iterable[str]) -> int:
+        bits = 0
+        for asset_id in asset_ids:
+            ordinal = self._ordinals.get(asset_id)
+            if ordinal is not None:
+                bits |= 1 << ordinal
+        return bits
+
+    def filter(
+        self,
+        asset_type: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        status: Optional[str] = None,
+        query: Optional[str] = None,
+        tag_asset_ids: Optional[Set[str]] = None
+    ) -> int:
+        # Deleted assets are outside the live set; only an explicit
+        # status filter for them looks past it
+        if status == AssetStatus.DELETED.value:
+            bits = self.by_status.get(status, 0)
+        else:
+            bits = self.live
+        if asset_type:
+            bits &= self.by_type.get(asset_type, 0)
+        if folder_id:
+            bits &= self.by_folder.get(folder_id, 0)
+        if status:
+            bits &= self.by_status.get(status, 0)
+        if tag_asset_ids is not None:
+            bits &= self.bitmap_for_ids(tag_asset_ids)
+        if query:
+            bits = self.name_bitmap(query, bits)
+        return bits
+
+    def page(self, bits: int, offset: int = 0, limit: Optional[int] = None) -> List[Asset]:
+        """
+        Materialize assets for set bits, newest first.
+
+        Only the page's assets are materialized, but skipping to offset
+        still walks that many set bits, so deep offsets cost O(offset)
+        integer steps.
+        """
+        results = []
+        for i, ordinal in enumerate(iter_bits_desc(bits)):
+            if i < offset:
+                continue
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(self._assets[ordinal])
+        return results
@@ -2,17 +2,17 @@
 Asset Service
 Main asset management operations.
 """
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 import threading
 
 from app.assets.models import (
-    Asset, AssetType, AssetStatus, AssetReference,
+    Asset, AssetType, AssetStatus, AssetReference, ASSET_CONFIG,
     create_asset_id, get_asset_type_from_extension, validate_asset_type
 )
-from app.assets.storage import (
-    get_storage_path, save_file, delete_file, calculate_checksum_from_bytes
-)
+from app.assets.storage import get_storage_path
+from app.assets.blobs import blob_store, BlobTooLargeError, CHUNK_SIZE
+from app.assets.index import UserAssetIndex
 from app.assets.folders import folder_service
 from app.assets.tags import tag_service
 from app.assets.versions import version_service
@@ -28,6 +28,10 @@ class AssetService:
             cls._instance = super().__new__(cls)
             cls._instance._assets: Dict[str, Asset] = {}
             cls._instance._references: Dict[str, List[AssetReference]] = {}
+            # (user_id, checksum) -> asset_id for O(1) duplicate detection
+            cls._instance._checksum_index: Dict[Tuple[str, str], str] = {}
+            # user_id -> secondary indexes and aggregates
+            cls._instance._user_indexes: Dict[str, UserAssetIndex] = {}
             cls._instance._lock = threading.Lock()
         return cls._instance
     
@@ -42,6 +46,32 @@ class AssetService:
         tags: List[str] = None
     ) -> Tuple[Optional[Asset], str]:
         """Upload new asset"""
+        return self.upload_asset_stream(
+            user_id=user_id,
+            filename=filename,
+            chunks=(data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)),
+            name=name,
+            description=description,
+            folder_id=folder_id,
+            tags=tags
+        )
+    
+    def upload_asset_stream(
+        self,
+        user_id: str,
+        filename: str,
+        chunks: Iterable[bytes],
+        name: str = None,
+        description: str = "",
+        folder_id: str = None,
+        tags: List[str] = None
+    ) -> Tuple[Optional[Asset], str]:
+        """
+        Upload new asset from a stream of chunks.
+        
+        Content is hashed while it is written to the blob store, so memory
+        use is independent of file size.
+        """
         # Extract extension and determine type
         ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ""
         asset_type = get_asset_type_from_extension(ext)
@@ -49,13 +79,19 @@ class AssetService:
         if not asset_type:
             return None, f"Unsupported file type: {ext}"
         
-        # Validate
-        valid, msg = validate_asset_type(asset_type, ext, len(data))
+        # Validate extension up front; size is enforced while streaming
+        valid, msg = validate_asset_type(asset_type, ext, 0)
         if not valid:
             return None, msg
         
+        max_size = ASSET_CONFIG[asset_type]["max_size"]
+        try:
+            checksum, file_size = blob_store.write_stream(chunks, max_size=max_size)
+        except BlobTooLargeError:
+            max_mb = max_size // (1024 * 1024)
+            return None, f"File too large. Max {max_mb}MB for {asset_type.value}"
+        
         # Check for duplicates
-        checksum = calculate_checksum_from_bytes(data)
         existing = self._find_by_checksum(user_id, checksum)
         if existing:
             return existing, f"Duplicate detected. Existing asset: {existing.name}"
@@ -64,8 +100,11 @@ class AssetService:
         asset_id = create_asset_id()
         storage_path = get_storage_path(user_id, asset_type.value, asset_id, ext)
         
-        # Save file
-        file_size = save_file(data, storage_path)
+        # Link the asset path to its blob (no copy). The blob can only be
+        # missing if its last other reference was released meanwhile, and the
+        # stream is already consumed, so the upload has to be retried.
+        if not blob_store.link(checksum, storage_path):
+            return None, "Upload failed: stored content went missing, please retry"
         
         # Create asset record
         asset = Asset(
@@ -86,6 +125,8 @@ class AssetService:
         
         with self._lock:
             self._assets[asset_id] = asset
+            self._checksum_index[(user_id, checksum)] = asset_id
+            self._index_for(user_id).add(asset)
         
         # Update folder count
         if folder_id:
@@ -115,29 +156,42 @@ class AssetService:
             return asset
         return None
     
+    def _index_for(self, user_id: str) -> UserAssetIndex:
+        index = self._user_indexes.get(user_id)
+        if index is None:
+            index = self._user_indexes[user_id] = UserAssetIndex()
+        return index
+    
     def list_assets(
         self,
         user_id: str,
         asset_type: str = None,
         folder_id: str = None,
-        status: str = None
+        status: str = None,
+        offset: int = 0,
+        limit: int = None
     ) -> List[Asset]:
-        """List assets with filters"""
-        assets = [
-            a for a in self._assets.values()
-            if a.user_id == user_id and a.status != AssetStatus.DELETED
-        ]
+        """List assets with filters, newest first"""
+        index = self._user_indexes.get(user_id)
+        if index is None:
+            return []
         
-        if asset_type:
-            assets = [a for a in assets if a.asset_type.value == asset_type]
-        
-        if folder_id:
-            assets = [a for a in assets if a.folder_id == folder_id]
-        
-        if status:
-            assets = [a for a in assets if a.status.value == status]
+        bits = index.filter(asset_type=asset_type, folder_id=folder_id, status=status)
+        return index.page(bits, offset, limit)
+    
+    def count_assets(
+        self,
+        user_id: str,
+        asset_type: str = None,
+        folder_id: str = None,
+        status: str = None
+    ) -> int:
+        """Count assets matching filters without materializing them"""
+        index = self._user_indexes.get(user_id)
+        if index is None:
+            return 0
         
-        return sorted(assets, key=lambda a: a.created_at, reverse=True)
+        return index.filter(asset_type=asset_type, folder_id=folder_id, status=status).bit_count()
     
     def update_asset(
         self,
@@ -153,13 +207,17 @@ class AssetService:
             return None, "Asset not found"
         
         old_folder = asset.folder_id
+        index = self._index_for(user_id)
         
         if name:
+            old_name = asset.name
             asset.name = name
+            index.rename(asset, old_name)
         if description is not None:
             asset.description = description
         if folder_id is not None:
             asset.folder_id = folder_id
+            index.move_folder(asset, old_folder)
             
             # Update folder counts
             if old_folder:
@@ -170,8 +228,26 @@ class AssetService:
         asset.updated_at = datetime.utcnow()
         return asset, "Asset updated"
     
-    def delete_asset(self, asset_id: str, user_id: str, force: bool = False) -> Tuple[bool, str]:
-        """Delete asset"""
+    def delete_asset(
+        self,
+        asset_id: str,
+        user_id: str,
+        force: bool = False,
+        permanent: bool = False
+    ) -> Tuple[bool, str]:
+        """
+        Delete asset.
+        
+        Soft delete by default: the record is marked DELETED and keeps its
+        stored file. permanent=True also purges it (see purge_asset), and
+        purges assets that were already soft-deleted.
+        """
+        if permanent:
+            asset = self._assets.get(asset_id)
+            if asset and asset.user_id == user_id and asset.status == AssetStatus.DELETED:
+                self.purge_asset(asset_id, user_id)
+                return True, "Asset permanently deleted"
+        
         asset = self.get_asset(asset_id, user_id)
         if not asset:
             return False, "Asset not found"
@@ -182,37 +258,74 @@ class AssetService:
             return False, f"Asset is used in {len(refs)} resources. Use force=true to delete."
         
         # Soft delete
+        old_status = asset.status
         asset.status = AssetStatus.DELETED
         asset.updated_at = datetime.utcnow()
         
+        with self._lock:
+            if self._checksum_index.get((user_id, asset.checksum)) == asset_id:
+                del self._checksum_index[(user_id, asset.checksum)]
+            index = self._index_for(user_id)
+            index.remove(asset)
+            index.set_status(asset, old_status)
+        
         # Update folder count
         if asset.folder_id:
             folder_service.decrement_asset_count(asset.folder_id)
         
+        if permanent:
+            self.purge_asset(asset_id, user_id)
+            return True, "Asset permanently deleted"
+        
         return True, "Asset deleted"
     
+    def purge_asset(self, asset_id: str, user_id: str) -> bool:
+        """Remove a soft-deleted asset's record and release its stored file"""
+        with self._lock:
+            asset = self._assets.get(asset_id)
+            if not asset or asset.user_id != user_id or asset.status != AssetStatus.DELETED:
+                return False
+            del self._assets[asset_id]
+            self._references.pop(asset_id, None)
+            self._index_for(user_id).purge(asset)
+        
+        # Drop the asset's link; version history keeps its own references
+        blob_store.release(asset.checksum, asset.storage_path)
+        return True
+    
     def search_assets(
         self,
         user_id: str,
         query: str = None,
         asset_type: str = None,
         tags: List[str] = None,
-        folder_id: str = None
+        folder_id: str = None,
+        offset: int = 0,
+        limit: int = None
     ) -> List[Asset]:
-        """Search assets"""
-        assets = self.list_assets(user_id, asset_type, folder_id)
+        """
+        Search assets.
         
-        if query:
-            query_lower = query.lower()
-            assets = [a for a in assets if query_lower in a.name.lower()]
+        The query matches names containing it (case-insensitive); assets
+        carrying any of the given tags match the tag filter.
+        """
+        index = self._user_indexes.get(user_id)
+        if index is None:
+            return []
         
+        tag_assets = None
         if tags:
             tag_assets = set()
             for tag_id in tags:
                 tag_assets.update(tag_service.get_assets_by_tag(tag_id))
-            assets = [a for a in assets if a.asset_id in tag_assets]
         
-        return assets
+        bits = index.filter(
+            asset_type=asset_type,
+            folder_id=folder_id,
+            query=query,
+            tag_asset_ids=tag_assets
+        )
+        return index.page(bits, offset, limit)
     
     def add_reference(
         self,
@@ -239,27 +352,26 @@ class AssetService:
         return self._references.get(asset_id, [])
     
     def get_stats(self, user_id: str) -> Dict:
-        """Get asset statistics for user"""
-        assets = [a for a in self._assets.values() if a.user_id == user_id and a.status != AssetStatus.DELETED]
-        
-        by_type = {}
-        total_size = 0
-        for a in assets:
-            by_type[a.asset_type.value] = by_type.get(a.asset_type.value, 0) + 1
-            total_size += a.file_size
+        """Get asset statistics for user (maintained incrementally)"""
+        index = self._user_indexes.get(user_id) or UserAssetIndex()
+        total_size = index.total_size
         
         return {
-            "total_assets": len(assets),
-            "by_type": by_type,
+            "total_assets": index.total_count,
+            "by_type": dict(index.count_by_type),
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2)
         }
     
     def _find_by_checksum(self, user_id: str, checksum: str) -> Optional[Asset]:
         """Find existing asset by checksum"""
-        for a in self._assets.values():
-            if a.user_id == user_id and a.checksum == checksum and a.status != AssetStatus.DELETED:
-                return a
+        asset_id = self._checksum_index.get((user_id, checksum))
+        if asset_id is None:
+            return None
+        
+        asset = self._assets.get(asset_id)
+        if asset and asset.status != AssetStatus.DELETED:
+            return asset
         return None
     
     def _get_mime_type(self, ext: str) -> str:
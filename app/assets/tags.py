@@ -19,6 +19,7 @@ class TagService:
             cls._instance = super().__new__(cls)
             cls._instance._tags: Dict[str, Tag] = {}
             cls._instance._asset_tags: Dict[str, Set[str]] = {}  # asset_id -> tag_ids
+            cls._instance._tag_assets: Dict[str, Set[str]] = {}  # tag_id -> asset_ids
             cls._instance._lock = threading.Lock()
         return cls._instance
     
@@ -81,9 +82,9 @@ class TagService:
         if not tag or tag.user_id != user_id:
             return False, "Tag not found"
         
-        # Remove from all assets
-        for asset_id, tags in self._asset_tags.items():
-            tags.discard(tag_id)
+        # Remove from all tagged assets
+        for asset_id in self._tag_assets.pop(tag_id, set()):
+            self._asset_tags.get(asset_id, set()).discard(tag_id)
         
         with self._lock:
             del self._tags[tag_id]
@@ -98,6 +99,7 @@ class TagService:
         for tag_id in tag_ids:
             if tag_id in self._tags:
                 self._asset_tags[asset_id].add(tag_id)
+                self._tag_assets.setdefault(tag_id, set()).add(asset_id)
                 self._tags[tag_id].usage_count += 1
     
     def remove_tags_from_asset(self, asset_id: str, tag_ids: List[str]) -> None:
@@ -106,6 +108,7 @@ class TagService:
             for tag_id in tag_ids:
                 if tag_id in self._asset_tags[asset_id]:
                     self._asset_tags[asset_id].discard(tag_id)
+                    self._tag_assets.get(tag_id, set()).discard(asset_id)
                     if tag_id in self._tags:
                         self._tags[tag_id].usage_count = max(0, self._tags[tag_id].usage_count - 1)
     
@@ -116,10 +119,7 @@ class TagService:
     
     def get_assets_by_tag(self, tag_id: str) -> List[str]:
         """Get asset IDs with tag"""
-        return [
-            asset_id for asset_id, tags in self._asset_tags.items()
-            if tag_id in tags
-        ]
+        return list(self._tag_assets.get(tag_id, ()))
 
 
 tag_service = TagService()
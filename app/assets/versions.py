@@ -9,6 +9,7 @@ import uuid
 
 from app.assets.models import AssetVersion
 from app.assets.storage import get_version_path, copy_file, delete_file
+from app.assets.blobs import blob_store
 
 
 MAX_VERSIONS = 10
@@ -44,9 +45,10 @@ class VersionService:
         versions = self._versions[asset_id]
         version_number = len(versions) + 1
         
-        # Copy file to version storage
+        # Link version storage to the content blob; copy only for legacy files
         version_path = get_version_path(user_id, asset_id, version_number, extension)
-        copy_file(storage_path, version_path)
+        if not blob_store.link(checksum, version_path):
+            copy_file(storage_path, version_path)
         
         version = AssetVersion(
             version_id=str(uuid.uuid4()),
@@ -111,7 +113,7 @@ class VersionService:
                     return False
                 
                 # Delete file
-                delete_file(v.storage_path)
+                self._remove_version_file(v)
                 
                 with self._lock:
                     versions.pop(i)
@@ -127,9 +129,16 @@ class VersionService:
         while len(versions) > MAX_VERSIONS:
             # Remove oldest (keep current)
             oldest = versions[0]
-            delete_file(oldest.storage_path)
+            self._remove_version_file(oldest)
             versions.pop(0)
     
+    def _remove_version_file(self, version: AssetVersion) -> None:
+        """Remove a version's file, releasing its blob reference"""
+        if blob_store.exists(version.checksum):
+            blob_store.release(version.checksum, version.storage_path)
+        else:
+            delete_file(version.storage_path)
+    
     def get_version_count(self, asset_id: str) -> int:
         """Get number of versions"""
         return len(self._versions.get(asset_id, []))
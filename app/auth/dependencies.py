@@ -4,18 +4,20 @@ Authentication dependencies for FastAPI.
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.auth.jwt import verify_token
-from app.core.database import get_db
-from sqlalchemy.orm import Session
 from typing import Optional
 
 security = HTTPBearer()
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
-    """Get current authenticated user from JWT token"""
+    """
+    Get current authenticated user from JWT token.
+    
+    Verified claims are cached per token until expiry, and no DB session
+    is opened here; routes that need one depend on get_db themselves.
+    """
     
     token = credentials.credentials
     payload = verify_token(token)
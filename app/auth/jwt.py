@@ -4,6 +4,10 @@ JWT token creation and validation.
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.auth.token_cache import VerifiedTokenCache
+
+
+_verified_tokens = VerifiedTokenCache()
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
@@ -21,7 +25,11 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 
 
 def verify_token(token: str) -> dict:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token (cached until the token expires)"""
+    return _verified_tokens.verify(token, _decode_token)
+
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -8,6 +8,8 @@ from datetime import datetime
 from enum import Enum
 import uuid
 
+from app.auth.permissions import PERMISSION_BITS
+
 
 class UserStatus(str, Enum):
     ACTIVE = "active"
@@ -115,10 +117,13 @@ class AuthContext:
     user: User
     api_key: Optional[APIKey] = None
     permissions: List[str] = field(default_factory=list)
+    permission_mask: Optional[int] = None  # precompiled form of permissions
     
     def has_permission(self, permission: str) -> bool:
         if self.user.is_admin():
             return True
+        if self.permission_mask is not None:
+            return bool(self.permission_mask & PERMISSION_BITS.get(permission, 0))
         return permission in self.permissions
     
     def to_dict(self) -> Dict:
@@ -2,8 +2,9 @@
 Permission Definitions and Checks
 Granular permission system.
 """
-from typing import List, Dict, Set
+from typing import Iterable, List, Dict, FrozenSet, Set
 from enum import Enum
+from functools import lru_cache
 
 
 class Permission(str, Enum):
@@ -33,6 +34,10 @@ class Permission(str, Enum):
     ADMIN_SYSTEM = "admin:system"
 
 
+# Each permission interned to one bit
+PERMISSION_BITS: Dict[str, int] = {p.value: 1 << i for i, p in enumerate(Permission)}
+
+
 # Permission groups
 PERMISSION_GROUPS: Dict[str, Set[str]] = {
     "readonly": {
@@ -78,6 +83,24 @@ ROLE_PERMISSIONS: Dict[str, Set[str]] = {
 }
 
 
+def permission_mask(permissions: Iterable[str]) -> int:
+    """Compile permission names to a bitmask"""
+    mask = 0
+    for p in permissions:
+        mask |= PERMISSION_BITS.get(p, 0)
+    return mask
+
+
+# Precompiled masks
+GROUP_MASKS: Dict[str, int] = {
+    name: permission_mask(perms) for name, perms in PERMISSION_GROUPS.items()
+}
+ROLE_MASKS: Dict[str, int] = {
+    role: permission_mask(perms) for role, perms in ROLE_PERMISSIONS.items()
+}
+ADMIN_SYSTEM_BIT = PERMISSION_BITS[Permission.ADMIN_SYSTEM.value]
+
+
 # Endpoint to permission mapping
 ENDPOINT_PERMISSIONS: Dict[str, str] = {
     # Projects
@@ -108,6 +131,11 @@ def get_role_permissions(role: str) -> Set[str]:
     return ROLE_PERMISSIONS.get(role, PERMISSION_GROUPS["readonly"])
 
 
+def get_role_mask(role: str) -> int:
+    """Get permission mask for role"""
+    return ROLE_MASKS.get(role, GROUP_MASKS["readonly"])
+
+
 def get_group_permissions(group: str) -> Set[str]:
     """Get permissions for group"""
     return PERMISSION_GROUPS.get(group, set())
@@ -125,6 +153,13 @@ def check_permission(
     return required in user_permissions
 
 
+def check_permission_mask(mask: int, required: str) -> bool:
+    """Bitmask variant of check_permission"""
+    if mask & ADMIN_SYSTEM_BIT:
+        return True
+    return bool(mask & PERMISSION_BITS.get(required, 0))
+
+
 def get_endpoint_permission(method: str, path: str) -> str:
     """Get required permission for endpoint"""
     # Normalize path
@@ -136,6 +171,16 @@ def get_endpoint_permission(method: str, path: str) -> str:
 
 def expand_permissions(permissions: List[str]) -> Set[str]:
     """Expand permission groups to individual permissions"""
+    return set(_expand(tuple(permissions)))
+
+
+def expand_permission_mask(permissions: List[str]) -> int:
+    """Expand permission groups straight to a bitmask"""
+    return _expand_mask(tuple(permissions))
+
+
+@lru_cache(maxsize=1024)
+def _expand(permissions: tuple) -> FrozenSet[str]:
     result = set()
     
     for p in permissions:
@@ -144,4 +189,20 @@ def expand_permissions(permissions: List[str]) -> Set[str]:
         else:
             result.add(p)
     
-    return result
+    return frozenset(result)
+
+
+@lru_cache(maxsize=1024)
+def _expand_mask(permissions: tuple) -> int:
+    mask = 0
+    
+    for p in permissions:
+        mask |= GROUP_MASKS.get(p, 0) or PERMISSION_BITS.get(p, 0)
+    
+    return mask
+
+
+@lru_cache(maxsize=256)
+def mask_to_permissions(mask: int) -> FrozenSet[str]:
+    """Decode a bitmask back to permission names"""
+    return frozenset(name for name, bit in PERMISSION_BITS.items() if mask & bit)
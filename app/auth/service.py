@@ -5,6 +5,7 @@ User and API key management operations.
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import threading
+import time
 
 from app.auth.models import (
     User, APIKey, AuthContext, UserStatus, UserRole, KeyStatus,
@@ -13,7 +14,7 @@ from app.auth.models import (
 from app.auth.password import hash_password, verify_password, validate_password_strength
 from app.auth.keys import create_api_key, hash_api_key, validate_key_format
 from app.auth.tokens import create_token_pair, verify_token
-from app.auth.permissions import get_role_permissions, expand_permissions
+from app.auth.permissions import get_role_mask, expand_permission_mask, mask_to_permissions
 from app.core.database import get_db_session, DBUser, DBAPIKey
 import json
 
@@ -23,9 +24,15 @@ class AuthService:
     
     _instance = None
     
+    # Seconds a hydrated user context is reused without hitting the DB
+    CONTEXT_TTL = 30.0
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            # user_id -> (AuthContext, expires_at)
+            cls._instance._contexts: Dict[str, Tuple[AuthContext, float]] = {}
+            cls._instance._contexts_lock = threading.Lock()
             # Initialize admin if not exists
             cls._instance._init_admin()
         return cls._instance
@@ -185,6 +192,7 @@ class AuthService:
             
             user.updated_at = datetime.utcnow()
             db.commit()
+            self.invalidate_context(user_id)
             return self._to_domain_user(user), "User updated"
         finally:
             db.close()
@@ -209,6 +217,7 @@ class AuthService:
             user.password_hash = hash_password(new)
             user.updated_at = datetime.utcnow()
             db.commit()
+            self.invalidate_context(user_id)
             
             return True, "Password changed"
         finally:
@@ -297,17 +306,23 @@ class AuthService:
         
         db = get_db_session()
         try:
-            db_key = db.query(DBAPIKey).filter(DBAPIKey.key_hash == key_hash).first()
+            # Key and owner in one round trip
+            row = (
+                db.query(DBAPIKey, DBUser)
+                .join(DBUser, DBUser.user_id == DBAPIKey.user_id)
+                .filter(DBAPIKey.key_hash == key_hash)
+                .first()
+            )
             
-            if not db_key:
+            if not row:
                 return None, None
             
+            db_key, user = row
             api_key = self._to_domain_key(db_key)
             if not api_key.is_valid():
                 return None, None
             
-            user = db.query(DBUser).filter(DBUser.user_id == db_key.user_id).first()
-            if not user or user.status != UserStatus.ACTIVE.value:
+            if user.status != UserStatus.ACTIVE.value:
                 return None, None
             
             # Update usage
@@ -346,19 +361,45 @@ class AuthService:
     
     # ==================== Auth Context ====================
     
+    def get_user_context(self, user_id: str) -> Optional[AuthContext]:
+        """
+        Auth context for an active user, hydrated with one query and
+        reused for CONTEXT_TTL seconds.
+        """
+        now = time.monotonic()
+        with self._contexts_lock:
+            entry = self._contexts.get(user_id)
+            if entry and entry[1] > now:
+                return entry[0]
+        
+        user = self.get_user(user_id)
+        if not user or not user.is_active():
+            self.invalidate_context(user_id)
+            return None
+        
+        context = self.get_auth_context(user)
+        with self._contexts_lock:
+            self._contexts[user_id] = (context, now + self.CONTEXT_TTL)
+        return context
+    
+    def invalidate_context(self, user_id: str):
+        """Forget a cached context after the user's record changes"""
+        with self._contexts_lock:
+            self._contexts.pop(user_id, None)
+    
     def get_auth_context(self, user: User, api_key: APIKey = None) -> AuthContext:
         """Build auth context for request"""
-        perms = get_role_permissions(user.role.value)
+        mask = get_role_mask(user.role.value)
         
         if api_key:
             # Restrict to key permissions
-            key_perms = expand_permissions(api_key.permissions)
-            perms = perms.intersection(key_perms)
+            mask &= expand_permission_mask(api_key.permissions)
         
         return AuthContext(
             user=user,
             api_key=api_key,
-            permissions=list(perms)
+            permissions=list(mask_to_permissions(mask)),
+            permission_mask=mask
         )
 
 
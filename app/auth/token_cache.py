@@ -0,0 +1,103 @@
+"""
+Verified Token Cache
+Bounded cache of already-verified JWT claims so repeat requests with the
+same token skip signature verification.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from datetime import datetime
+import hashlib
+import threading
+import time
+
+
+def token_digest(token: str) -> str:
+    """Cache key for a token (the raw token is never stored)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _exp_timestamp(claims: Dict) -> Optional[float]:
+    exp = claims.get("exp")
+    if isinstance(exp, datetime):
+        return exp.timestamp()
+    if isinstance(exp, (int, float)):
+        return float(exp)
+    return None
+
+
+class VerifiedTokenCache:
+    """
+    LRU of token digest -> (claims, expires_at).
+
+    Entries never outlive the token's own ``exp`` claim, and tokens without
+    one are kept at most ``max_ttl`` seconds. Only successful verifications
+    are cached, so bad tokens always go through full verification.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl: float = 300.0):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Dict]:
+        key = token_digest(token)
+        now = time.time() if now is None else now
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # Callers may mutate the payload
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        expires_at = now + self.max_ttl
+        exp = _exp_timestamp(claims)
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return
+
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (dict(claims), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def verify(self, token: str, decode: Callable[[str], Optional[Dict]]) -> Optional[Dict]:
+        """Return cached claims, or decode (fully verify) and cache them"""
+        claims = self.get(token)
+        if claims is not None:
+            return claims
+
+        claims = decode(token)
+        if claims:
+            self.put(token, claims)
+        return claims
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(token_digest(token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,6 +7,8 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 
+from app.auth.token_cache import VerifiedTokenCache
+
 
 # Token configuration
 SECRET_KEY = secrets.token_hex(32)  # In production, load from env
@@ -14,6 +16,8 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+_verified_tokens = VerifiedTokenCache()
+
 
 def create_access_token(user_id: str, role: str, extra: Dict = None) -> str:
     """Create JWT access token"""
@@ -62,7 +66,11 @@ def create_token_pair(user_id: str, role: str) -> Dict:
 
 
 def verify_token(token: str) -> Optional[Dict]:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token (cached until the token expires)"""
+    return _verified_tokens.verify(token, _decode_token)
+
+
+def _decode_token(token: str) -> Optional[Dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
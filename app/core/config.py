@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
     
+    # API startup
+    LAZY_ROUTERS: bool = True  # import route modules on first use
+    ROUTER_WARMUP: bool = True  # then load the rest in the background after startup
+    
     # Database
     DATABASE_URL: str = "sqlite:///./shorts_platform.db"
     DB_POOL_SIZE: int = 10
@@ -190,6 +190,20 @@ class DBAPIKey(Base):
     usage_count = Column(Integer, default=0)
 
 
+class DBMemoryEntry(Base):
+    """SQLAlchemy model for creative_memory table."""
+    __tablename__ = "creative_memory"
+    
+    id = Column(String, primary_key=True)
+    memory_type = Column(String, index=True)  # hook, persona, emotion_curve
+    reference_id = Column(String)
+    platform = Column(String, index=True)
+    score = Column(Float, index=True)
+    metadata_json = Column(Text, default="{}")
+    reuse_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 # ============== Database Operations ==============
 
 
@@ -2,16 +2,20 @@
 Structured Logging Module for the Creative AI Shorts Platform.
 Provides consistent logging format across all services with context propagation and rotation.
 """
+import atexit
 import json
 import logging
+import queue
 import sys
 import os
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
+import threading
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from typing import Optional, Dict, Any, Union
 from enum import Enum
 
 from app.core.context import get_context
+from app.core.tracing import get_trace_context
 
 class LogLevel(str, Enum):
     DEBUG = "DEBUG"
@@ -21,63 +25,118 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+# Context fields in output order; trace context wins over request context
+CONTEXT_FIELDS = ("trace_id", "request_id", "user_id", "job_id", "batch_id")
+
+
+def capture_context(record: logging.LogRecord) -> Dict[str, Any]:
+    """
+    Attach the caller's trace/request context to a record.
+
+    Context lives in contextvars, so this must run on the logging thread
+    before the record is handed to a background writer.
+    """
+    fields = getattr(record, "context_fields", None)
+    if fields is not None:
+        return fields
+    
+    fields = {}
+    trace_ctx = get_trace_context()
+    if trace_ctx:
+        fields["trace_id"] = trace_ctx.trace_id
+        fields["request_id"] = trace_ctx.request_id
+        if trace_ctx.user_id:
+            fields["user_id"] = trace_ctx.user_id
+        if trace_ctx.job_id:
+            fields["job_id"] = trace_ctx.job_id
+        if trace_ctx.batch_id:
+            fields["batch_id"] = trace_ctx.batch_id
+    
+    # Fallback to old context system
+    ctx = get_context()
+    if ctx:
+        fields.setdefault("request_id", ctx.request_id)
+        if ctx.user_id:
+            fields.setdefault("user_id", ctx.user_id)
+        if ctx.job_id:
+            fields.setdefault("job_id", ctx.job_id)
+        if ctx.batch_id:
+            fields.setdefault("batch_id", ctx.batch_id)
+    
+    record.context_fields = fields
+    return fields
+
+
+_encode_str = json.encoder.encode_basestring_ascii
+
+
 class StructuredFormatter(logging.Formatter):
-    """JSON formatter for structured logging"""
+    """
+    JSON formatter for structured logging.
+    
+    Output is assembled from string pieces rather than a dict passed to
+    json.dumps: the level/logger fragment is encoded once per pair and the
+    timestamp prefix once per second.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._static: Dict[tuple, str] = {}
+        self._second = None
+        self._second_prefix = ""
+    
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_prefix}.{int((created - second) * 1e6):06d}Z"
     
     def format(self, record: logging.LogRecord) -> str:
-        # Base log structure
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
+        static = self._static.get((record.levelname, record.name))
+        if static is None:
+            static = ', "level": %s, "logger": %s' % (
+                _encode_str(record.levelname), _encode_str(record.name)
+            )
+            self._static[(record.levelname, record.name)] = static
         
-        # Add trace context if available
-        try:
-            from app.core.tracing import get_trace_context
-            trace_ctx = get_trace_context()
-            if trace_ctx:
-                log_entry["trace_id"] = trace_ctx.trace_id
-                log_entry["request_id"] = trace_ctx.request_id
-                if trace_ctx.user_id:
-                    log_entry["user_id"] = trace_ctx.user_id
-                if trace_ctx.job_id:
-                    log_entry["job_id"] = trace_ctx.job_id
-                if trace_ctx.batch_id:
-                    log_entry["batch_id"] = trace_ctx.batch_id
-        except ImportError:
-            pass
+        parts = [
+            '{"timestamp": "', self._timestamp(record.created), '"',
+            static,
+            ', "message": ', _encode_str(record.getMessage()),
+        ]
         
-        # Fallback to old context system
-        ctx = get_context()
-        if ctx:
-            if "request_id" not in log_entry:
-                log_entry["request_id"] = ctx.request_id
-            if ctx.job_id and "job_id" not in log_entry:
-                log_entry["job_id"] = ctx.job_id
-            if ctx.batch_id and "batch_id" not in log_entry:
-                log_entry["batch_id"] = ctx.batch_id
-            if ctx.user_id and "user_id" not in log_entry:
-                log_entry["user_id"] = ctx.user_id
+        fields = capture_context(record)
+        for name in CONTEXT_FIELDS:
+            value = fields.get(name)
+            if value is not None:
+                parts.append(f', "{name}": ')
+                parts.append(_encode_str(str(value)))
         
         # Add duration if provided
-        if hasattr(record, 'duration_ms'):
-            log_entry["duration_ms"] = record.duration_ms
+        duration_ms = getattr(record, "duration_ms", None)
+        if duration_ms is not None:
+            parts.append(f', "duration_ms": {json.dumps(duration_ms)}')
         
         # Add status code if provided
-        if hasattr(record, 'status_code'):
-            log_entry["status_code"] = record.status_code
+        status_code = getattr(record, "status_code", None)
+        if status_code is not None:
+            parts.append(f', "status_code": {json.dumps(status_code)}')
         
         # Add extra data
-        if hasattr(record, 'extra_data') and record.extra_data:
-            log_entry["extra"] = record.extra_data
+        extra_data = getattr(record, "extra_data", None)
+        if extra_data:
+            parts.append(', "extra": ')
+            parts.append(json.dumps(extra_data, default=str))
         
         # Add exception info
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
+        if record.exc_info or record.exc_text:
+            exc_text = record.exc_text or self.formatException(record.exc_info)
+            parts.append(', "exception": ')
+            parts.append(_encode_str(exc_text))
         
-        return json.dumps(log_entry)
+        parts.append("}")
+        return "".join(parts)
 
 
 class PrettyFormatter(logging.Formatter):
@@ -96,32 +155,86 @@ class PrettyFormatter(logging.Formatter):
         color = self.COLORS.get(record.levelname, self.COLORS["RESET"])
         reset = self.COLORS["RESET"]
         
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(record.created))
         
         # Get context info
-        ctx = get_context()
+        fields = capture_context(record)
         ctx_str = ""
-        if ctx:
-            ctx_str = f" [{ctx.request_id[:8]}]"
-            if ctx.job_id:
-                ctx_str += f" job:{ctx.job_id[:8]}"
+        if fields.get("request_id"):
+            ctx_str = f" [{fields['request_id'][:8]}]"
+            if fields.get("job_id"):
+                ctx_str += f" job:{fields['job_id'][:8]}"
         
         msg = f"{color}{timestamp}{reset} {color}{record.levelname:8}{reset} {record.name}{ctx_str}: {record.getMessage()}"
         
-        if record.exc_info:
-            msg += f"\n{self.formatException(record.exc_info)}"
+        if record.exc_info or record.exc_text:
+            msg += f"\n{record.exc_text or self.formatException(record.exc_info)}"
         
         return msg
 
 
+class LogSampler:
+    """
+    Thins out a repetitive log stream: keeps every Nth record and at most
+    max_per_second of those. The next record let through carries the number
+    suppressed since the last one.
+    """
+    
+    def __init__(self, every: int = 1, max_per_second: Optional[float] = None):
+        self.every = max(1, every)
+        self.max_per_second = max_per_second
+        self._seen = 0
+        self._tokens = max_per_second or 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.suppressed = 0
+    
+    def allow(self) -> Optional[int]:
+        """Suppressed count to report if the record should be emitted, else None."""
+        with self._lock:
+            self._seen += 1
+            if self._seen % self.every:
+                self.suppressed += 1
+                return None
+            
+            if self.max_per_second is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_per_second,
+                    self._tokens + (now - self._last) * self.max_per_second
+                )
+                self._last = now
+                if self._tokens < 1:
+                    self.suppressed += 1
+                    return None
+                self._tokens -= 1
+            
+            suppressed, self.suppressed = self.suppressed, 0
+            return suppressed
+
+
 class StructuredLogger:
     """Logger wrapper with structured data support"""
     
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
         self.name = name
+        self.debug_sampler: Optional[LogSampler] = None
+    
+    def sample_debug(self, every: int = 1, max_per_second: Optional[float] = None):
+        """Sample/rate-limit this logger's DEBUG records (for per-item noise)."""
+        self.debug_sampler = LogSampler(every, max_per_second)
     
     def _log(self, level: int, message: str, duration_ms: int = None, **extra):
+        if not self.logger.isEnabledFor(level):
+            return
+        if level == logging.DEBUG and self.debug_sampler is not None:
+            suppressed = self.debug_sampler.allow()
+            if suppressed is None:
+                return
+            if suppressed:
+                extra["suppressed"] = suppressed
+        
         record = self.logger.makeRecord(
             self.name, level, "", 0, message, None, None
         )
@@ -131,6 +244,9 @@ class StructuredLogger:
             record.extra_data = extra
         self.logger.handle(record)
     
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+    
     def debug(self, message: str, **extra):
         self._log(logging.DEBUG, message, **extra)
     
@@ -207,12 +323,67 @@ class JobLogger:
         self.info(f"Step {step_num}/{total_steps}: {msg}")
 
 
+class StructuredQueueHandler(QueueHandler):
+    """
+    Hands records to a QueueListener thread that formats and writes them.
+    
+    The calling thread only captures context and merges the message; when
+    the queue is full, records below WARNING are dropped (and counted)
+    while higher levels wait for space.
+    """
+    
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        capture_context(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+class StructuredQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room in a full queue."""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+# Active background listener, if logging is asynchronous
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def configure_logging(
     level: str = "INFO",
     format_type: str = "pretty",
     log_file: Optional[str] = None,
     rotation_max_bytes: int = 10 * 1024 * 1024,  # 10MB
-    rotation_backup_count: int = 5
+    rotation_backup_count: int = 5,
+    async_handlers: bool = False,
+    queue_size: int = 10000
 ):
     """
     Configure logging for the application.
@@ -222,12 +393,15 @@ def configure_logging(
         format_type: 'json' or 'pretty'
         log_file: Path to log file for output. If set, logs to file with rotation.
                   If explicitly 'console' or None, logs to stdout.
+        async_handlers: Format and write on a background thread; callers
+                  only enqueue records (bounded by queue_size).
     """
     root = logging.getLogger()
     log_level = getattr(logging, level.upper())
     root.setLevel(log_level)
     
     # Clear existing handlers
+    _stop_listener()
     root.handlers.clear()
     
     handlers = []
@@ -256,11 +430,21 @@ def configure_logging(
     for handler in handlers:
         handler.setFormatter(formatter)
         handler.setLevel(log_level)
+    
+    if async_handlers:
+        global _listener
+        log_queue = queue.Queue(maxsize=queue_size)
+        _listener = StructuredQueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [StructuredQueueHandler(log_queue)]
+    
+    for handler in handlers:
         root.addHandler(handler)
 
 # Initialize with development defaults
 # Check env vars for config or default to pretty
 configure_logging(
     level=os.getenv("LOG_LEVEL", "INFO"),
-    format_type=os.getenv("LOG_FORMAT", "pretty")
+    format_type=os.getenv("LOG_FORMAT", "pretty"),
+    async_handlers=os.getenv("LOG_ASYNC", "false").lower() == "true"
 )
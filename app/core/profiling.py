@@ -0,0 +1,339 @@
+"""
+Stage Latency Profiler
+Span-based timing of pipeline stages, engine executions and provider
+calls (LLM, TTS, Veo, stitching, DB) on top of core.tracing spans.
+Every span feeds a fixed-bucket latency histogram; sampled jobs also keep
+their span tree for a flamegraph-style breakdown.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+import asyncio
+import functools
+import inspect
+import os
+import random
+import threading
+
+from app.core.tracing import Span, get_current_span
+
+# Upper bounds in seconds; the last bucket is +Inf
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 30, 60, 120, 300
+)
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution: O(log buckets) per observation, fixed memory"""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the p-th value"""
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0,
+            "max": round(self.max, 6),
+            "p50": round(self.percentile(50), 6),
+            "p95": round(self.percentile(95), 6),
+            "p99": round(self.percentile(99), 6)
+        }
+
+
+class StageProfiler:
+    """
+    Records nested spans and exports them.
+
+    span()/profiled() time a block or function. Durations always go to
+    the per-(kind, name) histogram. A root span (no current span) decides
+    sampling for its whole tree: with probability sample_rate the tree is
+    kept, and when it belongs to a job it is stored (last max_jobs jobs)
+    for breakdown()/folded().
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        sample_rate: float = 1.0,
+        max_jobs: int = 200,
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_jobs = max_jobs
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._jobs: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ----- Recording -----
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "stage",
+        job_id: Optional[str] = None,
+        activate: bool = True,
+        **attrs
+    ) -> Span:
+        parent = get_current_span()
+        sampled = parent.sampled if parent is not None else random.random() < self.sample_rate
+        span = Span(name, kind, parent=parent, job_id=job_id, sampled=sampled, attrs=attrs or None)
+        return span.activate() if activate else span
+
+    def finish_span(self, span: Span, error: Optional[BaseException] = None):
+        duration = span.finish()
+        if error is not None and span.sampled:
+            span.attrs = {**(span.attrs or {}), "error": type(error).__name__}
+
+        key = (span.kind, span.name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.buckets)
+            histogram.observe(duration)
+
+            if span.parent is None and span.sampled and span.job_id:
+                self._jobs.setdefault(span.job_id, []).append(span)
+                self._jobs.move_to_end(span.job_id)
+                while len(self._jobs) > self.max_jobs:
+                    self._jobs.popitem(last=False)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "stage", job_id: Optional[str] = None, **attrs):
+        """Time a block as a span (no-op when the profiler is disabled)"""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, kind, job_id=job_id, **attrs)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish_span(span, e)
+            raise
+        self.finish_span(span)
+
+    def profiled(self, name: Optional[str] = None, kind: str = "stage"):
+        """Decorator form of span() for sync and async functions"""
+        def decorator(fn: Callable):
+            span_name = name or fn.__qualname__
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, kind):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, kind):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def wrap_client(self, client, kind: str, prefix: str, methods: Sequence[str]):
+        """Proxy a provider client so the given methods are recorded as spans"""
+        return ProfiledClient(self, client, kind, prefix, methods)
+
+    # ----- Export -----
+
+    def histograms(self) -> Dict[str, Dict]:
+        """Latency summaries keyed "kind/name" """
+        with self._lock:
+            items = list(self._histograms.items())
+        return {f"{kind}/{name}": h.summary() for (kind, name), h in sorted(items, key=lambda kv: kv[0])}
+
+    def prometheus_text(self, metric: str = "stage_latency_seconds") -> str:
+        """Histograms in the Prometheus text exposition format"""
+        with self._lock:
+            items = sorted(self._histograms.items(), key=lambda kv: kv[0])
+            lines = [
+                f"# HELP {metric} Pipeline span latency by kind and name",
+                f"# TYPE {metric} histogram"
+            ]
+            for (kind, name), h in items:
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum{{{labels}}} {h.sum}")
+                lines.append(f"{metric}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def job_ids(self) -> List[str]:
+        with self._lock:
+            return list(reversed(self._jobs))
+
+    def breakdown(self, job_id: str) -> Optional[Dict]:
+        """
+        Flamegraph-style view of a job: identical stacks merged, each frame
+        with total and self time, plus self time rolled up by kind.
+        """
+        with self._lock:
+            roots = list(self._jobs.get(job_id, ()))
+        if not roots:
+            return None
+
+        tree = _merge(roots)
+        by_kind: Dict[str, float] = {}
+        _self_by_kind(tree, by_kind)
+        total = sum(frame["total_ms"] for frame in tree)
+        return {
+            "job_id": job_id,
+            "total_ms": round(total, 3),
+            "self_ms_by_kind": {
+                k: round(v, 3) for k, v in sorted(by_kind.items(), key=lambda kv: -kv[1])
+            },
+            "frames": tree
+        }
+
+    def folded(self, job_id: str) -> str:
+        """Folded stacks ("a;b;c <microseconds of self time>") for flamegraph tools"""
+        with self._lock:
+            roots = list(self._jobs.get(job_id, ()))
+        lines: Dict[str, int] = {}
+        for root in roots:
+            _fold(root, "", lines)
+        return "\n".join(f"{stack} {us}" for stack, us in lines.items() if us > 0)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._jobs.clear()
+
+
+class ProfiledClient:
+    """Attribute proxy that times selected methods of a provider client"""
+
+    def __init__(self, profiler: StageProfiler, client, kind: str, prefix: str, methods: Sequence[str]):
+        self._profiler = profiler
+        self._client = client
+        self._kind = kind
+        self._prefix = prefix
+        self._methods = frozenset(methods)
+
+    def __getattr__(self, attr):
+        value = getattr(self._client, attr)
+        if attr not in self._methods or not callable(value):
+            return value
+
+        profiler, name, kind = self._profiler, f"{self._prefix}.{attr}", self._kind
+
+        if asyncio.iscoroutinefunction(value):
+            async def timed_async(*args, **kwargs):
+                with profiler.span(name, kind):
+                    return await value(*args, **kwargs)
+            return timed_async
+
+        def timed(*args, **kwargs):
+            if not profiler.enabled:
+                return value(*args, **kwargs)
+            span = profiler.start_span(name, kind)
+            try:
+                result = value(*args, **kwargs)
+            except BaseException as e:
+                profiler.finish_span(span, e)
+                raise
+            if inspect.isgenerator(result):
+                # Streaming call: the span stays open until the stream is consumed
+                span.deactivate()
+                return _timed_stream(profiler, span, result)
+            profiler.finish_span(span)
+            return result
+        return timed
+
+
+def _timed_stream(profiler: StageProfiler, span: Span, stream):
+    try:
+        yield from stream
+    finally:
+        profiler.finish_span(span)
+
+
+def _merge(spans: List[Span]) -> List[Dict]:
+    """Merge sibling spans with the same (kind, name) into one frame"""
+    frames: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+    grouped: Dict[Tuple[str, str], List[Span]] = {}
+    for span in spans:
+        if span.duration is None:
+            continue
+        key = (span.kind, span.name)
+        frame = frames.get(key)
+        if frame is None:
+            frame = frames[key] = {"name": span.name, "kind": span.kind, "count": 0, "total_ms": 0.0}
+            grouped[key] = []
+        frame["count"] += 1
+        frame["total_ms"] += span.duration * 1000
+        grouped[key].extend(span.children)
+
+    result = []
+    for key, frame in frames.items():
+        children = _merge(grouped[key])
+        child_ms = sum(c["total_ms"] for c in children)
+        # Children running in parallel threads can exceed the parent's wall time
+        frame["self_ms"] = round(max(frame["total_ms"] - child_ms, 0.0), 3)
+        frame["total_ms"] = round(frame["total_ms"], 3)
+        frame["children"] = children
+        result.append(frame)
+    result.sort(key=lambda f: -f["total_ms"])
+    return result
+
+
+def _self_by_kind(frames: List[Dict], totals: Dict[str, float]):
+    for frame in frames:
+        totals[frame["kind"]] = totals.get(frame["kind"], 0.0) + frame["self_ms"]
+        _self_by_kind(frame["children"], totals)
+
+
+def _fold(span: Span, prefix: str, lines: Dict[str, int]):
+    if span.duration is None:
+        return
+    stack = f"{prefix};{span.name}" if prefix else span.name
+    child_time = sum(c.duration or 0.0 for c in span.children)
+    lines[stack] = lines.get(stack, 0) + int(max(span.duration - child_time, 0.0) * 1e6)
+    for child in span.children:
+        _fold(child, stack, lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Global instance
+profiler = StageProfiler(
+    enabled=os.getenv("PROFILING_ENABLED", "true").lower() == "true",
+    sample_rate=float(os.getenv("PROFILING_SAMPLE_RATE", "1.0"))
+)
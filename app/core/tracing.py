@@ -1,14 +1,19 @@
 """
 Distributed Tracing with Trace ID Propagation
 """
+import itertools
+import time
 import uuid
 from contextvars import ContextVar
-from typing import Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 # Context variables for async propagation
 _trace_context: ContextVar[Optional['TraceContext']] = ContextVar('trace_context', default=None)
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+_span_ids = itertools.count(1)
 
 
 @dataclass
@@ -38,6 +43,87 @@ class TraceContext:
         }
 
 
+class Span:
+    """
+    A timed operation within a trace. Spans started while another is
+    current become its children; trace_id and job_id are inherited from
+    the parent or, for a root span, taken from the TraceContext.
+    
+    Children are only kept when the span is sampled, so unsampled spans
+    cost a couple of clock reads.
+    """
+    
+    __slots__ = (
+        "name", "kind", "span_id", "parent", "trace_id", "job_id",
+        "sampled", "start", "duration", "children", "attrs", "_token"
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional['Span'] = None,
+        job_id: Optional[str] = None,
+        sampled: bool = True,
+        attrs: Optional[Dict] = None
+    ):
+        self.name = name
+        self.kind = kind
+        self.span_id = next(_span_ids)
+        self.parent = parent
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.job_id = job_id or parent.job_id
+        else:
+            context = _trace_context.get()
+            self.trace_id = context.trace_id if context else None
+            self.job_id = job_id or (context.job_id if context else None)
+        self.sampled = sampled
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.children: List['Span'] = []
+        self.attrs = attrs
+        self._token = None
+        if sampled and parent is not None and parent.sampled:
+            parent.children.append(self)
+    
+    def activate(self) -> 'Span':
+        """Make this the current span (children started from here attach to it)"""
+        self._token = _current_span.set(self)
+        return self
+    
+    def finish(self) -> float:
+        """Stop the clock and restore the previous current span; returns seconds"""
+        self.duration = time.perf_counter() - self.start
+        self.deactivate()
+        return self.duration
+    
+    def deactivate(self):
+        """Restore the previous current span without stopping the clock"""
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Finished from a different context than it was activated in
+                _current_span.set(self.parent)
+            self._token = None
+    
+    def to_dict(self) -> dict:
+        return {
+            "span_id": f"span_{self.span_id:x}",
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "attrs": self.attrs or {},
+            "children": [c.to_dict() for c in self.children]
+        }
+
+
+def get_current_span() -> Optional[Span]:
+    """Get the innermost active span"""
+    return _current_span.get()
+
+
 def generate_trace_id() -> str:
     """Generate a new trace ID"""
     return f"trace_{uuid.uuid4().hex[:16]}"
@@ -14,6 +14,7 @@ sys.path.insert(0, str(STORYGENIUS_PATH))
 from app.core.models import Story, CriticScore
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.profiling import profiler
 from app.intelligence.emotion_curves import EmotionCurveService, Emotion
 
 logger = get_logger(__name__)
@@ -41,7 +42,7 @@ class CriticService:
         if self._llm is None:
             try:
                 from story_genius.llm.vertex_wrapper import VertexLLM
-                self._llm = VertexLLM()
+                self._llm = profiler.wrap_client(VertexLLM(), "llm", "vertex", ("generate_content",))
             except Exception as e:
                 logger.error(f"Failed to initialize LLM for critic: {e}")
                 raise
@@ -9,6 +9,8 @@ from datetime import datetime
 from enum import Enum
 import uuid
 
+from app.core.profiling import profiler
+
 
 class EngineStatus(str, Enum):
     IDLE = "idle"
@@ -73,6 +75,13 @@ class EngineOutput:
 class BaseEngine(ABC):
     """Base class for all engines - defines standard interface"""
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Profile every engine's execute() as an "engine" span
+        execute = cls.__dict__.get("execute")
+        if execute is not None and not getattr(execute, "__isabstractmethod__", False):
+            cls.execute = profiler.profiled(f"{cls.__name__}.execute", kind="engine")(execute)
+    
     def __init__(self, engine_id: str, engine_type: str, version: str = "1.0.0"):
         self.engine_id = engine_id
         self.engine_type = engine_type
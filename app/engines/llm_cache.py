@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
+# Hit/miss/set lines are per lookup; keep a trickle of them under load
+logger.sample_debug(max_per_second=20)
 
 
 @dataclass
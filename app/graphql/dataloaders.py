@@ -0,0 +1,206 @@
+"""
+GraphQL DataLoaders.
+Request-scoped loaders that batch and dedupe lookups made in the same
+event-loop tick, so nested queries don't issue one call per parent.
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+import asyncio
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+BatchLoadFn = Callable[[List[Hashable]], Awaitable[Any]]
+
+
+class DataLoader:
+    """
+    Collects keys requested during one tick and resolves them with a single
+    batch call.
+
+    The batch function receives the unique keys in request order and returns
+    either a list of values in the same order or a dict keyed by key
+    (missing keys resolve to None). A value that is an Exception fails only
+    its own key. Results are cached for the life of the loader, which should
+    be one request.
+    """
+
+    def __init__(
+        self,
+        batch_load_fn: BatchLoadFn,
+        max_batch_size: Optional[int] = None,
+        cache: bool = True,
+        name: str = "loader"
+    ):
+        self._batch_load_fn = batch_load_fn
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self.name = name
+
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._scheduled = False
+
+        self.stats = {"loads": 0, "batches": 0, "keys": 0}
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        self.stats["loads"] += 1
+
+        future = self._futures.get(key) if self.cache else None
+        if future is not None:
+            return future
+
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        self._queue.append(key)
+        if self.cache:
+            self._futures[key] = future
+
+        if not self._scheduled:
+            self._scheduled = True
+            # Two hops: let every resolver started this tick enqueue first
+            loop.call_soon(lambda: loop.create_task(self._dispatch()))
+
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def prime(self, key: Hashable, value: Any):
+        """Seed the cache (e.g. with rows fetched by a list query)."""
+        if self.cache and key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key: Hashable):
+        self._futures.pop(key, None)
+
+    async def _dispatch(self):
+        keys, pending = self._queue, self._pending
+        self._queue, self._pending = [], {}
+        self._scheduled = False
+
+        size = self.max_batch_size or len(keys)
+        batches = [keys[i:i + size] for i in range(0, len(keys), size)]
+        await asyncio.gather(*(self._run_batch(b, pending) for b in batches))
+
+    async def _run_batch(self, keys: List[Hashable], pending: Dict[Hashable, asyncio.Future]):
+        self.stats["batches"] += 1
+        self.stats["keys"] += len(keys)
+
+        try:
+            values = await self._batch_load_fn(keys)
+            if isinstance(values, dict):
+                values = [values.get(k) for k in keys]
+            else:
+                values = list(values)
+                if len(values) != len(keys):
+                    raise ValueError(
+                        f"{self.name} batch returned {len(values)} values for {len(keys)} keys"
+                    )
+        except Exception as e:
+            logger.error(f"DataLoader {self.name} batch failed: {e}")
+            for key in keys:
+                self._futures.pop(key, None)
+                if not pending[key].done():
+                    pending[key].set_exception(e)
+            return
+
+        for key, value in zip(keys, values):
+            future = pending[key]
+            if future.done():
+                continue
+            if isinstance(value, Exception):
+                self._futures.pop(key, None)
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def batch_via(service: Any, batch_method: str, single_method: str) -> BatchLoadFn:
+    """
+    Batch function calling service.<batch_method>(keys), or one concurrent
+    service.<single_method>(key) per key if the service has no batch API.
+    """
+    async def load(keys: List[Hashable]):
+        if service is None:
+            raise RuntimeError(f"No service configured for {batch_method}")
+
+        batch = getattr(service, batch_method, None)
+        if batch is not None:
+            return await _maybe_await(batch(keys))
+
+        single = getattr(service, single_method)
+        return await asyncio.gather(
+            *(_maybe_await(single(k)) for k in keys), return_exceptions=True
+        )
+
+    return load
+
+
+def _user_videos_batch(video_service: Any) -> BatchLoadFn:
+    """Keys are (user_id, limit); one call per distinct limit."""
+    async def load(keys: List[Hashable]):
+        if video_service is None:
+            raise RuntimeError("No video service configured")
+
+        by_limit: Dict[int, List[str]] = {}
+        for user_id, limit in keys:
+            by_limit.setdefault(limit, []).append(user_id)
+
+        results: Dict[Hashable, Any] = {}
+        batch = getattr(video_service, "get_videos_for_users", None)
+
+        for limit, user_ids in by_limit.items():
+            if batch is not None:
+                videos_by_user = await _maybe_await(batch(user_ids, limit))
+                for user_id in user_ids:
+                    results[(user_id, limit)] = videos_by_user.get(user_id, [])
+            else:
+                lists = await asyncio.gather(*(
+                    _maybe_await(video_service.get_videos(user_id=u, page=1, limit=limit))
+                    for u in user_ids
+                ))
+                for user_id, videos in zip(user_ids, lists):
+                    results[(user_id, limit)] = videos
+
+        return results
+
+    return load
+
+
+def create_loaders(
+    user_service: Any = None,
+    video_service: Any = None,
+    analytics_service: Any = None
+) -> Dict[str, DataLoader]:
+    """Fresh loaders for one GraphQL request."""
+    return {
+        "user_loader": DataLoader(
+            batch_via(user_service, "get_users_by_ids", "get_user"), name="users"
+        ),
+        "video_loader": DataLoader(
+            batch_via(video_service, "get_videos_by_ids", "get_video"), name="videos"
+        ),
+        "user_videos_loader": DataLoader(
+            _user_videos_batch(video_service), name="user_videos"
+        ),
+        "video_analytics_loader": DataLoader(
+            batch_via(analytics_service, "get_video_analytics_batch", "get_video_analytics"),
+            name="video_analytics"
+        ),
+    }
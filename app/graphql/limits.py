@@ -0,0 +1,205 @@
+"""
+GraphQL Query Limits.
+Depth and complexity validation rules, and selection-set inspection for
+resolvers that can skip work nobody asked for.
+"""
+from typing import Dict, Optional, Set
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLNamedType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    ValidationRule,
+    get_named_type,
+)
+
+
+MAX_QUERY_DEPTH = 8
+MAX_QUERY_COMPLEXITY = 5000
+
+# Arguments that size a list field, and the size assumed when they're
+# passed as variables or omitted (omitted arguments use the schema default
+# when the field's type is known)
+LIST_SIZE_ARGS = ("limit", "first", "last")
+DEFAULT_LIST_SIZE = 20
+
+
+def _fragments(document) -> Dict[str, FragmentDefinitionNode]:
+    return {
+        d.name.value: d for d in document.definitions
+        if isinstance(d, FragmentDefinitionNode)
+    }
+
+
+def selection_depth(
+    selection_set: Optional[SelectionSetNode],
+    fragments: Dict[str, FragmentDefinitionNode],
+    visited: Optional[Set[str]] = None
+) -> int:
+    """Deepest field nesting under a selection set (introspection excluded)."""
+    if selection_set is None:
+        return 0
+    visited = visited or set()
+
+    depth = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if selection.name.value.startswith("__"):
+                continue
+            depth = max(depth, 1 + selection_depth(selection.selection_set, fragments, visited))
+        elif isinstance(selection, InlineFragmentNode):
+            depth = max(depth, selection_depth(selection.selection_set, fragments, visited))
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in visited or name not in fragments:
+                continue
+            depth = max(depth, selection_depth(
+                fragments[name].selection_set, fragments, visited | {name}
+            ))
+    return depth
+
+
+def _schema_default(field_def: Optional[GraphQLField]) -> Optional[int]:
+    if field_def is None:
+        return None
+    for name in LIST_SIZE_ARGS:
+        arg = field_def.args.get(name)
+        if arg is not None:
+            default = arg.default_value
+            # SDL-built schemas keep the default as a literal on the AST node
+            literal = getattr(arg.ast_node, "default_value", None)
+            if not isinstance(default, int) and isinstance(literal, IntValueNode):
+                default = int(literal.value)
+            return max(1, default) if isinstance(default, int) else DEFAULT_LIST_SIZE
+    return None
+
+
+def _list_size(field: FieldNode, field_def: Optional[GraphQLField] = None) -> int:
+    default = _schema_default(field_def)
+    for arg in field.arguments or ():
+        if arg.name.value in LIST_SIZE_ARGS:
+            if isinstance(arg.value, IntValueNode):
+                return max(1, int(arg.value.value))
+            return max(default or 0, DEFAULT_LIST_SIZE)
+    return default or 1
+
+
+def _field_def(parent_type: Optional[GraphQLNamedType], name: str) -> Optional[GraphQLField]:
+    fields = getattr(parent_type, "fields", None)
+    return fields.get(name) if fields else None
+
+
+def _named_type(field_def: Optional[GraphQLField]) -> Optional[GraphQLNamedType]:
+    if field_def is None:
+        return None
+    return get_named_type(field_def.type)
+
+
+def selection_complexity(
+    selection_set: Optional[SelectionSetNode],
+    fragments: Dict[str, FragmentDefinitionNode],
+    visited: Optional[Set[str]] = None,
+    parent_type: Optional[GraphQLNamedType] = None,
+    schema=None
+) -> int:
+    """
+    Estimated number of resolved fields: each field costs 1 plus its
+    children, multiplied by its page size when it takes limit/first/last.
+
+    With parent_type (and schema, for fragment type conditions) an omitted
+    size argument counts as the field's schema default instead of 1.
+    """
+    if selection_set is None:
+        return 0
+    visited = visited or set()
+
+    def type_condition(node, fallback):
+        if schema is None or node.type_condition is None:
+            return fallback
+        return schema.get_type(node.type_condition.name.value) or fallback
+
+    total = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if selection.name.value.startswith("__"):
+                continue
+            field_def = _field_def(parent_type, selection.name.value)
+            children = selection_complexity(
+                selection.selection_set, fragments, visited, _named_type(field_def), schema
+            )
+            total += _list_size(selection, field_def) * (1 + children)
+        elif isinstance(selection, InlineFragmentNode):
+            total += selection_complexity(
+                selection.selection_set, fragments, visited,
+                type_condition(selection, parent_type), schema
+            )
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in visited or name not in fragments:
+                continue
+            total += selection_complexity(
+                fragments[name].selection_set, fragments, visited | {name},
+                type_condition(fragments[name], None), schema
+            )
+    return total
+
+
+def depth_limit_rule(max_depth: int = MAX_QUERY_DEPTH):
+    """Validation rule rejecting operations nested deeper than max_depth."""
+    class DepthLimitRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_):
+            depth = selection_depth(node.selection_set, _fragments(self.context.document))
+            if depth > max_depth:
+                self.report_error(GraphQLError(
+                    f"Query depth {depth} exceeds maximum of {max_depth}", node
+                ))
+
+    return DepthLimitRule
+
+
+def complexity_limit_rule(max_complexity: int = MAX_QUERY_COMPLEXITY):
+    """Validation rule rejecting operations above an estimated field count."""
+    class ComplexityLimitRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_):
+            schema = self.context.schema
+            root_type = getattr(schema, f"{node.operation.value}_type", None)
+            cost = selection_complexity(
+                node.selection_set, _fragments(self.context.document),
+                parent_type=root_type, schema=schema
+            )
+            if cost > max_complexity:
+                self.report_error(GraphQLError(
+                    f"Query complexity {cost} exceeds maximum of {max_complexity}", node
+                ))
+
+    return ComplexityLimitRule
+
+
+def field_selected(info, name: str) -> bool:
+    """Whether the current field's selection includes `name` (through fragments)."""
+    fragments = info.fragments or {}
+
+    def walk(selection_set, visited) -> bool:
+        if selection_set is None:
+            return False
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if selection.name.value == name:
+                    return True
+            elif isinstance(selection, InlineFragmentNode):
+                if walk(selection.selection_set, visited):
+                    return True
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = selection.name.value
+                if fragment not in visited and fragment in fragments:
+                    if walk(fragments[fragment].selection_set, visited | {fragment}):
+                        return True
+        return False
+
+    return any(walk(node.selection_set, set()) for node in info.field_nodes)
@@ -4,12 +4,18 @@ Flexible queries and real-time updates via WebSocket.
 """
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from ariadne import QueryType, MutationType, SubscriptionType, make_executable_schema
+from ariadne import ObjectType, QueryType, MutationType, SubscriptionType, make_executable_schema
 from ariadne.asgi import GraphQL
 from graphql import GraphQLResolveInfo
 import asyncio
 import logging
 
+from app.graphql.dataloaders import create_loaders
+from app.graphql.limits import (
+    MAX_QUERY_COMPLEXITY, MAX_QUERY_DEPTH,
+    complexity_limit_rule, depth_limit_rule, field_selected
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -194,6 +200,18 @@ async def resolve_me(obj, info: GraphQLResolveInfo):
     return user
 
 
+@query.field("user")
+async def resolve_user(obj, info: GraphQLResolveInfo, id: str):
+    """Get user by ID."""
+    return await info.context["user_loader"].load(id)
+
+
+@query.field("video")
+async def resolve_video(obj, info: GraphQLResolveInfo, id: str):
+    """Get video by ID."""
+    return await info.context["video_loader"].load(id)
+
+
 @query.field("videos")
 async def resolve_videos(
     obj,
@@ -206,7 +224,8 @@ async def resolve_videos(
     """
     Resolve videos with pagination and filtering.
     
-    Uses DataLoader pattern for efficient database querying.
+    totalCount is only counted when the client selects it, and fetched
+    rows prime the video loader for nested lookups.
     """
     user_id = info.context["user_id"]
     
@@ -223,9 +242,20 @@ async def resolve_videos(
     if orderBy:
         query_params["order_by"] = orderBy
     
-    # Fetch videos
-    videos = await info.context["video_service"].get_videos(**query_params)
-    total_count = await info.context["video_service"].count_videos(user_id, filter)
+    # Fetch videos (and the count, only if selected) concurrently
+    video_service = info.context["video_service"]
+    if field_selected(info, "totalCount"):
+        videos, total_count = await asyncio.gather(
+            video_service.get_videos(**query_params),
+            video_service.count_videos(user_id, filter)
+        )
+    else:
+        videos = await video_service.get_videos(**query_params)
+        total_count = None
+    
+    video_loader = info.context["video_loader"]
+    for video in videos:
+        video_loader.prime(video["id"], video)
     
     # Build connection
     edges = [
@@ -414,22 +444,75 @@ def resolve_processing_status(status, info: GraphQLResolveInfo, videoId: str):
 
 
 # Field Resolvers
-@query.field("user")
-@mutation.field("user")
+user_type = ObjectType("User")
+video_type = ObjectType("Video")
+
+
+@user_type.field("videos")
 async def resolve_user_videos(user, info: GraphQLResolveInfo, limit: int = 10):
-    """Resolve user's videos."""
-    videos = await info.context["video_loader"].load_user_videos(
-        user_id=user["id"],
-        limit=limit
-    )
-    return videos
+    """Resolve user's videos (batched across all parent users)."""
+    return await info.context["user_videos_loader"].load((user["id"], limit))
+
+
+@video_type.field("user")
+async def resolve_video_user(video, info: GraphQLResolveInfo):
+    """Resolve video owner (batched)."""
+    return await info.context["user_loader"].load(video["user_id"])
+
+
+@video_type.field("analytics")
+async def resolve_video_analytics(video, info: GraphQLResolveInfo):
+    """Resolve video analytics (batched)."""
+    return await info.context["video_analytics_loader"].load(video["id"])
 
 
 # Create executable schema
-schema = make_executable_schema(type_defs, query, mutation, subscription)
+schema = make_executable_schema(
+    type_defs, query, mutation, subscription, user_type, video_type
+)
+
+
+def make_context_value(services: Optional[Dict[str, Any]] = None):
+    """
+    Build the per-request context: services plus fresh DataLoaders, so
+    batching and caching never leak across requests.
+    """
+    services = services or {}
+    
+    def context_value(request, data=None) -> Dict[str, Any]:
+        state = getattr(request, "state", None)
+        context = {
+            "request": request,
+            "user_id": getattr(state, "user_id", None),
+            **services
+        }
+        context.update(create_loaders(
+            user_service=services.get("user_service"),
+            video_service=services.get("video_service"),
+            analytics_service=services.get("analytics_service")
+        ))
+        return context
+    
+    return context_value
+
+
+def create_graphql_app(
+    services: Optional[Dict[str, Any]] = None,
+    max_depth: int = MAX_QUERY_DEPTH,
+    max_complexity: int = MAX_QUERY_COMPLEXITY,
+    debug: bool = True
+) -> GraphQL:
+    """ASGI GraphQL app with request-scoped loaders and query limits."""
+    return GraphQL(
+        schema,
+        context_value=make_context_value(services),
+        validation_rules=[depth_limit_rule(max_depth), complexity_limit_rule(max_complexity)],
+        debug=debug
+    )
+
 
 # Create ASGI app
-graphql_app = GraphQL(schema, debug=True)
+graphql_app = create_graphql_app()
 
 
 # FastAPI integration
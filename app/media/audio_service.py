@@ -14,6 +14,7 @@ sys.path.insert(0, str(STORYGENIUS_PATH))
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.profiling import profiler
 
 logger = get_logger(__name__)
 
@@ -38,7 +39,9 @@ class AudioService:
         if self._voice_module is None:
             try:
                 from story_genius.audio.edge_tts_module import EdgeTTSVoiceModule
-                self._voice_module = EdgeTTSVoiceModule(self.voice)
+                self._voice_module = profiler.wrap_client(
+                    EdgeTTSVoiceModule(self.voice), "media", "tts", ("generate_voice",)
+                )
             except Exception as e:
                 logger.error(f"Failed to initialize voice module: {e}")
                 raise
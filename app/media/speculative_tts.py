@@ -0,0 +1,180 @@
+"""
+Speculative TTS
+Starts narration audio as soon as a scene's text is known, keyed by
+(voice, text hash) so unchanged scenes are reused across critic retries.
+"""
+import concurrent.futures
+import contextvars
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from app.core.models import Scene
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+AudioKey = Tuple[str, str]  # (voice, sha256 of narration)
+
+
+def audio_key(voice: str, text: str) -> AudioKey:
+    """Cache key for a narration rendered with a voice."""
+    return (voice, hashlib.sha256(text.strip().encode("utf-8")).hexdigest())
+
+
+class SpeculativeTTS:
+    """
+    Runs TTS in the background while the story is still being generated,
+    validated and scored.
+
+    Audio files are content-addressed within the instance (one per job,
+    see prefix), so the same narration in the same voice is synthesized
+    once, even across retries. Work for narrations that are no longer part
+    of the story is cancelled, and close() deletes every file the instance
+    rendered that the finished story doesn't use.
+    """
+
+    def __init__(
+        self,
+        audio_service,
+        output_dir: Optional[Path] = None,
+        max_workers: int = 4,
+        prefix: str = ""
+    ):
+        if output_dir is None:
+            from app.core.config import settings
+            output_dir = settings.MEDIA_DIR
+
+        self.audio_service = audio_service
+        self.output_dir = Path(output_dir)
+        self.prefix = prefix
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tts"
+        )
+        self._futures: Dict[AudioKey, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._rendered: Set[str] = set()  # files this instance produced
+        self._kept: Optional[Set[str]] = None  # set by close()
+        self.stats = {"submitted": 0, "ready_early": 0, "cancelled": 0, "released": 0}
+
+    def _path_for(self, key: AudioKey) -> str:
+        voice, digest = key
+        prefix = f"{self.prefix}_" if self.prefix else ""
+        return str(self.output_dir / f"{prefix}tts_{voice}_{digest[:24]}.mp3")
+
+    def submit(self, scene: Scene) -> Optional[AudioKey]:
+        """Start synthesizing a scene's narration if it isn't already in flight."""
+        key, _ = self._ensure(scene)
+        return key
+
+    def _ensure(self, scene: Scene) -> Tuple[Optional[AudioKey], Optional[concurrent.futures.Future]]:
+        text = scene.narration_text
+        if not text or not text.strip():
+            return None, None
+
+        key = audio_key(self.audio_service.voice, text)
+
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.cancelled():
+                # Copy the context so the synthesis span joins the job's profile
+                future = self._executor.submit(
+                    contextvars.copy_context().run, self._synthesize, key, text
+                )
+                self._futures[key] = future
+                self.stats["submitted"] += 1
+
+        return key, future
+
+    def submit_all(self, scenes: Iterable[Scene]):
+        for scene in scenes:
+            self.submit(scene)
+
+    def _synthesize(self, key: AudioKey, text: str) -> str:
+        output_path = self._path_for(key)
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            self._track(output_path)
+            return output_path
+
+        # Render to a temp file so a cancelled or failed run never leaves a partial cache entry
+        tmp_path = f"{output_path}.{threading.get_ident()}.tmp.mp3"
+        try:
+            self.audio_service.generate_audio(text, tmp_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._track(output_path)
+        return output_path
+
+    def _track(self, path: str):
+        with self._lock:
+            if self._kept is None:
+                self._rendered.add(path)
+                return
+            kept = path in self._kept
+        # Finished after close(): nothing will collect it
+        if not kept:
+            self._release(path)
+
+    def _release(self, path: str):
+        try:
+            os.remove(path)
+            self.stats["released"] += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete unused audio {path}: {e}")
+
+    def retain(self, scenes: Iterable[Scene]):
+        """Cancel audio for narrations that are no longer in the story."""
+        voice = self.audio_service.voice
+        keep = {audio_key(voice, s.narration_text) for s in scenes if s.narration_text}
+
+        with self._lock:
+            for key in [k for k in self._futures if k not in keep]:
+                future = self._futures.pop(key)
+                if future.cancel():
+                    self.stats["cancelled"] += 1
+
+    def collect(self, scenes: Iterable[Scene], job_logger=None):
+        """Wait for each scene's audio and attach its path to the scene."""
+        for scene in scenes:
+            key, future = self._ensure(scene)
+            if key is None:
+                continue
+
+            if future.done() and not future.exception():
+                self.stats["ready_early"] += 1
+
+            try:
+                scene.audio_path = future.result()
+                if job_logger:
+                    job_logger.info(f"Scene {scene.id} audio ready")
+            except Exception as e:
+                # Forget the failure so a later submit retries it
+                with self._lock:
+                    if self._futures.get(key) is future:
+                        del self._futures[key]
+                if job_logger:
+                    job_logger.error(f"Scene {scene.id} failed: {e}")
+                else:
+                    logger.error(f"Scene {scene.id} audio failed: {e}")
+
+    def close(self, keep: Iterable[Scene] = ()):
+        """
+        Drop queued work, release worker threads and delete the audio this
+        instance rendered except the files attached to the kept scenes.
+        Syntheses still running are deleted when they finish.
+        """
+        with self._lock:
+            self._kept = {s.audio_path for s in keep if s.audio_path}
+            unused = self._rendered - self._kept
+            self._rendered.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for path in unused:
+            self._release(path)
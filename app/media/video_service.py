@@ -15,6 +15,7 @@ sys.path.insert(0, str(STORYGENIUS_PATH))
 from app.core.config import settings
 from app.core.models import Scene
 from app.core.logging import get_logger
+from app.core.profiling import profiler
 
 logger = get_logger(__name__)
 
@@ -32,7 +33,7 @@ class VideoService:
         if self._veo is None:
             try:
                 from story_genius.assets.veo_wrapper import VeoWrapper
-                self._veo = VeoWrapper()
+                self._veo = profiler.wrap_client(VeoWrapper(), "media", "veo", ("generate_video",))
             except Exception as e:
                 logger.error(f"Failed to initialize Veo: {e}")
                 raise
@@ -75,6 +76,7 @@ class VideoService:
             logger.error(f"Video clip generation failed: {e}")
             raise
     
+    @profiler.profiled("stitch", kind="media")
     def stitch_video(
         self,
         scenes: List[Scene],
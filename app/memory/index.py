@@ -0,0 +1,109 @@
+"""
+Memory Index
+Score-ordered, bounded indexes over creative memory entries so top-k
+retrieval doesn't sort every stored pattern.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import bisect
+import itertools
+
+
+DEFAULT_MAX_PER_PLATFORM = 500
+
+# Ranking key: best score first, earlier entries win ties
+RankKey = Tuple[float, int, str]
+
+
+class MemoryIndex:
+    """
+    Entries ranked per (memory_type, platform) and per memory_type.
+
+    Each ranking is a sorted list of (-score, seq, id), so top(k) is a slice
+    and insert/remove are a binary search plus a list shift. Each
+    (memory_type, platform) keeps at most max_per_platform entries; adding
+    past that evicts its lowest-scoring entry everywhere.
+
+    Entries are any objects with id, memory_type, platform, score and
+    reuse_count attributes (MemoryEntry in practice).
+    """
+
+    def __init__(self, max_per_platform: int = DEFAULT_MAX_PER_PLATFORM):
+        self.max_per_platform = max_per_platform
+        self._entries: Dict[str, Any] = {}
+        self._keys: Dict[str, RankKey] = {}
+        self._by_platform: Dict[Tuple[str, str], List[RankKey]] = {}
+        self._by_type: Dict[str, List[RankKey]] = {}
+        self._score_sum: Dict[str, float] = {}
+        self._reuses = 0
+        self._seq = itertools.count()
+
+    def add(self, entry) -> List[Any]:
+        """Index an entry. Returns the entries evicted to stay within bounds."""
+        if entry.id in self._entries:
+            self.remove(entry.id)
+
+        key = (-entry.score, next(self._seq), entry.id)
+        self._entries[entry.id] = entry
+        self._keys[entry.id] = key
+        bisect.insort(self._by_platform.setdefault((entry.memory_type, entry.platform), []), key)
+        bisect.insort(self._by_type.setdefault(entry.memory_type, []), key)
+        self._score_sum[entry.memory_type] = self._score_sum.get(entry.memory_type, 0.0) + entry.score
+        self._reuses += entry.reuse_count
+
+        evicted = []
+        ranked = self._by_platform[(entry.memory_type, entry.platform)]
+        while len(ranked) > self.max_per_platform:
+            evicted.append(self.remove(ranked[-1][2]))
+        return evicted
+
+    def remove(self, entry_id: str) -> Optional[Any]:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return None
+
+        key = self._keys.pop(entry_id)
+        for ranked in (self._by_platform[(entry.memory_type, entry.platform)],
+                       self._by_type[entry.memory_type]):
+            del ranked[bisect.bisect_left(ranked, key)]
+        self._score_sum[entry.memory_type] -= entry.score
+        self._reuses -= entry.reuse_count
+        return entry
+
+    def get(self, entry_id: str) -> Optional[Any]:
+        return self._entries.get(entry_id)
+
+    def top(self, memory_type: str, platform: Optional[str] = None, limit: int = 5) -> List[Any]:
+        """Best-scoring entries of a type, optionally for one platform."""
+        if platform:
+            ranked = self._by_platform.get((memory_type, platform), [])
+        else:
+            ranked = self._by_type.get(memory_type, [])
+        return [self._entries[entry_id] for _, _, entry_id in ranked[:limit]]
+
+    def record_reuse(self, entry):
+        entry.reuse_count += 1
+        self._reuses += 1
+
+    def count(self, memory_type: Optional[str] = None) -> int:
+        if memory_type is None:
+            return len(self._entries)
+        return len(self._by_type.get(memory_type, []))
+
+    def average_score(self, memory_type: str) -> float:
+        count = self.count(memory_type)
+        return self._score_sum[memory_type] / count if count else 0
+
+    @property
+    def total_reuses(self) -> int:
+        return self._reuses
+
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+        self._by_platform.clear()
+        self._by_type.clear()
+        self._score_sum.clear()
+        self._reuses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
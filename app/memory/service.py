@@ -3,17 +3,25 @@ Memory Service (v1)
 Stores and retrieves high-performing content patterns for reuse and learning.
 """
 import uuid
-from datetime import datetime
+import json
+import threading
+import time
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from dataclasses import dataclass, asdict
 
-from app.core.database import get_db_session, Base
+from sqlalchemy import select
+
+from app.core.database import get_db_session, engine, DBMemoryEntry
 from app.core.logging import get_logger
-from app.core.config import settings
-from sqlalchemy import Column, String, Float, DateTime, Text, Integer
+from app.memory.index import MemoryIndex, DEFAULT_MAX_PER_PLATFORM
 
 logger = get_logger(__name__)
 
+# Refreshes re-read rows this much older than the newest one seen, to catch
+# rows another worker stamped before committing
+REFRESH_SLACK = timedelta(seconds=60)
+
 
 @dataclass
 class MemoryEntry:
@@ -28,6 +36,195 @@ class MemoryEntry:
     created_at: datetime = None
 
 
+class CreativeMemoryStore:
+    """
+    Per-process creative memory: a MemoryIndex over the creative_memory
+    table, which every worker process shares.
+
+    Rows are loaded into the index on first use. Before reads, the index
+    picks up rows other workers inserted since it last looked (at most
+    every refresh_interval seconds); writes go through to the database.
+    The per-platform bound is enforced in SQL, ranking the whole table,
+    so a worker never deletes rows based on its own possibly stale view;
+    the index applies the same bound and converges on the table's rows.
+    Database failures are logged and the in-memory index keeps working.
+    """
+
+    def __init__(
+        self,
+        max_per_platform: int = DEFAULT_MAX_PER_PLATFORM,
+        refresh_interval: float = 5.0
+    ):
+        self.index = MemoryIndex(max_per_platform)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._watermark: Optional[datetime] = None  # newest created_at indexed
+        self._refreshed_at = 0.0
+
+    def ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+            db = get_db_session()
+            try:
+                DBMemoryEntry.__table__.create(bind=engine, checkfirst=True)
+                rows = db.query(DBMemoryEntry).order_by(DBMemoryEntry.score.desc()).all()
+                over_bound = set()
+                for row in rows:
+                    if self._index_row(row):
+                        over_bound.add((row.memory_type, row.platform))
+                # Tables written before the bound existed
+                for memory_type, platform in over_bound:
+                    self._prune(db, memory_type, platform)
+                db.commit()
+                logger.info(f"Loaded {len(self.index)} creative memory entries")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to load creative memory: {e}")
+            finally:
+                db.close()
+
+    def refresh(self, force: bool = False):
+        """Index rows other workers inserted since the last look"""
+        self.ensure_loaded()
+        if not force and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return
+            self._refreshed_at = time.monotonic()
+
+            db = get_db_session()
+            try:
+                query = db.query(DBMemoryEntry)
+                if self._watermark is not None:
+                    query = query.filter(DBMemoryEntry.created_at >= self._watermark - REFRESH_SLACK)
+                for row in query.all():
+                    self._index_row(row)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to refresh creative memory: {e}")
+            finally:
+                db.close()
+
+    def _index_row(self, row: DBMemoryEntry) -> bool:
+        """Index a row not seen yet; True if that evicted something"""
+        if row.created_at is not None and (self._watermark is None or row.created_at > self._watermark):
+            self._watermark = row.created_at
+        if self.index.get(row.id) is not None:
+            return False
+        return bool(self.index.add(self._from_row(row)))
+
+    def add(self, entry: MemoryEntry):
+        self.ensure_loaded()
+        with self._lock:
+            # Evicts from this process's view only; the table is pruned below
+            self.index.add(entry)
+
+        db = get_db_session()
+        try:
+            db.add(DBMemoryEntry(
+                id=entry.id,
+                memory_type=entry.memory_type,
+                reference_id=entry.reference_id,
+                platform=entry.platform,
+                score=entry.score,
+                metadata_json=json.dumps(entry.metadata),
+                reuse_count=entry.reuse_count,
+                created_at=entry.created_at
+            ))
+            db.flush()
+            self._prune(db, entry.memory_type, entry.platform)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to persist memory entry {entry.id}: {e}")
+        finally:
+            db.close()
+
+    def top(self, memory_type: str, platform: str = None, limit: int = 5) -> List[MemoryEntry]:
+        self.refresh()
+        with self._lock:
+            return self.index.top(memory_type, platform, limit)
+
+    def record_reuse(self, entry: MemoryEntry):
+        with self._lock:
+            self.index.record_reuse(entry)
+
+        db = get_db_session()
+        try:
+            db.query(DBMemoryEntry).filter(DBMemoryEntry.id == entry.id).update(
+                {DBMemoryEntry.reuse_count: entry.reuse_count},
+                synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to record reuse of memory entry {entry.id}: {e}")
+        finally:
+            db.close()
+
+    def reset(self):
+        """Drop this process's index; it is reloaded from the table on next use"""
+        with self._lock:
+            self.index.clear()
+            self._loaded = False
+            self._watermark = None
+
+    def delete_all(self):
+        """
+        Delete every row of the shared creative_memory table, i.e. the
+        memory of all workers, and reset this process's index (other
+        workers keep serving their indexes until they reset).
+        """
+        db = get_db_session()
+        try:
+            db.query(DBMemoryEntry).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to delete creative memory: {e}")
+        finally:
+            db.close()
+        self.reset()
+
+    def _prune(self, db, memory_type: str, platform: str):
+        """Delete a (memory_type, platform)'s rows ranked past the bound in the table"""
+        in_group = (DBMemoryEntry.memory_type == memory_type, DBMemoryEntry.platform == platform)
+        keep = (
+            select(DBMemoryEntry.id)
+            .where(*in_group)
+            .order_by(DBMemoryEntry.score.desc(), DBMemoryEntry.created_at)
+            .limit(self.index.max_per_platform)
+        )
+        db.query(DBMemoryEntry).filter(*in_group, DBMemoryEntry.id.not_in(keep)).delete(
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def _from_row(row: DBMemoryEntry) -> MemoryEntry:
+        return MemoryEntry(
+            id=row.id,
+            memory_type=row.memory_type,
+            reference_id=row.reference_id,
+            platform=row.platform,
+            score=row.score,
+            metadata=json.loads(row.metadata_json or "{}"),
+            reuse_count=row.reuse_count or 0,
+            created_at=row.created_at
+        )
+
+
+# Shared by every MemoryService (the orchestrator creates one per job)
+memory_store = CreativeMemoryStore()
+
+
 class MemoryService:
     """
     Creative Memory System (v1).
@@ -36,9 +233,8 @@ class MemoryService:
     
     SCORE_THRESHOLD = 0.85  # Store patterns scoring above this
     
-    def __init__(self):
-        self.db = get_db_session()
-        self._memory_cache: List[MemoryEntry] = []
+    def __init__(self, store: CreativeMemoryStore = None):
+        self.store = store or memory_store
     
     def store_winning_hook(
         self,
@@ -80,10 +276,9 @@ class MemoryService:
             created_at=datetime.utcnow()
         )
         
-        self._memory_cache.append(entry)
+        self.store.add(entry)
         logger.info(f"Stored winning hook (score={score:.2f}): {hook_text[:40]}...")
         
-        # TODO: Persist to database in future version
         return entry
     
     def get_top_hooks(
@@ -101,15 +296,7 @@ class MemoryService:
         Returns:
             List of MemoryEntry for hooks
         """
-        hooks = [e for e in self._memory_cache if e.memory_type == "hook"]
-        
-        if platform:
-            hooks = [h for h in hooks if h.platform == platform]
-        
-        # Sort by score
-        hooks.sort(key=lambda h: h.score, reverse=True)
-        
-        return hooks[:limit]
+        return self.store.top("hook", platform, limit)
     
     def mutate_hook(self, hook_text: str, mutation_type: str = "rephrase") -> str:
         """
@@ -161,7 +348,7 @@ class MemoryService:
             created_at=datetime.utcnow()
         )
         
-        self._memory_cache.append(entry)
+        self.store.add(entry)
         logger.info(f"Stored {pattern_type} pattern: {pattern_id} (score={score:.2f})")
         return entry
     
@@ -172,14 +359,14 @@ class MemoryService:
         Returns:
             Hook metadata dict or None
         """
-        top_hooks = self.get_top_hooks(platform, limit=3)
+        top_hooks = self.get_top_hooks(platform, limit=1)
         
         if not top_hooks:
             return None
         
         # Pick best hook and mutate it
         best = top_hooks[0]
-        best.reuse_count += 1
+        self.store.record_reuse(best)
         
         original_text = best.metadata.get("hook_text", "")
         mutated_text = self.mutate_hook(original_text, "intensify")
@@ -195,16 +382,25 @@ class MemoryService:
     
     def get_memory_stats(self) -> Dict:
         """Get statistics about stored memories."""
-        hooks = [e for e in self._memory_cache if e.memory_type == "hook"]
+        self.store.refresh()
+        index = self.store.index
         
         return {
-            "total_entries": len(self._memory_cache),
-            "hooks": len(hooks),
-            "avg_hook_score": sum(h.score for h in hooks) / len(hooks) if hooks else 0,
-            "total_reuses": sum(e.reuse_count for e in self._memory_cache)
+            "total_entries": index.count(),
+            "hooks": index.count("hook"),
+            "avg_hook_score": index.average_score("hook"),
+            "total_reuses": index.total_reuses
         }
     
-    def clear_memory(self):
-        """Clear all memory (for testing)."""
-        self._memory_cache.clear()
-        logger.info("Memory cleared")
+    def clear_memory(self, delete_persisted: bool = False):
+        """
+        Clear this process's memory index (it reloads from the database on
+        next use). delete_persisted=True also deletes every stored pattern
+        from the shared creative_memory table, for all workers.
+        """
+        if delete_persisted:
+            self.store.delete_all()
+            logger.warning("Creative memory deleted from the database")
+        else:
+            self.store.reset()
+            logger.info("Memory index cleared")
@@ -7,21 +7,41 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 from app.models.privacy import AuditLog
 from app.database import get_db
+from app.middleware.audit_writer import AuditBatchWriter
 from datetime import datetime
+from typing import Dict, List
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 
 
+def insert_audit_logs(records: List[Dict]):
+    """Insert a batch of audit records with one multi-row INSERT."""
+    db = next(get_db())
+    try:
+        db.execute(AuditLog.__table__.insert(), records)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Shared writer; starts on the first request that needs it
+audit_writer = AuditBatchWriter(insert_audit_logs)
+
+
 class AuditMiddleware(BaseHTTPMiddleware):
     """
     Middleware to log all data access for GDPR compliance.
     Records who accessed what data, when, and from where.
     """
     
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, writer: AuditBatchWriter = None):
         super().__init__(app)
+        self.writer = writer or audit_writer
     
     async def dispatch(self, request: Request, call_next):
         """Process request and log audit trail."""
@@ -51,9 +71,9 @@ class AuditMiddleware(BaseHTTPMiddleware):
         is_data_access = self._is_data_access_operation(request.method, request.url.path)
         
         if is_data_access:
-            # Log to database asynchronously
+            # Queue for the background writer
             try:
-                await self._log_to_database(
+                self._log_to_database(
                     request_id=request_id,
                     user_id=user_id,
                     ip_address=ip_address,
@@ -98,7 +118,7 @@ class AuditMiddleware(BaseHTTPMiddleware):
         
         return False
     
-    async def _log_to_database(
+    def _log_to_database(
         self,
         request_id: str,
         user_id: str,
@@ -109,45 +129,33 @@ class AuditMiddleware(BaseHTTPMiddleware):
         status_code: int,
         duration_ms: float
     ):
-        """Write audit log to database."""
-        db = next(get_db())
-        
-        try:
-            # Determine action from method
-            action_map = {
-                "GET": "read",
-                "POST": "create",
-                "PUT": "update",
-                "PATCH": "update",
-                "DELETE": "delete"
-            }
-            action = action_map.get(method, "unknown")
-            
-            # Extract resource type from path
-            resource_type = self._extract_resource_type(path)
-            
-            # Create audit log
-            audit_log = AuditLog(
-                request_id=request_id,
-                user_id=user_id,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                method=method,
-                path=path,
-                status_code=str(status_code),
-                action=action,
-                resource_type=resource_type,
-                timestamp=datetime.utcnow()
-            )
-            
-            db.add(audit_log)
-            db.commit()
-        
-        except Exception as e:
-            logger.error(f"Failed to create audit log: {e}")
-            db.rollback()
-        finally:
-            db.close()
+        """Queue an audit record for the batched database writer."""
+        # Determine action from method
+        action_map = {
+            "GET": "read",
+            "POST": "create",
+            "PUT": "update",
+            "PATCH": "update",
+            "DELETE": "delete"
+        }
+        action = action_map.get(method, "unknown")
+        
+        # Extract resource type from path
+        resource_type = self._extract_resource_type(path)
+        
+        self.writer.submit({
+            "id": str(uuid.uuid4()),
+            "request_id": request_id,
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "method": method,
+            "path": path,
+            "status_code": str(status_code),
+            "action": action,
+            "resource_type": resource_type,
+            "timestamp": datetime.utcnow()
+        })
     
     def _extract_resource_type(self, path: str) -> str:
         """Extract resource type from path."""
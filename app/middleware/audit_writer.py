@@ -0,0 +1,319 @@
+"""
+Audit Log Writer.
+Bounded in-memory queue of audit records drained by a background task with
+multi-row inserts. Records that can't be queued or written are appended to
+a spill file and replayed when the writer next starts.
+"""
+from typing import Callable, Dict, Iterator, List, Optional
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # Windows: spill locks only cover this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+FlushFn = Callable[[List[Dict]], None]
+
+DEFAULT_SPILL_PATH = ".story_assets/audit/spill.jsonl"
+
+# Started writers, so shutdown can flush them without importing their owners
+_running_writers: "weakref.WeakSet[AuditBatchWriter]" = weakref.WeakSet()
+
+
+class AuditBatchWriter:
+    """
+    Batches audit records off the request path.
+
+    submit() is a deque append; a background task wakes every
+    flush_interval_ms, or as soon as batch_size records are waiting, and
+    hands up to batch_size records to flush_fn in a worker thread.
+
+    Backpressure: at max_queue pending records, submit() sets the record
+    aside for the background task to append to the spill file, so requests
+    never wait on the database or the disk and no record is dropped. A
+    failed flush spills its batch the same way. start() replays the spill
+    file before accepting new work.
+
+    Every worker process shares the spill file: appends and the hand-off to
+    replay hold an flock on <spill_path>.lock, and only the process holding
+    <spill_path>.replay.lock replays, so no record is inserted twice.
+    """
+
+    def __init__(
+        self,
+        flush_fn: FlushFn,
+        batch_size: int = 200,
+        flush_interval_ms: int = 250,
+        max_queue: int = 10000,
+        spill_path: str = DEFAULT_SPILL_PATH
+    ):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue = max_queue
+        self.spill_path = spill_path
+
+        self._queue: deque = deque()
+        self._overflow: deque = deque()  # waiting to be spilled
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._spill_lock = threading.Lock()
+
+        self.stats = {"submitted": 0, "written": 0, "batches": 0, "spilled": 0, "failed_batches": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, record: Dict) -> bool:
+        """
+        Queue a record. Returns False if the queue was full and the record
+        is headed for the spill file instead.
+        """
+        self.stats["submitted"] += 1
+        if not self.running:
+            self._start_in_running_loop()
+
+        if len(self._queue) >= self.max_queue:
+            self._overflow.append(record)
+            if self._wakeup is not None:
+                self._wakeup.set()
+            return False
+
+        self._queue.append(record)
+        if len(self._queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        """Start the background writer on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        _running_writers.add(self)
+
+    async def stop(self):
+        """Stop the writer after flushing everything queued."""
+        task = self._task
+        self._task = None
+        _running_writers.discard(self)
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def flush(self):
+        """Write everything queued so far."""
+        await self._spill_overflow()
+        while self._queue:
+            await self._flush_batch()
+
+    def spill_pending(self):
+        """Synchronously move queued records to the spill file (for exit without a loop)."""
+        records = list(self._overflow) + list(self._queue)
+        self._overflow.clear()
+        self._queue.clear()
+        if records:
+            self._spill(records)
+
+    def _start_in_running_loop(self):
+        try:
+            self.start()
+        except RuntimeError:
+            # No running loop (sync caller); records wait for the next start()
+            pass
+
+    async def _run(self):
+        try:
+            await self._replay_spill()
+        except Exception as e:
+            logger.error(f"Replaying spilled audit records failed: {e}")
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            # Keep the writer alive through disk errors; records stay queued
+            try:
+                await self._spill_overflow()
+                while self._queue:
+                    await self._flush_batch()
+                    if len(self._queue) < self.batch_size:
+                        break
+            except Exception as e:
+                logger.error(f"Audit writer pass failed: {e}")
+
+    async def _flush_batch(self):
+        batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        if not batch:
+            return
+        await self._write(batch)
+
+    async def _write(self, batch: List[Dict]) -> bool:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.flush_fn, batch)
+        except Exception as e:
+            logger.error(f"Audit batch of {len(batch)} failed, spilling: {e}")
+            self.stats["failed_batches"] += 1
+            await loop.run_in_executor(None, self._spill, batch)
+            return False
+
+        self.stats["batches"] += 1
+        self.stats["written"] += len(batch)
+        return True
+
+    # ----- Spill file -----
+
+    async def _spill_overflow(self):
+        if not self._overflow:
+            return
+        records = list(self._overflow)
+        self._overflow.clear()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._spill, records)
+        except Exception:
+            # Try again on the next pass
+            self._overflow.extendleft(reversed(records))
+            raise
+
+    def _spill(self, records: List[Dict]):
+        lines = "".join(json.dumps(r, default=_encode) + "\n" for r in records)
+        with self._spill_lock, _file_lock(self.spill_path + ".lock"):
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        self.stats["spilled"] += len(records)
+
+    async def _replay_spill(self):
+        """
+        Write spilled records back in batches; keep the file if a batch
+        fails. Skipped while another process (or writer) is replaying.
+        """
+        replay_path = self.spill_path + ".replay"
+        with _file_lock(replay_path + ".lock", blocking=False) as acquired:
+            if acquired:
+                await self._replay_locked(replay_path)
+
+    async def _replay_locked(self, replay_path: str):
+        with self._spill_lock, _file_lock(self.spill_path + ".lock"):
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+
+        records = []
+        with open(replay_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(_decode(json.loads(line)))
+                except ValueError:
+                    logger.warning("Skipping unreadable spilled audit record")
+
+        logger.info(f"Replaying {len(records)} spilled audit records")
+        for i in range(0, len(records), self.batch_size):
+            batch = records[i:i + self.batch_size]
+            if not await self._write(batch):
+                # _write spilled the failed batch; respill the rest behind it
+                self._spill(records[i + self.batch_size:])
+                break
+        try:
+            os.remove(replay_path)
+        except FileNotFoundError:
+            pass
+
+
+# Without fcntl, non-blocking locks held by this process
+_held_locks: set = set()
+_held_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _file_lock(path: str, blocking: bool = True) -> Iterator[bool]:
+    """
+    Exclusive lock on path across processes (flock). With blocking=False
+    yields False instead of waiting when someone else holds it.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if fcntl is None:
+        if blocking:
+            # Callers also hold their writer's _spill_lock
+            yield True
+            return
+        with _held_locks_guard:
+            acquired = path not in _held_locks
+            _held_locks.add(path)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with _held_locks_guard:
+                    _held_locks.discard(path)
+        return
+
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+async def stop_all():
+    """Flush and stop every started writer (call from app shutdown)."""
+    for writer in list(_running_writers):
+        await writer.stop()
+
+
+def _spill_all_pending():
+    # Last resort at interpreter exit: the loop is gone, keep records on disk
+    for writer in list(_running_writers):
+        try:
+            writer.spill_pending()
+        except Exception as e:
+            logger.error(f"Could not spill pending audit records: {e}")
+
+
+atexit.register(_spill_all_pending)
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _decode(record: Dict) -> Dict:
+    for key, value in record.items():
+        if isinstance(value, dict) and "__datetime__" in value:
+            record[key] = datetime.fromisoformat(value["__datetime__"])
+    return record
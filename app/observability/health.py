@@ -6,6 +6,7 @@ from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+import threading
 import time
 import asyncio
 
@@ -43,28 +44,52 @@ class SystemHealth:
     components: List[ComponentHealth]
     version: str
     uptime_seconds: int
+    age_seconds: Optional[float] = None  # set when served from the cached snapshot
+    stale: bool = False
     
     def to_dict(self) -> Dict:
-        return {
+        result = {
             "status": self.status.value,
             "timestamp": self.timestamp.isoformat(),
             "version": self.version,
             "uptime_seconds": self.uptime_seconds,
             "components": [c.to_dict() for c in self.components]
         }
+        if self.age_seconds is not None:
+            result["age_seconds"] = self.age_seconds
+            result["stale"] = self.stale
+        return result
 
 
 class HealthChecker:
     """Component health checker"""
     
-    def __init__(self, name: str, check_fn: Callable, timeout: float = 5.0):
+    def __init__(
+        self,
+        name: str,
+        check_fn: Callable,
+        timeout: float = 5.0,
+        interval: float = 15.0
+    ):
         self.name = name
         self.check_fn = check_fn
         self.timeout = timeout
+        self.interval = interval
         self.last_success: Optional[datetime] = None
+        self.last_result: Optional[ComponentHealth] = None
+        self.last_checked: Optional[float] = None  # time.monotonic()
+    
+    def is_due(self, now: float) -> bool:
+        return self.last_checked is None or now - self.last_checked >= self.interval
     
     async def check(self) -> ComponentHealth:
-        """Run health check"""
+        """Run health check (sync checks run in a worker thread, both under the timeout)"""
+        result = await self._run()
+        self.last_result = result
+        self.last_checked = time.monotonic()
+        return result
+    
+    async def _run(self) -> ComponentHealth:
         start = time.time()
         
         try:
@@ -72,7 +97,9 @@ class HealthChecker:
             if asyncio.iscoroutinefunction(self.check_fn):
                 result = await asyncio.wait_for(self.check_fn(), timeout=self.timeout)
             else:
-                result = self.check_fn()
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(self.check_fn), timeout=self.timeout
+                )
             
             latency = int((time.time() - start) * 1000)
             
@@ -115,7 +142,14 @@ class HealthChecker:
 
 
 class HealthMonitor:
-    """Central health monitoring orchestrator"""
+    """
+    Central health monitoring orchestrator.
+    
+    A background thread refreshes checks whose interval has elapsed, all
+    due checks concurrently, and publishes a SystemHealth snapshot.
+    Probes read that snapshot instead of running checks; a snapshot older
+    than stale_after seconds is reported as stale.
+    """
     
     _instance = None
     _start_time: datetime = None
@@ -126,19 +160,37 @@ class HealthMonitor:
             cls._instance._checkers: List[HealthChecker] = []
             cls._instance._start_time = datetime.utcnow()
             cls._instance._version = "1.0.0"
+            cls._instance._snapshot: Optional[SystemHealth] = None
+            cls._instance._snapshot_at: Optional[float] = None
+            cls._instance._refresher: Optional[threading.Thread] = None
+            cls._instance._stop = threading.Event()
+            cls._instance._start_lock = threading.Lock()
+            cls._instance.tick = 1.0
+            cls._instance.stale_after = 60.0
         return cls._instance
     
-    def register(self, name: str, check_fn: Callable, timeout: float = 5.0):
+    def register(
+        self,
+        name: str,
+        check_fn: Callable,
+        timeout: float = 5.0,
+        interval: float = 15.0
+    ):
         """Register a health check"""
-        self._checkers.append(HealthChecker(name, check_fn, timeout))
+        self._checkers.append(HealthChecker(name, check_fn, timeout, interval))
     
     async def check_all(self) -> SystemHealth:
-        """Run all health checks"""
-        component_healths = []
+        """Run all health checks now (concurrently) and publish the result"""
+        return await self.refresh(force=True)
+    
+    async def refresh(self, force: bool = False) -> SystemHealth:
+        """Run due checks (all of them if force) concurrently and publish a snapshot"""
+        now = time.monotonic()
+        due = [c for c in self._checkers if force or c.is_due(now)]
+        if due:
+            await asyncio.gather(*(c.check() for c in due))
         
-        for checker in self._checkers:
-            health = await checker.check()
-            component_healths.append(health)
+        component_healths = [c.last_result for c in self._checkers if c.last_result is not None]
         
         # Determine overall status
         statuses = [c.status for c in component_healths]
@@ -152,21 +204,99 @@ class HealthMonitor:
         
         uptime = int((datetime.utcnow() - self._start_time).total_seconds())
         
-        return SystemHealth(
+        health = SystemHealth(
             status=overall,
             timestamp=datetime.utcnow(),
             components=component_healths,
             version=self._version,
             uptime_seconds=uptime
         )
+        self._snapshot, self._snapshot_at = health, time.monotonic()
+        return health
+    
+    # ----- Background refresh -----
+    
+    def start(self):
+        """Start the background refresher (idempotent)"""
+        with self._start_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(
+                target=lambda: asyncio.run(self._refresh_loop()),
+                name="health-refresh",
+                daemon=True
+            )
+            self._refresher.start()
+    
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout)
+            self._refresher = None
+    
+    async def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep refreshing; staleness will surface a persistent failure
+                pass
+            await asyncio.sleep(self.tick)
+    
+    # ----- Snapshot reads (O(1)) -----
+    
+    def snapshot(self) -> Optional[SystemHealth]:
+        """Latest published health with its age, starting the refresher if needed"""
+        self.start()
+        health, taken_at = self._snapshot, self._snapshot_at
+        if health is None:
+            return None
+        age = time.monotonic() - taken_at
+        return SystemHealth(
+            status=health.status,
+            timestamp=health.timestamp,
+            components=health.components,
+            version=health.version,
+            uptime_seconds=health.uptime_seconds,
+            age_seconds=round(age, 3),
+            stale=age > self.stale_after
+        )
+    
+    async def get_health(self) -> SystemHealth:
+        """Cached snapshot, or a direct check while the first one is pending"""
+        return self.snapshot() or await self.check_all()
     
     def liveness(self) -> Dict:
         """Quick liveness check"""
-        return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+        health = self.snapshot()
+        return {
+            "status": "alive",
+            "timestamp": datetime.utcnow().isoformat(),
+            "snapshot_age_seconds": health.age_seconds if health else None,
+            "stale": health.stale if health else None
+        }
     
     def readiness(self) -> Dict:
-        """Readiness check (sync, basic)"""
-        return {"status": "ready", "timestamp": datetime.utcnow().isoformat()}
+        """Readiness from the cached snapshot: not ready if unhealthy or stale"""
+        health = self.snapshot()
+        if health is None:
+            # First refresh still running
+            return {
+                "status": "ready",
+                "timestamp": datetime.utcnow().isoformat(),
+                "snapshot_age_seconds": None,
+                "stale": None
+            }
+        
+        ready = health.status != HealthStatus.UNHEALTHY and not health.stale
+        return {
+            "status": "ready" if ready else "not_ready",
+            "timestamp": datetime.utcnow().isoformat(),
+            "health": health.status.value,
+            "snapshot_age_seconds": health.age_seconds,
+            "stale": health.stale
+        }
 
 
 # Singleton instance
@@ -220,6 +350,6 @@ def check_engine_registry() -> Dict:
 
 
 # Register default checks
-health_monitor.register("memory", check_memory)
-health_monitor.register("disk", check_disk)
-health_monitor.register("engines", check_engine_registry)
+health_monitor.register("memory", check_memory, interval=10.0)
+health_monitor.register("disk", check_disk, interval=60.0)
+health_monitor.register("engines", check_engine_registry, interval=30.0)
@@ -5,6 +5,7 @@ Includes media generation, validation, and critic scoring.
 import uuid
 import os
 import concurrent.futures
+import contextvars
 from datetime import datetime
 from typing import Optional
 
@@ -12,11 +13,14 @@ from app.core.models import Job, JobStatus, Story, Scene
 from app.core.database import get_db_session, DBJob, DBStory, DBScene, DBVideo, DBCriticScore
 from app.core.logging import JobLogger, get_logger
 from app.core.config import settings
+from app.core.profiling import profiler
 from app.story.adapter import StoryAdapter
 from app.media.audio_service import AudioService
 from app.media.video_service import VideoService
+from app.media.speculative_tts import SpeculativeTTS
 from app.strategy.shorts_rules import ShortsValidator
 from app.critic.service import CriticService
+from app.realtime import ws_manager
 
 logger = get_logger(__name__)
 
@@ -65,6 +69,7 @@ class OrchestratorService:
         logger.info(f"Created job {job.id[:8]} - {job.platform}")
         return job
     
+    @profiler.profiled(kind="db")
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID."""
         db_job = self.db.query(DBJob).filter(DBJob.id == job_id).first()
@@ -91,6 +96,7 @@ class OrchestratorService:
             retry_count=db_job.retry_count
         )
     
+    @profiler.profiled(kind="db")
     def update_job_status(self, job_id: str, status: JobStatus, error_message: str = None):
         """Update job status in database."""
         db_job = self.db.query(DBJob).filter(DBJob.id == job_id).first()
@@ -102,6 +108,7 @@ class OrchestratorService:
             self.db.commit()
             logger.info(f"Job {job_id[:8]} status → {status.value}")
     
+    @profiler.profiled(kind="db")
     def update_job_scores(self, job_id: str, scores: dict):
         """Update job critic scores."""
         db_job = self.db.query(DBJob).filter(DBJob.id == job_id).first()
@@ -112,6 +119,7 @@ class OrchestratorService:
             db_job.total_score = scores.get("total_score")
             self.db.commit()
     
+    @profiler.profiled(kind="db")
     def save_story(self, story: Story):
         """Save story and its scenes to database."""
         db_story = DBStory(
@@ -144,6 +152,7 @@ class OrchestratorService:
         self.db.commit()
         logger.info(f"Saved story {story.id[:8]} with {len(story.scenes)} scenes")
     
+    @profiler.profiled(kind="db")
     def save_video(self, job_id: str, video_path: str, duration: int):
         """Save final video metadata."""
         db_video = DBVideo(
@@ -161,6 +170,7 @@ class OrchestratorService:
         
         self.db.commit()
     
+    @profiler.profiled(kind="db")
     def save_critic_score(self, job_id: str, score, platform: str):
         """Save critic score to database."""
         db_score = DBCriticScore(
@@ -177,10 +187,39 @@ class OrchestratorService:
         self.db.add(db_score)
         self.db.commit()
     
-    def generate_scene_assets(self, scenes: list, job_id: str):
-        """Generate audio for all scenes in parallel."""
+    def _scene_streamer(self, job_id: str):
+        """
+        Callback that forwards each scene to WebSocket watchers as it is generated.
+        
+        generation identifies the story attempt the scene belongs to, so
+        watchers can replace the scenes of an earlier attempt on a retry.
+        """
+        def on_scene(scene: Scene, generation: int = 0):
+            if not ws_manager.has_job_watchers(job_id):
+                return
+            ws_manager.publish(ws_manager.notify_scene_ready(job_id, {
+                "id": scene.id,
+                "start_sec": scene.start_sec,
+                "end_sec": scene.end_sec,
+                "purpose": scene.purpose.value,
+                "narration_text": scene.narration_text,
+                "visual_prompt": scene.visual_prompt
+            }, generation))
+        return on_scene
+    
+    def generate_scene_assets(self, scenes: list, job_id: str, tts: Optional[SpeculativeTTS] = None):
+        """
+        Generate audio for all scenes in parallel.
+        
+        When a SpeculativeTTS is given, audio already started during story
+        generation is reused and only missing scenes are synthesized.
+        """
         job_logger = JobLogger(job_id)
         
+        if tts is not None:
+            tts.collect(scenes, job_logger)
+            return
+        
         def process_scene(scene):
             try:
                 # Generate audio
@@ -194,16 +233,29 @@ class OrchestratorService:
                 return scene
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(process_scene, scene) for scene in scenes]
+            futures = [
+                executor.submit(contextvars.copy_context().run, process_scene, scene)
+                for scene in scenes
+            ]
             for future in concurrent.futures.as_completed(futures):
                 future.result()
     
     def start_job(self, job_id: str) -> bool:
         """
         Execute the complete shorts generation pipeline.
+        
+        The run is profiled as a "job" span with one span per stage; see
+        profiler.breakdown(job_id) for where the time went.
         """
+        with profiler.span("job", kind="job", job_id=job_id):
+            return self._run_job(job_id)
+    
+    def _run_job(self, job_id: str) -> bool:
         job_logger = JobLogger(job_id)
         job_logger.info("Starting job execution...")
+        tts = None
+        story = None
+        completed = False
         
         try:
             # 1. Update status to RUNNING
@@ -216,41 +268,64 @@ class OrchestratorService:
             
             retry_count = 0
             max_retries = settings.MAX_RETRIES
-            story = None
             story_adapter = StoryAdapter(job)  # Initialize once
             
+            # Start narration audio as soon as each scene's text is known
+            self.audio_service.set_voice(story_adapter.persona.voice_id)
+            tts = SpeculativeTTS(self.audio_service, prefix=job_id[:8])
+            notify_scene = self._scene_streamer(job_id)
+            generation = 0
+            
+            def on_scene(scene: Scene):
+                notify_scene(scene, generation)
+                tts.submit(scene)
+            
             while retry_count <= max_retries:
                 # 2. Generate/Regenerate story
                 if retry_count == 0:
                     job_logger.step(1, 6, "Generating intelligent story...")
-                    story = story_adapter.generate_story(use_hook_engine=True)
+                    with profiler.span("story"):
+                        story = story_adapter.generate_story(
+                            use_hook_engine=True, on_scene=on_scene
+                        )
                 else:
                     target = self.critic.get_retry_target(score) if 'score' in locals() else None
                     job_logger.warning(f"Retry {retry_count}: Targeting {target or 'full story'}...")
                     
-                    if target == "hook_only":
-                        story = story_adapter.regenerate_hook_only(story)
-                    elif target == "ending_only":
-                        story = story_adapter.regenerate_ending_only(story)
-                    else:
-                        story = story_adapter.generate_story(use_hook_engine=True)
+                    with profiler.span("story_retry", target=target or "full"):
+                        if target == "hook_only":
+                            story = story_adapter.regenerate_hook_only(story)
+                        elif target == "ending_only":
+                            story = story_adapter.regenerate_ending_only(story)
+                        else:
+                            # Scenes streamed from here on replace the earlier attempt's
+                            generation += 1
+                            story = story_adapter.generate_story(
+                                use_hook_engine=True, on_scene=on_scene
+                            )
+                
+                # Cancel audio for replaced scenes, start any new narration
+                tts.retain(story.scenes)
+                tts.submit_all(story.scenes)
 
                 # 3. Validate shorts rules
                 job_logger.step(2, 6, "Validating shorts rules...")
-                is_valid, messages = self.validator.validate_all(story.scenes)
-                for msg in messages:
-                    job_logger.info(msg)
-                
-                if not is_valid:
-                    story.scenes[0] = self.validator.fix_hook(story.scenes[0])
-                    story.scenes = self.validator.fix_duration(story.scenes, job.duration)
+                with profiler.span("validate"):
+                    is_valid, messages = self.validator.validate_all(story.scenes)
+                    for msg in messages:
+                        job_logger.info(msg)
+                    
+                    if not is_valid:
+                        story.scenes[0] = self.validator.fix_hook(story.scenes[0])
+                        story.scenes = self.validator.fix_duration(story.scenes, job.duration)
                 
                 # 4. Score with critic (Week 2 Enhanced)
                 job_logger.step(3, 6, "Scoring content (Week 2)...")
                 
                 # Pass expected curve ID for alignment check
                 curve_id = story_adapter.emotion_curve.id
-                score = self.critic.score_content(story, job.platform, expected_curve_id=curve_id)
+                with profiler.span("critic"):
+                    score = self.critic.score_content(story, job.platform, expected_curve_id=curve_id)
                 
                 self.save_critic_score(job_id, score, job.platform)
                 self.update_job_scores(job_id, {
@@ -271,24 +346,26 @@ class OrchestratorService:
                     # Find hook scene
                     hook_scene = next((s for s in story.scenes if s.purpose == "hook"), None)
                     if hook_scene:
-                        memory.store_winning_hook(
-                            hook_text=hook_scene.narration_text,
-                            hook_type="generated",  # TODO: passthrough type
-                            score=score.hook_score,
-                            platform=job.platform,
-                            visual_prompt=hook_scene.visual_prompt
-                        )
+                        with profiler.span("memory"):
+                            memory.store_winning_hook(
+                                hook_text=hook_scene.narration_text,
+                                hook_type="generated",  # TODO: passthrough type
+                                score=score.hook_score,
+                                platform=job.platform,
+                                visual_prompt=hook_scene.visual_prompt
+                            )
                 
                 break
             
             # 6. Generate media assets
             job_logger.step(5, 6, "Generating audio & video...")
-            # Set voice based on persona
-            self.audio_service.set_voice(story_adapter.persona.voice_id)
-            self.generate_scene_assets(story.scenes, job_id)
+            with profiler.span("audio"):
+                self.generate_scene_assets(story.scenes, job_id, tts=tts)
+            job_logger.info(f"Speculative TTS: {tts.stats}")
             
             # Generate final video (Veo + Stitching)
-            video_path = self.video_service.create_shorts_video(story.scenes, job_id, style_prefix="cinematic, 4k")
+            with profiler.span("video"):
+                video_path = self.video_service.create_shorts_video(story.scenes, job_id, style_prefix="cinematic, 4k")
             self.save_video(job_id, video_path, story.total_duration)
 
             # 7. Save story and complete
@@ -296,6 +373,7 @@ class OrchestratorService:
             self.save_story(story)
             
             self.update_job_status(job_id, JobStatus.COMPLETED)
+            completed = True
             job_logger.info(f"Job completed with score {score.total_score}")
             return True
             
@@ -305,6 +383,10 @@ class OrchestratorService:
             traceback.print_exc()
             self.update_job_status(job_id, JobStatus.FAILED, str(e))
             return False
+        finally:
+            if tts is not None:
+                # Keep only the narration the saved story uses
+                tts.close(keep=story.scenes if completed else ())
     
     def close(self):
         """Close database session."""
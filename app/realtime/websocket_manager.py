@@ -2,7 +2,7 @@
 WebSocket Manager for Real-time Notifications
 Handles WebSocket connections and broadcasts events.
 """
-from typing import Dict, Set, Any
+from typing import Dict, Set, Any, Optional, Coroutine
 from dataclasses import dataclass
 from datetime import datetime
 import json
@@ -42,6 +42,10 @@ class WebSocketConnectionManager:
     def __init__(self):
         # Active connections: {user_id: set of websockets}
         self._connections: Dict[str, Set] = {}
+        # Job watchers: {job_id: set of user_ids}
+        self._job_watchers: Dict[str, Set[str]] = {}
+        # Loop the connections live on, for publishing from worker threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         logger.info("WebSocketConnectionManager initialized")
     
     async def connect(self, websocket, user_id: str):
@@ -53,6 +57,7 @@ class WebSocketConnectionManager:
             user_id: User ID
         """
         await websocket.accept()
+        self._loop = asyncio.get_running_loop()
         
         if user_id not in self._connections:
             self._connections[user_id] = set()
@@ -84,6 +89,7 @@ class WebSocketConnectionManager:
             # Remove user if no more connections
             if not self._connections[user_id]:
                 del self._connections[user_id]
+                self._unwatch_all(user_id)
         
         logger.info(f"WebSocket disconnected: user={user_id}")
     
@@ -190,6 +196,70 @@ class WebSocketConnectionManager:
             )
         )
     
+    def watch_job(self, user_id: str, job_id: str):
+        """Subscribe a user to streaming progress for a job"""
+        self._job_watchers.setdefault(job_id, set()).add(user_id)
+    
+    def unwatch_job(self, user_id: str, job_id: str):
+        """Stop streaming a job's progress to a user"""
+        watchers = self._job_watchers.get(job_id)
+        if watchers is None:
+            return
+        watchers.discard(user_id)
+        if not watchers:
+            del self._job_watchers[job_id]
+    
+    def _unwatch_all(self, user_id: str):
+        for job_id in [j for j, users in self._job_watchers.items() if user_id in users]:
+            self.unwatch_job(user_id, job_id)
+    
+    def has_job_watchers(self, job_id: str) -> bool:
+        return job_id in self._job_watchers
+    
+    async def notify_scene_ready(self, job_id: str, scene: Dict[str, Any], generation: int = 0):
+        """
+        Push a partial scene to everyone watching the job.
+        
+        generation increases each time the whole story is regenerated;
+        clients should drop scenes received for an earlier generation.
+        """
+        message = WebSocketMessage(
+            type="info",
+            message=f"Scene {scene.get('id')} ready",
+            data={
+                "job_id": job_id,
+                "event": "scene_ready",
+                "generation": generation,
+                "scene": scene
+            }
+        )
+        for user_id in list(self._job_watchers.get(job_id, ())):
+            await self.send_personal_message(user_id, message)
+    
+    def publish(self, coro: Coroutine) -> bool:
+        """
+        Schedule a notification coroutine from any thread.
+        
+        Pipeline code runs in worker threads; this hands the coroutine to the
+        loop that owns the sockets. Returns False (and drops the coroutine)
+        when no loop is available.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            coro.close()
+            return False
+        
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is loop:
+            loop.create_task(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, loop)
+        return True
+    
     def get_active_connections(self) -> int:
         """Get total active connections"""
         return sum(len(sockets) for sockets in self._connections.values())
@@ -0,0 +1,275 @@
+"""
+Artifact Catalog
+Persisted index of artifact files (path, type, size, mtime) so storage
+accounting and retention cleanup don't walk the media volume.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# (path, size_bytes, mtime)
+ArtifactRow = Tuple[str, int, float]
+
+RECONCILE_BATCH = 10000
+
+
+class ArtifactCatalog:
+    """
+    SQLite-backed artifact catalog.
+
+    Rows are indexed by (type, mtime), so "older than the retention cutoff"
+    is a range scan. Per-type count/size totals are kept in memory and
+    adjusted on every write, so storage stats never scan the table; they
+    are reloaded from SQL whenever another process has committed to the
+    database (PRAGMA data_version). Writers call record()/remove();
+    reconcile() rescans a directory with os.scandir to pick up anything
+    written or deleted behind our back.
+    """
+
+    def __init__(self, path: str = ".story_assets/artifact_catalog.db"):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._totals: Optional[Dict[str, List[int]]] = None
+        self._data_version: Optional[int] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "path TEXT PRIMARY KEY, type TEXT, size INTEGER, "
+                "mtime REAL, scan INTEGER DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_artifacts_age ON artifacts (type, mtime)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reconciliations ("
+                "type TEXT PRIMARY KEY, scan INTEGER, reconciled_at REAL, running INTEGER)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reconciliations)")}
+            if "running" not in columns:
+                self._conn.execute("ALTER TABLE reconciliations ADD COLUMN running INTEGER")
+            self._conn.commit()
+        return self._conn
+
+    def _get_totals(self) -> Dict[str, List[int]]:
+        conn = self._get_conn()
+        # data_version changes only when another connection commits
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._totals is None or version != self._data_version:
+            rows = conn.execute(
+                "SELECT type, COUNT(*), COALESCE(SUM(size), 0) FROM artifacts GROUP BY type"
+            ).fetchall()
+            self._totals = {t: [count, size] for t, count, size in rows}
+            self._data_version = version
+        return self._totals
+
+    def _adjust(self, artifact_type: str, count: int, size: int):
+        totals = self._get_totals().setdefault(artifact_type, [0, 0])
+        totals[0] += count
+        totals[1] += size
+
+    # ----- Writes -----
+
+    def record(
+        self,
+        path: str,
+        artifact_type: str,
+        size_bytes: Optional[int] = None,
+        mtime: Optional[float] = None
+    ):
+        """Add or update an artifact (size/mtime are read from disk if omitted)"""
+        if size_bytes is None or mtime is None:
+            stat = os.stat(path)
+            size_bytes = stat.st_size if size_bytes is None else size_bytes
+            mtime = stat.st_mtime if mtime is None else mtime
+
+        with self._lock:
+            conn = self._get_conn()
+            self._get_totals()  # load before changing rows
+            self._forget(conn, [path])
+            # Tag the row with the number of a reconcile in progress (in any
+            # process), so it isn't dropped as unseen when that scan ends
+            conn.execute(
+                "INSERT INTO artifacts (path, type, size, mtime, scan) VALUES (?, ?, ?, ?, "
+                "COALESCE((SELECT running FROM reconciliations WHERE type = ?), 0))",
+                (path, artifact_type, size_bytes, mtime, artifact_type)
+            )
+            conn.commit()
+            self._adjust(artifact_type, 1, size_bytes)
+
+    def remove(self, paths: Iterable[str]):
+        """Drop artifacts from the catalog"""
+        with self._lock:
+            conn = self._get_conn()
+            self._get_totals()  # load before changing rows
+            self._forget(conn, list(paths))
+            conn.commit()
+
+    def _forget(self, conn: sqlite3.Connection, paths: List[str]):
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT type, size FROM artifacts WHERE path IN ({marks})", chunk
+            ).fetchall()
+            if not rows:
+                continue
+            conn.execute(f"DELETE FROM artifacts WHERE path IN ({marks})", chunk)
+            for artifact_type, size in rows:
+                self._adjust(artifact_type, -1, -size)
+
+    # ----- Queries -----
+
+    def expired(
+        self,
+        artifact_type: str,
+        cutoff: float,
+        limit: Optional[int] = None
+    ) -> List[ArtifactRow]:
+        """Artifacts of a type last modified before cutoff, oldest first"""
+        query = (
+            "SELECT path, size, mtime FROM artifacts "
+            "WHERE type = ? AND mtime < ? ORDER BY mtime"
+        )
+        params: list = [artifact_type, cutoff]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return self._get_conn().execute(query, params).fetchall()
+
+    def totals(self) -> Dict[str, Tuple[int, int]]:
+        """(file count, total bytes) per artifact type"""
+        with self._lock:
+            return {t: (c, s) for t, (c, s) in self._get_totals().items()}
+
+    def last_reconciled(self, artifact_type: str) -> Optional[float]:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT reconciled_at FROM reconciliations WHERE type = ?", (artifact_type,)
+            ).fetchone()
+        return row[0] if row else None
+
+    # ----- Reconciliation -----
+
+    def reconcile(self, artifact_type: str, root: str) -> Dict:
+        """
+        Make the catalog match the files under root.
+
+        Every file found is upserted with the current scan number; rows of
+        this type not touched by the scan (or recorded during it) are
+        deleted afterwards. The directory walk runs outside the catalog
+        lock, which is only held to write each batch, so queries and
+        writers aren't blocked for the length of the scan.
+        """
+        started = time.time()
+        seen = 0
+
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT scan FROM reconciliations WHERE type = ?", (artifact_type,)
+            ).fetchone()
+            scan = ((row[0] or 0) if row else 0) + 1
+            conn.execute(
+                "INSERT INTO reconciliations (type, scan, running) VALUES (?, ?, ?) "
+                "ON CONFLICT(type) DO UPDATE SET running = excluded.running",
+                (artifact_type, scan - 1, scan)
+            )
+            conn.commit()
+
+        batch = []
+        for path, size, mtime in scan_files(root):
+            batch.append((path, artifact_type, size, mtime, scan))
+            if len(batch) >= RECONCILE_BATCH:
+                self._write_batch(batch)
+                seen += len(batch)
+                batch = []
+
+        with self._lock:
+            conn = self._get_conn()
+            self._upsert(conn, batch)
+            seen += len(batch)
+
+            removed = conn.execute(
+                "DELETE FROM artifacts WHERE type = ? AND scan != ?", (artifact_type, scan)
+            ).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO reconciliations (type, scan, reconciled_at, running) "
+                "VALUES (?, ?, ?, NULL)",
+                (artifact_type, scan, time.time())
+            )
+            conn.commit()
+            self._totals = None
+
+        elapsed = time.time() - started
+        logger.info(
+            f"Reconciled {artifact_type} catalog: {seen} files, "
+            f"{removed} stale rows removed ({elapsed:.2f}s)"
+        )
+        return {"type": artifact_type, "files": seen, "removed": removed, "seconds": round(elapsed, 3)}
+
+    def _write_batch(self, batch: List[tuple]):
+        with self._lock:
+            conn = self._get_conn()
+            self._upsert(conn, batch)
+            conn.commit()
+            self._totals = None
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, batch: List[tuple]):
+        if batch:
+            conn.executemany(
+                "INSERT INTO artifacts (path, type, size, mtime, scan) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET type = excluded.type, "
+                "size = excluded.size, mtime = excluded.mtime, scan = excluded.scan",
+                batch
+            )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._totals = None
+
+
+def scan_files(root: str) -> Iterable[ArtifactRow]:
+    """Yield (path, size, mtime) for every file under root using os.scandir"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            yield entry.path, stat.st_size, stat.st_mtime
+                    except OSError as e:
+                        logger.error(f"Error scanning {entry.path}: {e}")
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.error(f"Error scanning {directory}: {e}")
+
+
+# Global instance
+artifact_catalog = ArtifactCatalog()
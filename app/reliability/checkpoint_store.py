@@ -0,0 +1,139 @@
+"""
+Checkpoint Store
+SQLite-backed storage for job checkpoints, shared by every worker process
+and indexed so the recovery scan reads only jobs with in-progress stages.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CheckpointStore:
+    """
+    One row per live job: the checkpoint as JSON plus the flags the
+    recovery scan filters on. The database runs in WAL mode with
+    synchronous=NORMAL, so a save is one append to SQLite's log (durable
+    across a process crash, synced to disk at checkpoint time), and
+    concurrent workers see each other's writes without a shared in-memory
+    index.
+    """
+
+    def __init__(self, path: str = ".story_assets/checkpoints/checkpoints.db"):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "job_id TEXT PRIMARY KEY, interrupted INTEGER, recoverable INTEGER, "
+                "updated_at REAL, data TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_checkpoints_interrupted "
+                "ON checkpoints (interrupted)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    # ----- Writes -----
+
+    def put(self, job_id: str, checkpoint: Dict, interrupted: bool, recoverable: bool = True):
+        """Insert or replace a job's checkpoint"""
+        self.put_many([(job_id, checkpoint, interrupted, recoverable)])
+
+    def put_many(self, rows: Iterable[Tuple[str, Dict, bool, bool]], replace: bool = True):
+        """
+        Write (job_id, checkpoint, interrupted, recoverable) rows in one
+        transaction; with replace=False existing jobs are left untouched.
+        """
+        now = time.time()
+        values = [
+            (job_id, int(interrupted), int(recoverable), now, json.dumps(checkpoint, default=str))
+            for job_id, checkpoint, interrupted, recoverable in rows
+        ]
+        if not values:
+            return
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self._lock:
+            conn = self._get_conn()
+            conn.executemany(
+                f"{verb} INTO checkpoints (job_id, interrupted, recoverable, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                values
+            )
+            conn.commit()
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            conn = self._get_conn()
+            deleted = conn.execute("DELETE FROM checkpoints WHERE job_id = ?", (job_id,)).rowcount
+            conn.commit()
+        return deleted > 0
+
+    # ----- Reads -----
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT data FROM checkpoints WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_all(self, recoverable_only: bool = False) -> List[Dict]:
+        query = "SELECT data FROM checkpoints"
+        if recoverable_only:
+            query += " WHERE recoverable = 1"
+        with self._lock:
+            rows = self._get_conn().execute(query).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def interrupted(self) -> List[Dict]:
+        """Checkpoints with an in-progress stage (index lookup)"""
+        with self._lock:
+            rows = self._get_conn().execute(
+                "SELECT data FROM checkpoints WHERE interrupted = 1"
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._get_conn().execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def read_wal(path: str) -> Dict[str, Dict]:
+    """
+    Live checkpoints from a checkpoints.wal log written by earlier
+    versions (one JSON put/del record per line; unreadable lines skipped).
+    """
+    live: Dict[str, Dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("op") == "del":
+                live.pop(record["job_id"], None)
+            else:
+                live[record["job_id"]] = record["checkpoint"]
+    return live
@@ -11,6 +11,7 @@ import json
 import os
 
 from app.core.logging import get_logger
+from app.reliability.checkpoint_store import CheckpointStore, read_wal
 
 logger = get_logger(__name__)
 
@@ -102,6 +103,11 @@ class JobCheckpoint:
             return completed[-1]
         return None
     
+    @property
+    def is_complete(self) -> bool:
+        """Every recorded stage has completed"""
+        return bool(self.stages) and all(s.status == StageStatus.COMPLETED for s in self.stages)
+    
     def get_failed_stages(self) -> List[StageCheckpoint]:
         """Get all failed stages"""
         return [s for s in self.stages if s.status == StageStatus.FAILED]
@@ -174,6 +180,10 @@ class JobCheckpoint:
             config_snapshot=data.get("config_snapshot", {}),
             metadata=data.get("metadata", {})
         )
+        if data.get("created_at"):
+            checkpoint.created_at = datetime.fromisoformat(data["created_at"])
+        if data.get("updated_at"):
+            checkpoint.updated_at = datetime.fromisoformat(data["updated_at"])
         
         checkpoint.stages = [
             StageCheckpoint.from_dict(s) for s in data.get("stages", [])
@@ -182,16 +192,59 @@ class JobCheckpoint:
         return checkpoint
 
 
-# In-memory storage (replace with database in production)
-_checkpoints: Dict[str, JobCheckpoint] = {}
+def _is_interrupted(checkpoint: JobCheckpoint) -> bool:
+    return any(s.status == StageStatus.IN_PROGRESS for s in checkpoint.stages)
+
+
+def _row(checkpoint: JobCheckpoint) -> tuple:
+    return (
+        checkpoint.job_id, checkpoint.to_dict(),
+        _is_interrupted(checkpoint), checkpoint.is_recoverable
+    )
 
 
 class CheckpointService:
-    """Service for managing job checkpoints"""
+    """
+    Service for managing job checkpoints.
+    
+    Checkpoints live in a SQLite store shared by every worker process, so
+    a job checkpointed by one worker is visible to the others and to the
+    recovery scan, which reads only the rows flagged as interrupted.
+    A checkpoint saved with all of its stages completed is the job's last:
+    the row is deleted instead, so the store only holds live jobs.
+    Legacy per-job JSON files and checkpoints.wal logs are imported once.
+    """
     
-    def __init__(self):
+    def __init__(self, store: CheckpointStore = None):
         self.storage_path = ".story_assets/checkpoints"
         os.makedirs(self.storage_path, exist_ok=True)
+        self.store = store or CheckpointStore(os.path.join(self.storage_path, "checkpoints.db"))
+        self._import_legacy()
+    
+    def _import_legacy(self):
+        """Move checkpoints written by older versions into the store"""
+        imported = 0
+        for name in sorted(os.listdir(self.storage_path)):
+            path = os.path.join(self.storage_path, name)
+            try:
+                if name.endswith(".json"):
+                    with open(path, 'r') as f:
+                        checkpoints = [JobCheckpoint.from_dict(json.load(f))]
+                elif name.endswith(".wal"):
+                    checkpoints = [JobCheckpoint.from_dict(d) for d in read_wal(path).values()]
+                else:
+                    continue
+                # Never overwrite a newer checkpoint another worker already saved
+                self.store.put_many([_row(c) for c in checkpoints], replace=False)
+                os.remove(path)
+                imported += len(checkpoints)
+            except FileNotFoundError:
+                # Another worker imported it first
+                continue
+            except Exception as e:
+                logger.error(f"Error importing legacy checkpoint {name}: {e}")
+        if imported:
+            logger.info(f"Imported {imported} legacy checkpoints into the store")
     
     def create_checkpoint(
         self,
@@ -206,7 +259,6 @@ class CheckpointService:
             config_snapshot=config or {}
         )
         
-        _checkpoints[job_id] = checkpoint
         self._save_checkpoint(checkpoint)
         
         logger.info(f"Created checkpoint for job {job_id}")
@@ -214,47 +266,48 @@ class CheckpointService:
     
     def get_checkpoint(self, job_id: str) -> Optional[JobCheckpoint]:
         """Get checkpoint for a job"""
-        if job_id in _checkpoints:
-            return _checkpoints[job_id]
-        return self._load_checkpoint(job_id)
+        data = self.store.get(job_id)
+        return JobCheckpoint.from_dict(data) if data else None
     
     def save_checkpoint(self, checkpoint: JobCheckpoint):
-        """Save checkpoint to storage"""
+        """Save checkpoint to storage (deleting it once the job has completed)"""
+        if checkpoint.is_complete:
+            self.complete_job(checkpoint.job_id)
+            return
         checkpoint.updated_at = datetime.now()
-        _checkpoints[checkpoint.job_id] = checkpoint
         self._save_checkpoint(checkpoint)
         logger.debug(f"Saved checkpoint for job {checkpoint.job_id}")
     
+    def complete_job(self, job_id: str) -> bool:
+        """Drop a finished job's checkpoint; there is nothing left to recover"""
+        if not self.store.delete(job_id):
+            return False
+        
+        logger.info(f"Job {job_id} completed, checkpoint removed")
+        return True
+    
     def delete_checkpoint(self, job_id: str) -> bool:
         """Delete checkpoint for completed job"""
-        if job_id in _checkpoints:
-            del _checkpoints[job_id]
+        if not self.store.delete(job_id):
+            return False
         
-        path = os.path.join(self.storage_path, f"{job_id}.json")
-        if os.path.exists(path):
-            os.remove(path)
-            logger.info(f"Deleted checkpoint for job {job_id}")
-            return True
-        return False
+        logger.info(f"Deleted checkpoint for job {job_id}")
+        return True
     
     def list_checkpoints(self, recoverable_only: bool = False) -> List[JobCheckpoint]:
         """List all checkpoints"""
-        checkpoints = list(_checkpoints.values())
-        
-        if recoverable_only:
-            checkpoints = [c for c in checkpoints if c.is_recoverable]
-        
-        return checkpoints
+        return [
+            JobCheckpoint.from_dict(data)
+            for data in self.store.list_all(recoverable_only=recoverable_only)
+        ]
+    
+    def count_checkpoints(self) -> int:
+        """Number of live jobs with a checkpoint"""
+        return self.store.count()
     
     def get_interrupted_jobs(self) -> List[JobCheckpoint]:
         """Get jobs that were interrupted (in_progress stages)"""
-        interrupted = []
-        for checkpoint in _checkpoints.values():
-            for stage in checkpoint.stages:
-                if stage.status == StageStatus.IN_PROGRESS:
-                    interrupted.append(checkpoint)
-                    break
-        return interrupted
+        return [JobCheckpoint.from_dict(data) for data in self.store.interrupted()]
     
     def validate_checkpoint(self, checkpoint: JobCheckpoint) -> Dict:
         """Validate checkpoint integrity"""
@@ -283,23 +336,5 @@ class CheckpointService:
         }
     
     def _save_checkpoint(self, checkpoint: JobCheckpoint):
-        """Save to disk"""
-        path = os.path.join(self.storage_path, f"{checkpoint.job_id}.json")
-        with open(path, 'w') as f:
-            json.dump(checkpoint.to_dict(), f, indent=2)
-    
-    def _load_checkpoint(self, job_id: str) -> Optional[JobCheckpoint]:
-        """Load from disk"""
-        path = os.path.join(self.storage_path, f"{job_id}.json")
-        if not os.path.exists(path):
-            return None
-        
-        try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            checkpoint = JobCheckpoint.from_dict(data)
-            _checkpoints[job_id] = checkpoint
-            return checkpoint
-        except Exception as e:
-            logger.error(f"Error loading checkpoint {job_id}: {e}")
-            return None
+        """Write the checkpoint row"""
+        self.store.put_many([_row(checkpoint)])
@@ -9,8 +9,12 @@ from enum import Enum
 import os
 import shutil
 import json
+import threading
+import time
 
 from app.core.logging import get_logger
+from app.reliability.artifact_catalog import ArtifactCatalog, artifact_catalog
+from app.reliability.dead_letter_store import dead_letter_store
 
 logger = get_logger(__name__)
 
@@ -35,6 +39,60 @@ RETENTION_POLICIES = {
     ArtifactType.ORPHANED: 0  # Immediate
 }
 
+# Rescan a directory for untracked changes at most this often (and at
+# least once per retention period of its type, see reconcile_interval_hours)
+RECONCILE_INTERVAL_HOURS = 24
+
+# How often the background reconciler checks for directories due a rescan
+RECONCILE_TICK_SECONDS = 300
+
+ARTIFACT_BASE_PATH = ".story_assets"
+ARTIFACT_PATHS = {
+    ArtifactType.TEMP_FILES: os.path.join(ARTIFACT_BASE_PATH, "temp"),
+    ArtifactType.FAILED_JOB: os.path.join(ARTIFACT_BASE_PATH, "failed"),
+    ArtifactType.PREVIEW: os.path.join(ARTIFACT_BASE_PATH, "previews"),
+    ArtifactType.COMPLETED: os.path.join(ARTIFACT_BASE_PATH, "videos"),
+    ArtifactType.DEAD_LETTER: os.path.join(ARTIFACT_BASE_PATH, "dead_letters")
+}
+
+
+def reconcile_interval_hours(artifact_type: ArtifactType) -> float:
+    """Rescan interval for a type: never longer than its retention period"""
+    return min(RECONCILE_INTERVAL_HOURS, RETENTION_POLICIES.get(artifact_type, 24))
+
+
+def retention_cutoff(artifact_type: ArtifactType, now: float) -> float:
+    """Epoch time before which artifacts of a type are expired"""
+    return now - RETENTION_POLICIES.get(artifact_type, 24) * 3600
+
+
+def artifact_type_for(path: str) -> Optional[ArtifactType]:
+    """Artifact type of a path under one of the managed directories"""
+    normalized = os.path.normpath(path)
+    for atype, root in ARTIFACT_PATHS.items():
+        if normalized.startswith(os.path.normpath(root) + os.sep):
+            return atype
+    return None
+
+
+def record_artifact(path: str, catalog: ArtifactCatalog = None):
+    """Register a newly written artifact with the catalog (no-op outside managed dirs)"""
+    atype = artifact_type_for(path)
+    if atype is None:
+        return
+    try:
+        (catalog or artifact_catalog).record(path, atype.value)
+    except Exception as e:
+        logger.error(f"Failed to catalog artifact {path}: {e}")
+
+
+def forget_artifact(path: str, catalog: ArtifactCatalog = None):
+    """Drop a deleted artifact from the catalog"""
+    try:
+        (catalog or artifact_catalog).remove([path])
+    except Exception as e:
+        logger.error(f"Failed to uncatalog artifact {path}: {e}")
+
 
 @dataclass
 class CleanupTarget:
@@ -76,17 +134,76 @@ class CleanupResult:
 
 
 class CleanupService:
-    """Service for cleaning up artifacts"""
+    """
+    Service for cleaning up artifacts.
     
-    def __init__(self):
-        self.base_path = ".story_assets"
-        self.paths = {
-            ArtifactType.TEMP_FILES: os.path.join(self.base_path, "temp"),
-            ArtifactType.FAILED_JOB: os.path.join(self.base_path, "failed"),
-            ArtifactType.PREVIEW: os.path.join(self.base_path, "previews"),
-            ArtifactType.COMPLETED: os.path.join(self.base_path, "videos"),
-            ArtifactType.DEAD_LETTER: os.path.join(self.base_path, "dead_letters")
-        }
+    Works from the artifact catalog: targets are an mtime range query and
+    storage stats are running totals. A background thread (started on first
+    use) reconciles each directory against disk when it has never been
+    scanned or the last scan is older than its reconcile_interval_hours, so
+    requests never walk the volume. The catalog can lag behind files that
+    were rewritten without being recorded, so every target is re-stat'ed
+    right before deletion.
+    """
+    
+    def __init__(
+        self,
+        catalog: ArtifactCatalog = None,
+        reconcile_tick: float = RECONCILE_TICK_SECONDS
+    ):
+        self.base_path = ARTIFACT_BASE_PATH
+        self.paths = dict(ARTIFACT_PATHS)
+        self.catalog = catalog or artifact_catalog
+        self.reconcile_tick = reconcile_tick
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reconciler: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the background reconciler (idempotent)"""
+        with self._start_lock:
+            if self._reconciler is not None and self._reconciler.is_alive():
+                return
+            self._stop.clear()
+            self._reconciler = threading.Thread(
+                target=self._reconcile_loop, name="artifact-reconcile", daemon=True
+            )
+            self._reconciler.start()
+    
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._reconciler is not None:
+            self._reconciler.join(timeout)
+            self._reconciler = None
+    
+    def _reconcile_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.reconcile(force=False)
+            except Exception as e:
+                logger.error(f"Artifact reconcile failed: {e}")
+            self._stop.wait(self.reconcile_tick)
+    
+    def reconcile(
+        self,
+        artifact_type: Optional[ArtifactType] = None,
+        force: bool = True
+    ) -> List[Dict]:
+        """Rescan artifact directories and correct the catalog"""
+        types = [artifact_type] if artifact_type else list(self.paths)
+        results = []
+        
+        for atype in types:
+            path = self.paths.get(atype)
+            if not path:
+                continue
+            if not force:
+                last = self.catalog.last_reconciled(atype.value)
+                if last is not None and time.time() - last < reconcile_interval_hours(atype) * 3600:
+                    continue
+            results.append(self.catalog.reconcile(atype.value, path))
+        
+        return results
     
     def preview_cleanup(
         self,
@@ -136,25 +253,57 @@ class CleanupService:
         deleted = 0
         bytes_reclaimed = 0
         errors = []
+        removed_paths = []
+        cutoff = retention_cutoff(artifact_type, time.time())
         
         for target in targets:
             if dry_run:
                 deleted += 1
                 bytes_reclaimed += target.size_bytes
-            else:
-                try:
-                    if os.path.isfile(target.path):
-                        os.remove(target.path)
-                    elif os.path.isdir(target.path):
-                        shutil.rmtree(target.path)
-                    
-                    deleted += 1
-                    bytes_reclaimed += target.size_bytes
-                    logger.debug(f"Deleted: {target.path}")
-                    
-                except Exception as e:
-                    errors.append(f"{target.path}: {str(e)}")
-                    logger.error(f"Error deleting {target.path}: {e}")
+                continue
+            
+            try:
+                stat = os.stat(target.path)
+            except FileNotFoundError:
+                # Already gone; just drop the stale catalog row
+                removed_paths.append(target.path)
+                continue
+            
+            if stat.st_mtime >= cutoff:
+                # Rewritten since it was cataloged: refresh the row, keep the file
+                self.catalog.record(
+                    target.path, artifact_type.value, stat.st_size, stat.st_mtime
+                )
+                logger.debug(f"Skipped (modified since cataloged): {target.path}")
+                continue
+            
+            try:
+                if os.path.isdir(target.path):
+                    shutil.rmtree(target.path)
+                else:
+                    os.remove(target.path)
+                
+                deleted += 1
+                bytes_reclaimed += stat.st_size
+                removed_paths.append(target.path)
+                logger.debug(f"Deleted: {target.path}")
+                
+            except Exception as e:
+                errors.append(f"{target.path}: {str(e)}")
+                logger.error(f"Error deleting {target.path}: {e}")
+        
+        if removed_paths:
+            self.catalog.remove(removed_paths)
+        
+        if artifact_type == ArtifactType.DEAD_LETTER:
+            # Dead letter entries are rows in the dead letter store, not files
+            try:
+                purged, purged_bytes = dead_letter_store.purge(cutoff, dry_run)
+                deleted += purged
+                bytes_reclaimed += purged_bytes
+            except Exception as e:
+                errors.append(f"dead letter store: {str(e)}")
+                logger.error(f"Error purging dead letter store: {e}")
         
         result = CleanupResult(
             timestamp=datetime.now(),
@@ -182,31 +331,22 @@ class CleanupService:
         
         types_to_scan = [artifact_type] if artifact_type else list(ArtifactType)
         
+        self.start()
+        now = time.time()
+        
         for atype in types_to_scan:
-            path = self.paths.get(atype)
-            if not path or not os.path.exists(path):
+            if atype not in self.paths:
                 continue
             
-            retention_hours = RETENTION_POLICIES.get(atype, 24)
-            cutoff = datetime.now() - timedelta(hours=retention_hours)
+            cutoff = retention_cutoff(atype, now)
             
-            for root, dirs, files in os.walk(path):
-                for filename in files:
-                    filepath = os.path.join(root, filename)
-                    try:
-                        stat = os.stat(filepath)
-                        mtime = datetime.fromtimestamp(stat.st_mtime)
-                        
-                        if mtime < cutoff:
-                            age_hours = (datetime.now() - mtime).total_seconds() / 3600
-                            targets.append(CleanupTarget(
-                                path=filepath,
-                                artifact_type=atype,
-                                size_bytes=stat.st_size,
-                                age_hours=age_hours
-                            ))
-                    except Exception as e:
-                        logger.error(f"Error scanning {filepath}: {e}")
+            for path, size_bytes, mtime in self.catalog.expired(atype.value, cutoff):
+                targets.append(CleanupTarget(
+                    path=path,
+                    artifact_type=atype,
+                    size_bytes=size_bytes,
+                    age_hours=(now - mtime) / 3600
+                ))
         
         return targets
     
@@ -228,45 +368,23 @@ class CleanupService:
     
     def get_storage_stats(self) -> Dict:
         """Get storage usage statistics"""
+        self.start()
+        totals = self.catalog.totals()
+        
         stats = {}
         total_size = 0
         
         for atype, path in self.paths.items():
-            if os.path.exists(path):
-                size = self._get_dir_size(path)
-                stats[atype.value] = {
-                    "path": path,
-                    "size_mb": round(size / (1024 * 1024), 2),
-                    "file_count": self._count_files(path)
-                }
-                total_size += size
-            else:
-                stats[atype.value] = {
-                    "path": path,
-                    "size_mb": 0,
-                    "file_count": 0
-                }
+            file_count, size = totals.get(atype.value, (0, 0))
+            stats[atype.value] = {
+                "path": path,
+                "size_mb": round(size / (1024 * 1024), 2),
+                "file_count": file_count
+            }
+            total_size += size
         
         stats["total"] = {
             "size_mb": round(total_size / (1024 * 1024), 2)
         }
         
         return stats
-    
-    def _get_dir_size(self, path: str) -> int:
-        """Get total size of directory"""
-        total = 0
-        for root, dirs, files in os.walk(path):
-            for f in files:
-                try:
-                    total += os.path.getsize(os.path.join(root, f))
-                except:
-                    pass
-        return total
-    
-    def _count_files(self, path: str) -> int:
-        """Count files in directory"""
-        count = 0
-        for root, dirs, files in os.walk(path):
-            count += len(files)
-        return count
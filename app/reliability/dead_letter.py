@@ -2,16 +2,20 @@
 Dead Letter Queue Management
 Handles jobs that fail permanently after exhausting retries.
 """
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import uuid
 import json
 import os
+import threading
+import time
 
 from app.reliability.checkpointing import JobCheckpoint, CheckpointService
 from app.reliability.retry import RetryAttempt, FailureType
+from app.reliability.cleanup import forget_artifact
+from app.reliability.dead_letter_store import DeadLetterStore, dead_letter_store
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -70,7 +74,7 @@ class DeadLetterEntry:
     
     @classmethod
     def from_dict(cls, data: Dict) -> "DeadLetterEntry":
-        return cls(
+        entry = cls(
             id=data.get("id", str(uuid.uuid4())),
             job_id=data.get("job_id", ""),
             job_type=data.get("job_type", ""),
@@ -85,19 +89,53 @@ class DeadLetterEntry:
             resolution_status=ResolutionStatus(data.get("resolution_status", "pending_review")),
             resolution_notes=data.get("resolution_notes")
         )
+        if data.get("created_at"):
+            entry.created_at = datetime.fromisoformat(data["created_at"])
+        return entry
 
 
-# In-memory storage
-_dead_letters: Dict[str, DeadLetterEntry] = {}
+# Per-entry JSON files from older versions are imported into the store once
+_legacy_import_lock = threading.Lock()
+_legacy_imported = False
 
 
 class DeadLetterService:
-    """Service for managing dead letter queue"""
+    """
+    Service for managing dead letter queue.
+    
+    Entries live in the DeadLetterStore, indexed by job, status, failure
+    type and failure time. Listing is cursor-paginated and bulk_retry()
+    resolves entries in rate-limited batches.
+    """
     
-    def __init__(self):
+    def __init__(self, store: DeadLetterStore = None):
         self.storage_path = ".story_assets/dead_letters"
-        os.makedirs(self.storage_path, exist_ok=True)
+        self.store = store or dead_letter_store
         self.checkpoint_service = CheckpointService()
+        self._import_legacy_files()
+    
+    def _import_legacy_files(self):
+        global _legacy_imported
+        with _legacy_import_lock:
+            if _legacy_imported or not os.path.isdir(self.storage_path):
+                _legacy_imported = True
+                return
+            imported = []
+            for name in os.listdir(self.storage_path):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.storage_path, name)
+                try:
+                    with open(path, 'r') as f:
+                        self.store.put(DeadLetterEntry.from_dict(json.load(f)).to_dict())
+                    os.remove(path)
+                    forget_artifact(path)
+                    imported.append(name)
+                except Exception as e:
+                    logger.error(f"Error importing legacy dead letter {name}: {e}")
+            if imported:
+                logger.info(f"Imported {len(imported)} legacy dead letter files")
+            _legacy_imported = True
     
     def add_to_dead_letter(
         self,
@@ -119,7 +157,6 @@ class DeadLetterService:
             config_snapshot=checkpoint.config_snapshot if checkpoint else {}
         )
         
-        _dead_letters[entry.id] = entry
         self._save_entry(entry)
         
         logger.warning(f"Job {job_id} moved to dead letter queue: {final_error}")
@@ -127,39 +164,69 @@ class DeadLetterService:
     
     def get_entry(self, entry_id: str) -> Optional[DeadLetterEntry]:
         """Get a dead letter entry by ID"""
-        if entry_id in _dead_letters:
-            return _dead_letters[entry_id]
-        return self._load_entry(entry_id)
+        data = self.store.get(entry_id)
+        return DeadLetterEntry.from_dict(data) if data else None
     
     def get_by_job_id(self, job_id: str) -> Optional[DeadLetterEntry]:
-        """Get dead letter entry by original job ID"""
-        for entry in _dead_letters.values():
-            if entry.job_id == job_id:
-                return entry
-        return None
+        """Get the most recent dead letter entry for an original job ID"""
+        data = self.store.get_by_job_id(job_id)
+        return DeadLetterEntry.from_dict(data) if data else None
     
     def list_entries(
         self,
         status: Optional[ResolutionStatus] = None,
-        limit: int = 50
+        limit: int = 50,
+        failure_type: Optional[str] = None
     ) -> List[DeadLetterEntry]:
-        """List dead letter entries"""
-        entries = list(_dead_letters.values())
-        
-        if status:
-            entries = [e for e in entries if e.resolution_status == status]
-        
-        # Sort by failure time, newest first
-        entries.sort(key=lambda e: e.final_failure_at, reverse=True)
-        
-        return entries[:limit]
+        """List dead letter entries, newest failure first"""
+        entries, _ = self.list_page(status=status, failure_type=failure_type, limit=limit)
+        return entries
+    
+    def list_page(
+        self,
+        status: Optional[ResolutionStatus] = None,
+        failure_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        oldest_first: bool = False
+    ) -> Tuple[List[DeadLetterEntry], Optional[str]]:
+        """One page of entries plus the cursor for the next page (None at the end)"""
+        rows, next_cursor = self.store.page(
+            status=status.value if status else None,
+            failure_type=failure_type,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            cursor=cursor,
+            limit=limit,
+            oldest_first=oldest_first
+        )
+        return [DeadLetterEntry.from_dict(r) for r in rows], next_cursor
+    
+    def iter_entries(
+        self,
+        status: Optional[ResolutionStatus] = None,
+        failure_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = 500,
+        oldest_first: bool = False
+    ) -> Iterator[DeadLetterEntry]:
+        """Stream every matching entry, one page in memory at a time"""
+        cursor = None
+        while True:
+            entries, cursor = self.list_page(
+                status=status, failure_type=failure_type, since=since, until=until,
+                cursor=cursor, limit=page_size, oldest_first=oldest_first
+            )
+            yield from entries
+            if cursor is None:
+                return
     
     def get_pending_count(self) -> int:
         """Get count of pending review entries"""
-        return len([
-            e for e in _dead_letters.values()
-            if e.resolution_status == ResolutionStatus.PENDING_REVIEW
-        ])
+        return self.store.count(ResolutionStatus.PENDING_REVIEW.value)
     
     def retry_entry(self, entry_id: str) -> Dict:
         """Mark entry for retry and return job info"""
@@ -170,13 +237,116 @@ class DeadLetterService:
         if entry.resolution_status != ResolutionStatus.PENDING_REVIEW:
             raise ValueError(f"Entry already resolved: {entry.resolution_status.value}")
         
-        entry.resolution_status = ResolutionStatus.RETRIED
-        entry.resolved_at = datetime.now()
-        entry.resolution_notes = "Retried via admin action"
+        self._mark_retried(entry)
         self._save_entry(entry)
         
         logger.info(f"Dead letter entry {entry_id} marked for retry")
         
+        return self._job_info(entry)
+    
+    def bulk_retry(
+        self,
+        entry_ids: Optional[List[str]] = None,
+        failure_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 100,
+        max_per_second: float = 50.0,
+        enqueue: Optional[Callable[[List[Dict]], None]] = None
+    ) -> Dict:
+        """
+        Retry pending entries in batches of batch_size, at most
+        max_per_second entries per second.
+        
+        Targets are the given entry_ids, or else every pending entry
+        (optionally of one failure_type), oldest failure first. Each batch
+        is handed to enqueue() as a list of job infos and only marked
+        retried (in one store write) once enqueue returns; if it raises,
+        the batch stays pending and the run stops.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        started = time.time()
+        interval = batch_size / max_per_second if max_per_second > 0 else 0
+        retried, skipped, batches = 0, 0, 0
+        errors = []
+        
+        for batch in self._retry_batches(entry_ids, failure_type, limit, batch_size):
+            pending = [e for e in batch if e.resolution_status == ResolutionStatus.PENDING_REVIEW]
+            skipped += len(batch) - len(pending)
+            if not pending:
+                continue
+            
+            # Pace batch starts so the downstream queue sees a steady rate
+            wait = started + batches * interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            
+            try:
+                if enqueue:
+                    enqueue([self._job_info(e) for e in pending])
+            except Exception as e:
+                errors.append(str(e))
+                logger.error(f"Bulk retry stopped after {retried} entries: {e}")
+                break
+            
+            for entry in pending:
+                self._mark_retried(entry, "Retried via bulk action")
+            self.store.put_many(e.to_dict() for e in pending)
+            retried += len(pending)
+            batches += 1
+        
+        elapsed = time.time() - started
+        logger.info(f"Bulk retry: {retried} entries in {batches} batches ({elapsed:.1f}s)")
+        return {
+            "retried": retried,
+            "skipped": skipped,
+            "batches": batches,
+            "errors": errors,
+            "seconds": round(elapsed, 3)
+        }
+    
+    def _retry_batches(
+        self,
+        entry_ids: Optional[List[str]],
+        failure_type: Optional[str],
+        limit: Optional[int],
+        batch_size: int
+    ) -> Iterator[List[DeadLetterEntry]]:
+        if entry_ids is not None:
+            entry_ids = entry_ids[:limit] if limit is not None else entry_ids
+            for i in range(0, len(entry_ids), batch_size):
+                yield [
+                    DeadLetterEntry.from_dict(d)
+                    for d in self.store.get_many(entry_ids[i:i + batch_size])
+                ]
+            return
+        
+        remaining = limit
+        cursor = None
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            batch, cursor = self.list_page(
+                status=ResolutionStatus.PENDING_REVIEW,
+                failure_type=failure_type,
+                cursor=cursor,
+                limit=size,
+                oldest_first=True
+            )
+            if batch:
+                yield batch
+            if remaining is not None:
+                remaining -= len(batch)
+            if cursor is None:
+                return
+    
+    @staticmethod
+    def _mark_retried(entry: DeadLetterEntry, notes: str = "Retried via admin action"):
+        entry.resolution_status = ResolutionStatus.RETRIED
+        entry.resolved_at = datetime.now()
+        entry.resolution_notes = notes
+    
+    @staticmethod
+    def _job_info(entry: DeadLetterEntry) -> Dict:
         return {
             "job_id": entry.job_id,
             "checkpoint": entry.checkpoint,
@@ -199,42 +369,20 @@ class DeadLetterService:
     
     def get_statistics(self) -> Dict:
         """Get dead letter queue statistics"""
-        entries = list(_dead_letters.values())
-        
-        by_status = {}
-        for status in ResolutionStatus:
-            by_status[status.value] = len([e for e in entries if e.resolution_status == status])
+        status_counts = self.store.counts_by("status")
         
-        by_failure_type = {}
-        for entry in entries:
-            ft = entry.failure_type
-            by_failure_type[ft] = by_failure_type.get(ft, 0) + 1
+        by_status = {
+            status.value: status_counts.get(status.value, 0)
+            for status in ResolutionStatus
+        }
         
         return {
-            "total_entries": len(entries),
+            "total_entries": sum(status_counts.values()),
             "by_status": by_status,
-            "by_failure_type": by_failure_type,
+            "by_failure_type": self.store.counts_by("failure_type"),
             "pending_review": by_status.get("pending_review", 0)
         }
     
     def _save_entry(self, entry: DeadLetterEntry):
-        """Save entry to disk"""
-        path = os.path.join(self.storage_path, f"{entry.id}.json")
-        with open(path, 'w') as f:
-            json.dump(entry.to_dict(), f, indent=2)
-    
-    def _load_entry(self, entry_id: str) -> Optional[DeadLetterEntry]:
-        """Load entry from disk"""
-        path = os.path.join(self.storage_path, f"{entry_id}.json")
-        if not os.path.exists(path):
-            return None
-        
-        try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            entry = DeadLetterEntry.from_dict(data)
-            _dead_letters[entry.id] = entry
-            return entry
-        except Exception as e:
-            logger.error(f"Error loading dead letter {entry_id}: {e}")
-            return None
+        """Write entry to the store"""
+        self.store.put(entry.to_dict())
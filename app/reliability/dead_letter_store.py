@@ -0,0 +1,222 @@
+"""
+Dead Letter Store
+SQLite-backed storage for dead letter entries, indexed by job, status,
+failure category and time so the admin views and bulk retries don't scan
+the whole queue.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DeadLetterStore:
+    """
+    One row per entry: the indexed fields as columns plus the full entry
+    as JSON. Listing is keyset-paginated on (failed_at, id), so a page
+    costs the same at offset 0 and offset 50,000.
+    """
+
+    def __init__(self, path: str = ".story_assets/dead_letters.db"):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dead_letters ("
+                "id TEXT PRIMARY KEY, job_id TEXT, status TEXT, failure_type TEXT, "
+                "failed_at REAL, updated_at REAL, data TEXT)"
+            )
+            for name, columns in (
+                ("job", "job_id, failed_at"),
+                ("status", "status, failed_at, id"),
+                ("failure_type", "failure_type, failed_at, id"),
+                ("failed_at", "failed_at, id"),
+                ("updated_at", "updated_at"),
+            ):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_dead_letters_{name} ON dead_letters ({columns})"
+                )
+            self._conn.commit()
+        return self._conn
+
+    # ----- Writes -----
+
+    def put_many(self, entries: Iterable[Dict]):
+        """Insert or replace entries (dicts as produced by DeadLetterEntry.to_dict)"""
+        now = time.time()
+        rows = [
+            (
+                e["id"], e["job_id"], e["resolution_status"], e["failure_type"],
+                _timestamp(e["final_failure_at"]), now, json.dumps(e, default=str)
+            )
+            for e in entries
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._get_conn()
+            conn.executemany(
+                "INSERT OR REPLACE INTO dead_letters "
+                "(id, job_id, status, failure_type, failed_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+
+    def put(self, entry: Dict):
+        self.put_many([entry])
+
+    def purge(self, updated_before: float, dry_run: bool = False) -> Tuple[int, int]:
+        """Delete entries not written since updated_before; returns (count, bytes)"""
+        with self._lock:
+            conn = self._get_conn()
+            count, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM dead_letters "
+                "WHERE updated_at < ?", (updated_before,)
+            ).fetchone()
+            if count and not dry_run:
+                conn.execute("DELETE FROM dead_letters WHERE updated_at < ?", (updated_before,))
+                conn.commit()
+        return count, size
+
+    # ----- Reads -----
+
+    def get(self, entry_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT data FROM dead_letters WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, entry_ids: List[str]) -> List[Dict]:
+        """Entries for the given ids, in the given order (missing ids skipped)"""
+        found = {}
+        with self._lock:
+            conn = self._get_conn()
+            for i in range(0, len(entry_ids), 500):
+                chunk = entry_ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for entry_id, data in conn.execute(
+                    f"SELECT id, data FROM dead_letters WHERE id IN ({marks})", chunk
+                ):
+                    found[entry_id] = data
+        return [json.loads(found[i]) for i in entry_ids if i in found]
+
+    def get_by_job_id(self, job_id: str) -> Optional[Dict]:
+        """Most recent entry for a job"""
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT data FROM dead_letters WHERE job_id = ? "
+                "ORDER BY failed_at DESC LIMIT 1", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def page(
+        self,
+        status: Optional[str] = None,
+        failure_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        oldest_first: bool = False
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of entries ordered by failure time (newest first by default).
+
+        Returns the entries and the cursor for the next page, or None when
+        this was the last page.
+        """
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if failure_type:
+            clauses.append("failure_type = ?")
+            params.append(failure_type)
+        if since is not None:
+            clauses.append("failed_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("failed_at < ?")
+            params.append(until)
+        if cursor:
+            failed_at, entry_id = _decode_cursor(cursor)
+            op = ">" if oldest_first else "<"
+            clauses.append(f"(failed_at {op} ? OR (failed_at = ? AND id {op} ?))")
+            params.extend([failed_at, failed_at, entry_id])
+
+        direction = "ASC" if oldest_first else "DESC"
+        query = "SELECT failed_at, id, data FROM dead_letters"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY failed_at {direction}, id {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._get_conn().execute(query, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1][0]!r}|{rows[-1][1]}"
+        return [json.loads(data) for _, _, data in rows], next_cursor
+
+    def count(self, status: Optional[str] = None) -> int:
+        with self._lock:
+            if status:
+                row = self._get_conn().execute(
+                    "SELECT COUNT(*) FROM dead_letters WHERE status = ?", (status,)
+                ).fetchone()
+            else:
+                row = self._get_conn().execute("SELECT COUNT(*) FROM dead_letters").fetchone()
+        return row[0]
+
+    def counts_by(self, column: str) -> Dict[str, int]:
+        """Entry counts grouped by "status" or "failure_type" (index-only scan)"""
+        if column not in ("status", "failure_type"):
+            raise ValueError(f"Cannot group dead letters by {column}")
+        with self._lock:
+            rows = self._get_conn().execute(
+                f"SELECT {column}, COUNT(*) FROM dead_letters GROUP BY {column}"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        failed_at, entry_id = cursor.split("|", 1)
+        return float(failed_at), entry_id
+    except ValueError:
+        raise ValueError(f"Invalid dead letter cursor: {cursor}")
+
+
+# Global instance
+dead_letter_store = DeadLetterStore()
@@ -2,11 +2,14 @@
 Health Check System
 Monitors system components and provides health endpoints.
 """
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import os
+import threading
+import time
 import psutil
 
 from app.core.logging import get_logger
@@ -43,69 +46,230 @@ class ComponentHealth:
         return result
 
 
+@dataclass
+class ScheduledCheck:
+    """A component check with its own refresh interval and timeout"""
+    name: str
+    fn: Callable[[], ComponentHealth]
+    interval: float
+    timeout: float
+    last_result: Optional[ComponentHealth] = None
+    last_run: Optional[float] = None  # time.monotonic()
+    inflight: Optional[Future] = field(default=None, repr=False)
+    
+    def is_due(self, now: float) -> bool:
+        return self.last_run is None or now - self.last_run >= self.interval
+
+
 class HealthCheckService:
-    """Service for checking system health"""
+    """
+    Service for checking system health.
+    
+    Checks run concurrently on a thread pool, each on its own interval and
+    timeout, from a background refresher that publishes a snapshot.
+    check_all(), liveness and readiness read that snapshot (with its age
+    and a stale flag) rather than touching storage or the database on
+    every probe. A check still running from an earlier round is not
+    started again; it is reported as timed out until it returns.
+    """
+    
+    # name -> (interval seconds, timeout seconds)
+    DEFAULT_SCHEDULE = {
+        "storage": (30.0, 5.0),
+        "memory": (10.0, 2.0),
+        "disk": (60.0, 2.0),
+        "database": (15.0, 5.0),
+        "job_queue": (15.0, 5.0),
+    }
     
-    def __init__(self):
+    def __init__(
+        self,
+        schedule: Optional[Dict[str, tuple]] = None,
+        tick: float = 1.0,
+        stale_after: float = 90.0
+    ):
         self.storage_path = ".story_assets"
+        self.tick = tick
+        self.stale_after = stale_after
         self._last_check: Optional[datetime] = None
         self._last_result: Optional[Dict] = None
-    
-    def check_all(self) -> Dict:
-        """Run all health checks"""
-        start = datetime.now()
+        self._last_result_at: Optional[float] = None
         
-        components = [
-            self._check_storage(),
-            self._check_memory(),
-            self._check_disk(),
-            self._check_database(),
-            self._check_job_queue()
+        check_fns = {
+            "storage": self._check_storage,
+            "memory": self._check_memory,
+            "disk": self._check_disk,
+            "database": self._check_database,
+            "job_queue": self._check_job_queue,
+        }
+        schedule = {**self.DEFAULT_SCHEDULE, **(schedule or {})}
+        self.checks: List[ScheduledCheck] = [
+            ScheduledCheck(name, fn, *schedule[name]) for name, fn in check_fns.items()
         ]
         
-        # Determine overall status
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.checks), thread_name_prefix="health-check"
+        )
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+    
+    # ----- Refresh -----
+    
+    def refresh(self, force: bool = False) -> Dict:
+        """Run due checks (all of them if force) concurrently and publish a snapshot"""
+        with self._refresh_lock:
+            start = datetime.now()
+            now = time.monotonic()
+            
+            started = {}
+            for check in self.checks:
+                if not (force or check.is_due(now)):
+                    continue
+                if check.inflight is not None and not check.inflight.done():
+                    continue  # hung from an earlier round
+                check.inflight = self._executor.submit(check.fn)
+                started[check.name] = check
+            
+            # Each check gets its own timeout, measured from submission
+            for check in sorted(started.values(), key=lambda c: c.timeout):
+                remaining = now + check.timeout - time.monotonic()
+                if remaining > 0:
+                    wait([check.inflight], timeout=remaining)
+            
+            for check in started.values():
+                check.last_run = time.monotonic()
+                check.last_result = self._collect(check)
+            # Hung checks from earlier rounds keep reporting a timeout
+            for check in self.checks:
+                if check.name not in started and check.inflight is not None and not check.inflight.done():
+                    check.last_result = self._timed_out(check)
+            
+            components = [c.last_result for c in self.checks if c.last_result is not None]
+            duration = (datetime.now() - start).total_seconds() * 1000
+            
+            result = {
+                "status": self._overall(components).value,
+                "timestamp": datetime.now().isoformat(),
+                "duration_ms": round(duration, 2),
+                "components": [c.to_dict() for c in components]
+            }
+            
+            self._last_check = datetime.now()
+            self._last_result, self._last_result_at = result, time.monotonic()
+            return result
+    
+    def _collect(self, check: ScheduledCheck) -> ComponentHealth:
+        future = check.inflight
+        if not future.done():
+            return self._timed_out(check)
+        try:
+            return future.result()
+        except Exception as e:
+            return ComponentHealth(
+                name=check.name,
+                status=HealthStatus.UNHEALTHY,
+                message=f"Check failed: {str(e)}"
+            )
+    
+    @staticmethod
+    def _timed_out(check: ScheduledCheck) -> ComponentHealth:
+        return ComponentHealth(
+            name=check.name,
+            status=HealthStatus.UNHEALTHY,
+            message=f"Health check timed out after {check.timeout}s",
+            latency_ms=check.timeout * 1000
+        )
+    
+    @staticmethod
+    def _overall(components: List[ComponentHealth]) -> HealthStatus:
         statuses = [c.status for c in components]
         if HealthStatus.UNHEALTHY in statuses:
-            overall = HealthStatus.UNHEALTHY
-        elif HealthStatus.DEGRADED in statuses:
-            overall = HealthStatus.DEGRADED
-        else:
-            overall = HealthStatus.HEALTHY
-        
-        duration = (datetime.now() - start).total_seconds() * 1000
-        
-        result = {
-            "status": overall.value,
-            "timestamp": datetime.now().isoformat(),
-            "duration_ms": round(duration, 2),
-            "components": [c.to_dict() for c in components]
-        }
-        
-        self._last_check = datetime.now()
-        self._last_result = result
-        
-        return result
+            return HealthStatus.UNHEALTHY
+        if HealthStatus.DEGRADED in statuses:
+            return HealthStatus.DEGRADED
+        return HealthStatus.HEALTHY
+    
+    def start(self):
+        """Start the background refresher (idempotent)"""
+        with self._start_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="health-refresh", daemon=True
+            )
+            self._refresher.start()
+    
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout)
+            self._refresher = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}")
+            self._stop.wait(self.tick)
+    
+    # ----- Snapshot reads -----
+    
+    def get_snapshot(self) -> Optional[Dict]:
+        """Latest published health with its age, starting the refresher if needed"""
+        self.start()
+        result, taken_at = self._last_result, self._last_result_at
+        if result is None:
+            return None
+        age = time.monotonic() - taken_at
+        return {**result, "age_seconds": round(age, 3), "stale": age > self.stale_after}
+    
+    def check_all(self) -> Dict:
+        """Health of all components from the snapshot (checked directly until the first one)"""
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return self.refresh(force=True)
+        return snapshot
     
     def check_liveness(self) -> Dict:
         """Simple liveness probe (is the service running?)"""
+        snapshot = self.get_snapshot()
         return {
             "status": "alive",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "snapshot_age_seconds": snapshot["age_seconds"] if snapshot else None,
+            "stale": snapshot["stale"] if snapshot else None
         }
     
     def check_readiness(self) -> Dict:
         """Readiness probe (is the service ready to accept requests?)"""
-        # Check critical components only
-        storage_ok = os.path.exists(self.storage_path)
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            # First refresh still running: fall back to the cheap storage check
+            storage_ok = os.path.exists(self.storage_path)
+            return {
+                "status": "ready" if storage_ok else "not_ready",
+                "timestamp": datetime.now().isoformat(),
+                "checks": {"storage": storage_ok},
+                "snapshot_age_seconds": None,
+                "stale": None
+            }
         
-        status = "ready" if storage_ok else "not_ready"
+        # Check critical components only
+        storage = next((c for c in snapshot["components"] if c["name"] == "storage"), None)
+        storage_ok = storage is not None and storage["status"] != HealthStatus.UNHEALTHY.value
+        ready = storage_ok and not snapshot["stale"]
         
         return {
-            "status": status,
+            "status": "ready" if ready else "not_ready",
             "timestamp": datetime.now().isoformat(),
-            "checks": {
-                "storage": storage_ok
-            }
+            "checks": {"storage": storage_ok},
+            "snapshot_age_seconds": snapshot["age_seconds"],
+            "stale": snapshot["stale"]
         }
     
     def _check_storage(self) -> ComponentHealth:
@@ -231,7 +395,7 @@ class HealthCheckService:
             checkpoint_svc = CheckpointService()
             dead_letter_svc = DeadLetterService()
             
-            active_jobs = len(checkpoint_svc.list_checkpoints())
+            active_jobs = checkpoint_svc.count_checkpoints()
             pending_dead_letters = dead_letter_svc.get_pending_count()
             
             if pending_dead_letters > 10:
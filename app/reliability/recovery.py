@@ -60,8 +60,9 @@ class RecoveryService:
         
         results: List[RecoveryResult] = []
         
-        # Get all checkpoints
-        checkpoints = self.checkpoint_service.list_checkpoints()
+        # Only jobs with a stage in progress (the store's interrupted index);
+        # completed jobs have no checkpoint left to scan
+        checkpoints = self.checkpoint_service.get_interrupted_jobs()
         
         for checkpoint in checkpoints:
             result = self._recover_job(checkpoint)
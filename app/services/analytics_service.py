@@ -2,14 +2,109 @@
 Advanced Analytics Service.
 Business intelligence and data-driven decision making.
 """
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy import func, and_, or_
 import logging
+import re
+
+from app.services.cohort_engine import CohortData, cohort_cache, month_index
 
 logger = logging.getLogger(__name__)
 
 
+# Funnel stages as (label, event). Events come from the users table and
+# audited API requests (see product_events); anonymous visits and signup
+# attempts carry no user id in the audit log, so the funnel starts at signup
+# and each later stage counts only signups that reached the one before.
+FUNNEL_STAGES = [
+    ("Completed Signup", "signup_completed"),
+    ("Email Verified", "email_verified"),
+    ("Created First Video", "video_created"),
+    ("Upgraded to Pro", "subscription_upgraded"),
+]
+
+FUNNEL_WINDOW_DAYS = 30
+
+# Tracked features as (name, description, event)
+FEATURES = [
+    ("Templates", "Used video template", "template_used"),
+    ("Custom Branding", "Added custom logo/watermark", "branding_used"),
+    ("Integrations", "Connected external service", "integration_connected"),
+    ("Collaboration", "Invited team member", "team_invited"),
+    ("Scheduling", "Scheduled video publish", "video_scheduled"),
+]
+
+# Successful audited requests that count as product events, as
+# (method, path pattern, event). AuditLog.action only holds the CRUD verb.
+AUDIT_ROUTE_EVENTS = [
+    ("POST", r"/v1/shorts/generate", "video_created"),
+    ("POST", r"/v1/batch", "video_created"),
+    ("POST", r"/v1/templates/[^/]+/instantiate/(batch|project)", "template_used"),
+    ("POST", r"/api/collaboration/templates", "template_used"),
+    ("POST", r"/v1/branding/kits", "branding_used"),
+    ("POST", r"/api/collaboration/integrations/.+", "integration_connected"),
+    ("POST", r"/api/collaboration/teams/[^/]+/members", "team_invited"),
+    ("POST", r"/v1/schedules", "video_scheduled"),
+    ("POST", r"/api/collaboration/schedule", "video_scheduled"),
+]
+
+_ROUTE_PATTERNS = [
+    (method, re.compile(pattern), event) for method, pattern, event in AUDIT_ROUTE_EVENTS
+]
+
+# Derived from the users table rather than anything the user did, so they
+# never count as retention activity
+SIGNUP_EVENTS = ("signup_completed", "email_verified")
+
+# Events written directly to AuditLog.action (rather than derived from a route)
+_TRACKED_EVENTS = (
+    {event for _, event in FUNNEL_STAGES}
+    | {event for _, _, event in FEATURES}
+)
+
+
+def audit_event(method: str, path: str, status_code, action: str) -> Optional[str]:
+    """Product event for one audit row, or None if it isn't one"""
+    if action in _TRACKED_EVENTS:
+        return action
+    if not str(status_code or "").startswith("2"):
+        return None
+    path = (path or "").rstrip("/")
+    for route_method, pattern, event in _ROUTE_PATTERNS:
+        if method == route_method and pattern.fullmatch(path):
+            return event
+    return None
+
+
+def product_events(signups: Iterable[Tuple], audit_rows: Iterable[Tuple]):
+    """
+    (user_id, event, at) rows for the cohort snapshot.
+
+    signups are (user_id, created_at, email_verified) from the users
+    table; audit_rows are (user_id, method, path, status_code, action,
+    timestamp) from AuditLog. Every audited request counts as activity
+    under its action; mapped requests also yield their event.
+
+    The users table has no verification time (updated_at moves on any
+    profile edit), so email_verified is stamped with the signup time: it
+    only marks the funnel stage, and SIGNUP_EVENTS are kept out of
+    retention.
+    """
+    for user_id, created_at, email_verified in signups:
+        if created_at is None:
+            continue
+        yield user_id, "signup_completed", created_at
+        if email_verified:
+            yield user_id, "email_verified", created_at
+
+    for user_id, method, path, status_code, action, at in audit_rows:
+        yield user_id, action, at
+        event = audit_event(method, path, status_code, action)
+        if event and event != action:
+            yield user_id, event, at
+
+
 class AnalyticsService:
     """Comprehensive analytics for business intelligence."""
     
@@ -77,6 +172,39 @@ class AnalyticsService:
         """Count active paying subscribers."""
         return 500  # Placeholder
     
+    # Cohort snapshot
+    
+    def _load_cohort_data(self) -> CohortData:
+        """Pull signups and activity events once, as columns."""
+        from app.core.database import DBUser
+        from app.models.privacy import AuditLog
+        
+        signups = self.db.query(
+            DBUser.user_id, DBUser.created_at, DBUser.email_verified
+        ).all()
+        audit_rows = (
+            self.db.query(
+                AuditLog.user_id, AuditLog.method, AuditLog.path,
+                AuditLog.status_code, AuditLog.action, AuditLog.timestamp
+            )
+            .filter(AuditLog.user_id.isnot(None))
+            .all()
+        )
+        
+        data = CohortData.from_records(
+            [(user_id, created_at) for user_id, created_at, _ in signups],
+            product_events(signups, audit_rows)
+        )
+        logger.info(
+            f"Loaded cohort snapshot: {data.user_count} users, "
+            f"{len(data.event_user)} events"
+        )
+        return data
+    
+    def _cohort_result(self, key, compute) -> Dict:
+        """Compute from today's snapshot, cached until tomorrow."""
+        return cohort_cache.get(key, self._load_cohort_data, compute)
+    
     # Retention Cohort Analysis
     
     def get_retention_cohorts(self, months: int = 12) -> Dict:
@@ -89,50 +217,14 @@ class AnalyticsService:
         Returns:
             Cohort retention data
         """
-        cohorts = []
+        end_month = month_index(datetime.now())
         
-        end_month = datetime.now().replace(day=1)
-        
-        for i in range(months):
-            cohort_month = end_month - timedelta(days=30 * i)
-            
-            # Users who signed up in this cohort
-            cohort_users = self._get_cohort_users(cohort_month)
-            cohort_size = len(cohort_users)
-            
-            if cohort_size == 0:
-                continue
-            
-            # Calculate retention for each subsequent month
-            retention = {}
-            for month_offset in range(min(i + 1, 12)):
-                check_month = cohort_month + timedelta(days=30 * month_offset)
-                active_users = self._count_active_users_in_month(cohort_users, check_month)
-                retention[f"month_{month_offset}"] = round(active_users / cohort_size * 100, 1)
-            
-            cohorts.append({
-                "cohort_month": cohort_month.strftime("%Y-%m"),
-                "cohort_size": cohort_size,
-                "retention": retention
-            })
-        
-        return {"cohorts": cohorts}
-    
-    def _get_cohort_users(self, month: datetime) -> List[str]:
-        """Get users who signed up in a specific month."""
-        # Query users by signup month
-        # Placeholder
-        return []
-    
-    def _count_active_users_in_month(
-        self,
-        cohort_users: List[str],
-        month: datetime
-    ) -> int:
-        """Count how many cohort users were active in a specific month."""
-        # Check activity (login, video creation, etc.)
-        # Placeholder
-        return 0
+        return self._cohort_result(
+            ("retention", end_month, months),
+            lambda engine: engine.retention_cohorts(
+                end_month, months, exclude_events=SIGNUP_EVENTS
+            )
+        )
     
     # Feature Adoption
     
@@ -143,48 +235,23 @@ class AnalyticsService:
         Returns:
             Adoption rates for key features
         """
-        total_users = self._count_total_users()
-        
-        features = [
-            {
-                "name": "Templates",
-                "description": "Used video template",
-                "users_who_tried": self._count_feature_users("template_used"),
-                "adoption_rate_pct": 0
-            },
-            {
-                "name": "Custom Branding",
-                "description": "Added custom logo/watermark",
-                "users_who_tried": self._count_feature_users("branding_used"),
-                "adoption_rate_pct": 0
-            },
-            {
-                "name": "Integrations",
-                "description": "Connected external service",
-                "users_who_tried": self._count_feature_users("integration_connected"),
-                "adoption_rate_pct": 0
-            },
-            {
-                "name": "Collaboration",
-                "description": "Invited team member",
-                "users_who_tried": self._count_feature_users("team_invited"),
-                "adoption_rate_pct": 0
-            },
-            {
-                "name": "Scheduling",
-                "description": "Scheduled video publish",
-                "users_who_tried": self._count_feature_users("video_scheduled"),
-                "adoption_rate_pct": 0
-            }
-        ]
+        return self._cohort_result("feature_adoption", self._compute_feature_adoption)
+    
+    def _compute_feature_adoption(self, engine) -> Dict:
+        total_users = engine.signed_up_users()
+        counts = engine.distinct_users([event for _, _, event in FEATURES])
         
-        # Calculate adoption rates
-        for feature in features:
-            if total_users > 0:
-                feature["adoption_rate_pct"] = round(
-                    feature["users_who_tried"] / total_users * 100,
-                    1
-                )
+        features = []
+        for name, description, event in FEATURES:
+            users_who_tried = counts[event]
+            features.append({
+                "name": name,
+                "description": description,
+                "users_who_tried": users_who_tried,
+                "adoption_rate_pct": round(
+                    users_who_tried / total_users * 100, 1
+                ) if total_users > 0 else 0
+            })
         
         return {
             "total_users": total_users,
@@ -193,77 +260,27 @@ class AnalyticsService:
     
     def _count_total_users(self) -> int:
         """Count total users."""
-        # Placeholder
-        return 500
-    
-    def _count_feature_users(self, feature_event: str) -> int:
-        """Count users who used a specific feature."""
-        # Query analytics events
-        # Placeholder
-        return 0
+        return self._cohort_result(
+            "total_users", lambda engine: {"total": engine.signed_up_users()}
+        )["total"]
     
     # Conversion Funnel
     
     def get_conversion_funnel(self) -> Dict:
         """
-        Calculate conversion funnel from visitor to paid customer.
+        Calculate conversion funnel from signup to paid customer for users
+        who signed up in the last FUNNEL_WINDOW_DAYS.
         
         Returns:
             Funnel stages with conversion rates
         """
-        # Define funnel stages
-        stages = [
-            {"name": "Visited Site", "users": self._count_site_visitors()},
-            {"name": "Started Signup", "users": self._count_signup_starts()},
-            {"name": "Completed Signup", "users": self._count_signups()},
-            {"name": "Email Verified", "users": self._count_verified_users()},
-            {"name": "Created First Video", "users": self._count_activated_users()},
-            {"name": "Upgraded to Pro", "users": self._count_pro_subscriptions()}
-        ]
-        
-        # Calculate conversion rates
-        for i, stage in enumerate(stages):
-            if i == 0:
-                stage["conversion_pct"] = 100.0
-            else:
-                prev_users = stages[i-1]["users"]
-                stage["conversion_pct"] = round(
-                    (stage["users"] / prev_users * 100) if prev_users > 0 else 0,
-                    1
-                )
-            
-            # Overall conversion from beginning
-            first_stage_users = stages[0]["users"]
-            stage["overall_conversion_pct"] = round(
-                (stage["users"] / first_stage_users * 100) if first_stage_users > 0 else 0,
-                1
-            )
+        since = datetime.now() - timedelta(days=FUNNEL_WINDOW_DAYS)
+        since_ts = int(since.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
         
-        return {"stages": stages}
-    
-    def _count_site_visitors(self) -> int:
-        """Count site visitors (last 30 days)."""
-        return 10000  # Placeholder
-    
-    def _count_signup_starts(self) -> int:
-        """Count signup starts."""
-        return 2000  # Placeholder
-    
-    def _count_signups(self) -> int:
-        """Count completed signups."""
-        return 1500  # Placeholder
-    
-    def _count_verified_users(self) -> int:
-        """Count email verified users."""
-        return 1200  # Placeholder
-    
-    def _count_activated_users(self) -> int:
-        """Count users who created first video."""
-        return 600  # Placeholder
-    
-    def _count_pro_subscriptions(self) -> int:
-        """Count Pro subscriptions."""
-        return 150  # Placeholder
+        return self._cohort_result(
+            ("funnel", since_ts),
+            lambda engine: engine.funnel(FUNNEL_STAGES, since_ts)
+        )
     
     # LTV (Lifetime Value) Metrics
     
@@ -10,6 +10,7 @@ import uuid
 from app.core.video_formats import Platform, get_format
 from app.services.video_processor import FormatAwareVideoProcessor
 from app.core.logging import get_logger
+from app.reliability.cleanup import record_artifact
 
 logger = get_logger(__name__)
 
@@ -118,6 +119,7 @@ class MultiPlatformBatchProcessor:
         
         # Get file size
         file_size = os.path.getsize(output_path)
+        record_artifact(output_path)
         
         return {
             "success": True,
@@ -0,0 +1,289 @@
+"""
+Cohort Engine.
+Columnar retention, funnel and feature-adoption computation over one
+snapshot of signup and activity events.
+"""
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+import threading
+
+import numpy as np
+
+
+def month_index(moment: datetime) -> int:
+    """Calendar month as a single integer (year * 12 + month - 1)."""
+    return moment.year * 12 + moment.month - 1
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class CohortData:
+    """
+    Signups and activity events as parallel NumPy columns.
+
+    Users are dense integer ids. ``signup_month`` is -1 for users seen only
+    in events (e.g. visitors who never signed up). Event names are interned
+    to small integer codes.
+    """
+
+    def __init__(
+        self,
+        signup_month: np.ndarray,
+        event_user: np.ndarray,
+        event_code: np.ndarray,
+        event_month: np.ndarray,
+        event_ts: np.ndarray,
+        event_names: List[str]
+    ):
+        self.signup_month = signup_month
+        self.event_user = event_user
+        self.event_code = event_code
+        self.event_month = event_month
+        self.event_ts = event_ts
+        self.event_names = event_names
+        self.event_codes = {name: i for i, name in enumerate(event_names)}
+
+    @property
+    def user_count(self) -> int:
+        return len(self.signup_month)
+
+    @classmethod
+    def from_records(
+        cls,
+        signups: Iterable[Tuple[str, datetime]],
+        events: Iterable[Tuple[str, str, datetime]]
+    ) -> "CohortData":
+        """Build columns from (user_id, signed_up_at) and (user_id, event, at) rows."""
+        users: Dict[str, int] = {}
+        signup_month: List[int] = []
+
+        for user_id, signed_up_at in signups:
+            if user_id in users or signed_up_at is None:
+                continue
+            users[user_id] = len(signup_month)
+            signup_month.append(month_index(signed_up_at))
+
+        codes: Dict[str, int] = {}
+        event_user: List[int] = []
+        event_code: List[int] = []
+        event_month: List[int] = []
+        event_ts: List[int] = []
+
+        for user_id, name, at in events:
+            if user_id is None or at is None:
+                continue
+            idx = users.get(user_id)
+            if idx is None:
+                idx = users[user_id] = len(signup_month)
+                signup_month.append(-1)
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = len(codes)
+            event_user.append(idx)
+            event_code.append(code)
+            event_month.append(month_index(at))
+            event_ts.append(int(at.timestamp()))
+
+        return cls(
+            signup_month=np.asarray(signup_month, dtype=np.int32),
+            event_user=np.asarray(event_user, dtype=np.int32),
+            event_code=np.asarray(event_code, dtype=np.int16),
+            event_month=np.asarray(event_month, dtype=np.int32),
+            event_ts=np.asarray(event_ts, dtype=np.int64),
+            event_names=list(codes)
+        )
+
+
+class CohortEngine:
+    """Vectorized group-bys over a CohortData snapshot."""
+
+    def __init__(self, data: CohortData):
+        self.data = data
+
+    def retention_matrix(
+        self,
+        end_month: int,
+        months: int,
+        max_offset: int = 12,
+        exclude_events: Iterable[str] = ()
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retention counts for the cohorts end_month - months + 1 .. end_month.
+
+        Events named in exclude_events (e.g. ones derived from the signup
+        itself) don't count as activity.
+
+        Returns:
+            (sizes[months], active[months, max_offset]) where active[c, k] is
+            the number of distinct users of cohort c active in month c + k.
+        """
+        d = self.data
+        first = end_month - months + 1
+
+        signup = d.signup_month
+        in_range = (signup >= first) & (signup <= end_month)
+        sizes = np.bincount(signup[in_range] - first, minlength=months)
+
+        cohort = signup[d.event_user]
+        offset = d.event_month - cohort
+        mask = (
+            (cohort >= first) & (cohort <= end_month)
+            & (offset >= 0) & (offset < max_offset)
+            & (d.event_month <= end_month)
+        )
+        excluded = [d.event_codes[e] for e in exclude_events if e in d.event_codes]
+        if excluded:
+            mask &= ~np.isin(d.event_code, excluded)
+
+        # One hit per (user, month offset)
+        keys = np.unique(d.event_user[mask].astype(np.int64) * max_offset + offset[mask])
+        users = keys // max_offset
+        offsets = keys % max_offset
+        cells = (signup[users] - first).astype(np.int64) * max_offset + offsets
+        active = np.bincount(cells, minlength=months * max_offset).reshape(months, max_offset)
+
+        return sizes, active
+
+    def retention_cohorts(
+        self,
+        end_month: int,
+        months: int = 12,
+        max_offset: int = 12,
+        exclude_events: Iterable[str] = ()
+    ) -> Dict:
+        """Cohorts newest first, each with retention for the months elapsed so far."""
+        sizes, active = self.retention_matrix(end_month, months, max_offset, exclude_events)
+        first = end_month - months + 1
+
+        cohorts = []
+        for i in range(months):
+            c = end_month - i - first
+            size = int(sizes[c])
+            if size == 0:
+                continue
+
+            retention = {
+                f"month_{k}": round(int(active[c, k]) / size * 100, 1)
+                for k in range(min(i + 1, max_offset))
+            }
+            cohorts.append({
+                "cohort_month": month_label(first + c),
+                "cohort_size": size,
+                "retention": retention
+            })
+
+        return {"cohorts": cohorts}
+
+    def distinct_users(self, events: List[str], since_ts: Optional[int] = None) -> Dict[str, int]:
+        """Number of distinct users with each event (optionally since a timestamp)."""
+        d = self.data
+        wanted = [d.event_codes[e] for e in events if e in d.event_codes]
+        counts = {e: 0 for e in events}
+        if not wanted or not len(d.event_code):
+            return counts
+
+        mask = np.isin(d.event_code, wanted)
+        if since_ts is not None:
+            mask &= d.event_ts >= since_ts
+
+        n_codes = len(d.event_names)
+        keys = np.unique(d.event_user[mask].astype(np.int64) * n_codes + d.event_code[mask])
+        per_code = np.bincount(keys % n_codes, minlength=n_codes)
+
+        for e in events:
+            code = d.event_codes.get(e)
+            if code is not None:
+                counts[e] = int(per_code[code])
+        return counts
+
+    def signed_up_users(self) -> int:
+        return int(np.count_nonzero(self.data.signup_month >= 0))
+
+    def users_with(self, event: str, since_ts: Optional[int] = None) -> np.ndarray:
+        """Boolean mask over users who have the event (optionally since a timestamp)."""
+        d = self.data
+        reached = np.zeros(d.user_count, dtype=bool)
+        code = d.event_codes.get(event)
+        if code is None:
+            return reached
+        mask = d.event_code == code
+        if since_ts is not None:
+            mask &= d.event_ts >= since_ts
+        reached[d.event_user[mask]] = True
+        return reached
+
+    def funnel(self, stages: List[Tuple[str, str]], since_ts: Optional[int] = None) -> Dict:
+        """
+        Nested funnel over (label, event) stages with step and overall
+        conversion: the first stage's users (since since_ts) form the
+        cohort, and each later stage counts only users who also reached
+        every earlier stage.
+        """
+        result = []
+        reached = None
+        for i, (label, event) in enumerate(stages):
+            stage_users = self.users_with(event, since_ts)
+            reached = stage_users if reached is None else reached & stage_users
+            users = int(np.count_nonzero(reached))
+            stage = {"name": label, "users": users}
+            if i == 0:
+                stage["conversion_pct"] = 100.0
+            else:
+                prev_users = result[i - 1]["users"]
+                stage["conversion_pct"] = round(
+                    (users / prev_users * 100) if prev_users > 0 else 0,
+                    1
+                )
+            first_stage_users = result[0]["users"] if result else users
+            stage["overall_conversion_pct"] = round(
+                (users / first_stage_users * 100) if first_stage_users > 0 else 0,
+                1
+            )
+            result.append(stage)
+
+        return {"stages": result}
+
+
+class CohortCache:
+    """
+    One snapshot and its computed results per calendar day.
+
+    The first request of a day loads the snapshot; later requests that day
+    reuse it and any result already computed from it.
+    """
+
+    def __init__(self):
+        self._day: Optional[date] = None
+        self._engine: Optional[CohortEngine] = None
+        self._results: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        load: Callable[[], CohortData],
+        compute: Callable[[CohortEngine], Dict],
+        today: Optional[date] = None
+    ) -> Dict:
+        today = today or date.today()
+        with self._lock:
+            if self._day != today or self._engine is None:
+                self._engine = CohortEngine(load())
+                self._results = {}
+                self._day = today
+
+            if key not in self._results:
+                self._results[key] = compute(self._engine)
+            return self._results[key]
+
+    def clear(self):
+        with self._lock:
+            self._day = None
+            self._engine = None
+            self._results = {}
+
+
+# Shared across AnalyticsService instances (they're created per DB session)
+cohort_cache = CohortCache()
@@ -2,8 +2,10 @@
 Internationalization (i18n) System.
 Multi-language support for global expansion.
 """
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 from enum import Enum
+from functools import lru_cache
+from string import Formatter
 import json
 import logging
 
@@ -319,11 +321,142 @@ TRANSLATIONS = {
 }
 
 
+# Distinct Accept-Language header values remembered by negotiate_language
+NEGOTIATION_CACHE_SIZE = 1024
+
+_formatter = Formatter()
+
+
+class CompiledMessage:
+    """
+    A translation parsed once at load.
+    
+    Static messages keep their rendered text; parameterized ones keep the
+    (literal, field, format_spec) pieces so rendering is a join instead
+    of re-parsing the template on every call. Fields using attribute or
+    index access or a conversion fall back to str.format.
+    """
+    
+    __slots__ = ("text", "static", "rendered", "_pieces", "_simple")
+    
+    def __init__(self, text: str):
+        self.text = text
+        pieces = []
+        simple = True
+        for literal, field_name, format_spec, conversion in _formatter.parse(text):
+            if field_name is not None:
+                if conversion or not field_name.isidentifier() or "{" in (format_spec or ""):
+                    simple = False
+                pieces.append((literal, field_name, format_spec or ""))
+            elif literal:
+                pieces.append((literal, None, ""))
+        self.static = all(field is None for _, field, _ in pieces)
+        # Unescaped text ("{{" -> "{"), as str.format would produce
+        self.rendered = "".join(literal for literal, _, _ in pieces) if self.static else None
+        self._pieces = tuple(pieces)
+        self._simple = simple
+    
+    def render(self, params: Dict) -> str:
+        """Interpolate params (raises KeyError for a missing one)"""
+        if self.static:
+            return self.rendered
+        if not self._simple:
+            return self.text.format(**params)
+        out = []
+        for literal, field, spec in self._pieces:
+            out.append(literal)
+            if field is not None:
+                value = params[field]
+                out.append(format(value, spec) if spec else str(value))
+        return "".join(out)
+
+
+def compile_catalogs(translations: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, CompiledMessage]]:
+    """Parse every message of every language into a CompiledMessage"""
+    return {
+        language: {key: CompiledMessage(text) for key, text in messages.items()}
+        for language, messages in translations.items()
+    }
+
+
+_SUPPORTED = {lang.value.lower(): lang.value for lang in Language}
+_SUPPORTED_BASE = {}
+for _code in _SUPPORTED.values():
+    _SUPPORTED_BASE.setdefault(_code.split("-")[0].lower(), _code)
+
+
+@lru_cache(maxsize=NEGOTIATION_CACHE_SIZE)
+def negotiate_language(accept_language_header: str, default: str = "en") -> str:
+    """
+    Pick a supported language for an Accept-Language header value.
+    
+    Tags are tried in descending q order (header order breaks ties); an
+    exact supported tag wins, otherwise the base language is matched
+    ("fr-CA" -> "fr", "zh-TW" -> "zh-CN"). q=0 means "not acceptable".
+    Results are cached per distinct header value.
+    """
+    if not accept_language_header:
+        return default
+    
+    languages = []
+    for lang_part in accept_language_header.split(','):
+        parts = lang_part.strip().split(';')
+        tag = parts[0].strip().lower()
+        if not tag:
+            continue
+        
+        # Get quality value (default 1.0)
+        quality = 1.0
+        for param in parts[1:]:
+            param = param.strip()
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 1.0
+        if quality <= 0:
+            continue
+        
+        languages.append((tag, quality))
+    
+    # Sort by quality (stable, so header order breaks ties)
+    languages.sort(key=lambda x: x[1], reverse=True)
+    
+    for tag, _ in languages:
+        if tag in _SUPPORTED:
+            return _SUPPORTED[tag]
+        base = tag.split('-')[0]
+        if base in _SUPPORTED_BASE:
+            return _SUPPORTED_BASE[base]
+    
+    return default
+
+
+_default_catalogs: Optional[Dict[str, Dict[str, CompiledMessage]]] = None
+
+
+def _get_default_catalogs() -> Dict[str, Dict[str, CompiledMessage]]:
+    global _default_catalogs
+    if _default_catalogs is None:
+        _default_catalogs = compile_catalogs(TRANSLATIONS)
+    return _default_catalogs
+
+
 class I18nService:
-    """Handle internationalization and localization."""
+    """
+    Handle internationalization and localization.
+    
+    Catalogs are compiled once (the built-in ones are shared by every
+    instance), so translate() is two dict lookups plus, for messages with
+    parameters, a join over pre-parsed pieces.
+    """
     
-    def __init__(self):
-        self.translations = TRANSLATIONS
+    def __init__(self, translations: Optional[Dict[str, Dict[str, str]]] = None):
+        self.translations = translations if translations is not None else TRANSLATIONS
+        self.catalogs = (
+            compile_catalogs(translations) if translations is not None
+            else _get_default_catalogs()
+        )
         self.default_language = Language.ENGLISH.value
     
     def translate(
@@ -343,25 +476,63 @@ class I18nService:
         Returns:
             Translated string
         """
-        # Get language dictionary (fallback to English)
-        lang_dict = self.translations.get(language, self.translations[self.default_language])
+        # Get language catalog (fallback to English)
+        catalog = self.catalogs.get(language)
+        if catalog is None:
+            catalog = self.catalogs[self.default_language]
         
         # Get translation (fallback to key if not found)
-        translation = lang_dict.get(key, key)
+        message = catalog.get(key)
+        if message is None:
+            return key
         
-        # Interpolate parameters
-        if params:
-            try:
-                translation = translation.format(**params)
-            except KeyError as e:
-                logger.warning(f"Missing parameter in translation: {e}")
+        if not params:
+            return message.text
         
-        return translation
+        # Interpolate parameters
+        try:
+            return message.render(params)
+        except KeyError as e:
+            logger.warning(f"Missing parameter in translation: {e}")
+            return message.text
     
     def t(self, key: str, language: str = "en", **params) -> str:
         """Shorthand for translate."""
         return self.translate(key, language, params if params else None)
     
+    def translate_many(
+        self,
+        keys: Iterable[str],
+        language: str = "en",
+        params: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, str]:
+        """
+        Translate every key a page needs in one call.
+        
+        Args:
+            keys: Translation keys
+            language: Target language code
+            params: Optional interpolation parameters per key
+            
+        Returns:
+            Translated strings by key
+        """
+        catalog = self.catalogs.get(language)
+        if catalog is None:
+            catalog = self.catalogs[self.default_language]
+        params = params or {}
+        
+        result = {}
+        for key in keys:
+            message = catalog.get(key)
+            if message is None:
+                result[key] = key
+            elif key in params:
+                result[key] = self.translate(key, language, params[key])
+            else:
+                result[key] = message.text
+        return result
+    
     def get_supported_languages(self) -> List[Dict]:
         """Get list of supported languages."""
         return [
@@ -413,44 +584,17 @@ class I18nService:
         Returns:
             Detected language code
         """
-        # Parse Accept-Language header
-        # Format: "en-US,en;q=0.9,es;q=0.8"
-        
-        if not accept_language_header:
-            return self.default_language
-        
-        # Extract language codes
-        languages = []
-        for lang_part in accept_language_header.split(','):
-            parts = lang_part.strip().split(';')
-            lang_code = parts[0].split('-')[0]  # Get base language
-            
-            # Get quality value (default 1.0)
-            quality = 1.0
-            if len(parts) > 1 and parts[1].startswith('q='):
-                try:
-                    quality = float(parts[1][2:])
-                except ValueError:
-                    quality = 1.0
-            
-            languages.append((lang_code, quality))
-        
-        # Sort by quality
-        languages.sort(key=lambda x: x[1], reverse=True)
-        
-        # Find first supported language
-        for lang_code, _ in languages:
-            if lang_code in [l.value for l in Language]:
-                return lang_code
-        
-        return self.default_language
+        # Format: "en-US,en;q=0.9,es;q=0.8"; negotiated once per distinct value
+        return negotiate_language(accept_language_header or "", self.default_language)
+
+
+# Global instance
+i18n_service = I18nService()
 
 
 # Usage examples
 """
-from app.services.i18n_service import I18nService
-
-i18n = I18nService()
+from app.services.i18n_service import i18n_service as i18n
 
 # Simple translation
 welcome_en = i18n.translate("welcome", "en")
@@ -470,18 +614,23 @@ msg = i18n.t("video_published", "de", platform="YouTube")
 # Detect from header
 lang = i18n.detect_language("fr-FR,fr;q=0.9,en;q=0.8")
 # "fr"
+
+# Everything a page needs in one call
+strings = i18n.translate_many(
+    ["dashboard", "total_videos", "videos_created_count"], "es",
+    params={"videos_created_count": {"count": 3}}
+)
 """
 
 
 # FastAPI integration
 """
 from fastapi import Request, Depends
-from app.services.i18n_service import I18nService
+from app.services.i18n_service import i18n_service as i18n
 
 def get_user_language(request: Request) -> str:
     '''Get user's preferred language.'''
-    i18n = I18nService()
-    
+
     # Check user preference (from database)
     # user_lang = db.get_user_preference(user_id, "language")
     
@@ -491,10 +640,5 @@ def get_user_language(request: Request) -> str:
 
 @router.get("/")
 async def index(lang: str = Depends(get_user_language)):
-    i18n = I18nService()
-    
-    return {
-        "message": i18n.t("welcome", lang),
-        "cta": i18n.t("create_video", lang)
-    }
+    return i18n.translate_many(["welcome", "create_video"], lang)
 """
@@ -42,6 +42,23 @@ class Permission(str, Enum):
     WEBHOOK_MANAGE = "webhook.manage"
 
 
+# Each permission interned to one bit, in declaration order
+PERMISSION_BITS: Dict[str, int] = {p.value: 1 << i for i, p in enumerate(Permission)}
+
+
+def permission_mask(permissions: List[str]) -> int:
+    """Compile permission strings to a bitmask (unknown names contribute nothing)"""
+    mask = 0
+    for perm in permissions:
+        mask |= PERMISSION_BITS.get(perm, 0)
+    return mask
+
+
+def mask_to_permissions(mask: int) -> List[str]:
+    """Decode a bitmask back to sorted permission strings"""
+    return sorted(name for name, bit in PERMISSION_BITS.items() if mask & bit)
+
+
 class Role:
     """Role model with permissions."""
     
@@ -56,6 +73,7 @@ class Role:
         self.id = id
         self.name = name
         self.permissions = permissions
+        self.mask = permission_mask(permissions)
         self.organization_id = organization_id
         self.description = description
         self.is_system_role = False
@@ -83,6 +101,12 @@ class RBACService:
         self.system_roles = self._create_system_roles()
         self.custom_roles: Dict[str, Role] = {}
         self.user_roles: Dict[str, Set[str]] = {}  # user_id -> set of role_ids
+        self.role_users: Dict[str, Set[str]] = {}  # role_id -> set of user_ids
+        
+        # Effective masks: user_id -> organization filter -> mask; rebuilt lazily
+        self._user_masks: Dict[str, Dict[Optional[str], int]] = {}
+        # Decoded permission lists per distinct mask
+        self._mask_permissions: Dict[int, List[str]] = {}
     
     def _create_system_roles(self) -> Dict[str, Role]:
         """Create predefined system roles."""
@@ -193,6 +217,46 @@ class RBACService:
         
         return role.to_dict()
     
+    def update_custom_role(
+        self,
+        role_id: str,
+        permissions: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Dict:
+        """
+        Edit a custom role.
+        
+        Recompiles the role mask and drops cached masks of every user
+        holding the role.
+        """
+        role = self.custom_roles.get(role_id)
+        
+        if not role:
+            raise ValueError(f"Role not found: {role_id}")
+        
+        if permissions is not None:
+            for perm in permissions:
+                if perm not in PERMISSION_BITS:
+                    raise ValueError(f"Invalid permission: {perm}")
+            role.permissions = permissions
+            role.mask = permission_mask(permissions)
+        
+        if name is not None:
+            role.name = name
+        if description is not None:
+            role.description = description
+        
+        role.updated_at = datetime.utcnow()
+        self._save_role(role)
+        
+        for user_id in self.role_users.get(role_id, set()):
+            self._invalidate_user(user_id)
+        
+        logger.info(f"Updated custom role {role_id}")
+        
+        return role.to_dict()
+    
     def assign_role(
         self,
         user_id: str,
@@ -225,6 +289,8 @@ class RBACService:
             self.user_roles[user_id] = set()
         
         self.user_roles[user_id].add(role_id)
+        self.role_users.setdefault(role_id, set()).add(user_id)
+        self._invalidate_user(user_id)
         
         # Save assignment
         self._save_user_role(user_id, role_id, organization_id)
@@ -246,6 +312,8 @@ class RBACService:
         """Remove role from user."""
         if user_id in self.user_roles:
             self.user_roles[user_id].discard(role_id)
+            self.role_users.get(role_id, set()).discard(user_id)
+            self._invalidate_user(user_id)
             self._delete_user_role(user_id, role_id)
             
             logger.info(f"Removed role {role_id} from user {user_id}")
@@ -272,33 +340,17 @@ class RBACService:
         Returns:
             True if user has permission
         """
-        # Get user's roles
-        user_role_ids = self.user_roles.get(user_id, set())
+        bit = PERMISSION_BITS.get(permission, 0)
         
-        if not user_role_ids:
-            logger.debug(f"User {user_id} has no roles")
+        if not self._effective_mask(user_id) & bit:
+            logger.debug(f"User {user_id} does not have permission: {permission}")
             return False
         
-        # Check each role for permission
-        for role_id in user_role_ids:
-            role = self._get_role(role_id)
-            
-            if not role:
-                continue
-            
-            # Check if role has permission
-            if permission in role.permissions:
-                # If resource-specific check
-                if resource_id:
-                    # Check resource ownership/access
-                    if self._check_resource_access(user_id, resource_id, organization_id):
-                        return True
-                else:
-                    # General permission granted
-                    return True
-        
-        logger.debug(f"User {user_id} does not have permission: {permission}")
-        return False
+        # If resource-specific check
+        if resource_id:
+            return self._check_resource_access(user_id, resource_id, organization_id)
+        
+        return True
     
     def get_user_permissions(
         self,
@@ -315,24 +367,14 @@ class RBACService:
         Returns:
             List of permission strings
         """
-        user_role_ids = self.user_roles.get(user_id, set())
+        mask = self._effective_mask(user_id, organization_id)
         
-        all_permissions = set()
+        permissions = self._mask_permissions.get(mask)
+        if permissions is None:
+            permissions = mask_to_permissions(mask)
+            self._mask_permissions[mask] = permissions
         
-        for role_id in user_role_ids:
-            role = self._get_role(role_id)
-            
-            if not role:
-                continue
-            
-            # Filter by organization if specified
-            if organization_id and role.organization_id not in [organization_id, "system"]:
-                continue
-            
-            # Add role permissions
-            all_permissions.update(role.permissions)
-        
-        return sorted(list(all_permissions))
+        return list(permissions)
     
     def get_user_roles(
         self,
@@ -388,6 +430,37 @@ class RBACService:
         
         return None
     
+    def _effective_mask(
+        self,
+        user_id: str,
+        organization_id: Optional[str] = None
+    ) -> int:
+        """OR of the user's role masks, cached until their roles change"""
+        cached = self._user_masks.get(user_id)
+        mask = cached.get(organization_id) if cached else None
+        
+        if mask is None:
+            mask = 0
+            for role_id in self.user_roles.get(user_id, set()):
+                role = self._get_role(role_id)
+                
+                if not role:
+                    continue
+                
+                # Filter by organization if specified
+                if organization_id and role.organization_id not in (organization_id, "system"):
+                    continue
+                
+                mask |= role.mask
+            
+            self._user_masks.setdefault(user_id, {})[organization_id] = mask
+        
+        return mask
+    
+    def _invalidate_user(self, user_id: str):
+        """Drop cached masks for a user (all organization filters)"""
+        self._user_masks.pop(user_id, None)
+    
     def _check_resource_access(
         self,
         user_id: str,
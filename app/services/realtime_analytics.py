@@ -11,13 +11,40 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Metrics that can be streamed, mapped to the fetcher that computes them
+METRIC_FETCHERS = {
+    "active_users": "_get_active_users",
+    "video_views_live": "_get_live_video_views",
+    "revenue_today": "_get_revenue_today",
+    "api_requests_per_min": "_get_api_request_rate",
+    "system_health": "_get_system_health",
+    "videos_created_today": "_get_videos_created_today",
+    "conversion_rate": "_get_conversion_rate",
+}
+
+
 class RealtimeAnalytics:
-    """Real-time analytics with WebSocket streaming."""
+    """
+    Real-time analytics with WebSocket streaming.
+    
+    A single shared ticker computes every subscribed metric once per
+    interval, caches the snapshot and fans out to each user only the
+    metrics they subscribed to. Backend cost scales with the number of
+    metrics, not the number of subscribers.
+    """
     
-    def __init__(self, websocket_manager, analytics_service):
+    def __init__(self, websocket_manager, analytics_service, update_interval: float = 5):
         self.ws_manager = websocket_manager
         self.analytics = analytics_service
+        self.update_interval = update_interval  # seconds
         self.active_subscriptions: Dict[str, Set[str]] = {}  # user_id -> set of metric names
+        
+        # Shared snapshot state
+        self._snapshot: Dict[str, Dict] = {}
+        self._snapshot_at: Optional[datetime] = None
+        self._raw_values: Dict[str, float] = {}  # metric -> last known raw value
+        self._pushed: Set[str] = set()  # metrics refreshed by a source since last tick
+        self._ticker: Optional[asyncio.Task] = None
     
     async def subscribe_metrics(
         self,
@@ -44,18 +71,8 @@ class RealtimeAnalytics:
             Subscription ID
         """
         # Validate metrics
-        valid_metrics = [
-            "active_users",
-            "video_views_live",
-            "revenue_today",
-            "api_requests_per_min",
-            "system_health",
-            "videos_created_today",
-            "conversion_rate"
-        ]
-        
         for metric in metrics:
-            if metric not in valid_metrics:
+            if metric not in METRIC_FETCHERS:
                 raise ValueError(f"Invalid metric: {metric}")
         
         # Store subscription
@@ -64,50 +81,109 @@ class RealtimeAnalytics:
         
         self.active_subscriptions[user_id].update(metrics)
         
-        # Start streaming task
-        asyncio.create_task(self._stream_metrics(user_id))
+        # Serve the cached snapshot right away when it covers the request
+        if self._snapshot and all(m in self._snapshot for m in metrics):
+            await self._send_update(user_id, self._snapshot_at)
+        
+        self._ensure_ticker()
         
         logger.info(f"User {user_id} subscribed to {len(metrics)} metrics")
         
         return f"subscription_{user_id}"
     
-    async def _stream_metrics(self, user_id: str):
-        """Stream metrics to user via WebSocket."""
-        
-        update_interval = 5  # seconds
+    def _ensure_ticker(self):
+        """Start the shared ticker if it is not already running."""
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._run_ticker())
+    
+    async def _run_ticker(self):
+        """Refresh the shared snapshot and fan it out until nobody is subscribed."""
         
-        while user_id in self.active_subscriptions:
-            # Get subscribed metrics
-            metrics = self.active_subscriptions.get(user_id, set())
-            
-            if not metrics:
-                break
-            
-            # Fetch current values
-            data = await self._get_current_metrics(list(metrics))
-            
-            # Send via WebSocket
+        while self.active_subscriptions:
             try:
-                await self.ws_manager.send_json(
-                    user_id,
-                    {
-                        "type": "metrics_update",
-                        "data": data,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                )
+                await self.tick()
             except Exception as e:
-                logger.error(f"Failed to send metrics to {user_id}: {e}")
-                break
+                logger.error(f"Metrics tick failed: {e}")
             
             # Wait before next update
-            await asyncio.sleep(update_interval)
+            await asyncio.sleep(self.update_interval)
         
-        # Cleanup
-        if user_id in self.active_subscriptions:
-            del self.active_subscriptions[user_id]
+        logger.info("Stopped metrics ticker: no active subscriptions")
+    
+    async def tick(self):
+        """
+        Compute each subscribed metric once and push it to subscribers.
+        
+        Exposed so callers (and tests) can drive a refresh without waiting
+        for the interval.
+        """
+        wanted: Set[str] = set()
+        for metrics in self.active_subscriptions.values():
+            wanted.update(metrics)
+        
+        if not wanted:
+            return
+        
+        self._snapshot = await self._get_current_metrics(list(wanted))
+        self._snapshot_at = datetime.utcnow()
         
-        logger.info(f"Stopped streaming metrics to {user_id}")
+        user_ids = list(self.active_subscriptions)
+        results = await asyncio.gather(
+            *(self._send_update(user_id, self._snapshot_at) for user_id in user_ids),
+            return_exceptions=True
+        )
+        
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send metrics to {user_id}: {result}")
+                self.unsubscribe_metrics(user_id)
+    
+    async def _send_update(self, user_id: str, timestamp: Optional[datetime]):
+        """Send the subscribed subset of the cached snapshot to one user."""
+        metrics = self.active_subscriptions.get(user_id, set())
+        data = {m: self._snapshot[m] for m in metrics if m in self._snapshot}
+        
+        if not data:
+            return
+        
+        await self.ws_manager.send_json(
+            user_id,
+            {
+                "type": "metrics_update",
+                "data": data,
+                "timestamp": (timestamp or datetime.utcnow()).isoformat()
+            }
+        )
+    
+    # Source-driven updates
+    
+    def push_metric(self, metric: str, value: float):
+        """
+        Push a fresh value for a metric from its source.
+        
+        The next tick uses the pushed value instead of querying the fetcher.
+        """
+        if metric not in METRIC_FETCHERS:
+            raise ValueError(f"Invalid metric: {metric}")
+        
+        self._raw_values[metric] = value
+        self._pushed.add(metric)
+    
+    def push_metric_delta(self, metric: str, delta: float):
+        """
+        Apply an incremental change (e.g. +1 view) to a metric.
+        
+        Deltas only apply on top of a known value; before the first tick the
+        fetcher is authoritative and the delta is already reflected in it.
+        """
+        if metric not in METRIC_FETCHERS:
+            raise ValueError(f"Invalid metric: {metric}")
+        
+        if metric not in self._raw_values:
+            return
+        
+        self._raw_values[metric] += delta
+        self._pushed.add(metric)
     
     async def _get_current_metrics(self, metrics: List[str]) -> Dict:
         """Fetch current values for requested metrics."""
@@ -115,61 +191,43 @@ class RealtimeAnalytics:
         data = {}
         
         for metric in metrics:
-            if metric == "active_users":
-                value = await self._get_active_users()
-                data[metric] = {
-                    "value": value,
-                    "change": await self._get_metric_change("active_users", value),
-                    "trend": self._calculate_trend(value, await self._get_previous_value("active_users"))
-                }
-            
-            elif metric == "video_views_live":
-                value = await self._get_live_video_views()
-                data[metric] = {
-                    "value": value,
-                    "change": await self._get_metric_change("video_views_live", value)
-                }
-            
-            elif metric == "revenue_today":
-                value = await self._get_revenue_today()
-                data[metric] = {
-                    "value": value,
-                    "change": await self._get_metric_change("revenue_today", value),
-                    "formatted": f"${value:,.2f}"
-                }
-            
-            elif metric == "api_requests_per_min":
-                value = await self._get_api_request_rate()
-                data[metric] = {
-                    "value": value,
-                    "change": await self._get_metric_change("api_requests_per_min", value)
-                }
-            
-            elif metric == "system_health":
-                value = await self._get_system_health()
-                data[metric] = {
-                    "value": value,
-                    "status": self._health_status(value),
-                    "color": self._health_color(value)
-                }
+            if metric in self._pushed:
+                value = self._raw_values[metric]
+            else:
+                value = await getattr(self, METRIC_FETCHERS[metric])()
+                self._raw_values[metric] = value
             
-            elif metric == "videos_created_today":
-                value = await self._get_videos_created_today()
-                data[metric] = {
-                    "value": value,
-                    "change": await self._get_metric_change("videos_created_today", value)
-                }
-            
-            elif metric == "conversion_rate":
-                value = await self._get_conversion_rate()
-                data[metric] = {
-                    "value": value,
-                    "change": await self._get_metric_change("conversion_rate", value),
-                    "formatted": f"{value:.1f}%"
-                }
+            data[metric] = await self._format_metric(metric, value)
+        
+        self._pushed.difference_update(metrics)
         
         return data
     
+    async def _format_metric(self, metric: str, value: float) -> Dict:
+        """Build the payload for a single metric value."""
+        
+        if metric == "system_health":
+            return {
+                "value": value,
+                "status": self._health_status(value),
+                "color": self._health_color(value)
+            }
+        
+        previous = await self._get_previous_value(metric)
+        payload = {
+            "value": value,
+            "change": self._percent_change(value, previous)
+        }
+        
+        if metric == "active_users":
+            payload["trend"] = self._calculate_trend(value, previous)
+        elif metric == "revenue_today":
+            payload["formatted"] = f"${value:,.2f}"
+        elif metric == "conversion_rate":
+            payload["formatted"] = f"{value:.1f}%"
+        
+        return payload
+    
     # Metric fetchers
     
     async def _get_active_users(self) -> int:
@@ -219,7 +277,10 @@ class RealtimeAnalytics:
     async def _get_metric_change(self, metric: str, current_value: float) -> float:
         """Calculate change from previous value."""
         previous = await self._get_previous_value(metric)
-        
+        return self._percent_change(current_value, previous)
+    
+    def _percent_change(self, current_value: float, previous: float) -> float:
+        """Percent change between two values."""
         if previous == 0:
             return 0
         
@@ -276,11 +337,16 @@ class RealtimeAnalytics:
         if user_id in self.active_subscriptions:
             del self.active_subscriptions[user_id]
             logger.info(f"User {user_id} unsubscribed from metrics")
+        
+        if not self.active_subscriptions and self._ticker and not self._ticker.done():
+            self._ticker.cancel()
+            self._ticker = None
     
     def get_active_subscriptions(self) -> Dict:
         """Get all active subscriptions."""
         return {
             "total_users": len(self.active_subscriptions),
+            "snapshot_at": self._snapshot_at.isoformat() if self._snapshot_at else None,
             "subscriptions": {
                 user_id: list(metrics)
                 for user_id, metrics in self.active_subscriptions.items()
@@ -0,0 +1,284 @@
+"""
+Report Aggregation.
+Mergeable per-date-bucket aggregates for ReportBuilder, a cache of closed
+buckets, and chunked CSV/JSON writers for exports.
+"""
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+import csv
+import hashlib
+import io
+import json
+import threading
+
+
+# Ratio metrics are averaged when rows are combined; the rest are summed
+RATE_METRICS = {"engagement", "churn_rate"}
+
+# Distinct counts can't be added across days (a user active on two days
+# is one active user). Merging buckets keeps the largest day as a lower
+# bound; ReportBuilder recomputes them over the whole range.
+DISTINCT_METRICS = {"active_users"}
+
+EXPORT_CHUNK_ROWS = 1000
+
+
+class MetricStats:
+    """Streaming total/count/min/max for one metric."""
+
+    __slots__ = ("total", "count", "min", "max")
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.total += value
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "MetricStats"):
+        if not other.count:
+            return
+        self.total += other.total
+        self.count += other.count
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "total": self.total,
+            "average": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count
+        }
+
+
+class BucketAggregate:
+    """
+    Rows of one date bucket folded into per-dimension groups plus summary
+    stats. Aggregates merge, so a report over many buckets never holds the
+    raw rows.
+    """
+
+    def __init__(self, dimensions: List[str], metrics: List[str]):
+        self.dimensions = list(dimensions)
+        self.metrics = list(metrics)
+        self.groups: Dict[Tuple, Dict[str, List]] = {}
+        self.stats: Dict[str, MetricStats] = {m: MetricStats() for m in metrics}
+        self.row_count = 0
+
+    def add(self, row: Dict):
+        self.row_count += 1
+        key = tuple(row.get(d) for d in self.dimensions)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {m: [0, 0] for m in self.metrics}
+
+        for metric in self.metrics:
+            value = row.get(metric)
+            if value is None:
+                continue
+            cell = group[metric]
+            cell[0] += value
+            cell[1] += 1
+            self.stats[metric].add(value)
+
+    def merge(self, other: "BucketAggregate"):
+        self.row_count += other.row_count
+        for key, other_group in other.groups.items():
+            group = self.groups.get(key)
+            if group is None:
+                self.groups[key] = {m: list(c) for m, c in other_group.items()}
+                continue
+            for metric, (total, count) in other_group.items():
+                cell = group[metric]
+                if metric in DISTINCT_METRICS:
+                    if count and (not cell[1] or total > cell[0]):
+                        cell[0], cell[1] = total, count
+                    continue
+                cell[0] += total
+                cell[1] += count
+        for metric, stats in other.stats.items():
+            self.stats[metric].merge(stats)
+
+    def replace_metrics(self, other: "BucketAggregate", metrics: List[str]):
+        """Take the given metrics (values and stats) from an aggregate over the same groups."""
+        for key, other_group in other.groups.items():
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = {m: [0, 0] for m in self.metrics}
+            for metric in metrics:
+                group[metric] = list(other_group[metric])
+        for key, group in self.groups.items():
+            if key not in other.groups:
+                for metric in metrics:
+                    group[metric] = [0, 0]
+        for metric in metrics:
+            self.stats[metric] = other.stats[metric]
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """One row per group; metrics with no values are left out."""
+        for key, group in self.groups.items():
+            row = dict(zip(self.dimensions, key))
+            for metric, (total, count) in group.items():
+                if not count:
+                    continue
+                row[metric] = total / count if metric in RATE_METRICS else total
+            yield row
+
+    def rows(self) -> List[Dict]:
+        return list(self.iter_rows())
+
+    @property
+    def columns(self) -> List[str]:
+        """Every field a row can have, for export headers."""
+        return self.dimensions + self.metrics
+
+    def summary(self) -> Dict:
+        return {m: s.to_dict() for m, s in self.stats.items() if s.count}
+
+
+def parse_day(value: Union[str, date, datetime]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)[:10]).date()
+
+
+def date_buckets(start: date, end: date) -> List[date]:
+    """Daily buckets from start to end inclusive."""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def query_fingerprint(query: Dict) -> str:
+    """Identity of a report query ignoring its date bounds, for cache keys."""
+    stable = {
+        k: v for k, v in query.items()
+        if k not in ("filters", "limit", "order_by")
+    }
+    stable["filters"] = [f for f in query.get("filters", []) if f.get("field") != "date"]
+    encoded = json.dumps(stable, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class ReportBucketCache:
+    """
+    LRU of (report_id, query fingerprint, day) -> BucketAggregate.
+
+    Only closed days should be stored; the current day keeps changing.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, date], BucketAggregate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, report_id: str, fingerprint: str, day: date) -> Optional[BucketAggregate]:
+        key = (report_id, fingerprint, day)
+        with self._lock:
+            aggregate = self._entries.get(key)
+            if aggregate is not None:
+                self._entries.move_to_end(key)
+            return aggregate
+
+    def put(self, report_id: str, fingerprint: str, day: date, aggregate: BucketAggregate):
+        with self._lock:
+            self._entries[(report_id, fingerprint, day)] = aggregate
+            self._entries.move_to_end((report_id, fingerprint, day))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, report_id: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == report_id]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ----- Streaming exports -----
+
+async def _aiter(rows: Union[Iterable[Dict], AsyncIterator[Dict]]) -> AsyncIterator[Dict]:
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+async def write_csv_stream(
+    file_obj,
+    rows: Union[Iterable[Dict], AsyncIterator[Dict]],
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    fieldnames: Optional[List[str]] = None
+) -> int:
+    """
+    Write rows as CSV, flushing every chunk_rows rows. The header is
+    fieldnames (fields a row lacks are left empty), else the first row's
+    keys. Returns the number of rows written.
+    """
+    buffer = io.StringIO()
+    writer = None
+    pending = 0
+    count = 0
+
+    if fieldnames is not None:
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+
+    async for row in _aiter(rows):
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        pending += 1
+        count += 1
+        if pending >= chunk_rows:
+            file_obj.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    file_obj.write(buffer.getvalue())
+    return count
+
+
+async def write_json_stream(
+    file_obj,
+    header: Dict[str, Any],
+    rows: Union[Iterable[Dict], AsyncIterator[Dict]],
+    rows_key: str = "data",
+    chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> int:
+    """
+    Write {**header, rows_key: [...]} without building the row list,
+    serializing one row at a time. Returns the number of rows written.
+    """
+    head = json.dumps({k: v for k, v in header.items() if k != rows_key}, default=str)
+    prefix = head[:-1] + (", " if len(head) > 2 else "") + json.dumps(rows_key) + ": ["
+    file_obj.write(prefix)
+
+    parts: List[str] = []
+    count = 0
+    async for row in _aiter(rows):
+        parts.append(("" if count == 0 else ", ") + json.dumps(row, default=str))
+        count += 1
+        if len(parts) >= chunk_rows:
+            file_obj.write("".join(parts))
+            parts = []
+
+    file_obj.write("".join(parts) + "]}")
+    return count
@@ -2,18 +2,35 @@
 Custom Report Builder.
 Drag-and-drop report creation with scheduled generation and exports.
 """
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Tuple
+from datetime import date, datetime, timedelta
 from enum import Enum
+from itertools import islice
+import heapq
 import json
 import csv
 import io
 import uuid
 import logging
 
+from app.services.report_aggregation import (
+    DISTINCT_METRICS, BucketAggregate, ReportBucketCache, date_buckets, parse_day,
+    query_fingerprint, write_csv_stream, write_json_stream
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _date_filters(start: Optional[date], end: Optional[date]) -> List[Dict]:
+    """Inclusive day bounds as report filters (None means unbounded)."""
+    filters = []
+    if start is not None:
+        filters.append({"field": "date", "operator": ">=", "value": start.isoformat()})
+    if end is not None:
+        filters.append({"field": "date", "operator": "<=", "value": end.isoformat()})
+    return filters
+
+
 class ReportMetric(str, Enum):
     """Available report metrics."""
     VIEWS = "views"
@@ -53,6 +70,8 @@ class ReportBuilder:
         self.export_service = export_service
         self.scheduler = scheduler
         self.reports: Dict[str, Dict] = {}
+        # Aggregates of closed days, reused by later (scheduled) runs
+        self.bucket_cache = ReportBucketCache()
     
     def create_report(
         self,
@@ -164,48 +183,21 @@ class ReportBuilder:
         Returns:
             Report data with visualizations
         """
-        report = self.reports.get(report_id)
-        
-        if not report:
-            raise ValueError(f"Report not found: {report_id}")
+        report = self._get_report(report_id)
         
         logger.info(f"Generating report {report_id}")
         
         config = report["config"]
+        query = self._build_query(report, config)
+        aggregate, computed, cached = await self._aggregate_report(report_id, query, date_range)
         
-        # Apply date range if provided
-        filters = config.get("filters", [])
-        if date_range:
-            filters.append({
-                "field": "date",
-                "operator": ">=",
-                "value": date_range["start"]
-            })
-            filters.append({
-                "field": "date",
-                "operator": "<=",
-                "value": date_range["end"]
-            })
-        
-        # Build query
-        query = {
-            "user_id": report["user_id"],
-            "metrics": config["metrics"],
-            "dimensions": config.get("dimensions", []),
-            "filters": filters,
-            "group_by": config.get("groupBy"),
-            "order_by": config.get("orderBy"),
-            "limit": config.get("limit", 1000)
-        }
-        
-        # Execute query
-        data = await self._execute_report_query(query)
+        data = list(self._order_and_limit(aggregate.iter_rows(), query["order_by"], query["limit"]))
         
         # Generate visualizations
         charts = self._generate_charts(data, config)
         
-        # Calculate summary statistics
-        summary = self._calculate_summary(data, config["metrics"])
+        # Summary statistics over the source rows, merged across buckets
+        summary = aggregate.summary()
         
         # Update report metadata
         report["last_run"] = datetime.utcnow()
@@ -215,16 +207,251 @@ class ReportBuilder:
             "report_id": report_id,
             "name": report["name"],
             "generated_at": datetime.utcnow().isoformat(),
+            "columns": aggregate.columns,
             "data": data,
             "charts": charts,
             "summary": summary,
-            "row_count": len(data)
+            "row_count": len(data),
+            "buckets": {"computed": computed, "cached": cached}
         }
         
-        logger.info(f"Generated report {report_id} with {len(data)} rows")
+        logger.info(
+            f"Generated report {report_id} with {len(data)} rows "
+            f"({computed} buckets computed, {cached} cached)"
+        )
         
         return result
     
+    async def iter_report_rows(
+        self,
+        report_id: str,
+        date_range: Optional[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream the rows generate_report returns (merged across days, ordered
+        and limited) one at a time, without building the report around them.
+        """
+        report = self._get_report(report_id)
+        query = self._build_query(report, report["config"])
+        aggregate, _, _ = await self._aggregate_report(report_id, query, date_range)
+        
+        for row in self._order_and_limit(aggregate.iter_rows(), query["order_by"], query["limit"]):
+            yield row
+    
+    async def export_report(
+        self,
+        report_id: str,
+        format: str,
+        user_email: str,
+        date_range: Optional[Dict] = None
+    ) -> str:
+        """
+        Export a report through the export service, streaming its rows into
+        the file instead of generating the full report data first.
+        
+        Returns:
+            Download URL
+        """
+        report = self._get_report(report_id)
+        query = self._build_query(report, report["config"])
+        
+        report_data = {
+            "report_id": report_id,
+            "name": report["name"],
+            "generated_at": datetime.utcnow().isoformat(),
+            "columns": query["dimensions"] + query["metrics"],
+            "data": self.iter_report_rows(report_id, date_range)
+        }
+        return await self.export_service.export_report(report_data, format, user_email)
+    
+    def _get_report(self, report_id: str) -> Dict:
+        report = self.reports.get(report_id)
+        
+        if not report:
+            raise ValueError(f"Report not found: {report_id}")
+        
+        return report
+    
+    async def _aggregate_report(
+        self,
+        report_id: str,
+        query: Dict,
+        date_range: Optional[Dict]
+    ) -> Tuple[BucketAggregate, int, int]:
+        """
+        Fold the report's daily buckets into one aggregate.
+        
+        Returns:
+            (aggregate, buckets computed, buckets served from cache)
+        """
+        report = self.reports[report_id]
+        start, end = self._resolve_date_range(report["config"].get("filters", []), date_range)
+        
+        # Closed buckets come from cache
+        aggregate = BucketAggregate(query["dimensions"], query["metrics"])
+        computed = cached = 0
+        async for _, bucket, from_cache in self._iter_buckets(report_id, query, start, end):
+            aggregate.merge(bucket)
+            if from_cache:
+                cached += 1
+            else:
+                computed += 1
+        
+        # Distinct counts don't add up across days; count them over the whole range
+        distinct = [m for m in query["metrics"] if m in DISTINCT_METRICS]
+        if distinct and start is not None and start != end and "date" not in query["dimensions"]:
+            whole = await self._aggregate_rows(
+                dict(query, metrics=distinct), query["filters"] + _date_filters(start, end)
+            )
+            aggregate.replace_metrics(whole, distinct)
+            computed += 1
+        
+        return aggregate, computed, cached
+    
+    def _build_query(self, report: Dict, config: Dict) -> Dict:
+        """Report query without date bounds (those are applied per bucket)."""
+        return {
+            "user_id": report["user_id"],
+            "metrics": config["metrics"],
+            "dimensions": config.get("dimensions", []),
+            "filters": [f for f in config.get("filters", []) if f.get("field") != "date"],
+            "group_by": config.get("groupBy"),
+            "order_by": config.get("orderBy"),
+            "limit": config.get("limit", 1000)
+        }
+    
+    def _resolve_date_range(
+        self,
+        filters: List[Dict],
+        date_range: Optional[Dict]
+    ) -> Tuple[Optional[date], Optional[date]]:
+        """Date bounds from the explicit range, else the config's date filters."""
+        start = end = None
+        
+        for f in filters:
+            if f.get("field") != "date":
+                continue
+            # Buckets are whole days, so strict bounds move by one day
+            operator = f.get("operator")
+            if operator == ">=":
+                start = parse_day(f["value"])
+            elif operator == ">":
+                start = parse_day(f["value"]) + timedelta(days=1)
+            elif operator == "<=":
+                end = parse_day(f["value"])
+            elif operator == "<":
+                end = parse_day(f["value"]) - timedelta(days=1)
+        
+        if date_range:
+            # Both apply, as when they were ANDed filters
+            range_start = parse_day(date_range["start"])
+            range_end = parse_day(date_range["end"])
+            start = max(start, range_start) if start else range_start
+            end = min(end, range_end) if end else range_end
+        
+        if start is not None and end is None:
+            end = datetime.utcnow().date()
+        
+        return start, end
+    
+    async def _iter_buckets(
+        self,
+        report_id: str,
+        query: Dict,
+        start: Optional[date],
+        end: Optional[date]
+    ) -> AsyncIterator[Tuple[Optional[date], BucketAggregate, bool]]:
+        """
+        Yield (day, aggregate, from_cache) per daily bucket. Each run of
+        consecutive days missing from the cache is computed by one query
+        grouped by day. Without a start date the whole query (up to end, if
+        set) is one uncached bucket.
+        """
+        if start is None:
+            filters = query["filters"] + _date_filters(None, end)
+            yield None, await self._aggregate_rows(query, filters), False
+            return
+        
+        fingerprint = query_fingerprint(query)
+        today = datetime.utcnow().date()
+        
+        days = date_buckets(start, end)
+        cached = {
+            day: self.bucket_cache.get(report_id, fingerprint, day)
+            for day in days if day < today
+        }
+        runs: List[List[date]] = []
+        for day in days:
+            if cached.get(day) is not None:
+                continue
+            if runs and runs[-1][-1] == day - timedelta(days=1):
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+        fresh: Dict[date, BucketAggregate] = {}
+        for run in runs:
+            fresh.update(await self._aggregate_days(query, run[0], run[-1]))
+        
+        for day in days:
+            bucket = cached.get(day)
+            if bucket is not None:
+                yield day, bucket, True
+                continue
+            
+            bucket = fresh.get(day) or BucketAggregate(query["dimensions"], query["metrics"])
+            if day < today:
+                self.bucket_cache.put(report_id, fingerprint, day, bucket)
+            yield day, bucket, False
+    
+    async def _aggregate_days(
+        self,
+        query: Dict,
+        start: date,
+        end: date
+    ) -> Dict[date, BucketAggregate]:
+        """Run the query grouped by day over start..end, folding rows into one aggregate per day."""
+        dimensions = query["dimensions"]
+        if "date" not in dimensions:
+            dimensions = dimensions + ["date"]
+        daily = dict(query, dimensions=dimensions, filters=query["filters"] + _date_filters(start, end))
+        
+        buckets: Dict[date, BucketAggregate] = {}
+        async for row in self._iter_report_rows(daily):
+            day = parse_day(row["date"])
+            bucket = buckets.get(day)
+            if bucket is None:
+                bucket = buckets[day] = BucketAggregate(query["dimensions"], query["metrics"])
+            bucket.add(row)
+        return buckets
+    
+    async def _aggregate_rows(self, query: Dict, filters: List[Dict]) -> BucketAggregate:
+        """Run one bucket's query as a streaming aggregation."""
+        aggregate = BucketAggregate(query["dimensions"], query["metrics"])
+        async for row in self._iter_report_rows(dict(query, filters=filters)):
+            aggregate.add(row)
+        return aggregate
+    
+    async def _iter_report_rows(self, query: Dict) -> AsyncIterator[Dict]:
+        """Stream rows for a query (override to read from a DB cursor)."""
+        for row in await self._execute_report_query(query):
+            yield row
+    
+    def _order_and_limit(
+        self,
+        rows: Iterable[Dict],
+        order_by: Optional[Dict],
+        limit: Optional[int]
+    ) -> Iterable[Dict]:
+        if order_by and order_by.get("field"):
+            field = order_by["field"]
+            key = lambda row: row.get(field) or 0
+            if limit:
+                pick = heapq.nsmallest if order_by.get("direction") == "asc" else heapq.nlargest
+                return pick(limit, rows, key=key)
+            return sorted(rows, key=key, reverse=order_by.get("direction") != "asc")
+        
+        return islice(rows, limit) if limit else rows
+    
     async def _execute_report_query(self, query: Dict) -> List[Dict]:
         """Execute analytics query."""
         # Query analytics data
@@ -285,24 +512,6 @@ class ReportBuilder:
         
         return charts
     
-    def _calculate_summary(self, data: List[Dict], metrics: List[str]) -> Dict:
-        """Calculate summary statistics."""
-        summary = {}
-        
-        for metric in metrics:
-            values = [row.get(metric, 0) for row in data if metric in row]
-            
-            if values:
-                summary[metric] = {
-                    "total": sum(values),
-                    "average": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "count": len(values)
-                }
-        
-        return summary
-    
     def list_reports(self, user_id: str) -> List[Dict]:
         """List all reports for user."""
         user_reports = [
@@ -337,6 +546,7 @@ class ReportBuilder:
         
         # Delete report
         del self.reports[report_id]
+        self.bucket_cache.invalidate(report_id)
         self._delete_report(report_id)
         
         logger.info(f"Deleted report {report_id}")
@@ -409,14 +619,17 @@ class DataExportService:
         return download_url
     
     async def _export_csv(self, report_data: Dict) -> str:
-        """Export to CSV format."""
+        """
+        Export to CSV format.
+        
+        report_data["data"] may be a list or an (async) iterator such as
+        ReportBuilder.iter_report_rows; rows are written chunk by chunk
+        under report_data["columns"] when given.
+        """
         file_path = f"/tmp/report_{report_data['report_id']}.csv"
         
         with open(file_path, 'w', newline='') as f:
-            if report_data["data"]:
-                writer = csv.DictWriter(f, fieldnames=report_data["data"][0].keys())
-                writer.writeheader()
-                writer.writerows(report_data["data"])
+            await write_csv_stream(f, report_data["data"], fieldnames=report_data.get("columns"))
         
         return file_path
     
@@ -431,7 +644,7 @@ class DataExportService:
         file_path = f"/tmp/report_{report_data['report_id']}.json"
         
         with open(file_path, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+            await write_json_stream(f, report_data, report_data["data"])
         
         return file_path
     
@@ -5,13 +5,13 @@ Send events to external URLs for third-party integrations.
 from typing import List, Dict, Optional
 from datetime import datetime
 from enum import Enum
-import asyncio
-import aiohttp
-import hashlib
-import hmac
+import json
 import uuid
 import logging
 
+from app.webhooks.delivery import WebhookDeliveryEngine, OutboxRecord, delivery_engine, sign_body
+from app.webhooks.routing import SubscriptionIndex, is_pattern, pattern_matches
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,13 +35,15 @@ class Webhook:
         user_id: str,
         url: str,
         events: List[str],
-        secret: str
+        secret: str,
+        batch: bool = False
     ):
         self.id = id
         self.user_id = user_id
         self.url = url
         self.events = events
         self.secret = secret
+        self.batch = batch
         self.active = True
         self.created_at = datetime.utcnow()
         self.last_triggered: Optional[datetime] = None
@@ -54,6 +56,7 @@ class Webhook:
             "webhook_id": self.id,
             "url": self.url,
             "events": self.events,
+            "batch": self.batch,
             "active": self.active,
             "created_at": self.created_at.isoformat(),
             "last_triggered": self.last_triggered.isoformat() if self.last_triggered else None,
@@ -70,16 +73,19 @@ class Webhook:
 class WebhookService:
     """Manage webhooks and event delivery."""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[WebhookDeliveryEngine] = None):
         self.webhooks: Dict[str, Webhook] = {}
-        self.delivery_queue: List[Dict] = []
+        self._index = SubscriptionIndex()
+        self.engine = engine or delivery_engine
+        self.engine.add_listener(self._on_delivery_result)
     
     def register_webhook(
         self,
         user_id: str,
         url: str,
         events: List[str],
-        secret: Optional[str] = None
+        secret: Optional[str] = None,
+        batch: bool = False
     ) -> Dict:
         """
         Register webhook endpoint.
@@ -87,8 +93,10 @@ class WebhookService:
         Args:
             user_id: User ID
             url: Webhook URL (must be HTTPS)
-            events: List of events to subscribe to
+            events: List of events to subscribe to ("*" or prefix
+                patterns like "video.*" subscribe to a whole family)
             secret: Optional signing secret (generated if not provided)
+            batch: Opt in to several events per request (a "batch" body)
             
         Returns:
             Webhook details with secret
@@ -100,7 +108,10 @@ class WebhookService:
         # Validate events
         valid_events = [e.value for e in WebhookEvent]
         for event in events:
-            if event not in valid_events:
+            if is_pattern(event):
+                if not any(pattern_matches(event, valid) for valid in valid_events):
+                    raise ValueError(f"Invalid event pattern: {event}")
+            elif event not in valid_events:
                 raise ValueError(f"Invalid event: {event}")
         
         # Generate webhook ID and secret
@@ -113,11 +124,13 @@ class WebhookService:
             user_id=user_id,
             url=url,
             events=events,
-            secret=webhook_secret
+            secret=webhook_secret,
+            batch=batch
         )
         
         # Save webhook
         self.webhooks[webhook_id] = webhook
+        self._index.add(webhook_id, user_id, events, webhook)
         self._save_webhook(webhook)
         
         logger.info(f"Registered webhook {webhook_id} for user {user_id}")
@@ -160,93 +173,38 @@ class WebhookService:
         
         logger.info(f"Triggering {len(webhooks)} webhooks for {event_type}")
         
-        # Send to each webhook
+        # Persist to the outbox; the delivery engine sends and retries
         for webhook in webhooks:
-            # Queue delivery (async)
-            asyncio.create_task(self._deliver_webhook(webhook, event_type, data))
-    
-    async def _deliver_webhook(
-        self,
-        webhook: Webhook,
-        event_type: str,
-        data: Dict
-    ):
-        """
-        Deliver webhook to endpoint.
-        
-        Args:
-            webhook: Webhook configuration
-            event_type: Event type
-            data: Event data
-        """
-        # Build payload
-        payload = {
-            "id": str(uuid.uuid4()),
-            "event": event_type,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat(),
-            "webhook_id": webhook.id
-        }
-        
-        # Sign payload
-        signature = self._sign_payload(payload, webhook.secret)
-        
-        # Prepare headers
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "VideoCreator-Webhooks/1.0",
-            "X-Webhook-Signature": signature,
-            "X-Webhook-Event": event_type,
-            "X-Webhook-ID": webhook.id
-        }
+            self.engine.enqueue(
+                subscription_id=webhook.id,
+                url=webhook.url,
+                event_type=event_type,
+                payload={
+                    "id": str(uuid.uuid4()),
+                    "event": event_type,
+                    "data": data,
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "webhook_id": webhook.id
+                },
+                secret=webhook.secret,
+                batch=webhook.batch
+            )
         
-        # Send HTTP POST with retry
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        webhook.url,
-                        json=payload,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-                        if response.status == 200:
-                            # Success
-                            webhook.last_triggered = datetime.utcnow()
-                            webhook.delivery_successes += 1
-                            
-                            logger.info(f"Webhook delivered successfully: {webhook.url}")
-                            return
-                        else:
-                            # Server error
-                            logger.warning(f"Webhook returned {response.status}: {webhook.url}")
-                            retry_count += 1
-                            
-                            if retry_count < max_retries:
-                                await asyncio.sleep(2 ** retry_count)  # Exponential backoff
-                
-            except asyncio.TimeoutError:
-                logger.error(f"Webhook timeout: {webhook.url}")
-                retry_count += 1
-                
-                if retry_count < max_retries:
-                    await asyncio.sleep(2 ** retry_count)
-            
-            except Exception as e:
-                logger.error(f"Webhook delivery error: {e}")
-                retry_count += 1
-                
-                if retry_count < max_retries:
-                    await asyncio.sleep(2 ** retry_count)
-        
-        # All retries failed
-        webhook.delivery_failures += 1
-        self._record_failure(webhook.id, event_type, str(e) if 'e' in locals() else "Max retries exceeded")
+        self.engine.ensure_started()
+    
+    def _on_delivery_result(self, record: OutboxRecord, success: bool):
+        """Update webhook stats when the engine settles a delivery."""
+        webhook = self.webhooks.get(record.subscription_id)
+        if webhook is None:
+            return
         
-        logger.error(f"Webhook delivery failed after {max_retries} attempts: {webhook.url}")
+        if success:
+            webhook.last_triggered = datetime.utcnow()
+            webhook.delivery_successes += 1
+            logger.info(f"Webhook delivered successfully: {webhook.url}")
+        else:
+            webhook.delivery_failures += 1
+            self._record_failure(webhook.id, record.event_type, record.last_error or "Max retries exceeded")
     
     def _sign_payload(self, payload: Dict, secret: str) -> str:
         """
@@ -259,19 +217,7 @@ class WebhookService:
         Returns:
             Signature string
         """
-        import json
-        
-        # Serialize payload
-        payload_str = json.dumps(payload, sort_keys=True)
-        
-        # Create HMAC signature
-        signature = hmac.new(
-            secret.encode('utf-8'),
-            payload_str.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return f"sha256={signature}"
+        return sign_body(json.dumps(payload, sort_keys=True), secret)
     
     def _get_webhooks_for_event(
         self,
@@ -279,17 +225,10 @@ class WebhookService:
         event_type: str
     ) -> List[Webhook]:
         """Get active webhooks for user and event."""
-        webhooks = []
-        
-        for webhook in self.webhooks.values():
-            if (
-                webhook.user_id == user_id and
-                webhook.active and
-                event_type in webhook.events
-            ):
-                webhooks.append(webhook)
-        
-        return webhooks
+        return [
+            webhook for webhook in self._index.match(event_type, user_id)
+            if webhook.active
+        ]
     
     def get_webhook(self, webhook_id: str) -> Optional[Dict]:
         """Get webhook by ID."""
@@ -298,12 +237,7 @@ class WebhookService:
     
     def list_webhooks(self, user_id: str) -> List[Dict]:
         """List all webhooks for user."""
-        user_webhooks = [
-            w for w in self.webhooks.values()
-            if w.user_id == user_id
-        ]
-        
-        return [w.to_dict() for w in user_webhooks]
+        return [w.to_dict() for w in self._index.for_user(user_id)]
     
     def delete_webhook(self, webhook_id: str, user_id: str) -> bool:
         """Delete webhook."""
@@ -316,6 +250,7 @@ class WebhookService:
             raise PermissionError("Not authorized")
         
         del self.webhooks[webhook_id]
+        self._index.remove(webhook_id)
         logger.info(f"Deleted webhook {webhook_id}")
         
         return True
@@ -361,6 +296,7 @@ class WebhookCreate(BaseModel):
     url: HttpUrl
     events: List[str]
     secret: Optional[str] = None
+    batch: bool = False
 
 @router.post("/")
 async def create_webhook(
@@ -374,7 +310,8 @@ async def create_webhook(
         user_id=current_user.id,
         url=str(data.url),
         events=data.events,
-        secret=data.secret
+        secret=data.secret,
+        batch=data.batch
     )
 
 @router.get("/")
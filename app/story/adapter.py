@@ -6,7 +6,7 @@ import uuid
 import json
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 # Add StoryGenius to path
 STORYGENIUS_PATH = Path(__file__).parent.parent.parent / "StoryGenius"
@@ -15,9 +15,11 @@ sys.path.insert(0, str(STORYGENIUS_PATH))
 from app.core.models import Story, Scene, ScenePurpose, Job
 from app.core.logging import JobLogger, get_logger
 from app.core.config import settings
+from app.core.profiling import profiler
 from app.strategy.hook_engine import HookEngine, HookResult
 from app.intelligence.personas import PersonaService, Persona
 from app.intelligence.emotion_curves import EmotionCurveService, EmotionCurve, Emotion
+from app.story.streaming import SceneStreamParser
 
 logger = get_logger(__name__)
 
@@ -46,7 +48,9 @@ class StoryAdapter:
         if self._llm is None:
             try:
                 from story_genius.llm.vertex_wrapper import VertexLLM
-                self._llm = VertexLLM()
+                self._llm = profiler.wrap_client(
+                    VertexLLM(), "llm", "vertex", ("generate_content", "stream_content")
+                )
             except Exception as e:
                 logger.error(f"Failed to initialize LLM: {e}")
                 raise
@@ -90,12 +94,60 @@ class StoryAdapter:
             count=5
         )
     
-    def generate_story(self, use_hook_engine: bool = True) -> Story:
+    def _build_scene(self, item: dict, scene_num: int, num_scenes: int) -> Scene:
+        """Turn one parsed LLM scene item into a Scene."""
+        start_sec, end_sec = self._calculate_scene_timing(
+            scene_num - 1, num_scenes, self.job.duration
+        )
+        purpose = self._determine_scene_purpose(scene_num - 1, num_scenes)
+        
+        # Add persona visual style
+        visual = f"{self.persona.visual_style_prefix}, {item.get('visual', '')}"
+        
+        return Scene(
+            id=scene_num,
+            start_sec=start_sec,
+            end_sec=end_sec,
+            purpose=purpose,
+            narration_text=item.get("narration", item.get("script", "")),
+            visual_prompt=visual
+        )
+    
+    def _stream_scene_data(self, llm, prompt: str, on_item: Callable[[dict], None]) -> list:
+        """
+        Stream the LLM response, handing each scene item to on_item as it parses.
+        
+        Falls back to parsing the full text if nothing could be parsed incrementally.
+        """
+        parser = SceneStreamParser()
+        items = []
+        
+        for chunk in llm.stream_content(prompt):
+            for item in parser.feed(chunk):
+                items.append(item)
+                on_item(item)
+        
+        if not items:
+            response = parser.text.replace("```json", "").replace("```", "").strip()
+            items = json.loads(response)
+            for item in items:
+                on_item(item)
+        
+        return items
+    
+    def generate_story(
+        self,
+        use_hook_engine: bool = True,
+        on_scene: Optional[Callable[[Scene], None]] = None
+    ) -> Story:
         """
         Generate a story with Week 2 intelligence.
         
         Args:
             use_hook_engine: Whether to use Hook Engine for Scene 1
+            on_scene: Optional callback invoked with each scene as soon as it
+                is available. When given and the LLM supports streaming, the
+                response is streamed and scenes are emitted as they parse.
             
         Returns:
             Story object with scenes
@@ -153,16 +205,20 @@ class StoryAdapter:
         """
         
         try:
-            response = llm.generate_content(prompt)
-            response = response.replace("```json", "").replace("```", "").strip()
-            scene_data = json.loads(response)
-            
             scenes = []
             
+            def emit(scene: Scene):
+                scenes.append(scene)
+                if on_scene:
+                    try:
+                        on_scene(scene)
+                    except Exception as e:
+                        self.job_logger.warning(f"Scene callback failed: {e}")
+            
             # Add hook as Scene 1 if using Hook Engine
             if hook_result:
                 hook = hook_result.selected_hook
-                scenes.append(Scene(
+                emit(Scene(
                     id=1,
                     start_sec=0,
                     end_sec=2,
@@ -172,29 +228,19 @@ class StoryAdapter:
                 ))
             
             # Add remaining scenes
-            start_index = 1 if hook_result else 0
-            for i, item in enumerate(scene_data):
-                scene_num = i + start_index + 1
+            def add_item(item: dict):
+                scene_num = len(scenes) + 1
                 if scene_num > num_scenes:
-                    break
-                    
-                start_sec, end_sec = self._calculate_scene_timing(
-                    scene_num - 1, num_scenes, self.job.duration
-                )
-                purpose = self._determine_scene_purpose(scene_num - 1, num_scenes)
-                
-                # Add persona visual style
-                visual = f"{self.persona.visual_style_prefix}, {item.get('visual', '')}"
-                
-                scene = Scene(
-                    id=scene_num,
-                    start_sec=start_sec,
-                    end_sec=end_sec,
-                    purpose=purpose,
-                    narration_text=item.get("narration", item.get("script", "")),
-                    visual_prompt=visual
-                )
-                scenes.append(scene)
+                    return
+                emit(self._build_scene(item, scene_num, num_scenes))
+            
+            if on_scene and hasattr(llm, "stream_content"):
+                self._stream_scene_data(llm, prompt, add_item)
+            else:
+                response = llm.generate_content(prompt)
+                response = response.replace("```json", "").replace("```", "").strip()
+                for item in json.loads(response):
+                    add_item(item)
             
             story = Story(
                 id=str(uuid.uuid4()),
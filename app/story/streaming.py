@@ -0,0 +1,77 @@
+"""
+Incremental parsing of streamed LLM scene output.
+Yields each scene object of a JSON array as soon as its closing brace arrives.
+"""
+import json
+from typing import Dict, List
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SceneStreamParser:
+    """
+    Incremental parser for a JSON array of scene objects.
+
+    Feed raw text chunks (markdown fences and surrounding prose are
+    tolerated); every top-level object inside the array is returned the
+    moment it is complete.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # Pieces of the object currently being read, from its opening brace
+        self._pending: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk and return any scene objects it completed."""
+        self._chunks.append(chunk)
+        completed = []
+        # Offset in this chunk where the open object began (0 if it began earlier)
+        start = 0 if self._depth > 0 else -1
+
+        for pos, ch in enumerate(chunk):
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    start = pos
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pending.append(chunk[start:pos + 1])
+                    raw = "".join(self._pending)
+                    self._pending = []
+                    start = -1
+                    try:
+                        completed.append(json.loads(raw))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping unparseable streamed scene: {e}")
+
+        if self._depth > 0:
+            self._pending.append(chunk[start:])
+
+        return completed
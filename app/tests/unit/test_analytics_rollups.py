@@ -0,0 +1,86 @@
+"""
+Unit Tests for analytics rollups
+"""
+from datetime import datetime, timedelta
+import random
+
+from app.analytics.rollups import AnalyticsRollups, TopK
+from app.analytics.service import AnalyticsService
+
+
+def _service():
+    service = AnalyticsService()
+    service.add_video("v1", "One", quality=0.9, platform="tiktok")
+    service.add_video("v2", "Two", quality=0.5, platform="youtube_shorts")
+    service.add_video("v3", "Three", quality=0.7, platform="tiktok")
+    for _ in range(10):
+        service.track_video_view("v1")
+    for _ in range(4):
+        service.track_video_view("v2")
+    service.track_video_like("v1")
+    service.track_video_share("v2")
+    service.track_video_like("v2")
+    return service
+
+
+def test_metrics_match_per_video_recompute():
+    service = _service()
+    metrics = service.get_metrics("30d")
+
+    videos = list(service._videos.values())
+    assert metrics.total_videos == 3
+    assert metrics.total_views == 14
+    assert metrics.total_likes == 2
+    assert metrics.total_shares == 1
+    expected = sum(service.calculate_engagement(v.id) for v in videos) / 3
+    assert abs(metrics.avg_engagement - expected) < 1e-9
+    assert abs(metrics.avg_quality - 0.7) < 1e-9
+
+
+def test_date_range_excludes_old_videos():
+    service = _service()
+    old = service._rollups.by_created_day
+    day = next(iter(old))
+    old_day = (datetime.utcnow() - timedelta(days=60)).strftime("%Y-%m-%d")
+    old[old_day] = old.pop(day)
+
+    assert service.get_metrics("30d").total_videos == 0
+    assert service.get_metrics("all").total_videos == 3
+
+
+def test_top_videos_and_timeseries():
+    service = _service()
+
+    assert [v.id for v in service.get_top_videos(limit=2)] == ["v1", "v2"]
+    assert [v.id for v in service.get_top_videos(limit=1, sort_by="quality")] == ["v1"]
+    assert [v.id for v in service.get_top_videos(limit=1, sort_by="engagement")] == ["v2"]
+
+    series = service.get_engagement_timeseries("7d")
+    assert len(series) == 7
+    assert series[-1].value == round(3 / 14 * 100, 2)
+    assert all(point.value == 0.0 for point in series[:-1])
+
+    tiktok = service.get_engagement_timeseries("7d", platform="tiktok")
+    assert tiktok[-1].value == 10.0
+    assert service.get_platform_breakdown()["tiktok"]["views"] == 10
+
+
+def test_top_k_matches_full_sort_for_monotonic_scores():
+    rng = random.Random(7)
+    tracker = TopK(capacity=5)
+    scores = {}
+    for _ in range(2000):
+        key = f"v{rng.randrange(50)}"
+        scores[key] = scores.get(key, 0) + rng.randrange(1, 4)
+        tracker.update(key, scores[key])
+
+    expected = sorted(scores.values(), reverse=True)[:5]
+    assert [scores[k] for k in tracker.top(5)] == expected
+    assert len(tracker._heap) <= 2 * 5 + 16
+
+
+def test_rollups_top_ids_depth_limit():
+    rollups = AnalyticsRollups(top_k=3)
+    assert rollups.top_ids("views", 3) == []
+    assert rollups.top_ids("views", 4) is None
+    assert rollups.top_ids("engagement", 1) is None
@@ -0,0 +1,181 @@
+"""
+Tests for the artifact catalog and catalog-backed cleanup.
+"""
+import os
+import time
+
+import pytest
+
+from app.reliability.artifact_catalog import ArtifactCatalog, scan_files
+from app.reliability.cleanup import ArtifactType, CleanupService
+
+
+def _write(path, size, age_hours=0.0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def _service(tmp_path, monkeypatch):
+    catalog = ArtifactCatalog(str(tmp_path / "catalog.db"))
+    service = CleanupService(catalog=catalog)
+    # Reconcile explicitly in tests instead of on the background thread
+    monkeypatch.setattr(service, "start", lambda: None)
+    service.paths = {
+        ArtifactType.TEMP_FILES: str(tmp_path / "temp"),
+        ArtifactType.COMPLETED: str(tmp_path / "videos"),
+    }
+    return service, catalog
+
+
+class TestArtifactCatalog:
+
+    def test_record_remove_and_totals(self, tmp_path):
+        catalog = ArtifactCatalog(str(tmp_path / "catalog.db"))
+        catalog.record("a.mp4", "completed", 100, 1000.0)
+        catalog.record("b.mp4", "completed", 50, 2000.0)
+        catalog.record("a.mp4", "completed", 120, 3000.0)  # rewritten
+
+        assert catalog.totals() == {"completed": (2, 170)}
+        assert catalog.expired("completed", 2500.0) == [("b.mp4", 50, 2000.0)]
+
+        catalog.remove(["b.mp4", "missing.mp4"])
+        assert catalog.totals() == {"completed": (1, 120)}
+
+        # Totals survive a reopen
+        catalog.close()
+        assert catalog.totals() == {"completed": (1, 120)}
+
+    def test_totals_see_other_processes_writes(self, tmp_path):
+        catalog = ArtifactCatalog(str(tmp_path / "catalog.db"))
+        other = ArtifactCatalog(str(tmp_path / "catalog.db"))
+        catalog.record("a.mp4", "completed", 100, 1000.0)
+        assert other.totals() == {"completed": (1, 100)}
+
+        other.record("b.mp4", "completed", 50, 1000.0)
+        other.remove(["a.mp4"])
+        assert catalog.totals() == {"completed": (1, 50)}
+        catalog.close()
+        other.close()
+
+    def test_row_recorded_during_reconcile_is_kept(self, tmp_path, monkeypatch):
+        root = tmp_path / "videos"
+        _write(root / "a.mp4", 10)
+        catalog = ArtifactCatalog(str(tmp_path / "catalog.db"))
+
+        def scan_and_record(directory):
+            yield from scan_files(directory)
+            # A job finishes writing while the walk is in progress
+            catalog.record(_write(root / "late.mp4", 5), "completed")
+
+        monkeypatch.setattr("app.reliability.artifact_catalog.scan_files", scan_and_record)
+        catalog.reconcile("completed", str(root))
+
+        assert catalog.totals() == {"completed": (2, 15)}
+
+    def test_reconcile_adds_updates_and_drops(self, tmp_path):
+        root = tmp_path / "videos"
+        kept = _write(root / "a" / "keep.mp4", 10)
+        gone = str(root / "gone.mp4")
+        catalog = ArtifactCatalog(str(tmp_path / "catalog.db"))
+        catalog.record(gone, "completed", 99, 1.0)
+        catalog.record(kept, "completed", 1, 1.0)
+        _write(root / "b" / "c" / "new.mp4", 5)
+
+        result = catalog.reconcile("completed", str(root))
+
+        assert result["files"] == 2
+        assert result["removed"] == 1
+        assert catalog.totals() == {"completed": (2, 15)}
+        assert catalog.last_reconciled("completed") is not None
+
+    def test_scan_files_skips_missing_root(self, tmp_path):
+        assert list(scan_files(str(tmp_path / "nope"))) == []
+
+
+class TestCatalogCleanup:
+
+    def test_cleanup_is_range_query_over_catalog(self, tmp_path, monkeypatch):
+        service, catalog = _service(tmp_path, monkeypatch)
+        old = _write(tmp_path / "temp" / "old.tmp", 10, age_hours=2)
+        fresh = _write(tmp_path / "temp" / "fresh.tmp", 20)
+        _write(tmp_path / "videos" / "v.mp4", 30, age_hours=2)
+        service.reconcile(force=False)
+
+        preview = service.preview_cleanup(ArtifactType.TEMP_FILES)
+        assert preview["targets_count"] == 1
+        assert preview["targets"][0]["path"] == old
+
+        [result] = service.run_cleanup(ArtifactType.TEMP_FILES)
+        assert result.items_deleted == 1
+        assert not os.path.exists(old)
+        assert os.path.exists(fresh)
+
+        stats = service.get_storage_stats()
+        assert stats["temp_files"]["file_count"] == 1
+        assert stats["completed"]["file_count"] == 1
+
+    def test_recent_reconcile_is_not_repeated(self, tmp_path, monkeypatch):
+        service, catalog = _service(tmp_path, monkeypatch)
+        service.reconcile(ArtifactType.TEMP_FILES)
+
+        # Written without telling the catalog: invisible until the next rescan
+        _write(tmp_path / "temp" / "untracked.tmp", 10, age_hours=2)
+        assert service.preview_cleanup(ArtifactType.TEMP_FILES)["targets_count"] == 0
+
+        service.reconcile(ArtifactType.TEMP_FILES)
+        assert service.preview_cleanup(ArtifactType.TEMP_FILES)["targets_count"] == 1
+
+    def test_requests_do_not_reconcile(self, tmp_path, monkeypatch):
+        service, catalog = _service(tmp_path, monkeypatch)
+        _write(tmp_path / "temp" / "old.tmp", 10, age_hours=2)
+        monkeypatch.setattr(
+            catalog, "reconcile", lambda *a: pytest.fail("reconciled on the request path")
+        )
+
+        assert service.preview_cleanup()["targets_count"] == 0
+        assert service.get_storage_stats()["temp_files"]["file_count"] == 0
+
+    def test_background_reconciler_picks_up_untracked_files(self, tmp_path):
+        catalog = ArtifactCatalog(str(tmp_path / "catalog.db"))
+        service = CleanupService(catalog=catalog, reconcile_tick=0.01)
+        service.paths = {ArtifactType.TEMP_FILES: str(tmp_path / "temp")}
+        _write(tmp_path / "temp" / "old.tmp", 10, age_hours=2)
+
+        service.start()
+        deadline = time.time() + 5
+        while catalog.last_reconciled("temp_files") is None and time.time() < deadline:
+            time.sleep(0.01)
+        service.stop()
+
+        assert service.preview_cleanup(ArtifactType.TEMP_FILES)["targets_count"] == 1
+        service.stop()
+
+    def test_file_rewritten_since_cataloged_is_kept(self, tmp_path, monkeypatch):
+        service, catalog = _service(tmp_path, monkeypatch)
+        path = _write(tmp_path / "temp" / "reused.tmp", 10, age_hours=2)
+        service.reconcile(ArtifactType.TEMP_FILES)
+
+        # Rewritten by a job without going through record_artifact
+        _write(tmp_path / "temp" / "reused.tmp", 40)
+        assert service.preview_cleanup(ArtifactType.TEMP_FILES)["targets_count"] == 1
+
+        [result] = service.run_cleanup(ArtifactType.TEMP_FILES)
+        assert result.items_deleted == 0
+        assert os.path.exists(path)
+        assert catalog.totals() == {"temp_files": (1, 40)}
+        assert service.preview_cleanup(ArtifactType.TEMP_FILES)["targets_count"] == 0
+
+    def test_reconcile_interval_never_exceeds_retention(self, tmp_path, monkeypatch):
+        service, catalog = _service(tmp_path, monkeypatch)
+        service.reconcile(ArtifactType.TEMP_FILES)
+        _write(tmp_path / "temp" / "untracked.tmp", 10, age_hours=2)
+
+        # Temp files are kept for an hour, so a two-hour-old scan is stale
+        later = time.time() + 2 * 3600
+        monkeypatch.setattr("app.reliability.cleanup.time.time", lambda: later)
+        assert service.reconcile(force=False)
+        assert service.preview_cleanup(ArtifactType.TEMP_FILES)["targets_count"] == 1
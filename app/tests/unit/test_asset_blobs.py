@@ -0,0 +1,114 @@
+"""
+Unit Tests for the content-addressable asset store
+"""
+import hashlib
+import os
+
+import pytest
+
+from app.assets.blobs import BlobStore, BlobTooLargeError
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(str(tmp_path / "blobs"))
+
+
+def test_stream_is_hashed_while_written(store):
+    checksum, size = store.write_stream([b"abc", b"def"])
+
+    assert checksum == hashlib.sha256(b"abcdef").hexdigest()
+    assert size == 6
+    assert store.exists(checksum)
+
+
+def test_identical_content_stored_once(store, tmp_path):
+    first, _ = store.write_bytes(b"same")
+    second, _ = store.write_bytes(b"same")
+
+    assert first == second
+    assert os.listdir(os.path.join(store.base_path, "tmp")) == []
+
+
+def test_links_share_blob_and_refcount(store, tmp_path):
+    checksum, _ = store.write_bytes(b"video")
+    a = str(tmp_path / "a.mp4")
+    b = str(tmp_path / "versions" / "v1.mp4")
+
+    store.link(checksum, a)
+    store.link(checksum, b)
+    assert store.refcount(checksum) == 2
+    assert open(b, "rb").read() == b"video"
+
+    store.release(checksum, a)
+    assert store.exists(checksum)
+    store.release(checksum, b)
+    assert not store.exists(checksum)
+    assert not os.path.exists(b)
+
+
+def test_oversized_stream_rejected_without_leftovers(store):
+    with pytest.raises(BlobTooLargeError):
+        store.write_stream([b"x" * 10, b"y" * 10], max_size=15)
+
+    assert os.listdir(os.path.join(store.base_path, "tmp")) == []
+
+
+def test_service_dedups_per_user(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from app.assets.service import asset_service
+
+    first, _ = asset_service.upload_asset("dedup_user", "clip.mp3", b"audio-bytes")
+    second, msg = asset_service.upload_asset("dedup_user", "copy.mp3", b"audio-bytes")
+
+    assert second.asset_id == first.asset_id
+    assert "Duplicate" in msg
+
+
+def test_soft_delete_keeps_file_until_purged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from app.assets.service import asset_service
+    from app.assets.blobs import blob_store
+
+    asset, _ = asset_service.upload_asset("purge_user", "clip.mp3", b"purge-bytes")
+    refs = blob_store.refcount(asset.checksum)
+    assert asset_service.delete_asset(asset.asset_id, "purge_user")[0]
+
+    # Soft-deleted: hidden, but the file and its blob reference are intact
+    assert asset_service.get_asset(asset.asset_id, "purge_user") is None
+    assert os.path.exists(asset.storage_path)
+    assert blob_store.refcount(asset.checksum) == refs
+    assert asset_service.count_assets("purge_user", status="deleted") == 1
+
+    # A permanent delete of a soft-deleted asset purges it
+    ok, msg = asset_service.delete_asset(asset.asset_id, "purge_user", permanent=True)
+    assert ok and "permanently" in msg
+    assert not os.path.exists(asset.storage_path)
+    assert blob_store.refcount(asset.checksum) == refs - 1
+    assert not asset_service.purge_asset(asset.asset_id, "purge_user")
+    assert not asset_service.delete_asset(asset.asset_id, "purge_user", permanent=True)[0]
+
+
+def test_permanent_delete_releases_blob(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from app.assets.service import asset_service
+
+    asset, _ = asset_service.upload_asset("purge_user", "clip.wav", b"gone-bytes")
+    ok, msg = asset_service.delete_asset(asset.asset_id, "purge_user", permanent=True)
+
+    assert ok and "permanently" in msg
+    assert not os.path.exists(asset.storage_path)
+    assert asset_service.count_assets("purge_user", status="deleted") == 0
+
+
+def test_upload_fails_when_blob_cannot_be_linked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from app.assets.service import asset_service
+    from app.assets.blobs import blob_store
+
+    monkeypatch.setattr(blob_store, "link", lambda checksum, dest: False)
+    asset, msg = asset_service.upload_asset("link_user", "clip.mp3", b"vanishing-bytes")
+
+    assert asset is None
+    assert "retry" in msg
+    assert asset_service.count_assets("link_user") == 0
@@ -0,0 +1,108 @@
+"""
+Unit Tests for asset secondary indexes
+"""
+from app.assets.index import UserAssetIndex
+from app.assets.models import Asset, AssetType, AssetStatus
+
+
+def _asset(asset_id, name, asset_type=AssetType.IMAGE, folder_id=None, size=100):
+    return Asset(
+        asset_id=asset_id,
+        user_id="u1",
+        name=name,
+        asset_type=asset_type,
+        mime_type="application/octet-stream",
+        file_extension="bin",
+        file_size=size,
+        storage_path=f"/tmp/{asset_id}",
+        original_filename=name,
+        checksum=asset_id,
+        status=AssetStatus.READY,
+        folder_id=folder_id
+    )
+
+
+def _build():
+    index = UserAssetIndex()
+    assets = [
+        _asset("a1", "Beach sunset", folder_id="f1"),
+        _asset("a2", "Intro music", AssetType.AUDIO, size=300),
+        _asset("a3", "Sunset timelapse", AssetType.VIDEO, folder_id="f1", size=1000),
+        _asset("a4", "Logo draft", folder_id="f2"),
+    ]
+    for asset in assets:
+        index.add(asset)
+    return index, assets
+
+
+def test_filters_combine_newest_first():
+    index, _ = _build()
+
+    ids = [a.asset_id for a in index.page(index.filter(folder_id="f1"))]
+    assert ids == ["a3", "a1"]
+
+    ids = [a.asset_id for a in index.page(index.filter(asset_type="image", folder_id="f1"))]
+    assert ids == ["a1"]
+
+
+def test_name_search_is_substring_match():
+    index, _ = _build()
+    index.add(_asset("a5", "bobcat.mp3", AssetType.AUDIO))
+
+    ids = [a.asset_id for a in index.page(index.filter(query="SUN"))]
+    assert ids == ["a3", "a1"]
+    assert [a.asset_id for a in index.page(index.filter(query="cat"))] == ["a5"]
+    assert [a.asset_id for a in index.page(index.filter(query="h sun"))] == ["a1"]
+    assert index.filter(query="sunset beach") == 0
+    # Queries shorter than a trigram still compare names
+    assert [a.asset_id for a in index.page(index.filter(query="go"))] == ["a4"]
+
+
+def test_non_ascii_names_are_searchable():
+    index = UserAssetIndex()
+    index.add(_asset("j1", "日本の夏"))
+    index.add(_asset("j2", "Café intro"))
+
+    assert [a.asset_id for a in index.page(index.filter(query="日本"))] == ["j1"]
+    assert [a.asset_id for a in index.page(index.filter(query="CAFÉ"))] == ["j2"]
+    assert [a.asset_id for a in index.page(index.filter(query="é"))] == ["j2"]
+
+
+def test_query_without_word_characters_matches_nothing():
+    index, _ = _build()
+    assert index.filter(query="-") == 0
+    assert index.filter(query="  ") == 0
+
+
+def test_pagination_and_tag_filter():
+    index, _ = _build()
+
+    assert [a.asset_id for a in index.page(index.live, offset=1, limit=2)] == ["a3", "a2"]
+    bits = index.filter(tag_asset_ids={"a2", "a4", "other"})
+    assert [a.asset_id for a in index.page(bits)] == ["a4", "a2"]
+
+
+def test_aggregates_follow_delete_rename_and_move():
+    index, assets = _build()
+    assert index.total_size == 1500
+
+    index.remove(assets[2])
+    assert index.total_count == 3
+    assert index.total_size == 500
+    assert "video" not in index.count_by_type
+    assert index.filter(query="timelapse") == 0
+
+    assets[2].status = AssetStatus.DELETED
+    index.set_status(assets[2], AssetStatus.READY)
+    assert [a.asset_id for a in index.page(index.filter(status="deleted"))] == ["a3"]
+    assert index.filter(status="ready").bit_count() == 3
+
+    old_name = assets[0].name
+    assets[0].name = "Ocean view"
+    index.rename(assets[0], old_name)
+    assert index.filter(query="beach") == 0
+    assert [a.asset_id for a in index.page(index.filter(query="ocean"))] == ["a1"]
+
+    assets[3].folder_id = "f1"
+    index.move_folder(assets[3], "f2")
+    assert [a.asset_id for a in index.page(index.filter(folder_id="f1"))] == ["a4", "a1"]
@@ -0,0 +1,185 @@
+"""
+Tests for the batched audit log writer.
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+from app.middleware import audit_writer
+from app.middleware.audit_writer import AuditBatchWriter
+
+
+def _record(i):
+    return {"id": str(i), "path": f"/api/videos/{i}", "timestamp": datetime(2026, 1, 1, 12, 0, i % 60)}
+
+
+class TestAuditBatchWriter:
+
+    def test_batches_by_size_and_interval(self, tmp_path):
+        batches = []
+        writer = AuditBatchWriter(
+            batches.append, batch_size=3, flush_interval_ms=20,
+            spill_path=str(tmp_path / "spill.jsonl")
+        )
+
+        async def run():
+            for i in range(7):
+                assert writer.submit(_record(i))
+            await asyncio.sleep(0.1)
+            await writer.stop()
+
+        asyncio.run(run())
+
+        assert [len(b) for b in batches] == [3, 3, 1]
+        assert [r["id"] for b in batches for r in b] == [str(i) for i in range(7)]
+        assert writer.stats["written"] == 7
+
+    def test_overflow_spills_and_replays(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+        batches = []
+        writer = AuditBatchWriter(
+            batches.append, batch_size=10, flush_interval_ms=1000,
+            max_queue=2, spill_path=str(spill)
+        )
+
+        async def fill():
+            results = [writer.submit(_record(i)) for i in range(5)]
+            await writer.stop()
+            return results
+
+        assert asyncio.run(fill()) == [True, True, False, False, False]
+        assert writer.stats["spilled"] == 3
+        lines = [json.loads(l) for l in spill.read_text().splitlines()]
+        assert [l["id"] for l in lines] == ["2", "3", "4"]
+
+        replayed = []
+        fresh = AuditBatchWriter(replayed.append, flush_interval_ms=10, spill_path=str(spill))
+
+        async def replay():
+            fresh.start()
+            await asyncio.sleep(0.05)
+            await fresh.stop()
+
+        asyncio.run(replay())
+
+        assert [r["id"] for r in replayed[0]] == ["2", "3", "4"]
+        assert replayed[0][0]["timestamp"] == datetime(2026, 1, 1, 12, 0, 2)
+        assert not spill.exists()
+
+    def test_failed_batch_is_spilled(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+
+        def fail(batch):
+            raise RuntimeError("database down")
+
+        writer = AuditBatchWriter(fail, batch_size=5, spill_path=str(spill))
+
+        async def run():
+            writer.submit(_record(1))
+            writer.submit(_record(2))
+            await writer.stop()
+
+        asyncio.run(run())
+
+        assert writer.stats["failed_batches"] == 1
+        assert len(spill.read_text().splitlines()) == 2
+
+    def test_overflow_is_spilled_off_the_request_path(self, tmp_path, monkeypatch):
+        spill = tmp_path / "spill.jsonl"
+        writer = AuditBatchWriter(lambda batch: None, max_queue=1, spill_path=str(spill))
+        spilled_on = []
+        real_spill = writer._spill
+        monkeypatch.setattr(writer, "_spill", lambda records: (
+            spilled_on.append(threading.current_thread()), real_spill(records)
+        ))
+
+        async def run():
+            writer.submit(_record(1))
+            assert writer.submit(_record(2)) is False
+            # Nothing touched the disk inside submit()
+            assert not spill.exists()
+            await audit_writer.stop_all()
+
+        asyncio.run(run())
+
+        assert spilled_on and threading.main_thread() not in spilled_on
+        assert [json.loads(l)["id"] for l in spill.read_text().splitlines()] == ["2"]
+        assert not writer.running
+
+    def test_spill_pending_keeps_queued_records(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+        writer = AuditBatchWriter(lambda batch: None, spill_path=str(spill))
+        writer.submit(_record(1))  # no running loop: stays queued
+        writer.spill_pending()
+
+        assert len(writer) == 0
+        assert [json.loads(l)["id"] for l in spill.read_text().splitlines()] == ["1"]
+
+    def test_replay_is_skipped_while_another_process_replays(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+        AuditBatchWriter(lambda batch: None, spill_path=str(spill))._spill([_record(1)])
+        replayed = []
+        writer = AuditBatchWriter(replayed.append, spill_path=str(spill))
+
+        async def replay():
+            await writer._replay_spill()
+
+        with audit_writer._file_lock(str(spill) + ".replay.lock", blocking=False) as held:
+            assert held
+            asyncio.run(replay())
+        assert replayed == []
+        assert spill.exists()
+
+        asyncio.run(replay())
+        assert [r["id"] for r in replayed[0]] == ["1"]
+        assert not spill.exists()
+        assert not (tmp_path / "spill.jsonl.replay").exists()
+
+    def test_concurrent_replays_write_each_record_once(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+        AuditBatchWriter(lambda batch: None, spill_path=str(spill))._spill(
+            [_record(i) for i in range(5)]
+        )
+        written = []
+        writers = [
+            AuditBatchWriter(written.extend, batch_size=2, spill_path=str(spill))
+            for _ in range(3)
+        ]
+
+        async def replay_all():
+            await asyncio.gather(*(w._replay_spill() for w in writers))
+
+        asyncio.run(replay_all())
+        assert sorted(r["id"] for r in written) == [str(i) for i in range(5)]
+
+    def test_writer_survives_a_failed_spill(self, tmp_path, monkeypatch):
+        spill = tmp_path / "spill.jsonl"
+        batches = []
+        writer = AuditBatchWriter(
+            batches.append, max_queue=1, flush_interval_ms=10, spill_path=str(spill)
+        )
+        real_spill = writer._spill
+        failures = []
+
+        def flaky_spill(records):
+            if not failures:
+                failures.append(records)
+                raise OSError("disk full")
+            real_spill(records)
+
+        monkeypatch.setattr(writer, "_spill", flaky_spill)
+
+        async def run():
+            writer.submit(_record(1))
+            writer.submit(_record(2))  # overflow: spill fails once
+            await asyncio.sleep(0.1)
+            assert writer.running
+            writer.submit(_record(3))
+            await writer.stop()
+
+        asyncio.run(run())
+
+        assert failures
+        assert [json.loads(l)["id"] for l in spill.read_text().splitlines()] == ["2"]
+        assert [r["id"] for b in batches for r in b] == ["1", "3"]
@@ -0,0 +1,164 @@
+"""
+Tests for the SQLite checkpoint store.
+"""
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from app.reliability import checkpointing
+from app.reliability.checkpoint_store import CheckpointStore
+from app.reliability.checkpointing import CheckpointService
+
+
+@pytest.fixture
+def fresh_service(tmp_path, monkeypatch):
+    """A factory for CheckpointServices rooted in tmp_path (one per "worker")."""
+    monkeypatch.chdir(tmp_path)
+    services = []
+
+    def make():
+        service = CheckpointService()
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.store.close()
+
+
+def _save_jobs(root, prefix, count):
+    os.chdir(root)
+    service = CheckpointService()
+    for i in range(count):
+        checkpoint = service.create_checkpoint(f"{prefix}-{i}")
+        checkpoint.add_stage("script")
+        checkpoint.start_stage("script")
+        service.save_checkpoint(checkpoint)
+    service.store.close()
+
+
+class TestCheckpointStore:
+
+    def test_put_replace_and_delete(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / "c.db"))
+        store.put("a", {"v": 1}, interrupted=True)
+        store.put("b", {"v": 1}, interrupted=False, recoverable=False)
+        store.put("a", {"v": 2}, interrupted=False)
+
+        assert store.get("a") == {"v": 2}
+        assert store.interrupted() == []
+        assert store.list_all(recoverable_only=True) == [{"v": 2}]
+        assert store.delete("b")
+        assert not store.delete("b")
+        assert store.count() == 1
+        store.close()
+
+    def test_put_many_without_replace_keeps_existing(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / "c.db"))
+        store.put("a", {"v": 2}, interrupted=False)
+        store.put_many([("a", {"v": 1}, False, True), ("b", {"v": 1}, False, True)], replace=False)
+
+        assert store.get("a") == {"v": 2}
+        assert store.get("b") == {"v": 1}
+        store.close()
+
+
+class TestCheckpointServiceRecovery:
+
+    def test_restart_sees_interrupted_jobs(self, fresh_service):
+        service = fresh_service()
+        running = service.create_checkpoint("job-running")
+        running.add_stage("script")
+        running.start_stage("script")
+        service.save_checkpoint(running)
+
+        done = service.create_checkpoint("job-done")
+        assert service.delete_checkpoint(done.job_id)
+        assert not service.delete_checkpoint(done.job_id)
+
+        queued = service.create_checkpoint("job-queued")
+
+        restarted = fresh_service()
+        assert {c.job_id for c in restarted.list_checkpoints()} == {"job-running", "job-queued"}
+        assert [c.job_id for c in restarted.get_interrupted_jobs()] == ["job-running"]
+        assert restarted.get_checkpoint("job-running").get_stage("script").started_at is not None
+        assert restarted.get_checkpoint("job-queued").created_at == queued.created_at
+
+        # Completing the job's last stage removes its checkpoint
+        checkpoint = restarted.get_checkpoint("job-running")
+        checkpoint.complete_stage("script", output_ref="script.json")
+        restarted.save_checkpoint(checkpoint)
+        assert restarted.get_interrupted_jobs() == []
+        assert restarted.get_checkpoint("job-running") is None
+        assert restarted.count_checkpoints() == 1
+
+    def test_recovery_scan_reads_interrupted_jobs_only(self, fresh_service, monkeypatch):
+        from app.reliability.recovery import RecoveryService
+
+        service = fresh_service()
+        running = service.create_checkpoint("job-running")
+        running.add_stage("script")
+        running.add_stage("audio")
+        running.complete_stage("script")
+        running.start_stage("audio")
+        service.save_checkpoint(running)
+        service.create_checkpoint("job-queued")
+
+        recovery = RecoveryService()
+        monkeypatch.setattr(
+            recovery.checkpoint_service, "list_checkpoints",
+            lambda *a, **k: pytest.fail("recovery scan listed every checkpoint")
+        )
+        result = recovery.run_recovery_scan()
+        recovery.checkpoint_service.store.close()
+
+        assert result["jobs_scanned"] == 1
+        assert result["results"][0]["job_id"] == "job-running"
+        assert result["results"][0]["from_stage"] == "audio"
+
+    def test_workers_see_each_others_checkpoints(self, fresh_service):
+        worker_a = fresh_service()
+        worker_b = fresh_service()
+
+        worker_a.create_checkpoint("job-a")
+        assert worker_b.get_checkpoint("job-a") is not None
+        assert worker_b.delete_checkpoint("job-a")
+        assert worker_a.get_checkpoint("job-a") is None
+
+    def test_concurrent_worker_processes(self, fresh_service, tmp_path):
+        fresh_service()
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=_save_jobs, args=(str(tmp_path), f"w{n}", 20))
+            for n in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            assert worker.exitcode == 0
+
+        service = fresh_service()
+        assert len(service.list_checkpoints()) == 80
+        assert len(service.get_interrupted_jobs()) == 80
+
+    def test_legacy_files_are_imported(self, fresh_service, tmp_path):
+        root = tmp_path / ".story_assets" / "checkpoints"
+        root.mkdir(parents=True)
+        legacy = checkpointing.JobCheckpoint(job_id="old-job")
+        (root / "old-job.json").write_text(json.dumps(legacy.to_dict()))
+        logged = checkpointing.JobCheckpoint(job_id="wal-job")
+        (root / "checkpoints.wal").write_text(
+            json.dumps({"op": "put", "job_id": "wal-job", "checkpoint": logged.to_dict()}) + "\n"
+            + json.dumps({"op": "put", "job_id": "gone", "checkpoint": {}}) + "\n"
+            + json.dumps({"op": "del", "job_id": "gone"}) + "\n{\"op\": \"pu"
+        )
+
+        service = fresh_service()
+        assert {c.job_id for c in service.list_checkpoints()} == {"old-job", "wal-job"}
+        assert not (root / "old-job.json").exists()
+        assert not (root / "checkpoints.wal").exists()
+
+        assert fresh_service().get_checkpoint("old-job") is not None
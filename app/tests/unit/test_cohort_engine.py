@@ -0,0 +1,161 @@
+"""
+Unit Tests for the columnar cohort engine
+"""
+from datetime import date, datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.cohort_engine import (
+    CohortCache, CohortData, CohortEngine, month_index, month_label
+)
+
+
+def _data():
+    signups = [
+        ("u1", datetime(2024, 1, 31)),
+        ("u2", datetime(2024, 1, 2)),
+        ("u3", datetime(2024, 2, 1)),
+    ]
+    events = [
+        ("u1", "login", datetime(2024, 1, 31)),
+        ("u1", "login", datetime(2024, 2, 1)),   # next calendar month, 1 day later
+        ("u1", "login", datetime(2024, 2, 20)),  # same month counted once
+        ("u2", "login", datetime(2024, 3, 5)),
+        ("u3", "login", datetime(2024, 2, 3)),
+        ("u3", "template_used", datetime(2024, 2, 3)),
+        ("u1", "template_used", datetime(2024, 3, 1)),
+        ("visitor", "site_visit", datetime(2024, 3, 1)),
+        ("u3", "site_visit", datetime(2024, 3, 1)),
+    ]
+    return CohortData.from_records(signups, events)
+
+
+def test_month_index_uses_calendar_months():
+    assert month_label(month_index(datetime(2024, 12, 31))) == "2024-12"
+    assert month_index(datetime(2025, 1, 1)) - month_index(datetime(2024, 12, 31)) == 1
+
+
+def test_retention_matrix_by_calendar_month():
+    engine = CohortEngine(_data())
+    result = engine.retention_cohorts(month_index(datetime(2024, 3, 1)), months=3)
+
+    cohorts = {c["cohort_month"]: c for c in result["cohorts"]}
+    assert set(cohorts) == {"2024-01", "2024-02"}
+
+    jan = cohorts["2024-01"]
+    assert jan["cohort_size"] == 2
+    assert jan["retention"] == {"month_0": 50.0, "month_1": 50.0, "month_2": 100.0}
+
+    feb = cohorts["2024-02"]
+    assert feb["retention"] == {"month_0": 100.0, "month_1": 100.0}
+
+
+def test_distinct_users_and_funnel():
+    engine = CohortEngine(_data())
+
+    assert engine.distinct_users(["template_used", "missing"]) == {
+        "template_used": 2, "missing": 0
+    }
+    assert engine.signed_up_users() == 3
+
+    since = int(datetime(2024, 2, 1).timestamp())
+    funnel = engine.funnel([("Visited", "site_visit"), ("Used template", "template_used")], since)
+    # u1 used a template but never visited, so it isn't in the second stage
+    assert [s["users"] for s in funnel["stages"]] == [2, 1]
+    assert funnel["stages"][1]["conversion_pct"] == 50.0
+
+
+def test_cache_reloads_once_per_day():
+    cache = CohortCache()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return _data()
+
+    compute = lambda engine: {"users": engine.signed_up_users()}
+    cache.get("total", load, compute, today=date(2024, 3, 1))
+    cache.get("total", load, compute, today=date(2024, 3, 1))
+    cache.get("other", load, compute, today=date(2024, 3, 1))
+    assert len(loads) == 1
+
+    cache.get("total", load, compute, today=date(2024, 3, 2))
+    assert len(loads) == 2
+
+
+def test_audit_rows_drive_funnel_and_feature_adoption():
+    from app.services.analytics_service import (
+        AnalyticsService, FUNNEL_STAGES, product_events
+    )
+
+    at = datetime(2024, 3, 2, 12)
+    signups = [
+        # (user_id, created_at, email_verified) as queried from DBUser
+        ("u1", datetime(2024, 3, 1), 1),
+        ("u2", datetime(2024, 3, 1), 1),
+        ("u3", datetime(2024, 3, 1), 0),
+    ]
+    audit_rows = [
+        # (user_id, method, path, status_code, action, timestamp) as AuditMiddleware writes them
+        ("u1", "POST", "/v1/shorts/generate", "200", "create", at),
+        ("u1", "POST", "/v1/templates/t1/instantiate/batch", "201", "create", at),
+        ("u2", "POST", "/v1/shorts/generate", "500", "create", at),      # failed: not an event
+        ("u2", "POST", "/v1/schedules", "200", "create", at),
+        ("u2", "POST", "/v1/batch/", "200", "create", at),
+        ("u3", "GET", "/api/videos/v1", "200", "read", at),
+        ("u1", "POST", "/api/billing", "200", "subscription_upgraded", at),  # tracked directly
+    ]
+    data = CohortData.from_records(
+        [(u, created) for u, created, _ in signups],
+        product_events(signups, audit_rows)
+    )
+    engine = CohortEngine(data)
+
+    funnel = engine.funnel(FUNNEL_STAGES, int(datetime(2024, 2, 1).timestamp()))
+    assert [s["users"] for s in funnel["stages"]] == [3, 2, 2, 1]
+    assert funnel["stages"][2]["conversion_pct"] == 100.0
+
+    adoption = AnalyticsService(db_session=None)._compute_feature_adoption(engine)
+    rates = {f["name"]: f["users_who_tried"] for f in adoption["features"]}
+    assert rates["Templates"] == 1
+    assert rates["Scheduling"] == 1
+    assert rates["Collaboration"] == 0
+    assert adoption["total_users"] == 3
+
+
+def test_funnel_is_nested_in_the_signup_cohort():
+    from app.services.analytics_service import FUNNEL_STAGES, product_events
+
+    signups = [("new", datetime(2024, 3, 1), 0), ("old", datetime(2023, 1, 1), 1)]
+    audit_rows = [
+        # Long-time users creating videos in the window aren't new conversions
+        ("old", "POST", "/v1/shorts/generate", "200", "create", datetime(2024, 3, 2)),
+        ("other", "POST", "/v1/shorts/generate", "200", "create", datetime(2024, 3, 2)),
+        ("new", "POST", "/v1/shorts/generate", "200", "create", datetime(2024, 3, 2)),
+    ]
+    engine = CohortEngine(CohortData.from_records(
+        [(u, created) for u, created, _ in signups], product_events(signups, audit_rows)
+    ))
+
+    funnel = engine.funnel(FUNNEL_STAGES, int(datetime(2024, 2, 1).timestamp()))
+    assert [s["users"] for s in funnel["stages"]] == [1, 0, 0, 0]
+    assert all(s["conversion_pct"] <= 100 for s in funnel["stages"])
+
+
+def test_signup_events_are_not_retention_activity():
+    from app.services.analytics_service import SIGNUP_EVENTS, product_events
+
+    signups = [("u1", datetime(2024, 1, 10), 1)]
+    audit_rows = [("u1", "GET", "/api/videos", "200", "read", datetime(2024, 3, 5))]
+    engine = CohortEngine(CohortData.from_records(
+        [(u, created) for u, created, _ in signups], product_events(signups, audit_rows)
+    ))
+
+    result = engine.retention_cohorts(
+        month_index(datetime(2024, 3, 1)), months=3, exclude_events=SIGNUP_EVENTS
+    )
+    assert result["cohorts"][0]["retention"] == {
+        "month_0": 0.0, "month_1": 0.0, "month_2": 100.0
+    }
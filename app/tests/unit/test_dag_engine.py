@@ -0,0 +1,114 @@
+"""
+Tests for the ready-queue DAG engine.
+"""
+import asyncio
+import threading
+import time
+
+from app.workflows.dag_engine import DAGEngine
+from app.workflows.primitives import DAG, ExecutionStatus, Task, TaskStatus
+
+
+def _dag(*tasks):
+    dag = DAG(id="test", name="Test")
+    for task in tasks:
+        dag.add_task(task)
+    return dag
+
+
+class TestCriticalPath:
+
+    def test_lengths_follow_longest_downstream_chain(self):
+        noop = lambda **_: None
+        dag = _dag(
+            Task("a", "A", noop),
+            Task("b", "B", noop, dependencies=["a"], metadata={"estimated_seconds": 5}),
+            Task("c", "C", noop, dependencies=["a"]),
+            Task("d", "D", noop, dependencies=["b", "c"]),
+        )
+        assert dag.get_critical_path_lengths() == {"a": 7.0, "b": 6.0, "c": 2.0, "d": 1.0}
+
+
+class TestDAGEngine:
+
+    def test_results_flow_to_dependents(self):
+        dag = _dag(
+            Task("a", "A", lambda: 2),
+            Task("b", "B", lambda: 3),
+            Task("sum", "Sum", lambda a, b: a + b, dependencies=["a", "b"]),
+        )
+        execution = DAGEngine(max_workers=4).execute_dag(dag)
+
+        assert execution.status == ExecutionStatus.COMPLETED
+        assert execution.results["sum"] == 5
+        assert set(execution.task_timings) == {"a", "b", "sum"}
+        assert execution.task_timings["sum"]["run_seconds"] >= 0
+
+    def test_task_starts_without_waiting_for_slow_sibling(self):
+        started = {}
+
+        def mark(name, delay=0.0):
+            def run(**_):
+                started[name] = time.perf_counter()
+                time.sleep(delay)
+            return run
+
+        dag = _dag(
+            Task("slow", "Slow", mark("slow", 0.3)),
+            Task("fast", "Fast", mark("fast")),
+            Task("after_fast", "After fast", mark("after_fast"), dependencies=["fast"]),
+        )
+        execution = DAGEngine(max_workers=4).execute_dag(dag)
+
+        assert execution.status == ExecutionStatus.COMPLETED
+        assert started["after_fast"] - started["slow"] < 0.2
+
+    def test_critical_path_runs_first(self):
+        order = []
+        lock = threading.Lock()
+
+        def mark(name):
+            def run(**_):
+                with lock:
+                    order.append(name)
+            return run
+
+        dag = _dag(
+            Task("leaf", "Leaf", mark("leaf")),
+            Task("head", "Head", mark("head")),
+            Task("mid", "Mid", mark("mid"), dependencies=["head"]),
+            Task("tail", "Tail", mark("tail"), dependencies=["mid"]),
+        )
+        DAGEngine(max_workers=1).execute_dag(dag)
+
+        assert order == ["head", "mid", "leaf", "tail"]
+
+    def test_failure_stops_new_tasks(self):
+        def boom():
+            raise RuntimeError("boom")
+
+        dag = _dag(
+            Task("bad", "Bad", boom),
+            Task("next", "Next", lambda bad: bad, dependencies=["bad"]),
+        )
+        execution = DAGEngine().execute_dag(dag)
+
+        assert execution.status == ExecutionStatus.FAILED
+        assert execution.errors == {"bad": "boom"}
+        assert dag.get_task("next").status == TaskStatus.PENDING
+
+    def test_async_variant_mixes_coroutines_and_functions(self):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 10
+
+        dag = _dag(
+            Task("fetch", "Fetch", fetch),
+            Task("double", "Double", lambda fetch: fetch * 2, dependencies=["fetch"]),
+        )
+        engine = DAGEngine(max_workers=2)
+        execution = asyncio.run(engine.execute_dag_async(dag))
+        engine.shutdown()
+
+        assert execution.status == ExecutionStatus.COMPLETED
+        assert execution.results["double"] == 20
@@ -0,0 +1,170 @@
+"""
+Tests for the indexed dead letter store and bulk retry.
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.reliability import dead_letter
+from app.reliability.dead_letter import DeadLetterEntry, DeadLetterService, ResolutionStatus
+from app.reliability.dead_letter_store import DeadLetterStore
+from app.reliability.retry import FailureType
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(dead_letter, "_legacy_imported", False)
+    store = DeadLetterStore(str(tmp_path / "dead_letters.db"))
+    yield DeadLetterService(store=store)
+    store.close()
+
+
+def add_entries(service, count, failure_type=FailureType.NETWORK_TIMEOUT, start=None):
+    start = start or datetime(2026, 1, 1)
+    entries = []
+    for i in range(count):
+        entry = DeadLetterEntry(
+            job_id=f"job-{failure_type.value}-{i}",
+            failure_type=failure_type.value,
+            final_error="boom",
+            final_failure_at=start + timedelta(minutes=i)
+        )
+        service._save_entry(entry)
+        entries.append(entry)
+    return entries
+
+
+class TestDeadLetterStore:
+
+    def test_lookup_by_id_and_job(self, service):
+        entry = service.add_to_dead_letter("job-1", "script", FailureType.NETWORK_TIMEOUT, "timed out")
+
+        assert service.get_entry(entry.id).job_id == "job-1"
+        assert service.get_by_job_id("job-1").id == entry.id
+        assert service.get_by_job_id("missing") is None
+
+    def test_pages_cover_every_entry_once(self, service):
+        add_entries(service, 23)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = service.list_page(limit=5, cursor=cursor)
+            seen.extend(e.job_id for e in page)
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen)) == 23
+        assert seen[0] == "job-network_timeout-22"  # newest first
+        assert [e.job_id for e in service.iter_entries(page_size=4, oldest_first=True)][:2] == [
+            "job-network_timeout-0", "job-network_timeout-1"
+        ]
+
+    def test_filters_and_statistics(self, service):
+        add_entries(service, 3, FailureType.NETWORK_TIMEOUT)
+        add_entries(service, 2, FailureType.API_RATE_LIMIT)
+        service.dismiss_entry(service.get_by_job_id("job-network_timeout-0").id)
+
+        timeouts = service.list_entries(failure_type=FailureType.NETWORK_TIMEOUT.value)
+        assert len(timeouts) == 3
+        assert len(service.list_entries(status=ResolutionStatus.DISMISSED)) == 1
+        assert service.get_pending_count() == 4
+
+        stats = service.get_statistics()
+        assert stats["total_entries"] == 5
+        assert stats["by_status"]["dismissed"] == 1
+        assert stats["by_failure_type"] == {"network_timeout": 3, "api_rate_limit": 2}
+
+    def test_invalid_cursor_raises(self, service):
+        with pytest.raises(ValueError):
+            service.list_page(cursor="not-a-cursor")
+
+    def test_legacy_files_imported(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(dead_letter, "_legacy_imported", False)
+        legacy_dir = tmp_path / ".story_assets" / "dead_letters"
+        legacy_dir.mkdir(parents=True)
+        legacy = DeadLetterEntry(job_id="old-job", failure_type="network_timeout")
+        (legacy_dir / f"{legacy.id}.json").write_text(json.dumps(legacy.to_dict()))
+
+        store = DeadLetterStore(str(tmp_path / "dl.db"))
+        service = DeadLetterService(store=store)
+        assert service.get_entry(legacy.id).job_id == "old-job"
+        assert not list(legacy_dir.iterdir())
+        store.close()
+
+
+class TestBulkRetry:
+
+    def test_retries_pending_in_batches(self, service):
+        add_entries(service, 10)
+        service.dismiss_entry(service.get_by_job_id("job-network_timeout-3").id)
+        batches = []
+
+        result = service.bulk_retry(batch_size=4, max_per_second=10_000, enqueue=batches.append)
+
+        assert result["retried"] == 9
+        assert [len(b) for b in batches] == [4, 4, 1]
+        assert batches[0][0]["job_id"] == "job-network_timeout-0"
+        assert service.get_pending_count() == 0
+        assert service.get_statistics()["by_status"]["retried"] == 9
+
+    def test_explicit_ids_skip_resolved_entries(self, service):
+        entries = add_entries(service, 3)
+        service.retry_entry(entries[0].id)
+
+        result = service.bulk_retry(entry_ids=[e.id for e in entries], max_per_second=10_000)
+        assert result["retried"] == 2
+        assert result["skipped"] == 1
+
+    def test_failed_enqueue_leaves_batch_pending(self, service):
+        add_entries(service, 6)
+        calls = []
+
+        def enqueue(jobs):
+            calls.append(jobs)
+            if len(calls) == 2:
+                raise RuntimeError("queue unavailable")
+
+        result = service.bulk_retry(batch_size=3, max_per_second=10_000, enqueue=enqueue)
+        assert result["retried"] == 3
+        assert result["errors"] == ["queue unavailable"]
+        assert service.get_pending_count() == 3
+
+    def test_rate_limit_paces_batches(self, service, monkeypatch):
+        add_entries(service, 6)
+        sleeps = []
+        monkeypatch.setattr(dead_letter.time, "sleep", sleeps.append)
+
+        service.bulk_retry(batch_size=2, max_per_second=4)
+        # Batch n starts n * batch_size / max_per_second after the first
+        assert sleeps == [pytest.approx(0.5, abs=0.05), pytest.approx(1.0, abs=0.05)]
+
+    def test_rejects_non_positive_batch_size(self, service):
+        with pytest.raises(ValueError):
+            service.bulk_retry(batch_size=0)
+
+    def test_route_returns_retried_jobs(self, service, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.api import admin_routes
+
+        add_entries(service, 3)
+        monkeypatch.setattr(admin_routes, "dead_letter_service", service)
+        app = FastAPI()
+        app.include_router(admin_routes.router)
+        client = TestClient(app)
+
+        response = client.post(
+            "/v1/admin/dead-letter/retry", json={"batch_size": 2, "max_per_second": 10_000}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["retried"] == 3
+        assert [job["job_id"] for job in body["jobs"]] == [
+            "job-network_timeout-0", "job-network_timeout-1", "job-network_timeout-2"
+        ]
+
+        for invalid in ({"batch_size": 0}, {"max_per_second": 0}):
+            assert client.post("/v1/admin/dead-letter/retry", json=invalid).status_code == 422
@@ -0,0 +1,144 @@
+"""
+Unit Tests for GraphQL DataLoaders and query limits
+"""
+import asyncio
+
+import pytest
+
+from app.graphql.dataloaders import DataLoader, create_loaders
+
+
+def test_loads_in_one_tick_are_batched_and_deduped():
+    calls = []
+
+    async def batch(keys):
+        calls.append(list(keys))
+        return [f"user:{k}" for k in keys]
+
+    async def run():
+        loader = DataLoader(batch)
+
+        async def resolve(key, hops=0):
+            # Resolvers reach the loader after awaiting their own parents
+            for _ in range(hops):
+                await asyncio.sleep(0)
+            return await loader.load(key)
+
+        results = await asyncio.gather(
+            resolve("a"), resolve("b"), resolve("a"), resolve("c", hops=1)
+        )
+        again = await loader.load("b")
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert results == ["user:a", "user:b", "user:a", "user:c"]
+    assert again == "user:b"
+    assert calls == [["a", "b", "c"]]
+
+
+def test_dict_results_errors_and_max_batch_size():
+    calls = []
+
+    async def batch(keys):
+        calls.append(list(keys))
+        return {k: (ValueError(k) if k == "bad" else k.upper()) for k in keys if k != "missing"}
+
+    async def run():
+        loader = DataLoader(batch, max_batch_size=2)
+        return await asyncio.gather(
+            loader.load("x"), loader.load("missing"), loader.load("bad"),
+            return_exceptions=True
+        )
+
+    x, missing, bad = asyncio.run(run())
+    assert x == "X"
+    assert missing is None
+    assert isinstance(bad, ValueError)
+    assert calls == [["x", "missing"], ["bad"]]
+
+
+def test_service_fallbacks_without_batch_api():
+    class Videos:
+        def __init__(self):
+            self.calls = []
+
+        async def get_video(self, video_id):
+            self.calls.append(video_id)
+            return {"id": video_id}
+
+        async def get_videos(self, user_id, page, limit):
+            return [{"id": f"{user_id}-{i}"} for i in range(limit)]
+
+    class Users:
+        def __init__(self):
+            self.batches = []
+
+        def get_users_by_ids(self, ids):
+            self.batches.append(ids)
+            return {i: {"id": i} for i in ids}
+
+    videos, users = Videos(), Users()
+
+    async def run():
+        loaders = create_loaders(user_service=users, video_service=videos)
+        return await asyncio.gather(
+            loaders["video_loader"].load("v1"),
+            loaders["user_loader"].load("u1"),
+            loaders["user_loader"].load("u2"),
+            loaders["user_videos_loader"].load(("u1", 2)),
+        )
+
+    v1, u1, u2, u1_videos = asyncio.run(run())
+    assert v1 == {"id": "v1"}
+    assert users.batches == [["u1", "u2"]]
+    assert [v["id"] for v in u1_videos] == ["u1-0", "u1-1"]
+
+
+def test_depth_and_complexity():
+    graphql = pytest.importorskip("graphql")
+    from app.graphql.limits import selection_complexity, selection_depth
+
+    document = graphql.parse("""
+        query {
+            videos(limit: 10) {
+                edges { node { id user { ...U } } }
+                totalCount
+            }
+        }
+        fragment U on User { id videos(limit: 5) { id } }
+    """)
+    operation = document.definitions[0]
+    fragments = {d.name.value: d for d in document.definitions[1:]}
+
+    assert selection_depth(operation.selection_set, fragments) == 6
+    # videos x10: edges, node, id, user(id, videos x5 (id)) + totalCount
+    assert selection_complexity(operation.selection_set, fragments) == 10 * (1 + 1 + 1 + 1 + 1 + 1 + 5 * 2 + 1)
+
+
+def test_omitted_limit_uses_schema_default():
+    graphql = pytest.importorskip("graphql")
+    from app.graphql.limits import complexity_limit_rule, selection_complexity
+
+    schema = graphql.build_schema("""
+        type Query { videos(limit: Int = 20): [Video!]! me: User! }
+        type User { id: ID! videos(limit: Int = 10): [Video!]! }
+        type Video { id: ID! user: User! }
+    """)
+    document = graphql.parse("""
+        query { videos { id user { ...U } } me { id } }
+        fragment U on User { videos { id } }
+    """)
+    operation = document.definitions[0]
+    fragments = {"U": document.definitions[1]}
+
+    # Without the schema the sizes are unknown
+    assert selection_complexity(operation.selection_set, fragments) == 1 * (1 + 1 + 1 * (1 + 1 * 2)) + 2
+    # videos x20: id, user(videos x10 (id)) + me(id)
+    cost = selection_complexity(
+        operation.selection_set, fragments, parent_type=schema.query_type, schema=schema
+    )
+    assert cost == 20 * (1 + 1 + 1 * (1 + 10 * 2)) + 2
+
+    errors = graphql.validate(schema, document, [complexity_limit_rule(cost - 1)])
+    assert len(errors) == 1 and "complexity" in errors[0].message
+    assert graphql.validate(schema, document, [complexity_limit_rule(cost)]) == []
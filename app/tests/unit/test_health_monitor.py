@@ -0,0 +1,96 @@
+"""
+Tests for the background-refreshed health snapshot.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.observability.health import HealthMonitor, HealthStatus
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monkeypatch.setattr(HealthMonitor, "_instance", None)
+    monitor = HealthMonitor()
+    yield monitor
+    monitor.stop()
+
+
+def test_due_checks_run_concurrently(monitor):
+    async def slow_async():
+        await asyncio.sleep(0.2)
+        return {"healthy": True}
+
+    def slow_sync():
+        time.sleep(0.2)
+        return {"healthy": True}
+
+    monitor.register("a", slow_async)
+    monitor.register("b", slow_sync)
+
+    start = time.perf_counter()
+    health = asyncio.run(monitor.check_all())
+    assert time.perf_counter() - start < 0.35
+    assert health.status == HealthStatus.HEALTHY
+
+
+def test_sync_check_respects_timeout(monitor):
+    monitor.register("hung", lambda: time.sleep(1) or {"healthy": True}, timeout=0.1)
+
+    async def timed():
+        start = time.perf_counter()
+        health = await monitor.check_all()
+        return health, time.perf_counter() - start
+
+    health, elapsed = asyncio.run(timed())
+    assert elapsed < 0.5
+    assert health.components[0].message == "Health check timed out"
+    assert health.status == HealthStatus.UNHEALTHY
+
+
+def test_refresh_only_runs_due_checks(monitor):
+    calls = {"fast": 0, "slow": 0}
+
+    def counter(name):
+        def check():
+            calls[name] += 1
+            return {"healthy": True}
+        return check
+
+    monitor.register("fast", counter("fast"), interval=0)
+    monitor.register("slow", counter("slow"), interval=3600)
+
+    for _ in range(3):
+        asyncio.run(monitor.refresh())
+    assert calls == {"fast": 3, "slow": 1}
+
+
+def test_probes_read_snapshot_and_report_staleness(monitor):
+    calls = []
+    monitor.register("db", lambda: calls.append(1) or {"healthy": True}, interval=3600)
+    monitor.tick = 0.01
+
+    monitor.start()
+    deadline = time.time() + 2
+    while monitor.snapshot() is None and time.time() < deadline:
+        time.sleep(0.01)
+
+    for _ in range(50):
+        assert monitor.readiness()["status"] == "ready"
+        assert monitor.liveness()["stale"] is False
+    assert len(calls) == 1
+
+    monitor.stale_after = 0
+    readiness = monitor.readiness()
+    assert readiness["status"] == "not_ready"
+    assert readiness["stale"] is True
+
+
+def test_unhealthy_snapshot_is_not_ready(monitor):
+    monitor.register("broken", lambda: 1 / 0)
+    asyncio.run(monitor.check_all())
+
+    readiness = monitor.readiness()
+    assert readiness["status"] == "not_ready"
+    assert readiness["health"] == "unhealthy"
@@ -0,0 +1,90 @@
+"""
+Tests for compiled i18n catalogs and Accept-Language negotiation.
+"""
+import pytest
+
+from app.services.i18n_service import (
+    CompiledMessage,
+    I18nService,
+    TRANSLATIONS,
+    negotiate_language,
+)
+
+
+@pytest.fixture
+def i18n():
+    return I18nService()
+
+
+class TestCompiledMessage:
+
+    def test_static_message(self):
+        message = CompiledMessage("Publish")
+        assert message.static
+        assert message.render({"unused": 1}) == "Publish"
+
+    @pytest.mark.parametrize("template,params", [
+        ("Video published to {platform}!", {"platform": "YouTube"}),
+        ("{count} of {total:>5}", {"count": 3, "total": 10}),
+        ("Hi {user.name} {n!r}", {"user": type("U", (), {"name": "Ana"})(), "n": "x"}),
+        ("{{literal}} {x}", {"x": 1}),
+    ])
+    def test_render_matches_str_format(self, template, params):
+        assert CompiledMessage(template).render(params) == template.format(**params)
+
+    def test_missing_param_raises_key_error(self):
+        with pytest.raises(KeyError):
+            CompiledMessage("{platform}").render({"other": 1})
+
+
+class TestTranslate:
+
+    def test_matches_catalog_for_every_key(self, i18n):
+        for language, messages in TRANSLATIONS.items():
+            for key, text in messages.items():
+                assert i18n.translate(key, language) == text
+
+    def test_params_and_fallbacks(self, i18n):
+        assert i18n.t("video_published", "de", platform="YouTube") == "Video auf YouTube veröffentlicht!"
+        assert i18n.translate("welcome", "xx") == TRANSLATIONS["en"]["welcome"]
+        assert i18n.translate("no_such_key", "fr") == "no_such_key"
+        # Missing parameter: template returned unformatted
+        assert i18n.translate("video_published", "en", {"count": 1}) == "Video published to {platform}!"
+
+    def test_translate_many(self, i18n):
+        result = i18n.translate_many(
+            ["dashboard", "videos_created_count", "missing"], "es",
+            params={"videos_created_count": {"count": 3}}
+        )
+        assert result == {
+            "dashboard": "Panel de Control",
+            "videos_created_count": "Has creado 3 videos",
+            "missing": "missing",
+        }
+
+    def test_custom_catalogs(self):
+        service = I18nService({"en": {"hello": "Hello {name}"}})
+        assert service.t("hello", "en", name="Bo") == "Hello Bo"
+
+
+class TestNegotiation:
+
+    @pytest.mark.parametrize("header,expected", [
+        ("fr-FR,fr;q=0.9,en;q=0.8", "fr"),
+        ("en;q=0.5,de;q=0.9", "de"),
+        ("zh-CN,zh;q=0.9", "zh-CN"),
+        ("zh-TW", "zh-CN"),
+        ("xx,ja;q=0.1", "ja"),
+        ("de;q=0,es;q=0.2", "es"),
+        ("xx-YY", "en"),
+        ("", "en"),
+    ])
+    def test_negotiate(self, i18n, header, expected):
+        assert i18n.detect_language(header) == expected
+
+    def test_cached_per_header(self, i18n):
+        negotiate_language.cache_clear()
+        for _ in range(3):
+            i18n.detect_language("pt-BR,pt;q=0.9")
+        info = negotiate_language.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
@@ -0,0 +1,84 @@
+"""
+Tests for the creative memory index.
+"""
+from dataclasses import dataclass
+
+from app.memory.index import MemoryIndex
+
+
+@dataclass
+class Entry:
+    id: str
+    memory_type: str
+    platform: str
+    score: float
+    reuse_count: int = 0
+
+
+class TestMemoryIndex:
+
+    def test_top_orders_by_score_then_insertion(self):
+        index = MemoryIndex()
+        index.add(Entry("a", "hook", "tiktok", 0.90))
+        index.add(Entry("b", "hook", "tiktok", 0.95))
+        index.add(Entry("c", "hook", "tiktok", 0.90))
+
+        assert [e.id for e in index.top("hook", "tiktok", 3)] == ["b", "a", "c"]
+        assert [e.id for e in index.top("hook", "tiktok", 1)] == ["b"]
+
+    def test_platform_and_type_filters(self):
+        index = MemoryIndex()
+        index.add(Entry("a", "hook", "tiktok", 0.90))
+        index.add(Entry("b", "hook", "youtube", 0.99))
+        index.add(Entry("c", "persona", "tiktok", 0.97))
+
+        assert [e.id for e in index.top("hook", "tiktok")] == ["a"]
+        assert [e.id for e in index.top("hook")] == ["b", "a"]
+        assert index.top("hook", "instagram") == []
+        assert index.count() == 3
+        assert index.count("hook") == 2
+
+    def test_bounded_per_platform_evicts_lowest(self):
+        index = MemoryIndex(max_per_platform=2)
+        index.add(Entry("a", "hook", "tiktok", 0.90))
+        index.add(Entry("b", "hook", "tiktok", 0.95))
+        index.add(Entry("other", "hook", "youtube", 0.86))
+
+        evicted = index.add(Entry("c", "hook", "tiktok", 0.92))
+
+        assert [e.id for e in evicted] == ["a"]
+        assert index.get("a") is None
+        assert [e.id for e in index.top("hook")] == ["b", "c", "other"]
+
+        # A newcomer below the floor is evicted straight away
+        evicted = index.add(Entry("d", "hook", "tiktok", 0.87))
+        assert [e.id for e in evicted] == ["d"]
+        assert len(index) == 3
+
+    def test_stats_follow_adds_removes_and_reuses(self):
+        index = MemoryIndex()
+        a = Entry("a", "hook", "tiktok", 0.9)
+        index.add(a)
+        index.add(Entry("b", "hook", "tiktok", 1.0, reuse_count=2))
+
+        index.record_reuse(a)
+        assert a.reuse_count == 1
+        assert index.total_reuses == 3
+        assert abs(index.average_score("hook") - 0.95) < 1e-9
+
+        index.remove("b")
+        assert index.total_reuses == 1
+        assert abs(index.average_score("hook") - 0.9) < 1e-9
+        assert index.average_score("persona") == 0
+
+        index.clear()
+        assert len(index) == 0
+        assert index.top("hook") == []
+
+    def test_readding_an_id_replaces_it(self):
+        index = MemoryIndex()
+        index.add(Entry("a", "hook", "tiktok", 0.9))
+        index.add(Entry("a", "hook", "tiktok", 0.99))
+
+        assert index.count() == 1
+        assert index.top("hook")[0].score == 0.99
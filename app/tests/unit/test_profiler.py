@@ -0,0 +1,203 @@
+"""
+Tests for the per-stage latency profiler.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import time
+
+import pytest
+
+from app.core.profiling import LatencyHistogram, StageProfiler, profiler as global_profiler
+from app.core.tracing import get_current_span
+
+
+@pytest.fixture
+def profiler():
+    return StageProfiler(sample_rate=1.0)
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.5, 1.0))
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(10):
+        histogram.observe(0.8)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) <= 0.1
+    assert 0.5 < histogram.percentile(95) <= 0.8
+    assert histogram.percentile(100) == pytest.approx(0.8)
+    assert histogram.summary()["max"] == pytest.approx(0.8)
+
+
+def test_nested_spans_breakdown(profiler):
+    with profiler.span("job", kind="job", job_id="job-1"):
+        with profiler.span("story"):
+            with profiler.span("vertex.generate_content", kind="llm"):
+                time.sleep(0.02)
+        with profiler.span("audio"):
+            for _ in range(3):
+                with profiler.span("tts.generate_voice", kind="tts"):
+                    time.sleep(0.005)
+
+    assert get_current_span() is None
+    breakdown = profiler.breakdown("job-1")
+    job = breakdown["frames"][0]
+    assert job["name"] == "job"
+    names = [f["name"] for f in job["children"]]
+    assert names == ["story", "audio"]
+
+    story = job["children"][0]
+    llm = story["children"][0]
+    assert llm["total_ms"] >= 20
+    assert story["self_ms"] == pytest.approx(story["total_ms"] - llm["total_ms"], abs=0.01)
+
+    tts = job["children"][1]["children"][0]
+    assert tts["count"] == 3
+    assert breakdown["self_ms_by_kind"]["llm"] >= 20
+
+    stats = profiler.histograms()
+    assert stats["tts/tts.generate_voice"]["count"] == 3
+    assert stats["job/job"]["count"] == 1
+
+
+def test_unsampled_jobs_still_feed_histograms():
+    profiler = StageProfiler(sample_rate=0.0)
+    with profiler.span("job", kind="job", job_id="job-2") as span:
+        with profiler.span("story") as child:
+            assert child.sampled is False
+        assert span.children == []
+
+    assert profiler.breakdown("job-2") is None
+    assert profiler.histograms()["stage/story"]["count"] == 1
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+    with profiler.span("job", job_id="job-3") as span:
+        assert span is None
+    assert profiler.histograms() == {}
+
+
+def test_profiled_sync_and_async(profiler):
+    @profiler.profiled(kind="db")
+    def save(x):
+        return x * 2
+
+    @profiler.profiled("fetch", kind="llm")
+    async def fetch():
+        await asyncio.sleep(0)
+        return "ok"
+
+    assert save(2) == 4
+    assert asyncio.run(fetch()) == "ok"
+    stats = profiler.histograms()
+    assert any(key.startswith("db/") and key.endswith("save") for key in stats)
+    assert stats["llm/fetch"]["count"] == 1
+
+
+def test_error_is_recorded(profiler):
+    with pytest.raises(RuntimeError):
+        with profiler.span("job", kind="job", job_id="job-4"):
+            with profiler.span("video"):
+                raise RuntimeError("veo down")
+
+    (root,) = profiler._jobs["job-4"]
+    assert root.children[0].attrs == {"error": "RuntimeError"}
+    assert root.attrs == {"error": "RuntimeError"}
+    assert get_current_span() is None
+
+
+def test_profiled_client_and_stream(profiler):
+    class Client:
+        model = "test"
+
+        def generate_content(self, prompt):
+            return prompt.upper()
+
+        def stream_content(self, prompt):
+            for word in prompt.split():
+                time.sleep(0.005)
+                yield word
+
+    client = profiler.wrap_client(Client(), "llm", "vertex", ("generate_content", "stream_content"))
+    assert client.model == "test"
+
+    with profiler.span("job", kind="job", job_id="job-5"):
+        assert client.generate_content("hi") == "HI"
+        with profiler.span("story"):
+            stream = client.stream_content("a b c")
+            # The open stream span must not capture work done by the consumer
+            assert get_current_span().name == "story"
+            assert list(stream) == ["a", "b", "c"]
+
+    stats = profiler.histograms()
+    assert stats["llm/vertex.generate_content"]["count"] == 1
+    assert stats["llm/vertex.stream_content"]["sum"] >= 0.015
+    story = profiler.breakdown("job-5")["frames"][0]["children"]
+    assert {f["name"] for f in story} == {"story", "vertex.generate_content"}
+
+
+def test_thread_pool_children_attach_with_copied_context(profiler):
+    def work():
+        with profiler.span("scene", kind="tts"):
+            time.sleep(0.01)
+
+    with profiler.span("job", kind="job", job_id="job-6"):
+        with profiler.span("audio"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, work) for _ in range(3)]
+                for future in futures:
+                    future.result()
+
+    audio = profiler.breakdown("job-6")["frames"][0]["children"][0]
+    assert audio["children"][0]["count"] == 3
+    # Parallel children can exceed the parent's wall time; self time floors at 0
+    assert audio["self_ms"] >= 0
+
+
+def test_folded_and_prometheus_output(profiler):
+    with profiler.span("job", kind="job", job_id="job-7"):
+        with profiler.span("critic"):
+            time.sleep(0.002)
+
+    folded = profiler.folded("job-7").splitlines()
+    stacks = {line.rsplit(" ", 1)[0] for line in folded}
+    assert "job;critic" in stacks
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in folded)
+
+    text = profiler.prometheus_text()
+    assert "# TYPE stage_latency_seconds histogram" in text
+    assert 'stage_latency_seconds_bucket{kind="stage",name="critic",le="+Inf"} 1' in text
+    assert 'stage_latency_seconds_count{kind="job",name="job"} 1' in text
+
+
+def test_job_retention_is_bounded():
+    profiler = StageProfiler(max_jobs=2)
+    for i in range(3):
+        with profiler.span("job", kind="job", job_id=f"job-{i}"):
+            pass
+    assert profiler.job_ids() == ["job-2", "job-1"]
+    assert profiler.breakdown("job-0") is None
+
+
+def test_engine_execute_is_profiled():
+    from app.engines.base import BaseEngine, EngineInput, EngineOutput
+
+    class EchoEngine(BaseEngine):
+        def validate_input(self, input_data):
+            return {"valid": True}
+
+        async def execute(self, input_data):
+            return EngineOutput(job_id=input_data.job_id, engine_id=self.engine_id)
+
+        def validate_output(self, output):
+            return {"valid": True}
+
+    global_profiler.reset()
+    engine = EchoEngine("echo", "test")
+    output = asyncio.run(engine.execute(EngineInput(job_id="j", engine_id="echo")))
+    assert output.job_id == "j"
+    assert global_profiler.histograms()["engine/EchoEngine.execute"]["count"] == 1
+    global_profiler.reset()
@@ -0,0 +1,68 @@
+"""
+Unit Tests for precompiled RBAC permission masks
+"""
+import pytest
+
+from app.auth.permissions import (
+    check_permission_mask, expand_permission_mask, expand_permissions,
+    get_role_mask, mask_to_permissions, Permission as AuthPermission
+)
+from app.services.rbac_service import RBACService, Permission
+
+
+def test_check_permission_follows_role_changes():
+    rbac = RBACService()
+    assert not rbac.check_permission("u1", Permission.VIDEO_EDIT.value)
+
+    rbac.assign_role("u1", "viewer", "org1")
+    assert rbac.check_permission("u1", Permission.VIDEO_VIEW.value)
+    assert not rbac.check_permission("u1", Permission.VIDEO_EDIT.value)
+
+    rbac.assign_role("u1", "editor", "org1")
+    assert rbac.check_permission("u1", Permission.VIDEO_EDIT.value)
+
+    rbac.remove_role("u1", "editor")
+    assert not rbac.check_permission("u1", Permission.VIDEO_EDIT.value)
+    assert not rbac.check_permission("u1", "no.such.permission")
+
+
+def test_custom_role_edit_invalidates_holders():
+    rbac = RBACService()
+    role = rbac.create_custom_role("org1", "Billing", [Permission.BILLING_VIEW.value])
+    rbac.assign_role("u1", role["role_id"], "org1")
+    assert rbac.get_user_permissions("u1") == [Permission.BILLING_VIEW.value]
+
+    rbac.update_custom_role(
+        role["role_id"],
+        permissions=[Permission.BILLING_VIEW.value, Permission.BILLING_MANAGE.value]
+    )
+    assert rbac.check_permission("u1", Permission.BILLING_MANAGE.value)
+    assert rbac.get_user_permissions("u1") == sorted(
+        [Permission.BILLING_VIEW.value, Permission.BILLING_MANAGE.value]
+    )
+
+    with pytest.raises(ValueError):
+        rbac.update_custom_role(role["role_id"], permissions=["bogus"])
+
+
+def test_organization_filter_uses_separate_mask():
+    rbac = RBACService()
+    role = rbac.create_custom_role("org2", "Hooks", [Permission.WEBHOOK_MANAGE.value])
+    rbac.assign_role("u1", role["role_id"], "org2")
+    rbac.assign_role("u1", "viewer", "org1")
+
+    assert Permission.WEBHOOK_MANAGE.value in rbac.get_user_permissions("u1")
+    assert Permission.WEBHOOK_MANAGE.value not in rbac.get_user_permissions("u1", "org1")
+
+
+def test_auth_permission_masks_match_sets():
+    key_perms = ["readonly", AuthPermission.JOBS_WRITE.value, "read"]
+    mask = expand_permission_mask(key_perms)
+
+    expanded = expand_permissions(key_perms)
+    assert mask_to_permissions(mask) == expanded - {"read"}
+
+    creator = get_role_mask("creator") & mask
+    assert check_permission_mask(creator, AuthPermission.JOBS_WRITE.value)
+    assert not check_permission_mask(creator, AuthPermission.PROJECTS_WRITE.value)
+    assert check_permission_mask(get_role_mask("admin"), AuthPermission.ADMIN_USERS.value)
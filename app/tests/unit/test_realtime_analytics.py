@@ -0,0 +1,98 @@
+"""
+Unit Tests for the shared RealtimeAnalytics ticker
+"""
+import asyncio
+
+import pytest
+
+from app.services.realtime_analytics import RealtimeAnalytics
+
+
+class FakeWebSocketManager:
+    def __init__(self, failing=()):
+        self.sent = []
+        self.failing = set(failing)
+
+    async def send_json(self, user_id, payload):
+        if user_id in self.failing:
+            raise ConnectionError("socket closed")
+        self.sent.append((user_id, payload))
+
+
+class CountingAnalytics(RealtimeAnalytics):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetches = 0
+
+    async def _get_active_users(self) -> int:
+        self.fetches += 1
+        return 450
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_each_metric_fetched_once_per_tick():
+    async def scenario():
+        ws = FakeWebSocketManager()
+        realtime = CountingAnalytics(ws, None, update_interval=3600)
+        for i in range(20):
+            realtime.active_subscriptions[f"user_{i}"] = {"active_users", "system_health"}
+        await realtime.tick()
+        return realtime, ws
+
+    realtime, ws = _run(scenario())
+    assert realtime.fetches == 1
+    assert len(ws.sent) == 20
+    assert set(ws.sent[0][1]["data"]) == {"active_users", "system_health"}
+
+
+def test_fan_out_sends_only_subscribed_subset():
+    async def scenario():
+        ws = FakeWebSocketManager()
+        realtime = RealtimeAnalytics(ws, None)
+        realtime.active_subscriptions["a"] = {"revenue_today"}
+        realtime.active_subscriptions["b"] = {"system_health", "conversion_rate"}
+        await realtime.tick()
+        return dict((user_id, payload["data"]) for user_id, payload in ws.sent)
+
+    sent = _run(scenario())
+    assert set(sent["a"]) == {"revenue_today"}
+    assert sent["a"]["revenue_today"]["formatted"] == "$15,420.50"
+    assert set(sent["b"]) == {"system_health", "conversion_rate"}
+    assert sent["b"]["system_health"]["status"] == "Excellent"
+
+
+def test_pushed_delta_skips_fetcher():
+    async def scenario():
+        ws = FakeWebSocketManager()
+        realtime = CountingAnalytics(ws, None)
+        realtime.active_subscriptions["a"] = {"active_users"}
+        await realtime.tick()
+        realtime.push_metric_delta("active_users", 5)
+        await realtime.tick()
+        return realtime, ws
+
+    realtime, ws = _run(scenario())
+    assert realtime.fetches == 1
+    assert ws.sent[-1][1]["data"]["active_users"]["value"] == 455
+
+
+def test_failed_send_drops_subscriber():
+    async def scenario():
+        ws = FakeWebSocketManager(failing={"gone"})
+        realtime = RealtimeAnalytics(ws, None)
+        realtime.active_subscriptions["gone"] = {"active_users"}
+        realtime.active_subscriptions["here"] = {"active_users"}
+        await realtime.tick()
+        return realtime
+
+    realtime = _run(scenario())
+    assert set(realtime.active_subscriptions) == {"here"}
+
+
+def test_invalid_metric_rejected():
+    realtime = RealtimeAnalytics(FakeWebSocketManager(), None)
+    with pytest.raises(ValueError):
+        realtime.push_metric("nope", 1)
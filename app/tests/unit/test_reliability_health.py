@@ -0,0 +1,164 @@
+"""
+Tests for the scheduled component health checks and readiness probes.
+"""
+import threading
+import time
+
+import pytest
+
+from app.reliability.health import ComponentHealth, HealthCheckService, HealthStatus
+
+
+def _check(name, status=HealthStatus.HEALTHY, delay=0.0, calls=None):
+    def run():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        return ComponentHealth(name=name, status=status)
+    return run
+
+
+@pytest.fixture
+def service(tmp_path):
+    # A long tick so the background refresher never races the test's own refreshes
+    service = HealthCheckService(tick=3600)
+    service.storage_path = str(tmp_path)
+    for check in service.checks:
+        check.fn = _check(check.name)
+    yield service
+    service.stop(timeout=0)
+
+
+def _set(service, name, fn, timeout=None):
+    check = next(c for c in service.checks if c.name == name)
+    check.fn = fn
+    if timeout is not None:
+        check.timeout = timeout
+    return check
+
+
+def _component(result, name):
+    return next(c for c in result["components"] if c["name"] == name)
+
+
+def test_checks_run_concurrently(service):
+    for check in service.checks:
+        check.fn = _check(check.name, delay=0.2)
+
+    start = time.perf_counter()
+    result = service.refresh(force=True)
+    assert time.perf_counter() - start < 0.5
+    assert result["status"] == "healthy"
+    assert len(result["components"]) == len(service.checks)
+
+
+def test_slow_check_times_out_without_delaying_others(service):
+    release = threading.Event()
+    _set(service, "database", lambda: release.wait(5), timeout=0.1)
+
+    start = time.perf_counter()
+    result = service.refresh(force=True)
+    release.set()
+
+    assert time.perf_counter() - start < 0.5
+    database = _component(result, "database")
+    assert database["status"] == "unhealthy"
+    assert "timed out after 0.1s" in database["message"]
+    assert _component(result, "storage")["status"] == "healthy"
+    assert result["status"] == "unhealthy"
+
+
+def test_hung_check_is_not_resubmitted(service):
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+        return ComponentHealth(name="database", status=HealthStatus.HEALTHY)
+
+    check = _set(service, "database", hung, timeout=0.05)
+    service.refresh(force=True)
+    second = service.refresh(force=True)
+
+    assert len(calls) == 1
+    assert "timed out" in _component(second, "database")["message"]
+
+    release.set()
+    check.inflight.result(timeout=5)
+    third = service.refresh(force=True)
+    assert len(calls) == 2
+    assert _component(third, "database")["status"] == "healthy"
+
+
+def test_only_due_checks_are_refreshed(service):
+    calls = []
+    for check in service.checks:
+        check.fn = _check(check.name, calls=calls)
+    _set(service, "memory", _check("memory", calls=calls)).interval = 0
+
+    service.refresh()
+    service.refresh()
+    assert calls.count("memory") == 2
+    assert calls.count("disk") == 1
+
+
+def test_failing_check_is_reported_unhealthy(service):
+    _set(service, "job_queue", lambda: 1 / 0)
+
+    result = service.refresh(force=True)
+    job_queue = _component(result, "job_queue")
+    assert job_queue["status"] == "unhealthy"
+    assert job_queue["message"].startswith("Check failed")
+
+
+def test_snapshot_staleness_fails_readiness(service, monkeypatch):
+    monkeypatch.setattr(service, "start", lambda: None)
+    service.refresh(force=True)
+
+    assert service.check_readiness()["status"] == "ready"
+    assert service.check_liveness()["stale"] is False
+
+    service.stale_after = 0
+    readiness = service.check_readiness()
+    assert readiness["status"] == "not_ready"
+    assert readiness["stale"] is True
+    assert readiness["checks"]["storage"] is True
+
+
+def test_unhealthy_storage_fails_readiness(service, monkeypatch):
+    monkeypatch.setattr(service, "start", lambda: None)
+    _set(service, "storage", _check("storage", HealthStatus.UNHEALTHY))
+    service.refresh(force=True)
+
+    readiness = service.check_readiness()
+    assert readiness["status"] == "not_ready"
+    assert readiness["checks"]["storage"] is False
+
+
+def test_readiness_endpoints_return_503_when_not_ready(service, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import admin_routes, observability_routes
+
+    monkeypatch.setattr(service, "start", lambda: None)
+    monkeypatch.setattr(admin_routes, "health_service", service)
+    readiness = {"status": "ready"}
+    monkeypatch.setattr(
+        observability_routes.health_monitor, "readiness", lambda: dict(readiness)
+    )
+    app = FastAPI()
+    app.include_router(admin_routes.router)
+    app.include_router(observability_routes.router)
+    client = TestClient(app)
+
+    service.refresh(force=True)
+    assert client.get("/v1/admin/health/ready").status_code == 200
+    assert client.get("/v1/health/ready").status_code == 200
+
+    service.stale_after = 0
+    readiness["status"] = "not_ready"
+    response = client.get("/v1/admin/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert client.get("/v1/health/ready").status_code == 503
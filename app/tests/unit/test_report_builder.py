@@ -0,0 +1,216 @@
+"""
+Unit Tests for incremental report execution and streaming exports
+"""
+import asyncio
+import io
+import json
+from datetime import date, datetime, timedelta
+
+from app.services.report_aggregation import date_buckets, write_csv_stream, write_json_stream
+from app.services.report_builder import DataExportService, ReportBuilder
+
+
+def _days(query):
+    bounds = {f["operator"]: date.fromisoformat(f["value"]) for f in query["filters"] if f["field"] == "date"}
+    return [day.isoformat() for day in date_buckets(bounds[">="], bounds["<="])]
+
+
+class _Builder(ReportBuilder):
+    """Serves one youtube and one instagram row per requested day."""
+
+    def __init__(self, export_service=None):
+        super().__init__(analytics_service=None, export_service=export_service, scheduler=None)
+        self.queries = []
+
+    async def _execute_report_query(self, query):
+        self.queries.append(query)
+        if not any(f["operator"] == ">=" for f in query["filters"] if f["field"] == "date"):
+            return [{"platform": "youtube", "views": 100}]
+        rows = []
+        for day in _days(query):
+            rows.append({"date": day, "platform": "youtube", "views": 100, "engagement": 10.0})
+            rows.append({"date": day, "platform": "instagram", "views": 50, "engagement": 20.0})
+        return rows
+
+
+def _report(builder, dimensions):
+    return builder.create_report("u1", {
+        "name": "Perf",
+        "metrics": ["views", "engagement"],
+        "dimensions": dimensions,
+        "orderBy": {"field": "views", "direction": "desc"},
+    })["report_id"]
+
+
+def _range(days_ago_start, days_ago_end):
+    today = datetime.utcnow().date()
+    return {
+        "start": (today - timedelta(days=days_ago_start)).isoformat(),
+        "end": (today - timedelta(days=days_ago_end)).isoformat(),
+    }
+
+
+def test_rerun_only_computes_new_buckets():
+    builder = _Builder()
+    report_id = _report(builder, ["platform"])
+
+    first = asyncio.run(builder.generate_report(report_id, _range(5, 1)))
+    assert first["buckets"] == {"computed": 5, "cached": 0}
+    # One query grouped by day for all five buckets
+    (query,) = builder.queries
+    assert query["dimensions"] == ["platform", "date"]
+    assert first["data"] == [
+        {"platform": "youtube", "views": 500, "engagement": 10.0},
+        {"platform": "instagram", "views": 250, "engagement": 20.0},
+    ]
+    assert first["summary"]["views"]["count"] == 10
+
+    second = asyncio.run(builder.generate_report(report_id, _range(6, 0)))
+    # Day -6 is new and today is never cached
+    assert second["buckets"] == {"computed": 2, "cached": 5}
+    assert second["data"][0]["views"] == 700
+    assert len(builder.queries) == 3
+
+
+def test_streamed_rows_and_exports():
+    builder = _Builder()
+    report_id = _report(builder, ["date", "platform"])
+
+    async def collect():
+        return [row async for row in builder.iter_report_rows(report_id, _range(2, 1))]
+
+    rows = asyncio.run(collect())
+    assert len(rows) == 4
+    assert rows == asyncio.run(builder.generate_report(report_id, _range(2, 1)))["data"]
+
+    csv_out = io.StringIO()
+    assert asyncio.run(write_csv_stream(csv_out, iter(rows), chunk_rows=3)) == 4
+    lines = csv_out.getvalue().strip().splitlines()
+    assert lines[0] == "date,platform,views,engagement"
+    assert len(lines) == 5
+
+    json_out = io.StringIO()
+    asyncio.run(write_json_stream(json_out, {"name": "Perf", "data": None}, rows, chunk_rows=3))
+    parsed = json.loads(json_out.getvalue())
+    assert parsed["name"] == "Perf"
+    assert parsed["data"] == rows
+
+
+def test_streamed_rows_are_merged_across_days():
+    builder = _Builder()
+    report_id = _report(builder, ["platform"])
+
+    async def collect():
+        return [row async for row in builder.iter_report_rows(report_id, _range(3, 1))]
+
+    assert asyncio.run(collect()) == [
+        {"platform": "youtube", "views": 300, "engagement": 10.0},
+        {"platform": "instagram", "views": 150, "engagement": 20.0},
+    ]
+
+
+def test_csv_header_comes_from_fieldnames():
+    out = io.StringIO()
+    rows = [{"platform": "youtube"}, {"platform": "instagram", "views": 5}]
+    asyncio.run(write_csv_stream(out, rows, fieldnames=["platform", "views"]))
+    assert out.getvalue().splitlines() == ["platform,views", "youtube,", "instagram,5"]
+
+
+class _Email:
+    def __init__(self):
+        self.sent = []
+
+    async def send_export_ready(self, **kwargs):
+        self.sent.append(kwargs)
+
+
+def test_export_streams_report_rows(tmp_path, monkeypatch):
+    email = _Email()
+    export_service = DataExportService(s3_client=None, email_service=email)
+    written = {}
+
+    async def upload(file_path):
+        with open(file_path) as f:
+            written["csv"] = f.read()
+        return "https://downloads.example.com/report.csv"
+
+    monkeypatch.setattr(export_service, "_upload_to_s3", upload)
+    builder = _Builder(export_service=export_service)
+    report_id = _report(builder, ["platform"])
+
+    url = asyncio.run(builder.export_report(report_id, "csv", "a@example.com", _range(2, 1)))
+
+    assert url == "https://downloads.example.com/report.csv"
+    assert written["csv"].splitlines() == [
+        "platform,views,engagement",
+        "youtube,200,10.0",
+        "instagram,100,20.0",
+    ]
+    assert email.sent[0]["report_name"] == "Perf"
+
+
+def test_empty_json_stream_is_valid():
+    out = io.StringIO()
+    asyncio.run(write_json_stream(out, {}, []))
+    assert json.loads(out.getvalue()) == {"data": []}
+
+
+def test_end_bound_kept_without_start():
+    builder = _Builder()
+    report_id = builder.create_report("u1", {
+        "name": "Until",
+        "metrics": ["views"],
+        "dimensions": ["platform"],
+        "filters": [{"field": "date", "operator": "<", "value": "2026-01-10"}],
+    })["report_id"]
+
+    result = asyncio.run(builder.generate_report(report_id))
+
+    assert result["buckets"] == {"computed": 1, "cached": 0}
+    (query,) = builder.queries
+    assert query["filters"] == [{"field": "date", "operator": "<=", "value": "2026-01-09"}]
+
+
+class _UsersBuilder(ReportBuilder):
+    """10 active users a day, 15 distinct over any multi-day range."""
+
+    def __init__(self):
+        super().__init__(analytics_service=None, export_service=None, scheduler=None)
+
+    async def _execute_report_query(self, query):
+        if "date" not in query["dimensions"]:
+            return [{"platform": "youtube", "active_users": 15}]
+        rows = []
+        for day in _days(query):
+            row = {"date": day, "platform": "youtube", "active_users": 10}
+            if "views" in query["metrics"]:
+                row["views"] = 100
+            rows.append(row)
+        return rows
+
+
+def test_distinct_metrics_are_not_summed_across_days():
+    builder = _UsersBuilder()
+    report_id = builder.create_report("u1", {
+        "name": "Users",
+        "metrics": ["views", "active_users"],
+        "dimensions": ["platform"],
+    })["report_id"]
+
+    result = asyncio.run(builder.generate_report(report_id, _range(7, 1)))
+
+    assert result["data"] == [{"platform": "youtube", "views": 700, "active_users": 15}]
+    assert result["summary"]["active_users"]["total"] == 15
+    assert result["buckets"] == {"computed": 8, "cached": 0}
+
+
+def test_merging_days_keeps_largest_distinct_count():
+    from app.services.report_aggregation import BucketAggregate
+
+    total = BucketAggregate(["platform"], ["views", "active_users"])
+    for users in (10, 12, 9):
+        day = BucketAggregate(["platform"], ["views", "active_users"])
+        day.add({"platform": "youtube", "views": 100, "active_users": users})
+        total.merge(day)
+
+    assert total.rows() == [{"platform": "youtube", "views": 300, "active_users": 12}]
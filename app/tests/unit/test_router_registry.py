@@ -0,0 +1,150 @@
+"""
+Unit Tests for lazy router registration
+"""
+import sys
+import types
+
+import pytest
+
+from app.api.router_registry import LazyRouterRegistry, LazyRouterMiddleware, RouterSpec
+
+
+class _Router:
+    def __init__(self, *paths):
+        self.routes = list(paths)
+
+    def include_router(self, router, prefix=""):
+        self.routes.extend(prefix + r for r in router.routes)
+
+
+class _App:
+    def __init__(self):
+        self.router = _Router()
+        self.openapi_schema = {"cached": True}
+
+    def include_router(self, router, prefix=""):
+        self.router.include_router(router, prefix=prefix)
+
+
+@pytest.fixture
+def modules(monkeypatch):
+    for name, paths in {
+        "fake_routes_a": ("/v1/a/x", "/v1/a/y"),
+        "fake_routes_b": ("/b/z",),
+        "fake_routes_c": ("/v1/c",),
+    }.items():
+        module = types.ModuleType(name)
+        module.router = _Router(*paths)
+        monkeypatch.setitem(sys.modules, name, module)
+
+
+def _registry(app):
+    return LazyRouterRegistry(app, [
+        RouterSpec("fake_routes_a", ("/v1/a",)),
+        RouterSpec("fake_routes_b", ("/v1/b",), prefix="/v1"),
+        RouterSpec("fake_routes_c", ("/v1/c",)),
+    ])
+
+
+def test_loads_only_matching_router(modules):
+    app = _App()
+    registry = _registry(app)
+    registry.include(_Router("/core"), name="core")
+    app.router.routes.append("/{catch_all}")
+
+    assert registry.load_for_path("/v1/b/z") == 1
+    assert registry.load_for_path("/v1/bb") == 0
+    assert app.router.routes == ["/core", "/v1/b/z", "/{catch_all}"]
+    assert app.openapi_schema is None
+    assert [s.module for s in registry.pending] == ["fake_routes_a", "fake_routes_c"]
+
+
+def test_declaration_order_preserved(modules):
+    app = _App()
+    registry = _registry(app)
+    app.router.routes.append("/{catch_all}")
+
+    registry.load_for_path("/v1/c")
+    registry.load_for_path("/v1/a/x")
+    registry.load_for_path("/v1/b")
+
+    assert app.router.routes == ["/v1/a/x", "/v1/a/y", "/v1/b/z", "/v1/c", "/{catch_all}"]
+
+
+def test_schema_request_loads_everything_and_reports(modules):
+    app = _App()
+    registry = _registry(app)
+
+    assert registry.load_for_path("/openapi.json") == 3
+    report = registry.report()
+    assert report["loaded"] == 3
+    assert report["pending"] == []
+    assert {r["module"] for r in report["routers"]} == {
+        "fake_routes_a", "fake_routes_b", "fake_routes_c"
+    }
+
+
+def test_warmup_skips_broken_router(modules, monkeypatch):
+    monkeypatch.setitem(sys.modules, "fake_routes_b", None)
+    app = _App()
+    registry = _registry(app)
+
+    assert registry.load_all() == 2
+    assert [s.module for s in registry.pending] == ["fake_routes_b"]
+    with pytest.raises(ImportError):
+        registry.load_for_path("/v1/b")
+
+
+def test_middleware_loads_before_dispatch(modules):
+    import asyncio
+
+    app = _App()
+    registry = _registry(app)
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(list(app.router.routes))
+
+    middleware = LazyRouterMiddleware(inner, registry=registry)
+    asyncio.run(middleware({"type": "http", "path": "/v1/a/x"}, None, None))
+
+    assert seen == [["/v1/a/x", "/v1/a/y"]]
+
+
+def test_load_swaps_route_list_instead_of_mutating(modules):
+    app = _App()
+    registry = _registry(app)
+    registry.include(_Router("/core"), name="core")
+    app.router.routes.append("/{catch_all}")
+
+    # A request being routed holds a reference to the current list
+    in_flight = app.router.routes
+    registry.load_for_path("/v1/a/x")
+
+    assert in_flight == ["/core", "/{catch_all}"]
+    assert app.router.routes == ["/core", "/v1/a/x", "/v1/a/y", "/{catch_all}"]
+
+
+def test_fastapi_routes_are_spliced(monkeypatch):
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+
+    lazy = APIRouter()
+
+    @lazy.get("/items")
+    def items():
+        return ["a"]
+
+    module = types.ModuleType("fake_fastapi_routes")
+    module.router = lazy
+    monkeypatch.setitem(sys.modules, "fake_fastapi_routes", module)
+
+    app = FastAPI()
+    registry = LazyRouterRegistry(app, [RouterSpec("fake_fastapi_routes", ("/v1/items",), prefix="/v1")])
+
+    @app.get("/{full_path:path}")
+    def catch_all(full_path: str):
+        return {"spa": full_path}
+
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    assert TestClient(app).get("/v1/items").json() == ["a"]
@@ -0,0 +1,44 @@
+"""
+Unit Tests for incremental scene parsing
+"""
+from app.story.streaming import SceneStreamParser
+
+
+def _parse(chunks):
+    parser = SceneStreamParser()
+    return [scene for chunk in chunks for scene in parser.feed(chunk)]
+
+
+def test_scenes_emitted_as_soon_as_they_close():
+    parser = SceneStreamParser()
+
+    assert parser.feed('```json\n[\n  {"narration": "A cat') == []
+    first = parser.feed(' wakes", "visual": "dawn"},\n  {"narr')
+    assert first == [{"narration": "A cat wakes", "visual": "dawn"}]
+    assert parser.feed('ation": "It jumps"}\n]\n```') == [{"narration": "It jumps"}]
+
+
+def test_braces_and_quotes_inside_strings():
+    chunks = ['[{"narration": "say \\"}\\" {ok}", ', '"visual": "x"}]']
+    scenes = _parse(chunks)
+
+    assert scenes == [{"narration": 'say "}" {ok}', "visual": "x"}]
+
+
+def test_nested_objects_stay_within_scene():
+    chunks = ['[{"narration": "a", "meta": {"k": 1}}', ', {"narration": "b"}]']
+    scenes = _parse(chunks)
+
+    assert [s["narration"] for s in scenes] == ["a", "b"]
+    assert scenes[0]["meta"] == {"k": 1}
+
+
+def test_scene_split_across_single_character_chunks():
+    text = '[{"narration": "a {b}", "visual": "c"}, {"narration": "d"}]'
+    parser = SceneStreamParser()
+    scenes = _parse(text)
+
+    assert scenes == [{"narration": "a {b}", "visual": "c"}, {"narration": "d"}]
+    parser.feed(text[:10])
+    parser.feed(text[10:])
+    assert parser.text == text
@@ -0,0 +1,165 @@
+"""
+Tests for speculative TTS synthesis.
+"""
+import os
+import threading
+
+import pytest
+
+from app.core.models import Scene, ScenePurpose
+from app.media.speculative_tts import SpeculativeTTS, audio_key
+
+
+class FakeVoice:
+    """Writes the narration to the output path; optionally blocks until released"""
+
+    voice = "test-voice"
+
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = set(fail_on)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def generate_audio(self, text, output_path):
+        self.calls.append(text)
+        self.started.set()
+        self.release.wait(5)
+        if text in self.fail_on:
+            raise RuntimeError("tts down")
+        with open(output_path, "w") as f:
+            f.write(text)
+
+
+def _scene(i, text):
+    return Scene(
+        id=i, start_sec=i * 5, end_sec=i * 5 + 5, purpose=ScenePurpose.ESCALATE,
+        narration_text=text, visual_prompt="prompt"
+    )
+
+
+@pytest.fixture
+def voice():
+    return FakeVoice()
+
+
+@pytest.fixture
+def tts(voice, tmp_path):
+    tts = SpeculativeTTS(voice, output_dir=tmp_path, max_workers=2)
+    yield tts
+    tts.close()
+
+
+def test_collect_attaches_audio_in_scene_order(tts, voice):
+    scenes = [_scene(i, f"line {i}") for i in range(4)]
+    tts.submit_all(reversed(scenes))
+    tts.collect(scenes)
+
+    for scene in scenes:
+        with open(scene.audio_path) as f:
+            assert f.read() == scene.narration_text
+    assert len({s.audio_path for s in scenes}) == 4
+    assert tts.stats["submitted"] == 4
+
+
+def test_unchanged_scenes_are_reused_across_retries(tts, voice):
+    first = [_scene(0, "hook"), _scene(1, "middle"), _scene(2, "ending")]
+    tts.submit_all(first)
+    tts.collect(first)
+
+    # Critic retry regenerates only the ending
+    retry = [_scene(0, "hook"), _scene(1, "middle"), _scene(2, "better ending")]
+    tts.retain(retry)
+    tts.submit_all(retry)
+    tts.collect(retry)
+
+    assert sorted(voice.calls) == sorted(["hook", "middle", "ending", "better ending"])
+    assert retry[0].audio_path == first[0].audio_path
+    assert tts.stats["submitted"] == 4
+
+
+def test_retain_cancels_replaced_scenes(voice, tmp_path):
+    voice.release.clear()
+    tts = SpeculativeTTS(voice, output_dir=tmp_path, max_workers=1)
+    try:
+        # The single worker is busy with "a", so "b" is still queued
+        tts.submit_all([_scene(0, "a"), _scene(1, "b")])
+        assert voice.started.wait(5)
+        tts.retain([_scene(0, "a")])
+        voice.release.set()
+        scenes = [_scene(0, "a")]
+        tts.collect(scenes)
+    finally:
+        tts.close()
+
+    assert tts.stats["cancelled"] == 1
+    assert voice.calls == ["a"]
+    assert scenes[0].audio_path is not None
+
+
+def test_failed_synthesis_is_retried_on_next_submit(tts, voice):
+    voice.fail_on.add("flaky")
+    scenes = [_scene(0, "flaky")]
+    tts.collect(scenes)
+    assert scenes[0].audio_path is None
+    assert audio_key(voice.voice, "flaky") not in tts._futures
+
+    voice.fail_on.clear()
+    tts.collect(scenes)
+    assert scenes[0].audio_path is not None
+    assert voice.calls == ["flaky", "flaky"]
+
+
+def test_empty_narration_is_skipped(tts, voice):
+    assert tts.submit(_scene(0, "   ")) is None
+    scenes = [_scene(0, "")]
+    tts.collect(scenes)
+    assert scenes[0].audio_path is None
+    assert voice.calls == []
+
+
+def test_close_drops_queued_work(voice, tmp_path):
+    voice.release.clear()
+    tts = SpeculativeTTS(voice, output_dir=tmp_path, max_workers=1)
+    tts.submit_all([_scene(0, "a"), _scene(1, "b")])
+    assert voice.started.wait(5)
+    tts.close()
+    voice.release.set()
+
+    queued = tts._futures[audio_key(voice.voice, "b")]
+    assert queued.cancelled()
+    tts._futures[audio_key(voice.voice, "a")].result(timeout=5)
+    assert voice.calls == ["a"]
+
+
+def test_close_deletes_audio_the_story_does_not_use(voice, tmp_path):
+    tts = SpeculativeTTS(voice, output_dir=tmp_path, max_workers=2, prefix="job1")
+    first = [_scene(0, "hook"), _scene(1, "ending")]
+    tts.submit_all(first)
+    tts.collect(first)
+
+    retry = [_scene(0, "hook"), _scene(1, "better ending")]
+    tts.retain(retry)
+    tts.collect(retry)
+    tts.close(keep=retry)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        os.path.basename(s.audio_path) for s in retry
+    )
+    assert all(os.path.basename(s.audio_path).startswith("job1_tts_") for s in retry)
+    assert not os.path.exists(first[1].audio_path)
+    assert tts.stats["released"] == 1
+
+
+def test_audio_finishing_after_close_is_deleted(voice, tmp_path):
+    voice.release.clear()
+    tts = SpeculativeTTS(voice, output_dir=tmp_path, max_workers=1)
+    tts.submit(_scene(0, "slow"))
+    assert voice.started.wait(5)
+    tts.close()
+    voice.release.set()
+
+    path = tts._futures[audio_key(voice.voice, "slow")].result(timeout=5)
+    assert not os.path.exists(path)
+    assert list(tmp_path.iterdir()) == []
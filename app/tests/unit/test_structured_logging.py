@@ -0,0 +1,122 @@
+"""
+Tests for the structured logging pipeline.
+"""
+import json
+import logging
+import queue
+import threading
+
+from app.core.context import RequestContext, clear_context, set_context
+from app.core.logging import (
+    LogSampler,
+    StructuredFormatter,
+    StructuredLogger,
+    StructuredQueueHandler,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _logger(name, handler, level=logging.DEBUG):
+    base = logging.getLogger(name)
+    base.handlers = [handler]
+    base.propagate = False
+    base.setLevel(level)
+    return StructuredLogger(name)
+
+
+class TestStructuredFormatter:
+
+    def test_json_fields_and_context(self):
+        handler = ListHandler()
+        logger = _logger("test.fmt", handler)
+
+        set_context(RequestContext(request_id="req_1", job_id="job_1"))
+        try:
+            logger.info('Rendered "scene"', duration_ms=12, scene=3)
+            entry = json.loads(StructuredFormatter().format(handler.records[0]))
+        finally:
+            clear_context()
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "test.fmt"
+        assert entry["message"] == 'Rendered "scene"'
+        assert entry["request_id"] == "req_1"
+        assert entry["job_id"] == "job_1"
+        assert entry["duration_ms"] == 12
+        assert entry["extra"] == {"scene": 3}
+        assert entry["timestamp"].endswith("Z")
+
+    def test_exception_text(self):
+        record = logging.LogRecord("x", logging.ERROR, "", 0, "failed", None, None)
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            import sys
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(StructuredFormatter().format(record))
+        assert "ValueError: bad" in entry["exception"]
+
+
+class TestQueueHandler:
+
+    def test_context_captured_on_calling_thread(self):
+        log_queue = queue.Queue()
+        logger = _logger("test.queue", StructuredQueueHandler(log_queue))
+
+        def work():
+            set_context(RequestContext(request_id="req_thread"))
+            logger.info("from worker %s")
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+        record = log_queue.get_nowait()
+        entry = json.loads(StructuredFormatter().format(record))
+        assert entry["request_id"] == "req_thread"
+        assert entry["message"] == "from worker %s"
+
+    def test_full_queue_drops_only_low_levels(self):
+        log_queue = queue.Queue(maxsize=1)
+        handler = StructuredQueueHandler(log_queue)
+        logger = _logger("test.full", handler)
+
+        logger.info("first")
+        logger.debug("dropped")
+        assert handler.dropped == 1
+        assert log_queue.qsize() == 1
+
+
+class TestLogSampler:
+
+    def test_every_nth(self):
+        sampler = LogSampler(every=3)
+        results = [sampler.allow() for _ in range(7)]
+        assert results == [None, None, 2, None, None, 2, None]
+
+    def test_rate_limited_debug_reports_suppressed(self):
+        handler = ListHandler()
+        logger = _logger("test.sampled", handler)
+        logger.sample_debug(max_per_second=2)
+
+        for _ in range(10):
+            logger.debug("Cache HIT")
+        logger.info("not sampled")
+
+        assert len(handler.records) == 3
+        assert handler.records[-1].getMessage() == "not sampled"
+
+    def test_disabled_level_skips_record(self):
+        handler = ListHandler()
+        logger = _logger("test.disabled", handler, level=logging.INFO)
+        logger.debug("ignored")
+        assert handler.records == []
@@ -0,0 +1,64 @@
+"""
+Unit Tests for the verified token cache
+"""
+from datetime import datetime
+
+from app.auth.token_cache import VerifiedTokenCache
+
+
+def test_verify_decodes_once_per_token():
+    cache = VerifiedTokenCache()
+    calls = []
+
+    def decode(token):
+        calls.append(token)
+        return {"sub": "u1", "exp": 4102444800}
+
+    assert cache.verify("tok", decode)["sub"] == "u1"
+    assert cache.verify("tok", decode)["sub"] == "u1"
+    assert calls == ["tok"]
+    assert cache.hits == 1
+
+
+def test_failures_are_not_cached():
+    cache = VerifiedTokenCache()
+    calls = []
+
+    def decode(token):
+        calls.append(token)
+        return None
+
+    assert cache.verify("bad", decode) is None
+    assert cache.verify("bad", decode) is None
+    assert len(calls) == 2
+
+
+def test_entries_expire_with_token():
+    cache = VerifiedTokenCache(max_ttl=300)
+    cache.put("tok", {"sub": "u1", "exp": 1000}, now=900)
+
+    assert cache.get("tok", now=999) is not None
+    assert cache.get("tok", now=1000) is None
+
+    # Already expired tokens are never stored
+    cache.put("old", {"exp": datetime(2000, 1, 1)}, now=2000000000)
+    assert len(cache) == 0
+
+
+def test_bounded_lru():
+    cache = VerifiedTokenCache(max_size=2)
+    cache.put("a", {"sub": "a"}, now=0)
+    cache.put("b", {"sub": "b"}, now=0)
+    cache.get("a", now=1)
+    cache.put("c", {"sub": "c"}, now=1)
+
+    assert cache.get("b", now=1) is None
+    assert cache.get("a", now=1) == {"sub": "a"}
+
+
+def test_returned_claims_are_copies():
+    cache = VerifiedTokenCache()
+    cache.put("tok", {"sub": "u1"}, now=0)
+    cache.get("tok", now=1)["sub"] = "mutated"
+
+    assert cache.get("tok", now=1)["sub"] == "u1"
@@ -0,0 +1,172 @@
+"""
+Unit Tests for the webhook delivery engine
+"""
+import asyncio
+import json
+import time
+
+from app.webhooks.delivery import WebhookDeliveryEngine, WebhookOutbox, sign_body
+from app.webhooks.manager import WebhookManager, EventType
+
+
+class RecordingTransport:
+    def __init__(self, statuses=None):
+        self.calls = []
+        self.statuses = list(statuses or [])
+
+    async def __call__(self, url, body, headers):
+        self.calls.append((url, body, headers))
+        return self.statuses.pop(0) if self.statuses else 200
+
+
+def _engine(tmp_path, transport, **kwargs):
+    outbox = WebhookOutbox(str(tmp_path / "outbox.db"))
+    return WebhookDeliveryEngine(outbox=outbox, transport=transport, **kwargs)
+
+
+def test_single_event_body_matches_signature(tmp_path):
+    transport = RecordingTransport()
+    engine = _engine(tmp_path, transport)
+    engine.enqueue("sub1", "https://example.com/hook", "video.created", {"b": 1, "a": 2}, "secret")
+
+    processed = asyncio.run(engine.process_due())
+
+    assert processed == 1
+    _, body, headers = transport.calls[0]
+    assert headers["X-Webhook-Signature"] == sign_body(body, "secret")
+    assert engine.outbox.count("pending") == 0
+
+
+def test_events_are_not_batched_by_default(tmp_path):
+    transport = RecordingTransport()
+    engine = _engine(tmp_path, transport, max_batch_size=10)
+    for i in range(3):
+        engine.enqueue("sub1", "https://example.com/hook", "video.created", {"i": i}, "secret")
+
+    asyncio.run(engine.process_due())
+
+    assert len(transport.calls) == 3
+    for _, body, headers in transport.calls:
+        assert "type" not in json.loads(body)
+        assert headers["X-Webhook-Signature"] == sign_body(body, "secret")
+
+
+def test_opted_in_events_to_same_endpoint_are_batched(tmp_path):
+    transport = RecordingTransport()
+    engine = _engine(tmp_path, transport, max_batch_size=10)
+    for i in range(25):
+        engine.enqueue(
+            "sub1", "https://example.com/hook", "video.created", {"i": i}, "secret", batch=True
+        )
+
+    asyncio.run(engine.process_due())
+
+    assert len(transport.calls) == 3
+    _, body, headers = transport.calls[0]
+    batch = json.loads(body)
+    assert batch["type"] == "batch"
+    assert len(batch["events"]) == 10
+    assert headers["X-Webhook-Signature"] == sign_body(body, "secret")
+    event = batch["events"][0]
+    assert event["signature"] == sign_body(event["body"], "secret")
+    assert engine.get_metrics()["delivered"] == 25
+
+
+def test_workers_sharing_outbox_deliver_each_record_once(tmp_path):
+    transport = RecordingTransport()
+    workers = [_engine(tmp_path, transport) for _ in range(3)]
+    for i in range(20):
+        workers[0].enqueue("sub1", "https://example.com/hook", "video.created", {"i": i}, "secret")
+
+    async def run():
+        await asyncio.gather(*(worker.process_due() for worker in workers))
+
+    asyncio.run(run())
+
+    assert sorted(json.loads(body)["i"] for _, body, _ in transport.calls) == list(range(20))
+    assert workers[0].outbox.count("pending") == 0
+    assert workers[0].outbox.count("in_flight") == 0
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    engine = _engine(tmp_path, RecordingTransport(), lease_seconds=30.0)
+    engine.enqueue("sub1", "https://example.com/hook", "video.created", {}, "secret")
+
+    # A worker that died after claiming the record
+    now = time.time()
+    assert len(engine.outbox.claim(now, 10, "dead-worker", 30.0)) == 1
+    assert engine.outbox.claim(now, 10, engine.owner, 30.0) == []
+    assert asyncio.run(engine.process_due(now=now)) == 0
+
+    assert asyncio.run(engine.process_due(now=now + 31)) == 1
+    assert engine.outbox.count("in_flight") == 0
+    assert engine.get_metrics()["delivered"] == 1
+
+
+def test_failed_attempt_is_rescheduled_in_outbox(tmp_path):
+    transport = RecordingTransport(statuses=[500])
+    engine = _engine(tmp_path, transport, base_backoff=2.0)
+    engine.enqueue("sub1", "https://example.com/hook", "video.created", {}, "secret")
+
+    asyncio.run(engine.process_due())
+
+    assert engine.outbox.count("pending") == 1
+    assert engine.outbox.due(time.time(), 10) == []
+    assert engine.outbox.next_due_at() > time.time()
+
+    # A fresh engine over the same outbox picks up the retry after a restart
+    restarted = _engine(tmp_path, RecordingTransport())
+    asyncio.run(restarted.process_due(now=time.time() + 60))
+    assert restarted.outbox.count("pending") == 0
+
+
+def test_permanent_failure_notifies_listener(tmp_path):
+    transport = RecordingTransport(statuses=[500, 500])
+    engine = _engine(tmp_path, transport)
+    results = []
+    engine.add_listener(lambda record, success: results.append((record.id, success)))
+    record = engine.enqueue("sub1", "https://example.com/hook", "video.created", {}, "secret", max_attempts=2)
+
+    asyncio.run(engine.process_due())
+    asyncio.run(engine.process_due(now=time.time() + 60))
+
+    assert results == [(record.id, False)]
+    assert engine.outbox.count("failed") == 1
+
+
+def test_manager_tracks_bounded_delivery_window(tmp_path):
+    engine = _engine(tmp_path, RecordingTransport())
+    manager = WebhookManager(engine=engine, max_tracked_deliveries=5)
+    manager.subscribe("https://example.com/hook", [EventType.VIDEO_CREATED])
+
+    for i in range(8):
+        manager.deliver_event(EventType.VIDEO_CREATED, {"video_id": i})
+    asyncio.run(engine.process_due())
+
+    assert len(manager.get_deliveries(limit=100)) == 5
+    stats = manager.get_stats()
+    assert stats["total_deliveries"] == 8
+    assert stats["successful_deliveries"] == 8
+
+
+def test_started_engine_resumes_outbox_and_drains_on_stop(tmp_path):
+    # Records left pending by a previous process
+    _engine(tmp_path, RecordingTransport()).enqueue(
+        "sub1", "https://example.com/hook", "video.created", {}, "secret"
+    )
+    transport = RecordingTransport()
+    engine = _engine(tmp_path, transport, poll_interval=30.0)
+
+    async def run():
+        engine.ensure_started()
+        await asyncio.sleep(0.05)
+        assert len(transport.calls) == 1
+
+        engine.enqueue("sub1", "https://example.com/hook", "video.created", {"late": True}, "secret")
+        await engine.stop()
+
+    asyncio.run(run())
+
+    assert len(transport.calls) == 2
+    assert engine.outbox.count("pending") == 0
+    assert engine._dispatcher is None
@@ -0,0 +1,46 @@
+"""
+Unit Tests for webhook subscription routing
+"""
+from app.webhooks.routing import SubscriptionIndex, candidate_keys
+from app.services.webhook_service import WebhookService
+
+
+def test_candidate_keys_cover_prefix_wildcards():
+    assert list(candidate_keys("video.created")) == ["video.created", "video.*", "*"]
+
+
+def test_match_by_event_and_user():
+    index = SubscriptionIndex()
+    index.add("a", "u1", ["video.created"], "A")
+    index.add("b", "u2", ["video.*"], "B")
+    index.add("c", "u1", ["*", "video.created"], "C")
+
+    assert sorted(index.match("video.created")) == ["A", "B", "C"]
+    assert sorted(index.match("video.created", "u1")) == ["A", "C"]
+    assert index.match("payment.failed", "u2") == []
+    assert index.match("payment.failed", "u1") == ["C"]
+
+
+def test_remove_clears_all_indexes():
+    index = SubscriptionIndex()
+    index.add("a", "u1", ["video.created", "video.deleted"], "A")
+    index.remove("a")
+
+    assert index.match("video.created") == []
+    assert index.for_user("u1") == []
+    assert len(index) == 0
+
+
+def test_service_routes_through_index():
+    service = WebhookService()
+    created = service.register_webhook("u1", "https://example.com/a", ["video.created"])
+    service.register_webhook("u1", "https://example.com/b", ["video.*"])
+    service.register_webhook("u2", "https://example.com/c", ["video.created"])
+
+    urls = sorted(w.url for w in service._get_webhooks_for_event("u1", "video.created"))
+    assert urls == ["https://example.com/a", "https://example.com/b"]
+
+    service.delete_webhook(created["webhook_id"], "u1")
+    urls = [w.url for w in service._get_webhooks_for_event("u1", "video.created")]
+    assert urls == ["https://example.com/b"]
+    assert len(service.list_webhooks("u1")) == 1
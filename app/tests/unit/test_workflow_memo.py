@@ -0,0 +1,124 @@
+"""
+Tests for workflow result memoization.
+"""
+from app.workflows.conditional import create_quality_workflow
+from app.workflows.dag_engine import DAGEngine
+from app.workflows.memo import TaskResultStore, task_fingerprint
+from app.workflows.primitives import DAG, ExecutionStatus, Task
+
+
+def _pipeline(calls, prompt="a fox", hook_style="question"):
+    def counted(name, fn):
+        def run(**kwargs):
+            calls.append(name)
+            return fn(**kwargs)
+        return run
+
+    dag = DAG(id="video", name="Video")
+    dag.add_task(Task(
+        "script", "Script", counted("script", lambda: f"script about {prompt}"),
+        fingerprint={"prompt": prompt}
+    ))
+    dag.add_task(Task(
+        "hook", "Hook", counted("hook", lambda script: f"{hook_style}: {script[:10]}"),
+        dependencies=["script"], fingerprint={"style": hook_style}
+    ))
+    dag.add_task(Task(
+        "render", "Render", counted("render", lambda hook: hook.upper()),
+        dependencies=["hook"], fingerprint=lambda hook: len(hook)
+    ))
+    dag.add_task(Task(
+        "notify", "Notify", counted("notify", lambda render: "sent"),
+        dependencies=["render"]
+    ))
+    return dag
+
+
+class TestTaskFingerprint:
+
+    def test_none_without_declared_fingerprint(self):
+        assert task_fingerprint(Task("t", "T", lambda: 1), {}) is None
+
+    def test_changes_with_inputs_and_dependency_results(self):
+        task = Task("t", "T", lambda a: a, dependencies=["a"], fingerprint="v1")
+        base = task_fingerprint(task, {"a": {"x": 1}})
+
+        assert task_fingerprint(task, {"a": {"x": 1}}) == base
+        assert task_fingerprint(task, {"a": {"x": 2}}) != base
+        task.fingerprint = "v2"
+        assert task_fingerprint(task, {"a": {"x": 1}}) != base
+
+
+class TestMemoizedExecution:
+
+    def test_rerun_only_executes_dirty_subgraph(self):
+        engine = DAGEngine(max_workers=2, result_store=TaskResultStore())
+        calls = []
+
+        first = engine.execute_dag(_pipeline(calls))
+        assert first.status == ExecutionStatus.COMPLETED
+        assert calls == ["script", "hook", "render", "notify"]
+
+        calls.clear()
+        second = engine.execute_dag(_pipeline(calls))
+        assert calls == ["notify"]
+        assert second.cached_tasks == ["script", "hook", "render"]
+        assert second.results == first.results
+
+        calls.clear()
+        third = engine.execute_dag(_pipeline(calls, hook_style="shock"))
+        assert calls == ["hook", "render", "notify"]
+        assert third.cached_tasks == ["script"]
+
+    def test_no_store_means_no_reuse(self):
+        engine = DAGEngine(max_workers=2)
+        calls = []
+        engine.execute_dag(_pipeline(calls))
+        engine.execute_dag(_pipeline(calls))
+        assert calls.count("script") == 2
+
+    def test_quality_check_reused_when_upstream_unchanged(self):
+        store = TaskResultStore()
+        engine = DAGEngine(max_workers=2, result_store=store)
+
+        def build():
+            dag = DAG(id="quality", name="Quality")
+            dag.add_task(Task("script", "Script", lambda: "same script", fingerprint="prompt"))
+            return create_quality_workflow(dag, depends_on=["script"])
+
+        engine.execute_dag(build())
+        execution = engine.execute_dag(build())
+
+        assert execution.status == ExecutionStatus.COMPLETED
+        assert execution.cached_tasks == ["script", "check_quality"]
+        assert execution.results["regenerate"] == {"status": "regenerating"}
+        assert store.get_stats()["hits"] == 2
+
+    def test_results_are_not_shared_across_dags(self):
+        engine = DAGEngine(max_workers=2, result_store=TaskResultStore())
+        calls = []
+
+        def build(dag_id, prompt):
+            dag = DAG(id=dag_id, name=dag_id)
+            dag.add_task(Task(
+                "script", "Script", lambda: calls.append(prompt) or prompt,
+                fingerprint="same-config"
+            ))
+            return dag
+
+        engine.execute_dag(build("video-a", "fox"))
+        execution = engine.execute_dag(build("video-b", "owl"))
+
+        assert calls == ["fox", "owl"]
+        assert execution.results["script"] == "owl"
+        assert execution.cached_tasks == []
+
+    def test_quality_check_without_upstream_always_runs(self):
+        store = TaskResultStore()
+        engine = DAGEngine(max_workers=2, result_store=store)
+
+        for dag_id in ("a", "b"):
+            execution = engine.execute_dag(create_quality_workflow(DAG(id=dag_id, name=dag_id)))
+            assert execution.status == ExecutionStatus.COMPLETED
+            assert execution.cached_tasks == []
+        assert store.get_stats()["hits"] == 0
@@ -1,6 +1,13 @@
 """
 Webhooks Module Initialization
 """
+from app.webhooks.delivery import (
+    OutboxRecord,
+    WebhookOutbox,
+    WebhookDeliveryEngine,
+    delivery_engine
+)
+from app.webhooks.routing import SubscriptionIndex
 from app.webhooks.manager import (
     EventType,
     WebhookSubscription,
@@ -14,5 +21,10 @@ __all__ = [
     'WebhookSubscription',
     'WebhookDelivery',
     'WebhookManager',
-    'webhook_manager'
+    'webhook_manager',
+    'OutboxRecord',
+    'WebhookOutbox',
+    'WebhookDeliveryEngine',
+    'delivery_engine',
+    'SubscriptionIndex'
 ]
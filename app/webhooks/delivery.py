@@ -0,0 +1,684 @@
+"""
+Webhook Delivery Engine
+Durable outbox, pooled HTTP transport and scheduled retries for webhook events.
+"""
+from typing import Dict, List, Optional, Any, Callable, Awaitable
+from dataclasses import dataclass, field
+from collections import deque
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# Transport signature: (url, body, headers) -> HTTP status code
+Transport = Callable[[str, str, Dict[str, str]], Awaitable[int]]
+
+# Called after each record settles: (record, success)
+ResultCallback = Callable[["OutboxRecord", bool], None]
+
+
+def sign_body(body: str, secret: str) -> str:
+    """Sign a serialized webhook body with HMAC-SHA256."""
+    signature = hmac.new(
+        secret.encode('utf-8'),
+        body.encode('utf-8'),
+        hashlib.sha256
+    ).hexdigest()
+    return f"sha256={signature}"
+
+
+@dataclass
+class OutboxRecord:
+    """A single webhook event waiting in the outbox"""
+    subscription_id: str
+    url: str
+    event_type: str
+    body: str  # Serialized payload, exactly as signed
+    signature: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = "pending"  # pending, in_flight, delivered, failed
+    attempts: int = 0
+    max_attempts: int = 3
+    next_attempt_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+    # Set only for subscriptions that opted in to batched delivery: the
+    # secret that signs a combined batch body
+    batch_secret: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "User-Agent": "VideoCreator-Webhooks/1.0",
+            "X-Webhook-Signature": self.signature,
+            "X-Webhook-Event": self.event_type,
+            "X-Webhook-ID": self.subscription_id,
+            "X-Webhook-Delivery": self.id,
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "subscription_id": self.subscription_id,
+            "url": self.url,
+            "event_type": self.event_type,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "next_attempt_at": self.next_attempt_at,
+            "created_at": self.created_at,
+            "last_error": self.last_error,
+        }
+
+
+class WebhookOutbox:
+    """
+    SQLite-backed outbox.
+
+    Pending rows are indexed by next_attempt_at, so the outbox doubles as
+    the delay queue for scheduled retries and survives restarts. Delivered
+    rows are removed; permanently failed rows are kept for inspection.
+
+    Every worker process runs a dispatcher over the same file, so due rows
+    are claimed (status in_flight, an owner and a lease expiry) in one
+    write transaction before delivery. Rows whose lease expired, e.g.
+    because their worker died mid-delivery, are claimable again.
+    """
+
+    _COLUMNS = (
+        "id, subscription_id, url, event_type, body, signature, status, "
+        "attempts, max_attempts, next_attempt_at, created_at, last_error, batch_secret"
+    )
+
+    # Columns added after the first release, as (name, type)
+    _ADDED_COLUMNS = (
+        ("batch_secret", "TEXT"),
+        ("owner", "TEXT"),
+        ("lease_expires_at", "REAL"),
+    )
+
+    def __init__(self, path: str = ".story_assets/webhooks/outbox.db"):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS webhook_outbox ("
+                "id TEXT PRIMARY KEY, subscription_id TEXT, url TEXT, "
+                "event_type TEXT, body TEXT, signature TEXT, status TEXT, "
+                "attempts INTEGER, max_attempts INTEGER, "
+                "next_attempt_at REAL, created_at REAL, last_error TEXT)"
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(webhook_outbox)")}
+            for name, column_type in self._ADDED_COLUMNS:
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE webhook_outbox ADD COLUMN {name} {column_type}")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_due "
+                "ON webhook_outbox (status, next_attempt_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_lease "
+                "ON webhook_outbox (status, lease_expires_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def add(self, records: List[OutboxRecord]):
+        """Persist new records"""
+        with self._lock:
+            conn = self._get_conn()
+            conn.executemany(
+                f"INSERT INTO webhook_outbox ({self._COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(r) for r in records]
+            )
+            conn.commit()
+
+    def due(self, now: float, limit: int) -> List[OutboxRecord]:
+        """Pending records whose next attempt is due, oldest first (not claimed)"""
+        with self._lock:
+            rows = self._get_conn().execute(
+                f"SELECT {self._COLUMNS} FROM webhook_outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def claim(self, now: float, limit: int, owner: str, lease_seconds: float) -> List[OutboxRecord]:
+        """
+        Atomically take up to limit due records (and records whose lease
+        expired) for owner until now + lease_seconds, oldest first.
+        """
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    f"SELECT {self._COLUMNS} FROM webhook_outbox "
+                    "WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                    "OR (status = 'in_flight' AND lease_expires_at <= ?) "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, now, limit)
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE webhook_outbox SET status = 'in_flight', owner = ?, "
+                    "lease_expires_at = ? WHERE id = ?",
+                    [(owner, now + lease_seconds, row[0]) for row in rows]
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        records = [self._from_row(row) for row in rows]
+        for record in records:
+            record.status = "in_flight"
+        return records
+
+    def release(self, owner: str) -> int:
+        """Hand owner's unfinished claims back as pending (e.g. on shutdown)"""
+        with self._lock:
+            conn = self._get_conn()
+            released = conn.execute(
+                "UPDATE webhook_outbox SET status = 'pending', owner = NULL, "
+                "lease_expires_at = NULL WHERE status = 'in_flight' AND owner = ?",
+                (owner,)
+            ).rowcount
+            conn.commit()
+        return released
+
+    def next_due_at(self) -> Optional[float]:
+        """Earliest scheduled attempt or lease expiry among undelivered records"""
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT MIN(CASE WHEN status = 'pending' THEN next_attempt_at "
+                "ELSE lease_expires_at END) FROM webhook_outbox "
+                "WHERE status IN ('pending', 'in_flight')"
+            ).fetchone()
+        return row[0] if row else None
+
+    def complete(
+        self,
+        delivered: List[str],
+        updated: List[OutboxRecord],
+        owner: Optional[str] = None
+    ):
+        """
+        Remove delivered records and persist retry/failure state in one
+        transaction. With an owner, only rows still claimed by it are
+        updated, so a worker whose lease lapsed can't undo a newer claim.
+        """
+        with self._lock:
+            conn = self._get_conn()
+            if delivered:
+                conn.executemany(
+                    "DELETE FROM webhook_outbox WHERE id = ?",
+                    [(record_id,) for record_id in delivered]
+                )
+            if updated:
+                query = (
+                    "UPDATE webhook_outbox SET status = ?, attempts = ?, "
+                    "next_attempt_at = ?, last_error = ?, owner = NULL, "
+                    "lease_expires_at = NULL WHERE id = ?"
+                )
+                params = [
+                    (r.status, r.attempts, r.next_attempt_at, r.last_error, r.id)
+                    for r in updated
+                ]
+                if owner is not None:
+                    query += " AND (owner = ? OR owner IS NULL)"
+                    params = [p + (owner,) for p in params]
+                conn.executemany(query, params)
+            conn.commit()
+
+    def count(self, status: str = "pending") -> int:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT COUNT(*) FROM webhook_outbox WHERE status = ?", (status,)
+            ).fetchone()
+        return row[0]
+
+    def list_failed(self, subscription_id: Optional[str] = None, limit: int = 50) -> List[OutboxRecord]:
+        """Permanently failed records, newest first"""
+        query = f"SELECT {self._COLUMNS} FROM webhook_outbox WHERE status = 'failed'"
+        params: List[Any] = []
+        if subscription_id:
+            query += " AND subscription_id = ?"
+            params.append(subscription_id)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._get_conn().execute(query, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _to_row(r: OutboxRecord) -> tuple:
+        return (
+            r.id, r.subscription_id, r.url, r.event_type, r.body, r.signature,
+            r.status, r.attempts, r.max_attempts, r.next_attempt_at,
+            r.created_at, r.last_error, r.batch_secret
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> OutboxRecord:
+        return OutboxRecord(
+            id=row[0], subscription_id=row[1], url=row[2], event_type=row[3],
+            body=row[4], signature=row[5], status=row[6], attempts=row[7],
+            max_attempts=row[8], next_attempt_at=row[9], created_at=row[10],
+            last_error=row[11], batch_secret=row[12]
+        )
+
+
+class WebhookDeliveryEngine:
+    """
+    Delivers webhook events from a durable outbox.
+
+    - Events are persisted before any network I/O, so restarts lose nothing.
+    - One shared HTTP session with total and per-host connection caps.
+    - Failed attempts are rescheduled with exponential backoff in the outbox
+      instead of sleeping inside a task.
+    - Due records are claimed under a lease before sending, so dispatchers
+      in several worker processes never deliver the same record twice
+      (unless a lease expires mid-delivery).
+    - For subscriptions that opted in, due events are sent as one signed
+      batched request; everything else keeps the one-event wire format.
+    """
+
+    def __init__(
+        self,
+        outbox: Optional[WebhookOutbox] = None,
+        transport: Optional[Transport] = None,
+        max_connections: int = 100,
+        max_per_host: int = 8,
+        max_batch_size: int = 20,
+        fetch_limit: int = 500,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        request_timeout: float = 10.0,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300.0
+    ):
+        self.outbox = outbox or WebhookOutbox()
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_batch_size = max(1, max_batch_size)
+        self.fetch_limit = fetch_limit
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.request_timeout = request_timeout
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._transport = transport
+        self._session = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._listeners: List[Any] = []  # weak refs to ResultCallbacks
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing = False
+
+        # Throughput metrics
+        self._started_at = time.time()
+        self._counters = {
+            "enqueued": 0,
+            "delivered": 0,
+            "retried": 0,
+            "failed": 0,
+            "requests": 0,
+            "events_sent": 0,
+            "batched_requests": 0,
+        }
+        self._recent_deliveries: deque = deque(maxlen=10000)  # timestamps
+        self._latency_ms: deque = deque(maxlen=1000)
+
+    # ----- Producer side -----
+
+    def add_listener(self, callback: ResultCallback):
+        """
+        Register a callback invoked when a record is delivered or fails permanently.
+
+        Bound methods are held weakly so short-lived services don't pile up.
+        """
+        if hasattr(callback, "__self__"):
+            self._listeners.append(weakref.WeakMethod(callback))
+        else:
+            self._listeners.append(lambda: callback)
+
+    def _live_listeners(self) -> List[ResultCallback]:
+        alive = []
+        for ref in self._listeners:
+            callback = ref()
+            if callback is not None:
+                alive.append((ref, callback))
+        self._listeners = [ref for ref, _ in alive]
+        return [callback for _, callback in alive]
+
+    def enqueue(
+        self,
+        subscription_id: str,
+        url: str,
+        event_type: str,
+        payload: Dict[str, Any],
+        secret: str,
+        max_attempts: int = 3,
+        batch: bool = False
+    ) -> OutboxRecord:
+        """
+        Persist an event for delivery.
+
+        Returns immediately; the dispatcher picks the record up on its next pass.
+        With batch=True (the subscription opted in) the event may be combined
+        with other due events for the same subscription into one request.
+        """
+        body = json.dumps(payload, sort_keys=True)
+        record = OutboxRecord(
+            subscription_id=subscription_id,
+            url=url,
+            event_type=event_type,
+            body=body,
+            signature=sign_body(body, secret),
+            max_attempts=max_attempts,
+            batch_secret=secret if batch else None
+        )
+
+        self.outbox.add([record])
+        self._counters["enqueued"] += 1
+        self._notify()
+
+        return record
+
+    def _notify(self):
+        """Wake the dispatcher (safe to call from any thread)"""
+        if self._wake is None or self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._wake.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    # ----- Lifecycle -----
+
+    async def start(self):
+        """Start the dispatcher on the running event loop"""
+        if self._dispatcher and not self._dispatcher.done():
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._dispatcher = asyncio.create_task(self._run())
+        logger.info("WebhookDeliveryEngine started")
+
+    def ensure_started(self):
+        """Start the dispatcher if called from within a running loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._dispatcher is None or self._dispatcher.done():
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._closing = False
+            self._dispatcher = asyncio.create_task(self._run())
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        Stop the dispatcher and release the HTTP pool.
+
+        Records already due are delivered for up to drain_timeout seconds;
+        anything left (including scheduled retries) stays in the outbox
+        for the next start.
+        """
+        if self._dispatcher:
+            self._closing = True
+            self._wake.set()
+            try:
+                await asyncio.wait_for(self._dispatcher, timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Webhook drain timed out; remaining records stay in the outbox")
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+            # Let another worker (or the next start) pick up interrupted claims
+            self.outbox.release(self.owner)
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        logger.info("WebhookDeliveryEngine stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.process_due()
+            except Exception as e:
+                logger.error(f"Webhook dispatcher pass failed: {e}")
+                processed = 0
+
+            if processed:
+                continue
+            if self._closing:
+                return
+
+            # Sleep until the next scheduled retry, a new enqueue, or the poll interval
+            timeout = self.poll_interval
+            next_due = self.outbox.next_due_at()
+            if next_due is not None:
+                timeout = min(timeout, max(0.0, next_due - time.time()))
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    # ----- Delivery -----
+
+    async def process_due(self, now: Optional[float] = None) -> int:
+        """
+        Deliver every record that is due.
+
+        Returns:
+            Number of records processed
+        """
+        now = now or time.time()
+        records = self.outbox.claim(now, self.fetch_limit, self.owner, self.lease_seconds)
+        if not records:
+            return 0
+
+        # Opted-in subscriptions get batched requests; others one per event
+        batches = []
+        groups: Dict[str, List[OutboxRecord]] = {}
+        for record in records:
+            if record.batch_secret:
+                groups.setdefault(record.subscription_id, []).append(record)
+            else:
+                batches.append([record])
+        for group in groups.values():
+            for i in range(0, len(group), self.max_batch_size):
+                batches.append(group[i:i + self.max_batch_size])
+
+        results = await asyncio.gather(*(self._send_batch(batch) for batch in batches))
+
+        delivered: List[str] = []
+        updated: List[OutboxRecord] = []
+        settled: List[tuple] = []
+        for batch, (ok, error) in zip(batches, results):
+            for record in batch:
+                record.attempts += 1
+                if ok:
+                    record.status = "delivered"
+                    delivered.append(record.id)
+                    settled.append((record, True))
+                    continue
+
+                record.last_error = error
+                if record.attempts >= record.max_attempts:
+                    record.status = "failed"
+                    settled.append((record, False))
+                    self._counters["failed"] += 1
+                else:
+                    record.status = "pending"
+                    record.next_attempt_at = time.time() + self._backoff(record.attempts)
+                    self._counters["retried"] += 1
+                updated.append(record)
+
+        self.outbox.complete(delivered, updated, owner=self.owner)
+
+        finished = time.time()
+        self._counters["delivered"] += len(delivered)
+        self._recent_deliveries.extend([finished] * len(delivered))
+
+        listeners = self._live_listeners() if settled else []
+        for record, success in settled:
+            if not success:
+                logger.error(
+                    f"Webhook delivery failed after {record.attempts} attempts: "
+                    f"{record.url} ({record.last_error})"
+                )
+            for listener in listeners:
+                try:
+                    listener(record, success)
+                except Exception as e:
+                    logger.error(f"Webhook result listener failed: {e}")
+
+        return len(records)
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.max_backoff, self.base_backoff ** attempts)
+
+    async def _send_batch(self, batch: List[OutboxRecord]) -> tuple:
+        """Send one request for a batch; returns (success, error)"""
+        first = batch[0]
+        if len(batch) == 1:
+            body = first.body
+            headers = first.headers()
+        else:
+            # The request is signed as a whole like any delivery; each event
+            # also keeps its own signature so receivers can verify them singly
+            body = json.dumps({
+                "type": "batch",
+                "events": [
+                    {"payload": json.loads(r.body), "body": r.body, "signature": r.signature}
+                    for r in batch
+                ]
+            })
+            headers = first.headers()
+            headers["X-Webhook-Signature"] = sign_body(body, first.batch_secret)
+            headers["X-Webhook-Event"] = "batch"
+            headers["X-Webhook-Batch-Size"] = str(len(batch))
+            del headers["X-Webhook-Delivery"]
+            self._counters["batched_requests"] += 1
+
+        semaphore = self._host_limits.get(first.host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._host_limits[first.host] = semaphore
+
+        async with semaphore:
+            started = time.perf_counter()
+            self._counters["requests"] += 1
+            self._counters["events_sent"] += len(batch)
+            try:
+                status = await self._post(first.url, body, headers)
+            except asyncio.TimeoutError:
+                return False, "timeout"
+            except Exception as e:
+                return False, str(e)
+            finally:
+                self._latency_ms.append((time.perf_counter() - started) * 1000)
+
+        if 200 <= status < 300:
+            return True, None
+
+        logger.warning(f"Webhook returned {status}: {first.url}")
+        return False, f"HTTP {status}"
+
+    async def _post(self, url: str, body: str, headers: Dict[str, str]) -> int:
+        if self._transport is not None:
+            return await self._transport(url, body, headers)
+
+        session = await self._get_session()
+        async with session.post(url, data=body.encode('utf-8'), headers=headers) as response:
+            return response.status
+
+    async def _get_session(self):
+        """Shared pooled session, created on first use"""
+        if self._session is None:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
+
+    # ----- Metrics -----
+
+    def get_metrics(self) -> Dict:
+        """Delivery throughput and queue metrics"""
+        now = time.time()
+        last_minute = sum(1 for ts in self._recent_deliveries if now - ts <= 60)
+        uptime = max(now - self._started_at, 1e-9)
+        latencies = sorted(self._latency_ms)
+
+        return {
+            **self._counters,
+            "pending": self.outbox.count("pending"),
+            "in_flight": self.outbox.count("in_flight"),
+            "failed_in_outbox": self.outbox.count("failed"),
+            "delivered_last_minute": last_minute,
+            "deliveries_per_second": round(self._counters["delivered"] / uptime, 3),
+            "avg_batch_size": round(
+                self._counters["events_sent"] / self._counters["requests"], 2
+            ) if self._counters["requests"] else 0.0,
+            "p50_latency_ms": round(latencies[len(latencies) // 2], 2) if latencies else 0.0,
+            "p95_latency_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2) if latencies else 0.0,
+        }
+
+
+# Global instance
+delivery_engine = WebhookDeliveryEngine()
@@ -5,12 +5,13 @@ Implements webhook subscription and event delivery with retry logic.
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
+from collections import OrderedDict
 from enum import Enum
 import hashlib
-import hmac
-import json
 
 from app.core.logging import get_logger
+from app.webhooks.delivery import WebhookDeliveryEngine, OutboxRecord, delivery_engine
+from app.webhooks.routing import SubscriptionIndex
 
 logger = get_logger(__name__)
 
@@ -29,9 +30,11 @@ class WebhookSubscription:
     """Webhook subscription"""
     id: str
     url: str
-    events: List[EventType]
+    events: List[EventType]  # May include wildcards such as "*" or "video.*"
     secret: str  # For HMAC signing
     active: bool = True
+    user_id: Optional[str] = None
+    batch: bool = False  # Opted in to combined, batch-signed deliveries
     created_at: datetime = field(default_factory=datetime.utcnow)
 
 
@@ -53,26 +56,43 @@ class WebhookDelivery:
 class WebhookManager:
     """
     Manages webhook subscriptions and event delivery.
+    
+    Delivery is handed to the shared WebhookDeliveryEngine; the manager only
+    keeps a bounded window of recent deliveries plus running counters.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        engine: Optional[WebhookDeliveryEngine] = None,
+        max_tracked_deliveries: int = 1000
+    ):
         self._subscriptions: Dict[str, WebhookSubscription] = {}
-        self._deliveries: List[WebhookDelivery] = []
+        self._index = SubscriptionIndex()  # active subscriptions only
+        self._deliveries: "OrderedDict[str, WebhookDelivery]" = OrderedDict()
+        self._max_tracked_deliveries = max_tracked_deliveries
+        self._stats = {"total": 0, "success": 0, "failed": 0}
+        self._engine = engine or delivery_engine
+        self._engine.add_listener(self._on_delivery_result)
         logger.info("WebhookManager initialized")
     
     def subscribe(
         self,
         url: str,
         events: List[EventType],
-        secret: Optional[str] = None
+        secret: Optional[str] = None,
+        user_id: Optional[str] = None,
+        batch: bool = False
     ) -> WebhookSubscription:
         """
         Subscribe to webhook events.
         
         Args:
             url: Webhook URL
-            events: List of event types to subscribe to
+            events: List of event types to subscribe to ("*" and
+                prefix patterns like "video.*" are accepted)
             secret: Secret for HMAC signing (generated if not provided)
+            user_id: Owning user (None for platform-wide subscriptions)
+            batch: Accept several events per request (a "batch" body)
         
         Returns:
             WebhookSubscription
@@ -89,14 +109,17 @@ class WebhookManager:
             id=subscription_id,
             url=url,
             events=events,
-            secret=secret
+            secret=secret,
+            user_id=user_id,
+            batch=batch
         )
         
         self._subscriptions[subscription_id] = subscription
+        self._index.add(subscription_id, user_id, events, subscription)
         
         logger.info(
             f"Webhook subscribed: {url} for events: "
-            f"{[e.value for e in events]}"
+            f"{[getattr(e, 'value', e) for e in events]}"
         )
         
         return subscription
@@ -105,27 +128,31 @@ class WebhookManager:
         """Unsubscribe webhook"""
         if subscription_id in self._subscriptions:
             self._subscriptions[subscription_id].active = False
+            self._index.remove(subscription_id)
             logger.info(f"Webhook unsubscribed: {subscription_id}")
     
     def deliver_event(
         self,
         event_type: EventType,
-        payload: Dict[str, Any]
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None
     ):
         """
         Deliver event to all subscribers.
         
+        Events are written to the delivery outbox and sent asynchronously.
+        
         Args:
             event_type: Event type
             payload: Event payload
+            user_id: Restrict to this user's subscriptions (plus
+                platform-wide ones); None delivers to every subscriber
         """
-        import uuid
-        
         # Find subscriptions for this event
-        subscribers = [
-            sub for sub in self._subscriptions.values()
-            if sub.active and event_type in sub.events
-        ]
+        if user_id is None:
+            subscribers = self._index.match(event_type)
+        else:
+            subscribers = self._index.match(event_type, user_id) + self._index.match(event_type, None)
         
         if not subscribers:
             logger.debug(f"No subscribers for event: {event_type.value}")
@@ -135,101 +162,58 @@ class WebhookManager:
             f"Delivering event {event_type.value} to {len(subscribers)} subscribers"
         )
         
-        # Create delivery for each subscriber
+        # Queue delivery for each subscriber
         for subscription in subscribers:
-            delivery = WebhookDelivery(
-                id=str(uuid.uuid4()),
+            record = self._engine.enqueue(
                 subscription_id=subscription.id,
-                event_type=event_type,
-                payload=payload,
                 url=subscription.url,
-                status="pending"
+                event_type=event_type.value,
+                payload={
+                    "event": event_type.value,
+                    "payload": payload,
+                    "timestamp": datetime.utcnow().isoformat()
+                },
+                secret=subscription.secret,
+                batch=subscription.batch
             )
             
-            self._deliveries.append(delivery)
-            
-            # Attempt delivery
-            self._attempt_delivery(delivery, subscription)
-    
-    def _attempt_delivery(
-        self,
-        delivery: WebhookDelivery,
-        subscription: WebhookSubscription
-    ):
-        """
-        Attempt to deliver webhook.
-        
-        Args:
-            delivery: Webhook delivery
-            subscription: Webhook subscription
-        """
-        delivery.attempts += 1
-        
-        # Create signed payload
-        signed_payload = self._sign_payload(
-            delivery.payload,
-            subscription.secret
-        )
+            self._track(WebhookDelivery(
+                id=record.id,
+                subscription_id=subscription.id,
+                event_type=event_type,
+                payload=payload,
+                url=subscription.url,
+                status="pending",
+                max_attempts=record.max_attempts
+            ))
         
-        # Mock HTTP delivery (in production: use requests/httpx)
-        try:
-            logger.info(
-                f"Delivering webhook to {delivery.url} "
-                f"(attempt {delivery.attempts}/{delivery.max_attempts})"
-            )
-            
-            # Mock: 90% success rate
-            import random
-            success = random.random() < 0.9
-            
-            if success:
-                delivery.status = "success"
-                delivery.delivered_at = datetime.utcnow()
-                logger.info(f"Webhook delivered successfully: {delivery.id}")
-            else:
-                raise Exception("Delivery failed (mock)")
-                
-        except Exception as e:
-            logger.error(f"Webhook delivery failed: {e}")
-            
-            if delivery.attempts >= delivery.max_attempts:
-                delivery.status = "failed"
-                logger.error(
-                    f"Webhook delivery failed permanently: {delivery.id} "
-                    f"(max attempts reached)"
-                )
-            else:
-                # Retry
-                logger.info(
-                    f"Webhook will be retried: {delivery.id} "
-                    f"({delivery.attempts}/{delivery.max_attempts})"
-                )
-                # In production: schedule retry with exponential backoff
+        self._engine.ensure_started()
     
-    def _sign_payload(self, payload: Dict, secret: str) -> Dict:
-        """
-        Sign payload with HMAC.
+    def _track(self, delivery: WebhookDelivery):
+        """Remember a delivery, evicting the oldest beyond the window"""
+        self._deliveries[delivery.id] = delivery
+        self._stats["total"] += 1
         
-        Args:
-            payload: Payload to sign
-            secret: Secret key
+        while len(self._deliveries) > self._max_tracked_deliveries:
+            self._deliveries.popitem(last=False)
+    
+    def _on_delivery_result(self, record: OutboxRecord, success: bool):
+        """Engine callback once a delivery succeeds or fails permanently"""
+        if record.subscription_id not in self._subscriptions:
+            return
         
-        Returns:
-            Signed payload with signature
-        """
-        payload_json = json.dumps(payload, sort_keys=True)
+        self._stats["success" if success else "failed"] += 1
         
-        signature = hmac.new(
-            secret.encode(),
-            payload_json.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        delivery = self._deliveries.get(record.id)
+        if delivery is None:
+            return
         
-        return {
-            "payload": payload,
-            "signature": signature,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        delivery.attempts = record.attempts
+        if success:
+            delivery.status = "success"
+            delivery.delivered_at = datetime.utcnow()
+        else:
+            delivery.status = "failed"
     
     def get_deliveries(
         self,
@@ -237,23 +221,24 @@ class WebhookManager:
         status: Optional[str] = None,
         limit: int = 50
     ) -> List[WebhookDelivery]:
-        """Get webhook deliveries"""
-        deliveries = self._deliveries
-        
-        if subscription_id:
-            deliveries = [d for d in deliveries if d.subscription_id == subscription_id]
+        """Get recent webhook deliveries, most recent first"""
+        results = []
         
-        if status:
-            deliveries = [d for d in deliveries if d.status == status]
-        
-        # Sort by most recent
-        deliveries.sort(key=lambda d: d.created_at, reverse=True)
+        for delivery in reversed(self._deliveries.values()):
+            if subscription_id and delivery.subscription_id != subscription_id:
+                continue
+            if status and delivery.status != status:
+                continue
+            
+            results.append(delivery)
+            if len(results) >= limit:
+                break
         
-        return deliveries[:limit]
+        return results
     
     def get_stats(self) -> Dict:
         """Get webhook statistics"""
-        total_deliveries = len(self._deliveries)
+        total_deliveries = self._stats["total"]
         
         if total_deliveries == 0:
             return {
@@ -263,16 +248,18 @@ class WebhookManager:
                 "success_rate": 0.0
             }
         
-        successful = sum(1 for d in self._deliveries if d.status == "success")
+        successful = self._stats["success"]
+        failed = self._stats["failed"]
         
         return {
             "total_subscriptions": len(self._subscriptions),
             "active_subscriptions": sum(1 for s in self._subscriptions.values() if s.active),
             "total_deliveries": total_deliveries,
             "successful_deliveries": successful,
-            "failed_deliveries": sum(1 for d in self._deliveries if d.status == "failed"),
-            "pending_deliveries": sum(1 for d in self._deliveries if d.status == "pending"),
-            "success_rate": round((successful / total_deliveries) * 100, 2)
+            "failed_deliveries": failed,
+            "pending_deliveries": total_deliveries - successful - failed,
+            "success_rate": round((successful / total_deliveries) * 100, 2),
+            "engine": self._engine.get_metrics()
         }
 
 
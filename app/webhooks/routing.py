@@ -0,0 +1,113 @@
+"""
+Webhook Subscription Routing
+Index of subscriptions by event type and (user, event type) with wildcard support.
+"""
+from typing import Dict, List, Optional, Iterable, Iterator, Tuple, Any
+
+
+WILDCARD = "*"
+
+# Sentinel for "any owner" lookups
+_ANY_USER = object()
+
+
+def candidate_keys(event_type: str) -> Iterator[str]:
+    """
+    Index keys that can match an event.
+
+    "video.created" -> "video.created", "video.*", "*"
+    """
+    yield event_type
+    parts = event_type.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        yield ".".join(parts[:i]) + ".*"
+    yield WILDCARD
+
+
+def is_pattern(event: str) -> bool:
+    """True for "*" and prefix patterns like "video.*"."""
+    return event == WILDCARD or event.endswith(".*")
+
+
+def pattern_matches(pattern: str, event_type: str) -> bool:
+    """Whether a subscription pattern matches a concrete event type."""
+    return pattern in set(candidate_keys(event_type))
+
+
+class SubscriptionIndex:
+    """
+    Maintains event_type -> subscriptions and (user_id, event_type) ->
+    subscriptions, updated on subscribe/unsubscribe.
+
+    Routing an event looks up at most one key per dotted segment plus the
+    global wildcard, so the cost is O(matches) rather than O(subscriptions).
+    """
+
+    def __init__(self):
+        self._by_event: Dict[str, Dict[str, Any]] = {}
+        self._by_user_event: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        self._by_user: Dict[Optional[str], Dict[str, Any]] = {}
+        self._keys: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+
+    def add(self, subscription_id: str, user_id: Optional[str], events: Iterable[str], item: Any):
+        """Index a subscription (re-adding replaces the previous entry)"""
+        self.remove(subscription_id)
+
+        keys = tuple(dict.fromkeys(str(getattr(e, "value", e)) for e in events))
+        for key in keys:
+            self._by_event.setdefault(key, {})[subscription_id] = item
+            self._by_user_event.setdefault((user_id, key), {})[subscription_id] = item
+
+        self._by_user.setdefault(user_id, {})[subscription_id] = item
+        self._keys[subscription_id] = (user_id, keys)
+
+    def remove(self, subscription_id: str) -> bool:
+        """Drop a subscription from every index"""
+        entry = self._keys.pop(subscription_id, None)
+        if entry is None:
+            return False
+
+        user_id, keys = entry
+        for key in keys:
+            self._discard(self._by_event, key, subscription_id)
+            self._discard(self._by_user_event, (user_id, key), subscription_id)
+        self._discard(self._by_user, user_id, subscription_id)
+        return True
+
+    @staticmethod
+    def _discard(index: Dict, key: Any, subscription_id: str):
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(subscription_id, None)
+        if not bucket:
+            del index[key]
+
+    def match(self, event_type: str, user_id: Any = _ANY_USER) -> List[Any]:
+        """
+        Subscriptions for an event, optionally restricted to one owner.
+
+        A subscription that matches through several patterns is returned once.
+        """
+        event_type = str(getattr(event_type, "value", event_type))
+        matches: Dict[str, Any] = {}
+
+        for key in candidate_keys(event_type):
+            if user_id is _ANY_USER:
+                bucket = self._by_event.get(key)
+            else:
+                bucket = self._by_user_event.get((user_id, key))
+            if bucket:
+                matches.update(bucket)
+
+        return list(matches.values())
+
+    def for_user(self, user_id: Optional[str]) -> List[Any]:
+        """All indexed subscriptions owned by a user"""
+        return list(self._by_user.get(user_id, {}).values())
+
+    def __contains__(self, subscription_id: str) -> bool:
+        return subscription_id in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -9,6 +9,7 @@ from app.workflows.primitives import (
     ExecutionStatus
 )
 from app.workflows.dag_engine import DAGEngine, dag_engine
+from app.workflows.memo import TaskResultStore, task_result_store
 from app.workflows.conditional import (
     Condition,
     ConditionalTask,
@@ -30,6 +31,8 @@ __all__ = [
     # Engine
     'DAGEngine',
     'dag_engine',
+    'TaskResultStore',
+    'task_result_store',
     
     # Conditional
     'Condition',
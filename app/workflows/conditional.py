@@ -39,14 +39,16 @@ class ConditionalTask(Task):
         condition: Condition,
         execute_fn: Callable,
         dependencies: List[str] = None,
-        metadata: dict = None
+        metadata: dict = None,
+        fingerprint: Any = None
     ):
         super().__init__(
             id=id,
             name=name,
             execute_fn=execute_fn,
             dependencies=dependencies or [],
-            metadata=metadata or {}
+            metadata=metadata or {},
+            fingerprint=fingerprint
         )
         self.condition = condition
     
@@ -139,16 +141,27 @@ def error_rate_condition(threshold: float) -> Condition:
 
 # Workflow builders with conditions
 
-def create_quality_workflow(dag: DAG, quality_threshold: float = 80.0):
+def create_quality_workflow(
+    dag: DAG,
+    quality_threshold: float = 80.0,
+    depends_on: Optional[List[str]] = None
+):
     """
     Create workflow with quality-based branching.
     
     Quality > 80: auto-publish
     Quality 70-80: manual review
     Quality < 70: regenerate
+    
+    The quality check runs after the `depends_on` tasks (e.g. script and
+    hook generation) and is fingerprinted on their results, so when a
+    regenerate loop re-executes the DAG the check reruns only if upstream
+    content changed. Without upstream tasks there is nothing to key the
+    result on, so the check always runs. The branch tasks have side
+    effects and always run.
     """
     # Quality check task
-    def check_quality():
+    def check_quality(**upstream):
         # Mock quality check
         quality_score = 85.0  # In production: actual quality check
         return {"quality_score": quality_score}
@@ -156,12 +169,14 @@ def create_quality_workflow(dag: DAG, quality_threshold: float = 80.0):
     quality_task = Task(
         id="check_quality",
         name="Quality Check",
-        execute_fn=check_quality
+        execute_fn=check_quality,
+        dependencies=list(depends_on or []),
+        fingerprint={"threshold": quality_threshold} if depends_on else None
     )
     dag.add_task(quality_task)
     
     # Publish task (quality > 80)
-    def publish():
+    def publish(**upstream):
         logger.info("Auto-publishing high-quality content")
         return {"status": "published"}
     
@@ -173,7 +188,7 @@ def create_quality_workflow(dag: DAG, quality_threshold: float = 80.0):
     )
     
     # Manual review task (quality 70-80)
-    def manual_review():
+    def manual_review(**upstream):
         logger.info("Queuing for manual review")
         return {"status": "queued_for_review"}
     
@@ -185,7 +200,7 @@ def create_quality_workflow(dag: DAG, quality_threshold: float = 80.0):
     )
     
     # Regenerate task (quality < 70)
-    def regenerate():
+    def regenerate(**upstream):
         logger.info("Quality too low, regenerating")
         return {"status": "regenerating"}
     
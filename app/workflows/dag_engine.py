@@ -4,8 +4,14 @@ Executes workflows defined as Directed Acyclic Graphs with parallel task executi
 """
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import asyncio
+import heapq
+import inspect
+import itertools
+import threading
 import time
+import uuid
 
 from app.workflows.primitives import (
     DAG,
@@ -14,36 +20,182 @@ from app.workflows.primitives import (
     TaskStatus,
     ExecutionStatus
 )
+from app.workflows.memo import TaskResultStore, task_fingerprint, task_result_store
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+class ReadyQueue:
+    """
+    Dependency-counting scheduler state for one execution.
+
+    A task becomes ready the moment its last dependency completes; ready
+    tasks come out longest critical path first, so the chain that bounds
+    the total runtime is started before short side branches.
+    """
+
+    def __init__(self, dag: DAG):
+        self._dependents = dag.get_dependents_map()
+        self._priority = dag.get_critical_path_lengths()
+        self._waiting = {
+            task_id: len(task.dependencies) for task_id, task in dag.tasks.items()
+        }
+        self._heap: List[tuple] = []
+        self._order = itertools.count()
+        self.ready_at: Dict[str, float] = {}
+
+        for task_id, count in self._waiting.items():
+            if count == 0:
+                self._push(task_id)
+
+    def _push(self, task_id: str):
+        self.ready_at[task_id] = time.perf_counter()
+        heapq.heappush(self._heap, (-self._priority[task_id], next(self._order), task_id))
+
+    def pop(self) -> str:
+        return heapq.heappop(self._heap)[2]
+
+    def complete(self, task_id: str):
+        """Mark a task done, releasing dependents whose last dependency it was."""
+        for dependent_id in self._dependents[task_id]:
+            self._waiting[dependent_id] -= 1
+            if self._waiting[dependent_id] == 0:
+                self._push(dependent_id)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+
 class DAGEngine:
     """
     DAG execution engine with parallel task execution.
+
+    Tasks run on one long-lived thread pool as soon as their dependencies
+    finish; at most max_workers tasks of an execution are in flight at once.
+    Tasks that declare a fingerprint reuse the stored result of a previous
+    run with identical inputs instead of executing again.
     """
-    
-    def __init__(self, max_workers: int = 10):
+
+    def __init__(self, max_workers: int = 10, result_store: Optional[TaskResultStore] = None):
         self.max_workers = max_workers
+        self.result_store = result_store
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         logger.info(f"DAGEngine initialized (max_workers={max_workers})")
-    
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Shared worker pool, created on first use"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="dag-task"
+                    )
+        return self._executor
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool (a later execution starts a new one)"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
     def execute_dag(self, dag: DAG, execution_id: Optional[str] = None) -> Execution:
         """
         Execute DAG workflow.
-        
+
         Args:
             dag: DAG to execute
             execution_id: Optional execution ID
-        
+
         Returns:
             Execution result
         """
-        import uuid
-        
+        execution = self._start_execution(dag, execution_id)
+
+        try:
+            ready = ReadyQueue(dag)
+            running = {}
+
+            while ready or running:
+                # Launch everything ready unless a task has already failed
+                while ready and len(running) < self.max_workers and not execution.errors:
+                    task_id = ready.pop()
+                    future = self.executor.submit(
+                        self._execute_task, dag.get_task(task_id), execution, ready.ready_at[task_id]
+                    )
+                    running[future] = task_id
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    if dag.get_task(task_id).status == TaskStatus.COMPLETED:
+                        ready.complete(task_id)
+
+            self._finish_execution(execution)
+
+        except Exception as e:
+            logger.error(f"DAG execution failed: {e}", exc_info=True)
+            execution.status = ExecutionStatus.FAILED
+            execution.errors["_execution"] = str(e)
+
+        finally:
+            execution.completed_at = datetime.utcnow()
+
+        return execution
+
+    async def execute_dag_async(self, dag: DAG, execution_id: Optional[str] = None) -> Execution:
+        """
+        Execute DAG workflow on the running event loop.
+
+        Coroutine task functions are awaited directly; plain functions run
+        on the engine's worker pool.
+        """
+        execution = self._start_execution(dag, execution_id)
+
+        try:
+            ready = ReadyQueue(dag)
+            running = {}
+
+            while ready or running:
+                while ready and len(running) < self.max_workers and not execution.errors:
+                    task_id = ready.pop()
+                    coro = self._execute_task_async(
+                        dag.get_task(task_id), execution, ready.ready_at[task_id]
+                    )
+                    running[asyncio.ensure_future(coro)] = task_id
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    if dag.get_task(task_id).status == TaskStatus.COMPLETED:
+                        ready.complete(task_id)
+
+            self._finish_execution(execution)
+
+        except Exception as e:
+            logger.error(f"DAG execution failed: {e}", exc_info=True)
+            execution.status = ExecutionStatus.FAILED
+            execution.errors["_execution"] = str(e)
+
+        finally:
+            execution.completed_at = datetime.utcnow()
+
+        return execution
+
+    def _start_execution(self, dag: DAG, execution_id: Optional[str]) -> Execution:
         # Validate DAG
         dag.validate()
-        
+
         # Create execution context
         exec_id = execution_id or str(uuid.uuid4())
         execution = Execution(
@@ -52,116 +204,127 @@ class DAGEngine:
             status=ExecutionStatus.RUNNING,
             started_at=datetime.utcnow()
         )
-        
-        logger.info(f"Starting DAG execution: {dag.id} (execution_id={exec_id})")
-        
-        try:
-            # Get execution order (topological sort)
-            levels = dag.get_execution_order()
-            
-            logger.info(
-                f"Execution plan: {len(levels)} levels, "
-                f"{len(dag.tasks)} total tasks"
+
+        logger.info(
+            f"Starting DAG execution: {dag.id} (execution_id={exec_id}, "
+            f"{len(dag.tasks)} tasks)"
+        )
+        return execution
+
+    def _finish_execution(self, execution: Execution):
+        if execution.errors:
+            logger.error(
+                f"DAG execution failed: {execution.id} "
+                f"({len(execution.errors)} tasks failed)"
             )
-            
-            # Execute each level
-            for level_idx, level_tasks in enumerate(levels):
-                logger.info(
-                    f"Executing level {level_idx + 1}/{len(levels)}: "
-                    f"{len(level_tasks)} parallel tasks"
-                )
-                
-                # Execute tasks in parallel
-                self._execute_level(dag, level_tasks, execution)
-                
-                # Check for failures
-                failed_tasks = [
-                    task_id for task_id in level_tasks
-                    if dag.get_task(task_id).status == TaskStatus.FAILED
-                ]
-                
-                if failed_tasks:
-                    logger.error(
-                        f"Level {level_idx + 1} failed: {len(failed_tasks)} tasks failed"
-                    )
-                    execution.status = ExecutionStatus.FAILED
-                    break
-            
-            # Mark as completed if no failures
-            if execution.status == ExecutionStatus.RUNNING:
-                execution.status = ExecutionStatus.COMPLETED
-                logger.info(f"DAG execution completed successfully: {exec_id}")
-            
-        except Exception as e:
-            logger.error(f"DAG execution failed: {e}", exc_info=True)
             execution.status = ExecutionStatus.FAILED
-            execution.errors["_execution"] = str(e)
-        
-        finally:
-            execution.completed_at = datetime.utcnow()
-        
-        return execution
-    
-    def _execute_level(
-        self,
-        dag: DAG,
-        task_ids: List[str],
-        execution: Execution
-    ):
-        """Execute tasks in parallel"""
-        
-        if len(task_ids) == 1:
-            # Single task, execute directly
-            task = dag.get_task(task_ids[0])
-            self._execute_task(task, execution)
         else:
-            # Multiple tasks, execute in parallel
-            with ThreadPoolExecutor(max_workers=min(len(task_ids), self.max_workers)) as executor:
-                futures = {
-                    executor.submit(self._execute_task, dag.get_task(task_id), execution): task_id
-                    for task_id in task_ids
-                }
-                
-                for future in as_completed(futures):
-                    task_id = futures[future]
-                    try:
-                        future.result()
-                    except Exception as e:
-                        logger.error(f"Task {task_id} execution failed: {e}")
-    
-    def _execute_task(self, task: Task, execution: Execution):
-        """Execute single task"""
+            execution.status = ExecutionStatus.COMPLETED
+            logger.info(f"DAG execution completed successfully: {execution.id}")
+
+    def _begin_task(self, task: Task, execution: Execution) -> Dict[str, Any]:
         task.status = TaskStatus.RUNNING
         task.started_at = datetime.utcnow()
-        
+
         logger.info(f"Executing task: {task.id} ({task.name})")
-        
+
+        # Get dependency results
+        return {
+            dep_id: execution.results.get(dep_id)
+            for dep_id in task.dependencies
+        }
+
+    def _lookup_result(self, task: Task, execution: Execution, dep_results: Dict[str, Any]):
+        """(fingerprint, found, result) from the result store, scoped to the DAG"""
+        if self.result_store is None:
+            return None, False, None
+        fingerprint = task_fingerprint(task, dep_results, scope=execution.dag.id)
+        if fingerprint is None:
+            return None, False, None
+        found, result = self.result_store.get(fingerprint)
+        return fingerprint, found, result
+
+    def _complete_task(
+        self,
+        task: Task,
+        execution: Execution,
+        result: Any,
+        fingerprint: Optional[str] = None,
+        cached: bool = False
+    ):
+        task.result = result
+        task.status = TaskStatus.COMPLETED
+        execution.results[task.id] = result
+
+        if cached:
+            execution.cached_tasks.append(task.id)
+            logger.info(f"Task reused: {task.id} (inputs unchanged)")
+            return
+
+        if fingerprint is not None:
+            self.result_store.put(fingerprint, result)
+        logger.info(f"Task completed: {task.id} (duration={task._calculate_duration()}s)")
+
+    def _fail_task(self, task: Task, execution: Execution, error: Exception):
+        logger.error(f"Task failed: {task.id} - {error}", exc_info=True)
+        task.status = TaskStatus.FAILED
+        task.error = str(error)
+        execution.errors[task.id] = str(error)
+
+    @staticmethod
+    def _record_timing(task: Task, execution: Execution, ready_at: float, started: float):
+        execution.task_timings[task.id] = {
+            "queue_seconds": round(started - ready_at, 4),
+            "run_seconds": round(time.perf_counter() - started, 4)
+        }
+
+    def _execute_task(self, task: Task, execution: Execution, ready_at: float):
+        """Execute single task"""
+        started = time.perf_counter()
+
+        try:
+            dep_results = self._begin_task(task, execution)
+
+            fingerprint, found, result = self._lookup_result(task, execution, dep_results)
+            if not found:
+                # Execute task function
+                result = task.execute_fn(**dep_results) if dep_results else task.execute_fn()
+
+            self._complete_task(task, execution, result, fingerprint, cached=found)
+
+        except Exception as e:
+            self._fail_task(task, execution, e)
+
+        finally:
+            task.completed_at = datetime.utcnow()
+            self._record_timing(task, execution, ready_at, started)
+
+    async def _execute_task_async(self, task: Task, execution: Execution, ready_at: float):
+        """Execute single task without blocking the event loop"""
+        started = time.perf_counter()
+
         try:
-            # Get dependency results
-            dep_results = {
-                dep_id: execution.results.get(dep_id)
-                for dep_id in task.dependencies
-            }
-            
-            # Execute task function
-            result = task.execute_fn(**dep_results) if dep_results else task.execute_fn()
-            
-            # Store result
-            task.result = result
-            task.status = TaskStatus.COMPLETED
-            execution.results[task.id] = result
-            
-            logger.info(f"Task completed: {task.id} (duration={task._calculate_duration()}s)")
-            
+            dep_results = self._begin_task(task, execution)
+
+            fingerprint, found, result = self._lookup_result(task, execution, dep_results)
+            if not found:
+                if inspect.iscoroutinefunction(task.execute_fn):
+                    result = await task.execute_fn(**dep_results)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(
+                        self.executor, lambda: task.execute_fn(**dep_results)
+                    )
+
+            self._complete_task(task, execution, result, fingerprint, cached=found)
+
         except Exception as e:
-            logger.error(f"Task failed: {task.id} - {e}", exc_info=True)
-            task.status = TaskStatus.FAILED
-            task.error = str(e)
-            execution.errors[task.id] = str(e)
-        
+            self._fail_task(task, execution, e)
+
         finally:
             task.completed_at = datetime.utcnow()
+            self._record_timing(task, execution, ready_at, started)
 
 
 # Global instance
-dag_engine = DAGEngine()
+dag_engine = DAGEngine(result_store=task_result_store)
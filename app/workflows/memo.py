@@ -0,0 +1,101 @@
+"""
+Workflow Result Memoization
+Content fingerprints for task inputs and a bounded store of results keyed
+by them, so re-executing a DAG only runs tasks whose inputs changed.
+"""
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+from app.workflows.primitives import Task
+
+
+def content_digest(value: Any) -> str:
+    """Stable digest of a JSON-like value (other objects hash by repr)."""
+    encoded = json.dumps(value, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def task_fingerprint(
+    task: Task,
+    dep_results: Dict[str, Any],
+    scope: Optional[str] = None
+) -> Optional[str]:
+    """
+    Fingerprint of everything a task's result depends on, or None if the
+    task doesn't declare one (and so is never memoized).
+
+    The task's declared fingerprint (a value, or a callable taking the same
+    arguments as execute_fn) covers its own inputs; dependency results are
+    folded in, so a task reruns when upstream output changes and is reused
+    when an upstream task reran but produced the same result. The scope
+    (normally the DAG id) keeps equal task ids in unrelated DAGs sharing
+    one store from reusing each other's results.
+    """
+    if task.fingerprint is None:
+        return None
+
+    declared = task.fingerprint
+    if callable(declared):
+        declared = declared(**dep_results)
+
+    return content_digest({
+        "scope": scope,
+        "task": task.id,
+        "inputs": declared,
+        "dependencies": {
+            dep_id: content_digest(result) for dep_id, result in sorted(dep_results.items())
+        }
+    })
+
+
+class TaskResultStore:
+    """LRU of task fingerprint -> result, shared across executions."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: str) -> Tuple[bool, Any]:
+        """(found, result); a stored None result is still a hit."""
+        with self._lock:
+            if fingerprint in self._results:
+                self._results.move_to_end(fingerprint)
+                self.hits += 1
+                return True, self._results[fingerprint]
+            self.misses += 1
+            return False, None
+
+    def put(self, fingerprint: str, result: Any):
+        with self._lock:
+            self._results[fingerprint] = result
+            self._results.move_to_end(fingerprint)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._results),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+# Global instance
+task_result_store = TaskResultStore()
@@ -31,6 +31,10 @@ class Task:
     execute_fn: Callable
     dependencies: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Content fingerprint of the task's own inputs: a value, or a callable
+    # taking the same arguments as execute_fn. Set it to let the engine reuse
+    # a previous result; leave None for tasks with side effects.
+    fingerprint: Optional[Any] = None
     
     # Runtime state
     status: TaskStatus = TaskStatus.PENDING
@@ -187,6 +191,47 @@ class DAG:
         
         return levels
     
+    def get_dependents_map(self) -> Dict[str, List[str]]:
+        """Map each task ID to the IDs of tasks that depend on it"""
+        dependents = {task_id: [] for task_id in self.tasks}
+        for task in self.tasks.values():
+            for dep_id in task.dependencies:
+                dependents[dep_id].append(task.id)
+        return dependents
+    
+    def get_critical_path_lengths(self) -> Dict[str, float]:
+        """
+        Longest remaining path from each task to the end of the DAG,
+        including the task itself.
+        
+        Task cost is metadata["estimated_seconds"] (default 1), so without
+        estimates this is the number of tasks on the longest downstream chain.
+        
+        Returns:
+            Dict of task ID to critical path length
+        """
+        dependents = self.get_dependents_map()
+        
+        # Topological order (Kahn), then fill lengths from the sinks back
+        in_degree = {task_id: len(task.dependencies) for task_id, task in self.tasks.items()}
+        order = [task_id for task_id, degree in in_degree.items() if degree == 0]
+        for task_id in order:
+            for dependent_id in dependents[task_id]:
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    order.append(dependent_id)
+        
+        if len(order) != len(self.tasks):
+            raise ValueError(f"DAG {self.id} has unresolvable dependencies")
+        
+        lengths: Dict[str, float] = {}
+        for task_id in reversed(order):
+            cost = float(self.tasks[task_id].metadata.get("estimated_seconds", 1.0))
+            downstream = max((lengths[d] for d in dependents[task_id]), default=0.0)
+            lengths[task_id] = cost + downstream
+        
+        return lengths
+    
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -220,6 +265,10 @@ class Execution:
     completed_at: Optional[datetime] = None
     results: Dict[str, Any] = field(default_factory=dict)
     errors: Dict[str, str] = field(default_factory=dict)
+    # Per task: seconds waiting after dependencies finished, and running
+    task_timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # Tasks whose result was reused from an earlier run with the same inputs
+    cached_tasks: List[str] = field(default_factory=list)
     
     def to_dict(self) -> dict:
         return {
@@ -234,7 +283,9 @@ class Execution:
             "task_statuses": {
                 task_id: task.status.value
                 for task_id, task in self.dag.tasks.items()
-            }
+            },
+            "task_timings": self.task_timings,
+            "cached_tasks": self.cached_tasks
         }
     
     def _calculate_duration(self) -> Optional[float]:
@@ -0,0 +1,114 @@
+"""
+Artifact Catalog Benchmark.
+Times cleanup target selection and storage stats from the catalog at
+catalog scale (synthetic rows, 1M by default), and compares an
+os.walk + stat traversal with os.scandir reconciliation on a real
+directory tree.
+
+Usage:
+    python scripts/benchmark_artifact_catalog.py --rows 1000000 --disk-files 20000
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from app.reliability.artifact_catalog import ArtifactCatalog
+
+TYPES = ["temp_files", "failed_job", "preview", "completed", "dead_letter"]
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {(time.perf_counter() - start) * 1000:>10.1f}ms")
+    return result
+
+
+def populate(catalog: ArtifactCatalog, rows: int):
+    """Insert synthetic rows spread over 60 days of mtimes."""
+    rng = random.Random(42)
+    now = time.time()
+    conn = catalog._get_conn()
+    batch = []
+    for i in range(rows):
+        batch.append((
+            f"/media/{TYPES[i % len(TYPES)]}/{i // 1000}/{i}.bin",
+            TYPES[i % len(TYPES)],
+            rng.randint(1_000, 50_000_000),
+            now - rng.uniform(0, 60 * 86400),
+        ))
+        if len(batch) >= 50_000:
+            catalog._upsert(conn, [r + (0,) for r in batch])
+            batch = []
+    catalog._upsert(conn, [r + (0,) for r in batch])
+    conn.commit()
+    catalog._totals = None
+
+
+def walk_stats(root: str):
+    """The previous approach: walk once for targets, twice for stats."""
+    cutoff = time.time() - 3600
+    targets = 0
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if os.stat(os.path.join(dirpath, name)).st_mtime < cutoff:
+                targets += 1
+    size = sum(
+        os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files
+    )
+    count = sum(len(files) for _, _, files in os.walk(root))
+    return targets, size, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artifact catalog benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--disk-files", type=int, default=20_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="catalog_bench_")
+    try:
+        print("=" * 60)
+        print(f"CATALOG: {args.rows:,} artifacts")
+        print("=" * 60)
+
+        catalog = ArtifactCatalog(os.path.join(workdir, "catalog.db"))
+        timed("populate", lambda: populate(catalog, args.rows))
+
+        cutoff = time.time() - 7 * 86400
+        expired = timed("cleanup targets (7d, one type)", lambda: catalog.expired("failed_job", cutoff))
+        print(f"{'  targets found':<36} {len(expired):>10,}")
+        timed("storage stats (cold totals)", catalog.totals)
+        timed("storage stats (warm totals)", catalog.totals)
+        timed("record one artifact", lambda: catalog.record("/media/new.bin", "completed", 10, time.time()))
+        timed("remove 1,000 artifacts", lambda: catalog.remove([p for p, _, _ in expired[:1000]]))
+        catalog.close()
+
+        print("=" * 60)
+        print(f"DISK: {args.disk_files:,} files")
+        print("=" * 60)
+
+        root = os.path.join(workdir, "media")
+        for i in range(args.disk_files):
+            directory = os.path.join(root, str(i // 500))
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"{i}.bin"), "wb") as f:
+                f.write(b"x" * (i % 4096))
+
+        disk_catalog = ArtifactCatalog(os.path.join(workdir, "disk.db"))
+        timed("os.walk targets + stats (before)", lambda: walk_stats(root))
+        timed("scandir reconcile (first)", lambda: disk_catalog.reconcile("completed", root))
+        timed("scandir reconcile (repeat)", lambda: disk_catalog.reconcile("completed", root))
+        timed("catalog targets + stats (after)", lambda: (
+            disk_catalog.expired("completed", time.time() - 3600), disk_catalog.totals()
+        ))
+        disk_catalog.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-Start Benchmark.
+Measures how long a fresh interpreter takes to import the API app, with
+lazy and eager router registration, and prints the per-router breakdown.
+
+Usage:
+    python scripts/benchmark_cold_start.py --runs 5 --max-seconds 3.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter; prints one JSON line
+PROBE = """
+import json, time
+start = time.perf_counter()
+from app.api.main import app, router_registry
+imported = time.perf_counter() - start
+warmup = None
+if {warm}:
+    router_registry.load_all(trigger="warmup")
+    warmup = time.perf_counter() - start
+print(json.dumps({{
+    "import_seconds": imported,
+    "warm_seconds": warmup,
+    "report": router_registry.report()
+}}))
+"""
+
+
+def run_probe(lazy: bool, warm: bool) -> Dict:
+    env = dict(os.environ)
+    env["LAZY_ROUTERS"] = "true" if lazy else "false"
+    env["ROUTER_WARMUP"] = "false"
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(warm=warm)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(runs: int) -> Dict:
+    lazy: List[float] = []
+    eager: List[float] = []
+    warm: List[float] = []
+    last = None
+
+    for _ in range(runs):
+        lazy.append(run_probe(lazy=True, warm=False)["import_seconds"])
+        eager.append(run_probe(lazy=False, warm=False)["import_seconds"])
+        last = run_probe(lazy=True, warm=True)
+        warm.append(last["warm_seconds"])
+
+    return {
+        "runs": runs,
+        "lazy_import_median_s": round(statistics.median(lazy), 3),
+        "eager_import_median_s": round(statistics.median(eager), 3),
+        "lazy_plus_warmup_median_s": round(statistics.median(warm), 3),
+        "routers": last["report"]["routers"] if last else []
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="Fail if the lazy import median exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.runs)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("=" * 60)
+        print("API COLD START")
+        print("=" * 60)
+        print(f"Lazy import (median of {results['runs']}):  {results['lazy_import_median_s']}s")
+        print(f"Eager import:                   {results['eager_import_median_s']}s")
+        print(f"Lazy + full warm-up:            {results['lazy_plus_warmup_median_s']}s")
+        print("\nPer-router import time:")
+        for row in results["routers"]:
+            print(f"  {row['module']:<36} {row['import_ms']:>9.1f}ms  {row['routes']:>3} routes")
+
+    if args.max_seconds is not None and results["lazy_import_median_s"] > args.max_seconds:
+        print(f"❌ Cold start {results['lazy_import_median_s']}s exceeds {args.max_seconds}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+i18n Benchmark.
+Per-request i18n overhead: negotiate the language from an Accept-Language
+header, then translate every string a dashboard page needs. Compares the
+previous approach (re-parse the header, dict lookup + str.format per key)
+with cached negotiation and precompiled catalogs.
+
+Usage:
+    python scripts/benchmark_i18n.py --requests 200000
+"""
+import argparse
+import random
+import time
+
+from app.services.i18n_service import TRANSLATIONS, Language, i18n_service
+
+HEADERS = [
+    "en-US,en;q=0.9",
+    "fr-FR,fr;q=0.9,en;q=0.8",
+    "es-ES,es;q=0.9,en-US;q=0.8,en;q=0.7",
+    "de-DE,de;q=0.9,en;q=0.8",
+    "ja,en-US;q=0.9,en;q=0.8",
+    "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "zh-CN,zh;q=0.9,en;q=0.8",
+    "ko-KR,ko;q=0.9",
+    "hi-IN,hi;q=0.9,en-IN;q=0.8,en;q=0.7",
+    "",
+]
+
+PAGE_KEYS = [
+    "dashboard", "total_videos", "total_views", "engagement_rate", "growth",
+    "create_video", "my_videos", "settings", "logout", "upgrade_to_pro",
+    "video_published", "videos_created_count",
+]
+PAGE_PARAMS = {
+    "video_published": {"platform": "YouTube"},
+    "videos_created_count": {"count": 42},
+}
+
+
+def legacy_detect(header: str) -> str:
+    """The previous detect_language: parse and sort on every call."""
+    if not header:
+        return "en"
+    languages = []
+    for lang_part in header.split(','):
+        parts = lang_part.strip().split(';')
+        lang_code = parts[0].split('-')[0]
+        quality = 1.0
+        if len(parts) > 1 and parts[1].startswith('q='):
+            try:
+                quality = float(parts[1][2:])
+            except ValueError:
+                quality = 1.0
+        languages.append((lang_code, quality))
+    languages.sort(key=lambda x: x[1], reverse=True)
+    for lang_code, _ in languages:
+        if lang_code in [l.value for l in Language]:
+            return lang_code
+    return "en"
+
+
+def legacy_translate(key: str, language: str, params=None) -> str:
+    """The previous translate: lookup + str.format per key."""
+    lang_dict = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+    translation = lang_dict.get(key, key)
+    if params:
+        translation = translation.format(**params)
+    return translation
+
+
+def legacy_request(header: str):
+    language = legacy_detect(header)
+    return {key: legacy_translate(key, language, PAGE_PARAMS.get(key)) for key in PAGE_KEYS}
+
+
+def compiled_request(header: str):
+    language = i18n_service.detect_language(header)
+    return i18n_service.translate_many(PAGE_KEYS, language, PAGE_PARAMS)
+
+
+def run(label: str, headers, handle):
+    start = time.perf_counter()
+    for header in headers:
+        handle(header)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<28} {len(headers) / elapsed:>11,.0f} req/s   "
+        f"{elapsed / len(headers) * 1e6:>7.2f}us/req"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="i18n per-request overhead benchmark")
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    headers = [rng.choice(HEADERS) for _ in range(args.requests)]
+
+    print("=" * 60)
+    print(f"I18N: {args.requests:,} requests, {len(PAGE_KEYS)} strings per page")
+    print("=" * 60)
+
+    run("legacy (parse + format)", headers, legacy_request)
+    run("compiled + cached", headers, compiled_request)
+    run("negotiation only (legacy)", headers, legacy_detect)
+    run("negotiation only (cached)", headers, i18n_service.detect_language)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Logging Benchmark.
+Records per second per core for the structured logging pipeline: JSON and
+pretty formatting written synchronously vs handed to the background
+listener, plus disabled and sampled DEBUG calls.
+
+Usage:
+    python scripts/benchmark_logging.py --records 200000
+"""
+import argparse
+import logging
+import os
+import time
+
+from app.core import logging as app_logging
+from app.core.context import RequestContext, clear_context, set_context
+
+
+def run(label: str, records: int, emit):
+    """Time `records` calls on the caller, then wait for the writer to drain."""
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for i in range(records):
+        emit(i)
+    caller = time.perf_counter() - start
+
+    app_logging._stop_listener()  # flushes the queue when asynchronous
+    total = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    print(
+        f"{label:<30} caller {records / caller:>11,.0f}/s   "
+        f"drained {records / total:>11,.0f}/s   "
+        f"per core {records / max(cpu, 1e-9):>11,.0f}/s"
+    )
+
+
+def configure(format_type: str, level: str = "INFO", async_handlers: bool = False):
+    """Configure logging to os.devnull and mute the console handler."""
+    app_logging.configure_logging(
+        level=level,
+        format_type=format_type,
+        log_file=os.devnull,
+        async_handlers=async_handlers
+    )
+    handlers = app_logging._listener.handlers if async_handlers else logging.getLogger().handlers
+    for handler in handlers:
+        if not hasattr(handler, "baseFilename"):
+            handler.setLevel(logging.CRITICAL + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured logging benchmark")
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"LOGGING: {args.records:,} records per case, output to {os.devnull}")
+    print("=" * 60)
+
+    logger = app_logging.get_logger("benchmark")
+    set_context(RequestContext(request_id="req_benchmark", job_id="job_benchmark"))
+
+    for format_type in ("json", "pretty"):
+        for async_handlers in (False, True):
+            configure(format_type, async_handlers=async_handlers)
+            mode = "queued" if async_handlers else "sync"
+            run(
+                f"{format_type} {mode}",
+                args.records,
+                lambda i: logger.info("Rendered scene", scene=i, duration_ms=12)
+            )
+
+    configure("json")
+    run("debug disabled", args.records, lambda i: logger.debug("Cache HIT"))
+
+    configure("json", level="DEBUG")
+    logger.sample_debug(max_per_second=20)
+    run("debug sampled (20/s)", args.records, lambda i: logger.debug("Cache HIT"))
+
+    clear_context()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Stage Profiler Benchmark.
+Per-span overhead of the stage profiler: a job span with a handful of
+stage spans and nested provider calls, repeated, with the profiler
+disabled, enabled but unsampled, and fully sampled.
+
+Usage:
+    python scripts/benchmark_profiler.py --jobs 20000
+"""
+import argparse
+import time
+
+from app.core.profiling import StageProfiler
+
+STAGES = ["story", "validate", "critic", "audio", "video", "save"]
+CALLS_PER_STAGE = 3
+
+
+def run_job(profiler: StageProfiler, job_id: str):
+    with profiler.span("job", kind="job", job_id=job_id):
+        for stage in STAGES:
+            with profiler.span(stage):
+                for _ in range(CALLS_PER_STAGE):
+                    with profiler.span("provider.call", kind="llm"):
+                        pass
+
+
+def baseline_job(_profiler, _job_id):
+    for _stage in STAGES:
+        for _ in range(CALLS_PER_STAGE):
+            pass
+
+
+def run(label: str, jobs: int, profiler: StageProfiler, handle):
+    spans = 1 + len(STAGES) * (1 + CALLS_PER_STAGE)
+    start = time.perf_counter()
+    for i in range(jobs):
+        handle(profiler, f"job-{i}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<24} {jobs / elapsed:>11,.0f} jobs/s   "
+        f"{elapsed / (jobs * spans) * 1e6:>6.2f}us/span"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage profiler span overhead benchmark")
+    parser.add_argument("--jobs", type=int, default=20_000)
+    args = parser.parse_args()
+
+    spans = 1 + len(STAGES) * (1 + CALLS_PER_STAGE)
+    print("=" * 60)
+    print(f"PROFILER: {args.jobs:,} jobs, {spans} spans per job")
+    print("=" * 60)
+
+    run("no instrumentation", args.jobs, None, baseline_job)
+    run("disabled", args.jobs, StageProfiler(enabled=False), run_job)
+    run("sample_rate=0.0", args.jobs, StageProfiler(sample_rate=0.0), run_job)
+    run("sample_rate=0.1", args.jobs, StageProfiler(sample_rate=0.1), run_job)
+    run("sample_rate=1.0", args.jobs, StageProfiler(sample_rate=1.0), run_job)
+
+
+if __name__ == "__main__":
+    main()